@@ -2,8 +2,8 @@
 Função: Analisa os dados sensoriados, armazenados no dataset './data/resultados_simulacao.csv' e gera estatísticas e gráficos
 """
 
+import argparse
 import os
-import csv
 import math
 import statistics
 from datetime import datetime
@@ -23,221 +23,88 @@ except ImportError as e:
     print("Execute: pip install pandas")
     exit(1)
 
-# Tentar importar bibliotecas opcionais
-try:
-    from scipy.interpolate import interp1d
-    SCIPY_AVAILABLE = True
-except ImportError:
-    print("Scipy não disponível - usando interpolação linear simples")
-    SCIPY_AVAILABLE = False
-
-try:
-    from sklearn.metrics import r2_score, mean_squared_error
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    print("Scikit-learn não disponível - usando implementação própria de métricas")
-    SKLEARN_AVAILABLE = False
+from cfe_hydro.cache import CacheResultados, digital_arrays
+from cfe_hydro.dados import DATASET_PADRAO, carregar_colunas
+from cfe_hydro.interpolacao import para_float64, preencher_lacunas
+from cfe_hydro.metricas import METRICAS, calcular_metricas
 
-try:
-    import matplotlib.pyplot as plt
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    print("Matplotlib não disponível - gráficos desabilitados")
-    MATPLOTLIB_AVAILABLE = False
+# O matplotlib é importado só ao gerar os gráficos (gerar_graficos_estatisticos): execuções
+# sem gráficos (--sem-graficos) não pagam a importação
 
 class SimpleInterpolator:
-    """Implementação simples de interpolação sem dependências externas"""
+    """Interpolação vetorizada das lacunas entre valores conhecidos (cfe_hydro.interpolacao)"""
     
     @staticmethod
     def linear_interpolation(ids, values):
         # Interpolação linear simples
-        ids = [float(x) for x in ids]  # Garantir que IDs são numéricos
-        values = [float(x) if x is not None and str(x).replace(',', '').replace('.', '').isdigit() else float('nan') for x in values]
-        result = values.copy()
-        
-        # Encontrar índices com valores conhecidos
-        known_indices = [i for i, val in enumerate(values) if not math.isnan(val)]
-        
-        for i in range(len(known_indices) - 1):
-            start_idx = known_indices[i]
-            end_idx = known_indices[i + 1]
-            
-            if end_idx - start_idx > 1:
-                start_id = ids[start_idx]
-                end_id = ids[end_idx]
-                start_val = values[start_idx]
-                end_val = values[end_idx]
-                
-                # Interpolar valores intermediários
-                for j in range(start_idx + 1, end_idx):
-                    current_id = ids[j]
-                    factor = (current_id - start_id) / (end_id - start_id)
-                    result[j] = start_val + (end_val - start_val) * factor
-        
-        return result
+        return preencher_lacunas(ids, values)
     
     @staticmethod
     def conservative_interpolation(ids, values, max_gap=2):
-        # Interpolação conservadora para parâmetros sensíveis
-        ids = [float(x) for x in ids]  # Garantir que IDs são numéricos
-        values = [float(x) if x is not None and str(x).replace(',', '').replace('.', '').isdigit() else float('nan') for x in values]
-        result = values.copy()
-        
-        known_indices = [i for i, val in enumerate(values) if not math.isnan(val)]
-        
-        for i in range(len(known_indices) - 1):
-            start_idx = known_indices[i]
-            end_idx = known_indices[i + 1]
-            gap_size = end_idx - start_idx
-            
-            if 1 < gap_size <= max_gap:
-                start_id = ids[start_idx]
-                end_id = ids[end_idx]
-                start_val = values[start_idx]
-                end_val = values[end_idx]
-                
-                for j in range(start_idx + 1, end_idx):
-                    current_id = ids[j]
-                    factor = (current_id - start_id) / (end_id - start_id)
-                    result[j] = start_val + (end_val - start_val) * factor
-        
-        return result
+        # Interpolação conservadora para parâmetros sensíveis: só preenche lacunas curtas
+        return preencher_lacunas(ids, values, max_gap=max_gap)
 
 class MetricCalculator:
-    # Calculadora de métricas sem dependência do scikit-learn
+    # Métricas de uma reconstrução, pelo kernel vetorizado de cfe_hydro.metricas
+    
+    @staticmethod
+    def calcular(y_true, y_pred):
+        """Todas as métricas (R², RMSE, MAE, MAPE, erro máximo); vírgula decimal é aceita"""
+        n = min(len(y_true), len(y_pred))
+        return calcular_metricas(para_float64(y_true[:n]), para_float64(y_pred[:n]))
     
     @staticmethod
     def r2_score(y_true, y_pred):
-        """Calcula R² manualmente"""
-        # Converter para float, tratando vírgula como separador decimal
-        y_true_clean = []
-        y_pred_clean = []
-        
-        for i in range(min(len(y_true), len(y_pred))):
-            try:
-                # Tentar converter para float, tratando vírgula
-                val_true = float(str(y_true[i]).replace(',', '.')) if y_true[i] is not None else float('nan')
-                val_pred = float(str(y_pred[i]).replace(',', '.')) if y_pred[i] is not None else float('nan')
-                
-                if not math.isnan(val_true) and not math.isnan(val_pred):
-                    y_true_clean.append(val_true)
-                    y_pred_clean.append(val_pred)
-            except (ValueError, TypeError):
-                continue
-        
-        if len(y_true_clean) < 2:
-            return float('nan')
-        
-        y_mean = statistics.mean(y_true_clean)
-        
-        ss_tot = sum((y - y_mean) ** 2 for y in y_true_clean)
-        ss_res = sum((y_true_clean[i] - y_pred_clean[i]) ** 2 for i in range(len(y_true_clean)))
-        
-        if ss_tot == 0:
-            return 1.0 if ss_res == 0 else 0.0
-        
-        return 1 - (ss_res / ss_tot)
+        """Calcula R² sobre os pares válidos"""
+        return MetricCalculator.calcular(y_true, y_pred)['r2']
     
     @staticmethod
     def rmse(y_true, y_pred):
-        # Calcula RMSE manualmente
-        # Converter para float, tratando vírgula como separador decimal
-        y_true_clean = []
-        y_pred_clean = []
-        
-        for i in range(min(len(y_true), len(y_pred))):
-            try:
-                val_true = float(str(y_true[i]).replace(',', '.')) if y_true[i] is not None else float('nan')
-                val_pred = float(str(y_pred[i]).replace(',', '.')) if y_pred[i] is not None else float('nan')
-                
-                if not math.isnan(val_true) and not math.isnan(val_pred):
-                    y_true_clean.append(val_true)
-                    y_pred_clean.append(val_pred)
-            except (ValueError, TypeError):
-                continue
-        
-        if len(y_true_clean) < 1:
-            return float('nan')
-        
-        mse = sum((y_true_clean[i] - y_pred_clean[i]) ** 2 for i in range(len(y_true_clean))) / len(y_true_clean)
-        return math.sqrt(mse)
+        # Calcula RMSE sobre os pares válidos
+        return MetricCalculator.calcular(y_true, y_pred)['rmse']
 
 class AnalisadorInterpolacaoCorrigido:
-    def __init__(self, arquivo_dataset):
-        # Inicializa o analisador com o dataset
+    def __init__(self, arquivo_dataset, cache=None):
+        # Inicializa o analisador com o dataset; cache (CacheResultados) guarda as reconstruções
+        # e métricas de cada intervalo entre execuções
         self.df = self.carregar_dataset_corrigido(arquivo_dataset)
+        self.cache = cache
         self.resultados = {}
         self.interpolator = SimpleInterpolator()
         self.metric_calculator = MetricCalculator()
         
     def carregar_dataset_corrigido(self, arquivo):
-        # Carrega o dataset CSV corrigindo problemas de vírgula decimal
+        # Carrega o dataset CSV em blocos, direto para arrays tipados (cfe_hydro.dados.ler_blocos),
+        # com vírgula ou ponto decimal; parâmetros em float64 para que as métricas e os gráficos
+        # não dependam do arredondamento para float32
         print("Carregando dataset...")
         
         try:
-            # Primeiro, ler como string para processamento manual
-            df_str = pd.read_csv(arquivo, sep=';', dtype=str, encoding='utf-8')
-            
-            # Converter colunas numéricas, tratando vírgula como ponto decimal
-            colunas_numericas = ['id', 'temperatura', 'ph', 'ec', 'od']
-            
-            for coluna in colunas_numericas:
-                if coluna in df_str.columns:
-                    # Substituir vírgula por ponto e converter para float
-                    df_str[coluna] = df_str[coluna].str.replace(',', '.', regex=False)
-                    df_str[coluna] = pd.to_numeric(df_str[coluna], errors='coerce')
-            
-            print(f"Dataset carregado com sucesso: {df_str.shape[0]} linhas, {df_str.shape[1]} colunas")
-            
+            colunas = carregar_colunas(arquivo, ['id'] + PARAMETROS, dtype_valores=np.float64)
         except Exception as e:
-            print(f"Erro ao carregar com pandas: {e}")
-            print("Tentando carregar manualmente...")
-            df_str = self._carregar_dataset_manual(arquivo)
+            print(f"Erro ao carregar o dataset: {e}")
+            raise
+        df = pd.DataFrame(colunas)
+        print(f"Dataset carregado com sucesso: {df.shape[0]} linhas, {df.shape[1]} colunas")
         
         # Verificar estrutura
-        print(f"Estrutura do dataset: {df_str.shape}")
-        print(f"Colunas: {df_str.columns.tolist()}")
+        print(f"Estrutura do dataset: {df.shape}")
+        print(f"Colunas: {df.columns.tolist()}")
         print(f"Primeiras linhas:")
-        print(df_str.head().to_string())
+        print(df.head().to_string())
         
         # Verificar valores nulos e estatísticas básicas
         print(f"\nEstatísticas básicas:")
-        for coluna in ['temperatura', 'ph', 'ec', 'od']:
-            if coluna in df_str.columns:
-                nulos = df_str[coluna].isna().sum()
+        for coluna in PARAMETROS:
+            if coluna in df.columns:
+                nulos = df[coluna].isna().sum()
                 if nulos == 0:
-                    media = df_str[coluna].mean()
-                    std = df_str[coluna].std()
+                    media = df[coluna].mean()
+                    std = df[coluna].std()
                     print(f"   {coluna.upper():<6}: Média = {media:.3f}, Desvio = {std:.3f}, Nulos = {nulos}")
                 else:
                     print(f"   {coluna.upper():<6}: Nulos = {nulos}")
         
-        return df_str
-    
-    def _carregar_dataset_manual(self, arquivo):
-        # Carrega dataset manualmente se o pandas falhar
-        dados = []
-        with open(arquivo, 'r', encoding='utf-8') as f:
-            leitor = csv.reader(f, delimiter=';')
-            cabecalho = next(leitor)
-            
-            for linha_num, linha in enumerate(leitor, start=2):
-                if len(linha) == len(cabecalho):
-                    # Processar cada valor, convertendo vírgula para ponto
-                    linha_processada = []
-                    for valor in linha:
-                        if ',' in str(valor) and valor.replace(',', '').replace('.', '').isdigit():
-                            # É um número com vírgula decimal
-                            linha_processada.append(float(valor.replace(',', '.')))
-                        else:
-                            linha_processada.append(valor)
-                    dados.append(linha_processada)
-                else:
-                    print(f"Linha {linha_num} ignorada: número de colunas incorreto")
-        
-        # Criar DataFrame manualmente
-        df = pd.DataFrame(dados, columns=cabecalho)
-        
         return df
     
     def _converter_para_float(self, valor):
@@ -291,8 +158,8 @@ class AnalisadorInterpolacaoCorrigido:
     def interpolar_parametro(self, ids, valores, parametro, intervalo=1):
         # Interpola valores baseado no tipo de parâmetro
         # Garantir que todos os valores são floats
-        ids_float = [self._converter_para_float(id_val) for id_val in ids]
-        valores_float = [self._converter_para_float(val) for val in valores]
+        ids_float = para_float64(ids)
+        valores_float = para_float64(valores)
         
         if parametro == 'temperatura':
             return self.interpolar_temperatura(ids_float, valores_float, intervalo)
@@ -321,35 +188,31 @@ class AnalisadorInterpolacaoCorrigido:
         # Interpolação para oxigênio dissolvido
         return self.interpolator.linear_interpolation(ids, valores_od)
     
+    def _metodos_interpolacao(self):
+        # Funções que definem as reconstruções: entram na chave do cache pelo bytecode
+        return [self.interpolar_parametro, self.interpolar_temperatura, self.interpolar_ph, self.interpolar_ec,
+                self.interpolar_od, SimpleInterpolator.linear_interpolation,
+                SimpleInterpolator.conservative_interpolation]
+    
+    def _reconstruir_intervalo(self, df_simulado, parametros, intervalo):
+        """Reconstruções e métricas de todos os parâmetros de uma simulação (dict nome -> valor)"""
+        if not parametros:
+            return {}
+        ids = df_simulado['id'].values
+        reconstrucoes = [self.interpolar_parametro(ids, df_simulado[p].values, p, intervalo) for p in parametros]
+        # Uma passada do kernel de métricas para todos os parâmetros (cada linha contra o seu original)
+        originais = np.vstack([para_float64(self.df[p].values) for p in parametros])
+        metricas = calcular_metricas(originais, np.vstack(reconstrucoes))
+        resultado = dict(zip(parametros, reconstrucoes))
+        for i, parametro in enumerate(parametros):
+            for nome in METRICAS:
+                resultado[f'{parametro}_{nome}'] = metricas[nome][i]
+        return resultado
+    
     def calcular_metricas(self, original, interpolado):
         # Calcula métricas de qualidade R² e RMSE
-        # Usar scikit-learn se disponível, senão usar implementação própria
-        if SKLEARN_AVAILABLE:
-            try:
-                # Garantir que são arrays numpy e converter para float
-                orig_clean = []
-                interp_clean = []
-                
-                for i in range(min(len(original), len(interpolado))):
-                    val_orig = self._converter_para_float(original[i])
-                    val_interp = self._converter_para_float(interpolado[i])
-                    
-                    if not math.isnan(val_orig) and not math.isnan(val_interp):
-                        orig_clean.append(val_orig)
-                        interp_clean.append(val_interp)
-                
-                if len(orig_clean) < 2:
-                    return float('nan'), float('nan')
-                
-                r2 = r2_score(orig_clean, interp_clean)
-                rmse = np.sqrt(mean_squared_error(orig_clean, interp_clean))
-                
-                return r2, rmse
-            except Exception as e:
-                print(f"Erro no scikit-learn: {e}")
-        
-        # Implementação própria
-        return self.metric_calculator.r2_score(original, interpolado), self.metric_calculator.rmse(original, interpolado)
+        metricas = self.metric_calculator.calcular(original, interpolado)
+        return metricas['r2'], metricas['rmse']
     
     def executar_simulacao(self, intervalos=None):
         # Executa simulações para diferentes intervalos
@@ -360,6 +223,12 @@ class AnalisadorInterpolacaoCorrigido:
         print("=" * 60)
         
         resultados_completos = []
+        simulados = []
+        parametros = [p for p in ['temperatura', 'ph', 'ec', 'od'] if p in self.df.columns]
+        if self.cache is not None:
+            colunas = [c for c in ['id'] + parametros if c in self.df.columns]
+            digital = digital_arrays(*[para_float64(self.df[c].values) for c in colunas])
+            em_cache = 0
         
         for intervalo in intervalos:
             print(f"\nAnalisando intervalo {intervalo}...")
@@ -368,63 +237,25 @@ class AnalisadorInterpolacaoCorrigido:
                 # Simular transmissão com intervalo
                 df_simulado = self.simular_transmissao_intervalo(intervalo)
                 
-                # Aplicar interpolações
-                ids = df_simulado['id'].values
-                
-                # Interpolar cada parâmetro
-                interpolacoes = {}
-                for parametro in ['temperatura', 'ph', 'ec', 'od']:
-                    if parametro in df_simulado.columns:
-                        valores_originais = df_simulado[parametro].values
-                        interpolacoes[parametro] = self.interpolar_parametro(
-                            ids, valores_originais, parametro, intervalo
-                        )
-                
-                # Calcular métricas para cada parâmetro
-                metricas = {}
-                
-                for parametro in ['temperatura', 'ph', 'ec', 'od']:
-                    if parametro in self.df.columns and parametro in interpolacoes:
-                        original = self.df[parametro].values
-                        interpolado = interpolacoes[parametro]
-                        
-                        r2, rmse = self.calcular_metricas(original, interpolado)
-                        metricas[parametro] = {'R2': r2, 'RMSE': rmse}
-                        
-                        status_r2 = f"{r2:.4f}" if not math.isnan(r2) else "NaN"
-                        status_rmse = f"{rmse:.4f}" if not math.isnan(rmse) else "NaN"
-                        print(f"   {parametro.upper():<6}\tR² = {status_r2}\tRMSE = {status_rmse}")
-                    else:
-                        print(f"   {parametro.upper():<6}\tColuna não encontrada no dataset")
-                
-                # Armazenar resultados
-                resultado_intervalo = {
-                    'intervalo': intervalo,
-                    'pontos_transmitidos': (~pd.isna(df_simulado['temp'])).sum() if 'temp' in df_simulado.columns else 0,
-                    'percentual_transmitido': 0
-                }
-                
-                # Calcular percentual
-                if 'temp' in df_simulado.columns:
-                    total = len(df_simulado)
-                    transmitidos = (~pd.isna(df_simulado['temp'])).sum()
-                    resultado_intervalo['percentual_transmitido'] = (transmitidos / total) * 100
-                
-                for parametro in ['temperatura', 'ph', 'ec', 'od']:
-                    if parametro in metricas:
-                        resultado_intervalo[f'{parametro}_r2'] = metricas[parametro]['R2']
-                        resultado_intervalo[f'{parametro}_rmse'] = metricas[parametro]['RMSE']
-                    else:
-                        resultado_intervalo[f'{parametro}_r2'] = float('nan')
-                        resultado_intervalo[f'{parametro}_rmse'] = float('nan')
-                
-                resultados_completos.append(resultado_intervalo)
+                # Interpolar cada parâmetro e calcular as métricas (do cache, se os dados, o
+                # intervalo e os métodos de interpolação não mudaram)
+                if self.cache is None:
+                    resultado = self._reconstruir_intervalo(df_simulado, parametros, intervalo)
+                else:
+                    acertos = self.cache.acertos
+                    resultado = self.cache.memorizar(
+                        'analise.simulacao_intervalo', [digital],
+                        {'intervalo': intervalo, 'colunas': colunas, 'metodos': self._metodos_interpolacao()},
+                        lambda: self._reconstruir_intervalo(df_simulado, parametros, intervalo))
+                    em_cache += self.cache.acertos - acertos
                 
                 # Salvar dados interpolados para análise posterior
                 self.resultados[intervalo] = {
                     'df_simulado': df_simulado,
-                    'interpolado': interpolacoes
+                    'interpolado': {p: resultado[p] for p in parametros},
+                    'metricas': {p: {nome: float(resultado[f'{p}_{nome}']) for nome in METRICAS} for p in parametros},
                 }
+                simulados.append(intervalo)
                 
             except Exception as e:
                 print(f"Erro no intervalo {intervalo}: {e}")
@@ -432,6 +263,43 @@ class AnalisadorInterpolacaoCorrigido:
                 traceback.print_exc()
                 continue
         
+        if self.cache is not None:
+            print(f"\n{em_cache} de {len(simulados)} intervalos recuperados do cache ({self.cache.diretorio})")
+        
+        print("\nMÉTRICAS POR INTERVALO")
+        for intervalo in simulados:
+            df_simulado = self.resultados[intervalo]['df_simulado']
+            metricas = self.resultados[intervalo]['metricas']
+            print(f"\nIntervalo {intervalo}:")
+            
+            # Armazenar resultados
+            resultado_intervalo = {
+                'intervalo': intervalo,
+                'pontos_transmitidos': (~pd.isna(df_simulado['temp'])).sum() if 'temp' in df_simulado.columns else 0,
+                'percentual_transmitido': 0
+            }
+            
+            # Calcular percentual
+            if 'temp' in df_simulado.columns:
+                total = len(df_simulado)
+                transmitidos = (~pd.isna(df_simulado['temp'])).sum()
+                resultado_intervalo['percentual_transmitido'] = (transmitidos / total) * 100
+            
+            for parametro in ['temperatura', 'ph', 'ec', 'od']:
+                if parametro in metricas:
+                    r2 = metricas[parametro]['r2']
+                    rmse = metricas[parametro]['rmse']
+                    status_r2 = f"{r2:.4f}" if not math.isnan(r2) else "NaN"
+                    status_rmse = f"{rmse:.4f}" if not math.isnan(rmse) else "NaN"
+                    print(f"   {parametro.upper():<6}\tR² = {status_r2}\tRMSE = {status_rmse}")
+                else:
+                    print(f"   {parametro.upper():<6}\tColuna não encontrada no dataset")
+                for nome in METRICAS:
+                    resultado_intervalo[f'{parametro}_{nome}'] = (
+                        metricas[parametro][nome] if parametro in metricas else float('nan'))
+            
+            resultados_completos.append(resultado_intervalo)
+        
         if resultados_completos:
             self.df_resultados = pd.DataFrame(resultados_completos)
             return self.df_resultados
@@ -575,195 +443,27 @@ class AnalisadorInterpolacaoCorrigido:
                         qualidade = "Excelente" if r2 >= 0.95 else "Boa" if r2 >= 0.9 else "Regular" if r2 >= 0.8 else "Ruim"
                         print(f"   {parametro.upper():<6}: R² = {r2:.4f} ({qualidade})")
     
-    def gerar_graficos_estatisticos(self):
+    def gerar_graficos_estatisticos(self, diretorio='./images', dpi=300):
         """
-        Gera gráficos individuais para análise estatística dos dados
+        Gera gráficos individuais para análise estatística dos dados (um arquivo por item de
+        FIGURAS; gerar_figuras.py gera os mesmos gráficos em paralelo)
         """
-        if not MATPLOTLIB_AVAILABLE:
+        try:
+            import matplotlib.pyplot as plt
+        except ImportError:
             print("Matplotlib não disponível - gráficos não serão gerados")
             return
         
         print("\nGERANDO GRÁFICOS ESTATÍSTICOS...")
         
         try:
-            # Gráfico 1: Evolução temporal dos parâmetros originais
-            fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-            fig.suptitle('EVOLUÇÃO TEMPORAL DOS PARÂMETROS - DADOS ORIGINAIS', fontsize=16, fontweight='bold')
-            
-            parametros = ['temperatura', 'ph', 'ec', 'od']
-            titulos = ['Temperatura', 'pH', 'Condutividade Elétrica', 'Oxigênio Dissolvido']
-            unidades = ['°C', 'pH', 'mS/cm', 'mg/L']
-
-            for idx, (parametro, titulo, unidade) in enumerate(zip(parametros, titulos, unidades)):
-                if parametro in self.df.columns:
-                    ax = axes[idx//2, idx%2]
-                    valores = self.df[parametro].dropna()
-                    
-                    if not valores.empty:
-                        ax.plot(range(len(valores)), valores, 'b-', linewidth=1, alpha=0.7)
-                        ax.set_title(f'{titulo}', fontweight='bold')
-                        ax.set_ylabel(unidade)
-                        ax.set_xlabel('Amostras')
-                        ax.grid(True, alpha=0.3)
-                        
-                        # Adicionar estatísticas no gráfico
-                        media = valores.mean()
-                        std = valores.std()
-                        ax.axhline(y=media, color='r', linestyle='--', alpha=0.8, label=f'Média: {media:.2f}')
-                        ax.axhline(y=media + std, color='orange', linestyle=':', alpha=0.6, label=f'+1σ: {media+std:.2f}')
-                        ax.axhline(y=media - std, color='orange', linestyle=':', alpha=0.6, label=f'-1σ: {media-std:.2f}')
-                        ax.legend(fontsize=8)
-            
-            plt.tight_layout()
-            plt.savefig('./images/evolucao_temporal_parametros.png', dpi=300, bbox_inches='tight')
-            print("Gráfico 1 salvo: 'evolucao_temporal_parametros.png'")
-            
-            # Gráfico 2: Distribuição dos parâmetros
-            fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-            fig.suptitle('DISTRIBUIÇÃO DOS PARÂMETROS - HISTOGRAMAS', fontsize=16, fontweight='bold')
-            
-            for idx, (parametro, titulo, unidade) in enumerate(zip(parametros, titulos, unidades)):
-                if parametro in self.df.columns:
-                    ax = axes[idx//2, idx%2]
-                    valores = self.df[parametro].dropna()
-                    
-                    if not valores.empty:
-                        n, bins, patches = ax.hist(valores, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-                        ax.set_title(f'{titulo}', fontweight='bold')
-                        ax.set_ylabel('Frequência')
-                        ax.set_xlabel(unidade)
-                        ax.grid(True, alpha=0.3)
-                        
-                        # Adicionar linhas de estatísticas
-                        media = valores.mean()
-                        mediana = valores.median()
-                        ax.axvline(media, color='red', linestyle='--', linewidth=2, label=f'Média: {media:.2f}')
-                        ax.axvline(mediana, color='green', linestyle='--', linewidth=2, label=f'Mediana: {mediana:.2f}')
-                        ax.legend()
-            
-            plt.tight_layout()
-            plt.savefig('./images/distribuicao_parametros.png', dpi=300, bbox_inches='tight')
-            print("Gráfico 2 salvo: 'distribuicao_parametros.png'")
-            
-            # Gráfico 3: Métricas R² por intervalo
-            if hasattr(self, 'df_resultados') and not self.df_resultados.empty:
-                fig, ax = plt.subplots(figsize=(12, 8))
-                
-                for parametro, cor, marcador in zip(['temperatura', 'ph', 'ec', 'od'], 
-                                                  ['red', 'blue', 'green', 'purple'],
-                                                  ['o', 's', '^', 'D']):
-                    r2_col = f'{parametro}_r2'
-                    if r2_col in self.df_resultados.columns:
-                        r2_values = self.df_resultados[r2_col]
-                        intervalos = self.df_resultados['intervalo']
-                        
-                        # Filtrar valores válidos
-                        valid_mask = ~r2_values.isna()
-                        if valid_mask.any():
-                            ax.plot(intervalos[valid_mask], r2_values[valid_mask], 
-                                   marker=marcador, color=cor, linewidth=2, 
-                                   markersize=8, label=parametro.upper())
-                
-                ax.set_title('QUALIDADE DA INTERPOLAÇÃO - R² POR INTERVALO', fontsize=14, fontweight='bold')
-                ax.set_xlabel('Intervalo de Transmissão')
-                ax.set_ylabel('Coeficiente de Determinação (R²)')
-                ax.grid(True, alpha=0.3)
-                ax.legend()
-                ax.set_ylim(0, 1)
-                
-                # Adicionar linha de referência para alta qualidade
-                ax.axhline(y=0.9, color='orange', linestyle='--', alpha=0.7, label='R² = 0.9 (Alta qualidade)')
-                ax.axhline(y=0.8, color='yellow', linestyle='--', alpha=0.7, label='R² = 0.8 (Qualidade aceitável)')
-                
-                plt.savefig('./images/r2_por_intervalo.png', dpi=300, bbox_inches='tight')
-                print("Gráfico 3 salvo: 'r2_por_intervalo.png'")
-            
-            # Gráfico 4: RMSE por intervalo
-            if hasattr(self, 'df_resultados') and not self.df_resultados.empty:
-                fig, ax = plt.subplots(figsize=(12, 8))
-                
-                for parametro, cor, marcador in zip(['temperatura', 'ph', 'ec', 'od'], 
-                                                  ['red', 'blue', 'green', 'purple'],
-                                                  ['o', 's', '^', 'D']):
-                    rmse_col = f'{parametro}_rmse'
-                    if rmse_col in self.df_resultados.columns:
-                        rmse_values = self.df_resultados[rmse_col]
-                        intervalos = self.df_resultados['intervalo']
-                        
-                        # Filtrar valores válidos
-                        valid_mask = ~rmse_values.isna()
-                        if valid_mask.any():
-                            ax.plot(intervalos[valid_mask], rmse_values[valid_mask], 
-                                   marker=marcador, color=cor, linewidth=2, 
-                                   markersize=8, label=parametro.upper())
-                
-                ax.set_title('ERRO DA INTERPOLAÇÃO - RMSE POR INTERVALO', fontsize=14, fontweight='bold')
-                ax.set_xlabel('Intervalo de Transmissão')
-                ax.set_ylabel('Raiz do Erro Quadrático Médio (RMSE)')
-                ax.grid(True, alpha=0.3)
-                ax.legend()
-                
-                plt.savefig('./images/rmse_por_intervalo.png', dpi=300, bbox_inches='tight')
-                print("Gráfico 4 salvo: 'rmse_por_intervalo.png'")
-            
-            # Gráfico 5: Boxplot dos parâmetros originais (CORREÇÃO DO WARNING)
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            dados_boxplot = []
-            labels_boxplot = []
-            
-            for parametro, titulo in zip(parametros, titulos):
-                if parametro in self.df.columns:
-                    valores = self.df[parametro].dropna()
-                    if not valores.empty:
-                        dados_boxplot.append(valores)
-                        labels_boxplot.append(titulo)
-            
-            if dados_boxplot:
-                # CORREÇÃO: usar 'tick_labels' em vez de 'labels' para versões recentes do Matplotlib
-                ax.boxplot(dados_boxplot, tick_labels=labels_boxplot, patch_artist=True)
-                ax.set_title('DISTRIBUIÇÃO - BOXPLOT DOS PARÂMETROS', fontsize=14, fontweight='bold')
-                ax.set_ylabel('Valores')
-                ax.grid(True, alpha=0.3)
-                plt.xticks(rotation=45)
-                
-                plt.savefig('./images/boxplot_parametros.png', dpi=300, bbox_inches='tight')
-                print("✅ Gráfico 5 salvo: 'boxplot_parametros.png'")
-            
-            # Gráfico 6: Eficiência por intervalo (novo)
-            if hasattr(self, 'df_resultados') and not self.df_resultados.empty:
-                fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-                fig.suptitle('EFICIÊNCIA: QUALIDADE vs ECONOMIA POR INTERVALO', fontsize=16, fontweight='bold')
-                
-                for idx, parametro in enumerate(['temperatura', 'ph', 'ec', 'od']):
-                    ax = axes[idx//2, idx%2]
-                    r2_col = f'{parametro}_r2'
-                    
-                    if r2_col in self.df_resultados.columns:
-                        # Calcular eficiência para este parâmetro
-                        eficiencias = []
-                        for _, row in self.df_resultados.iterrows():
-                            if row['intervalo'] > 1:  # Apenas intervalos > 1
-                                eff = self._calcular_eficiencia(row[r2_col], row['percentual_transmitido'])
-                                eficiencias.append((row['intervalo'], eff))
-                        
-                        if eficiencias:
-                            intervalos_eff, scores_eff = zip(*eficiencias)
-                            bars = ax.bar(intervalos_eff, scores_eff, color='lightgreen', alpha=0.7, edgecolor='green')
-                            ax.set_title(f'{parametro.upper()} - Score de Eficiência', fontweight='bold')
-                            ax.set_xlabel('Intervalo')
-                            ax.set_ylabel('Score de Eficiência')
-                            ax.grid(True, alpha=0.3)
-                            
-                            # Destacar a melhor barra
-                            melhor_idx = np.argmax(scores_eff)
-                            bars[melhor_idx].set_color('gold')
-                            bars[melhor_idx].set_edgecolor('orange')
-                            bars[melhor_idx].set_linewidth(2)
-                
-                plt.tight_layout()
-                plt.savefig('./images/eficiencia_por_intervalo.png', dpi=300, bbox_inches='tight')
-                print("Gráfico 6 salvo: 'eficiencia_por_intervalo.png'")
+            for numero, (nome, grafico) in enumerate(FIGURAS.items(), start=1):
+                fig = grafico(self)
+                if fig is None:
+                    continue
+                fig.savefig(os.path.join(diretorio, f'{nome}.png'), dpi=dpi, bbox_inches='tight')
+                plt.close(fig)
+                print(f"Gráfico {numero} salvo: '{nome}.png'")
             
             print("Todos os gráficos gerados com sucesso!")
             
@@ -772,40 +472,289 @@ class AnalisadorInterpolacaoCorrigido:
             import traceback
             traceback.print_exc()
     
-    def salvar_resultados(self, arquivo='./data/resultados_simulacao.csv'):
-        """Salva resultados em arquivo CSV"""
+    def salvar_resultados(self, arquivo='./data/resultados_simulacao.csv',
+                          arquivo_metricas='./data/resultados_simulacao_metricas.csv'):
+        """
+        Salva resultados em arquivo CSV: `arquivo` mantém as colunas originais (R² e RMSE, lidas
+        por Graficos_Resultados.py) e `arquivo_metricas` recebe todas as métricas (METRICAS).
+        Ambos com fim de linha CRLF, como os arquivos versionados em ./data
+        """
         if hasattr(self, 'df_resultados') and not self.df_resultados.empty:
-            self.df_resultados.to_csv(arquivo, index=False)
+            colunas = ['intervalo', 'pontos_transmitidos', 'percentual_transmitido'] + [
+                f'{parametro}_{nome}' for parametro in ['temperatura', 'ph', 'ec', 'od'] for nome in ('r2', 'rmse')]
+            self.df_resultados[colunas].to_csv(arquivo, index=False, lineterminator='\r\n')
             print(f"Resultados salvos em '{arquivo}'")
+            if arquivo_metricas:
+                self.df_resultados.to_csv(arquivo_metricas, index=False, lineterminator='\r\n')
+                print(f"Métricas completas salvas em '{arquivo_metricas}'")
         else:
             print("Nenhum resultado para salvar")
 
-def main():
+# ===================================================================
+# GRÁFICOS ESTATÍSTICOS: cada função recebe o analisador (após executar_simulacao) e devolve a
+# figura, ou None quando não há resultados de simulação
+# ===================================================================
+
+PARAMETROS = ['temperatura', 'ph', 'ec', 'od']
+TITULOS = ['Temperatura', 'pH', 'Condutividade Elétrica', 'Oxigênio Dissolvido']
+UNIDADES = ['°C', 'pH', 'mS/cm', 'mg/L']
+
+def grafico_evolucao_temporal_parametros(analisador):
+    """Evolução temporal dos parâmetros originais, com média e ±1σ"""
+    import matplotlib.pyplot as plt
+
+    # Gráfico 1: Evolução temporal dos parâmetros originais
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig.suptitle('EVOLUÇÃO TEMPORAL DOS PARÂMETROS - DADOS ORIGINAIS', fontsize=16, fontweight='bold')
+
+    for idx, (parametro, titulo, unidade) in enumerate(zip(PARAMETROS, TITULOS, UNIDADES)):
+        if parametro in analisador.df.columns:
+            ax = axes[idx//2, idx%2]
+            valores = analisador.df[parametro].dropna()
+
+            if not valores.empty:
+                ax.plot(range(len(valores)), valores, 'b-', linewidth=1, alpha=0.7)
+                ax.set_title(f'{titulo}', fontweight='bold')
+                ax.set_ylabel(unidade)
+                ax.set_xlabel('Amostras')
+                ax.grid(True, alpha=0.3)
+
+                # Adicionar estatísticas no gráfico
+                media = valores.mean()
+                std = valores.std()
+                ax.axhline(y=media, color='r', linestyle='--', alpha=0.8, label=f'Média: {media:.2f}')
+                ax.axhline(y=media + std, color='orange', linestyle=':', alpha=0.6, label=f'+1σ: {media+std:.2f}')
+                ax.axhline(y=media - std, color='orange', linestyle=':', alpha=0.6, label=f'-1σ: {media-std:.2f}')
+                ax.legend(fontsize=8)
+
+    plt.tight_layout()
+    return fig
+
+
+def grafico_distribuicao_parametros(analisador):
+    """Histogramas dos parâmetros originais, com média e mediana"""
+    import matplotlib.pyplot as plt
+
+    # Gráfico 2: Distribuição dos parâmetros
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig.suptitle('DISTRIBUIÇÃO DOS PARÂMETROS - HISTOGRAMAS', fontsize=16, fontweight='bold')
+
+    for idx, (parametro, titulo, unidade) in enumerate(zip(PARAMETROS, TITULOS, UNIDADES)):
+        if parametro in analisador.df.columns:
+            ax = axes[idx//2, idx%2]
+            valores = analisador.df[parametro].dropna()
+
+            if not valores.empty:
+                n, bins, patches = ax.hist(valores, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
+                ax.set_title(f'{titulo}', fontweight='bold')
+                ax.set_ylabel('Frequência')
+                ax.set_xlabel(unidade)
+                ax.grid(True, alpha=0.3)
+
+                # Adicionar linhas de estatísticas
+                media = valores.mean()
+                mediana = valores.median()
+                ax.axvline(media, color='red', linestyle='--', linewidth=2, label=f'Média: {media:.2f}')
+                ax.axvline(mediana, color='green', linestyle='--', linewidth=2, label=f'Mediana: {mediana:.2f}')
+                ax.legend()
+
+    plt.tight_layout()
+    return fig
+
+
+def grafico_r2_por_intervalo(analisador):
+    """R² da interpolação por intervalo de transmissão"""
+    import matplotlib.pyplot as plt
+
+    if not hasattr(analisador, 'df_resultados') or analisador.df_resultados.empty:
+        return None
+
+    # Gráfico 3: Métricas R² por intervalo
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    for parametro, cor, marcador in zip(['temperatura', 'ph', 'ec', 'od'], 
+                                      ['red', 'blue', 'green', 'purple'],
+                                      ['o', 's', '^', 'D']):
+        r2_col = f'{parametro}_r2'
+        if r2_col in analisador.df_resultados.columns:
+            r2_values = analisador.df_resultados[r2_col]
+            intervalos = analisador.df_resultados['intervalo']
+
+            # Filtrar valores válidos
+            valid_mask = ~r2_values.isna()
+            if valid_mask.any():
+                ax.plot(intervalos[valid_mask], r2_values[valid_mask], 
+                       marker=marcador, color=cor, linewidth=2, 
+                       markersize=8, label=parametro.upper())
+
+    ax.set_title('QUALIDADE DA INTERPOLAÇÃO - R² POR INTERVALO', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Intervalo de Transmissão')
+    ax.set_ylabel('Coeficiente de Determinação (R²)')
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    ax.set_ylim(0, 1)
+
+    # Adicionar linha de referência para alta qualidade
+    ax.axhline(y=0.9, color='orange', linestyle='--', alpha=0.7, label='R² = 0.9 (Alta qualidade)')
+    ax.axhline(y=0.8, color='yellow', linestyle='--', alpha=0.7, label='R² = 0.8 (Qualidade aceitável)')
+    return fig
+
+
+def grafico_rmse_por_intervalo(analisador):
+    """RMSE da interpolação por intervalo de transmissão"""
+    import matplotlib.pyplot as plt
+
+    if not hasattr(analisador, 'df_resultados') or analisador.df_resultados.empty:
+        return None
+
+    # Gráfico 4: RMSE por intervalo
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    for parametro, cor, marcador in zip(['temperatura', 'ph', 'ec', 'od'], 
+                                      ['red', 'blue', 'green', 'purple'],
+                                      ['o', 's', '^', 'D']):
+        rmse_col = f'{parametro}_rmse'
+        if rmse_col in analisador.df_resultados.columns:
+            rmse_values = analisador.df_resultados[rmse_col]
+            intervalos = analisador.df_resultados['intervalo']
+
+            # Filtrar valores válidos
+            valid_mask = ~rmse_values.isna()
+            if valid_mask.any():
+                ax.plot(intervalos[valid_mask], rmse_values[valid_mask], 
+                       marker=marcador, color=cor, linewidth=2, 
+                       markersize=8, label=parametro.upper())
+
+    ax.set_title('ERRO DA INTERPOLAÇÃO - RMSE POR INTERVALO', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Intervalo de Transmissão')
+    ax.set_ylabel('Raiz do Erro Quadrático Médio (RMSE)')
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    return fig
+
+
+def grafico_boxplot_parametros(analisador):
+    """Boxplot dos parâmetros originais"""
+    import matplotlib.pyplot as plt
+
+    # Gráfico 5: Boxplot dos parâmetros originais (CORREÇÃO DO WARNING)
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    dados_boxplot = []
+    labels_boxplot = []
+
+    for parametro, titulo in zip(PARAMETROS, TITULOS):
+        if parametro in analisador.df.columns:
+            valores = analisador.df[parametro].dropna()
+            if not valores.empty:
+                dados_boxplot.append(valores)
+                labels_boxplot.append(titulo)
+
+    if dados_boxplot:
+        # CORREÇÃO: usar 'tick_labels' em vez de 'labels' para versões recentes do Matplotlib
+        ax.boxplot(dados_boxplot, tick_labels=labels_boxplot, patch_artist=True)
+        ax.set_title('DISTRIBUIÇÃO - BOXPLOT DOS PARÂMETROS', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Valores')
+        ax.grid(True, alpha=0.3)
+        plt.xticks(rotation=45)
+    return fig
+
+
+def grafico_eficiencia_por_intervalo(analisador):
+    """Score de eficiência (qualidade x economia) por intervalo"""
+    import matplotlib.pyplot as plt
+
+    if not hasattr(analisador, 'df_resultados') or analisador.df_resultados.empty:
+        return None
+
+    # Gráfico 6: Eficiência por intervalo (novo)
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig.suptitle('EFICIÊNCIA: QUALIDADE vs ECONOMIA POR INTERVALO', fontsize=16, fontweight='bold')
+
+    for idx, parametro in enumerate(['temperatura', 'ph', 'ec', 'od']):
+        ax = axes[idx//2, idx%2]
+        r2_col = f'{parametro}_r2'
+
+        if r2_col in analisador.df_resultados.columns:
+            # Calcular eficiência para este parâmetro
+            eficiencias = []
+            for _, row in analisador.df_resultados.iterrows():
+                if row['intervalo'] > 1:  # Apenas intervalos > 1
+                    eff = analisador._calcular_eficiencia(row[r2_col], row['percentual_transmitido'])
+                    eficiencias.append((row['intervalo'], eff))
+
+            if eficiencias:
+                intervalos_eff, scores_eff = zip(*eficiencias)
+                bars = ax.bar(intervalos_eff, scores_eff, color='lightgreen', alpha=0.7, edgecolor='green')
+                ax.set_title(f'{parametro.upper()} - Score de Eficiência', fontweight='bold')
+                ax.set_xlabel('Intervalo')
+                ax.set_ylabel('Score de Eficiência')
+                ax.grid(True, alpha=0.3)
+
+                # Destacar a melhor barra
+                melhor_idx = np.argmax(scores_eff)
+                bars[melhor_idx].set_color('gold')
+                bars[melhor_idx].set_edgecolor('orange')
+                bars[melhor_idx].set_linewidth(2)
+
+    plt.tight_layout()
+    return fig
+
+
+# Nome do arquivo (sem extensão) -> função que monta o gráfico
+FIGURAS = {
+    'evolucao_temporal_parametros': grafico_evolucao_temporal_parametros,
+    'distribuicao_parametros': grafico_distribuicao_parametros,
+    'r2_por_intervalo': grafico_r2_por_intervalo,
+    'rmse_por_intervalo': grafico_rmse_por_intervalo,
+    'boxplot_parametros': grafico_boxplot_parametros,
+    'eficiencia_por_intervalo': grafico_eficiencia_por_intervalo,
+}
+
+DIRETORIO_FIGURAS = './images'
+ENTRADAS = [DATASET_PADRAO]  # arquivos (ou raiz Parquet) que definem os gráficos (gerar_figuras.py)
+INTERVALOS_PADRAO = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+
+def preparar_dados(arquivo_dataset=DATASET_PADRAO, intervalos=INTERVALOS_PADRAO, usar_cache=True):
+    """Analisador com as simulações já executadas (entrada das funções de FIGURAS)"""
+    analisador = AnalisadorInterpolacaoCorrigido(arquivo_dataset, CacheResultados() if usar_cache else None)
+    analisador.executar_simulacao(intervalos)
+    return analisador
+
+
+def main(gerar_graficos=True, usar_cache=True):
     """
     Função principal
+
+    Args:
+        gerar_graficos: Se False, apenas simula, gera o relatório e salva os resultados (sem importar
+                        o matplotlib), para execuções em lote sem interface gráfica.
+        usar_cache: Reaproveita as reconstruções e métricas de execuções anteriores sobre os
+                    mesmos dados (cfe_hydro.cache).
     """
     print("ANALISADOR DE INTERPOLAÇÃO")
     print("=" * 50)
     
     # Verificar se o arquivo existe
-    arquivo_dataset = './data/dataset_cfe-hydro.csv'
+    arquivo_dataset = DATASET_PADRAO  # CSV ou raiz Parquet (CFE_HYDRO_DATASET)
     if not os.path.exists(arquivo_dataset):
         print(f"Arquivo '{arquivo_dataset}' não encontrado.")
         print("Criando dataset de exemplo...")
         criar_dataset_exemplo(arquivo_dataset)
     
     # Inicializar analisador
-    analisador = AnalisadorInterpolacaoCorrigido(arquivo_dataset)
+    analisador = AnalisadorInterpolacaoCorrigido(arquivo_dataset, CacheResultados() if usar_cache else None)
     
     # Executar simulações
-    intervalos_testar = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-    resultados = analisador.executar_simulacao(intervalos_testar)
+    resultados = analisador.executar_simulacao(INTERVALOS_PADRAO)
     
     # Gerar relatório
     analisador.gerar_relatorio()
     
     # Gerar gráficos estatísticos
-    analisador.gerar_graficos_estatisticos()
+    if gerar_graficos:
+        analisador.gerar_graficos_estatisticos()
     
     # Salvar resultados
     analisador.salvar_resultados()
@@ -834,6 +783,12 @@ def criar_dataset_exemplo(arquivo):
     print(f"Dataset de exemplo criado: '{arquivo}' com {n_points} registros")
 
 if __name__ == "__main__":
-    analisador = main()
+    parser = argparse.ArgumentParser(description="Simulação de transmissão por intervalo e análise estatística")
+    parser.add_argument('--sem-graficos', action='store_true',
+                        help="Não gera os gráficos (execução em lote, sem matplotlib)")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Refaz todas as simulações, sem ler nem gravar o cache de resultados")
+    args = parser.parse_args()
+    analisador = main(gerar_graficos=not args.sem_graficos, usar_cache=not args.sem_cache)
 
 
@@ -4,7 +4,7 @@
    Placa : ESP32 Dev Module
    Função: Enviar dados sensoriados para o broker MQTT
    Date  : 06/02/2026 - 07:36h
-   L.U.  : 09/02/2026 - 23:54h
+   L.U.  : 16/10/2026 - 16:30h
    Referências:
       - WifiManager : https://github.com/tzapu/WiFiManager
       - PubSubClient: https://github.com/knolleary/pubsubclient
@@ -39,12 +39,21 @@ const char* mqtt_topic_data = "cfe-hydro/data";
 const char* mqtt_topic_status = "cfe-hydro/status";
 const char* mqtt_topic_heartbeat = "cfe-hydro/heartbeat";
 const char* mqtt_client_id = "ESP32_Hydro_01";
+// Taxa de transmissão por sensor recomendada pelo receptor (retido): cfe-hydro/<device_id>/control
+const char* mqtt_topic_control = "cfe-hydro/ESP32_Hydro_01/control";
 
 // Configura intervalos
-const unsigned long sampling_interval = 30000;     // 30 seconds
-const unsigned long transmission_interval = 60000; // 60 seconds
+unsigned long sampling_interval = 30000;           // 30 seconds
+unsigned long transmission_interval = 60000;       // 60 seconds
 const unsigned long heartbeat_interval = 20000;    // 20 seconds
 
+// Intervalo de envio por sensor: 1 a cada N transmissões (N = passo), ajustado pelo receptor no
+// tópico de controle e limitado a [min_sensor_interval, max_sensor_interval]
+const unsigned long min_sensor_interval = 60000;   // 1 minute (todas as transmissões)
+const unsigned long max_sensor_interval = 600000;  // 10 minutes
+uint8_t sensor_step[4] = {1, 1, 1, 1};
+unsigned long transmission_count = 0;
+
 // Variáveis Globais
 unsigned long last_sample_time = 0;
 unsigned long last_transmission_time = 0;
@@ -444,7 +453,47 @@ void conecta_WiFi() {
    }
 } // end conectaWiFi()
 
+// Intervalo efetivo de envio do sensor (ms)
+unsigned long sensorInterval(int i) {
+    return transmission_interval * sensor_step[i];
+}
+
+// Converte a fração recomendada (1 = todas as transmissões) no passo mais próximo dentro dos limites
+void setTransmissionRatio(int i, float ratio) {
+    if (!(ratio > 0.0)) return;
+    long min_step = max(1UL, min_sensor_interval / transmission_interval);
+    long max_step = max((unsigned long)min_step, max_sensor_interval / transmission_interval);
+    long step = lroundf(1.0 / ratio);
+    sensor_step[i] = (uint8_t)constrain(step, min_step, min(max_step, 255L));
+}
+
+// Aplica {"transmission_ratio": {"<sensor_type>": fração, ...}}; sensores ausentes mantêm o passo
+void applyControl(byte* payload, unsigned int length) {
+    StaticJsonDocument<512> doc;
+    if (deserializeJson(doc, payload, length)) {
+        Serial.println("Mensagem de controle inválida");
+        return;
+    }
+    JsonObject ratios = doc["transmission_ratio"];
+    for (int i = 0; i < 4; i++) {
+        JsonVariant ratio = ratios[sensorTypeToString((SensorType)i)];
+        if (!ratio.isNull()) setTransmissionRatio(i, ratio.as<float>());
+    }
+    Serial.print("Intervalos de envio (s):");
+    for (int i = 0; i < 4; i++) {
+        Serial.print(" ");
+        Serial.print(sensorTypeToString((SensorType)i));
+        Serial.print("=");
+        Serial.print(sensorInterval(i) / 1000);
+    }
+    Serial.println();
+}
+
 void mqtt_callback(char* topic, byte* payload, unsigned int length) {
+    if (strcmp(topic, mqtt_topic_control) == 0) {
+        applyControl(payload, length);
+        return;
+    }
     Serial.print("Mensagem MQTT [");
     Serial.print(topic);
     Serial.print("]: ");
@@ -465,6 +514,7 @@ void reconnect_mqtt() {
         if (client.connect(clientId.c_str())) {
             Serial.println("conectado!");
             digitalWrite(STATUS_LED, HIGH);
+            client.subscribe(mqtt_topic_control);
         } else {
             Serial.print("falhou, rc=");
             Serial.print(client.state());
@@ -476,6 +526,11 @@ void reconnect_mqtt() {
 }
 
 // ============== FUNÇÕES DE PREPARAÇÃO DE DADOS ==============
+// O sensor entra nesta transmissão? (1 a cada sensor_step transmissões)
+bool sensorDue(int i) {
+    return current_readings[i].valid && transmission_count % sensor_step[i] == 0;
+}
+
 String prepareCFEHYDROData() {
     StaticJsonDocument<2048> doc;
     
@@ -490,12 +545,13 @@ String prepareCFEHYDROData() {
     JsonArray readings = doc.createNestedArray("readings");
     
     for (int i = 0; i < 4; i++) {
-        if (current_readings[i].valid) {
+        if (sensorDue(i)) {
             JsonObject reading = readings.createNestedObject();
             reading["sensor_type"] = sensorTypeToString(current_readings[i].type);
             reading["value"] = current_readings[i].value;
             reading["timestamp"] = current_readings[i].timestamp; // Em MILISSEGUNDOS
             reading["interpolation"] = interpolationTypeToString(current_readings[i].interpolation);
+            reading["transmission_interval"] = sensorInterval(i);
             
             // Adicionar metadados
             JsonObject metadata = reading.createNestedObject("metadata");
@@ -612,15 +668,21 @@ void loop() {
    // Enviar dados periodicamente
    if (current_time - last_transmission_time >= transmission_interval) {
       if (wifi_connected && client.connected()) {
-         Serial.println("\n>>> ENVIANDO DADOS DOS SENSORES VIA CFE-HYDRO <<<");
-            
-         String sensor_data = prepareCFEHYDROData();
-         if (client.publish(mqtt_topic_data, sensor_data.c_str())) {
-            Serial.println("✓ Dados enviados com sucesso!");
-         } else {
-            Serial.println("✗ Falha no envio dos dados");
+         bool due = false;
+         for (int i = 0; i < 4; i++) {
+            if (sensorDue(i)) due = true;
          }
-            
+         if (due) {
+            Serial.println("\n>>> ENVIANDO DADOS DOS SENSORES VIA CFE-HYDRO <<<");
+
+            String sensor_data = prepareCFEHYDROData();
+            if (client.publish(mqtt_topic_data, sensor_data.c_str())) {
+               Serial.println("✓ Dados enviados com sucesso!");
+            } else {
+               Serial.println("✗ Falha no envio dos dados");
+            }
+         }
+         transmission_count++;
          last_transmission_time = current_time;
       }
    }
@@ -1,27 +1,29 @@
 import streamlit as st
-import paho.mqtt.client as mqtt
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import json
-import time
-import threading
-from scipy import interpolate
+from datetime import datetime
 import logging
-import pytz
+import os
 import socket
+import sys
+import time
 from streamlit_autorefresh import st_autorefresh
 
+from config import (ALTURA_GRAFICO_PX, GRAFICOS_INCREMENTAIS, HORIZONTE_PREVISAO_S, LARGURA_GRAFICO_PX,
+                    METODO_REDUCAO, RECALCULO_OCIOSO_S, TOPICOS_DADOS)
+from grafico_incremental import exibir_grafico_incremental
+from servico import ServicoIngestao
+
+# Pacote cfe_hydro (em src/), compartilhado com os scripts de análise
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.metricas import calcular_metricas  # noqa: E402
+from cfe_hydro.reducao import reduzir  # noqa: E402
+
 # ==================== CONFIGURAÇÃO DE LOG ====================
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# ==================== CONFIGURAÇÕES PADRÃO ====================
-DEFAULT_BROKER = "test.mosquitto.org"
-DEFAULT_PORT = 1883
-TOPIC_DATA = "cfe-hydro/data"
-LOCAL_TIMEZONE = pytz.timezone('America/Sao_Paulo')
 
 st.set_page_config(
     page_title="Dashboard CFE-HYDRO",
@@ -54,247 +56,6 @@ css = '''
 '''
 st.markdown(css, unsafe_allow_html=True)
 
-# ==================== INTERPOLADOR ====================
-class InterpoladorSeletivo:
-    @staticmethod
-    def interpolar(x_known, y_known, x_new, metodo='linear'):
-        if len(x_known) < 2:
-            return np.full_like(x_new, y_known[0] if len(y_known) > 0 else np.nan)
-        
-        x_known = np.asarray(x_known, dtype=np.float64)
-        y_known = np.asarray(y_known, dtype=np.float64)
-        x_new = np.asarray(x_new, dtype=np.float64)
-        
-        if metodo == 'logarithmic':
-            min_x = x_known.min()
-            x_known_adj = x_known - min_x + 1
-            x_new_adj = x_new - min_x + 1
-            log_x_known = np.log(x_known_adj)
-            log_x_new = np.log(x_new_adj)
-            y_interp = np.interp(log_x_new, log_x_known, y_known)
-            return np.clip(y_interp, 0, 14)
-        elif metodo == 'polynomial':
-            try:
-                k = min(3, len(x_known)-1)
-                tck = interpolate.splrep(x_known, y_known, s=0, k=k)
-                return interpolate.splev(x_new, tck, der=0)
-            except Exception:
-                return np.interp(x_new, x_known, y_known)
-        else:
-            return np.interp(x_new, x_known, y_known)
-
-# ==================== GERENCIADOR DE DADOS ====================
-class GerenciadorDados:
-    def __init__(self):
-        self.lock = threading.Lock()
-        self.sensor_data = {}          # sensor_type -> DataFrame
-        self.sensor_metadata = {}       # sensor_type -> dict
-        self.messages_received = 0
-        self.last_message_time = None
-        self.novos_dados = False
-
-    def adicionar_ponto(self, sensor_type, timestamp_ms, value, interpolation, metadata):
-        try:
-            with self.lock:
-                # Metadados
-                if sensor_type not in self.sensor_metadata:
-                    self.sensor_metadata[sensor_type] = {}
-                self.sensor_metadata[sensor_type].update(metadata)
-                self.sensor_metadata[sensor_type]['interpolation'] = interpolation
-
-                # Dados
-                if sensor_type not in self.sensor_data:
-                    self.sensor_data[sensor_type] = pd.DataFrame(columns=['timestamp', 'value'])
-                new_row = pd.DataFrame({
-                    'timestamp': [timestamp_ms],
-                    'value': [float(value)]
-                })
-                self.sensor_data[sensor_type] = pd.concat(
-                    [self.sensor_data[sensor_type], new_row], ignore_index=True
-                )
-                # Limitar tamanho
-                if len(self.sensor_data[sensor_type]) > 1000:
-                    self.sensor_data[sensor_type] = self.sensor_data[sensor_type].iloc[-1000:]
-
-                self.messages_received += 1
-                self.last_message_time = datetime.now()
-                self.novos_dados = True
-                logger.info(f"✅ Ponto adicionado: {sensor_type} = {value:.3f} em {timestamp_ms}")
-        except Exception as e:
-            logger.error(f"Erro ao adicionar ponto para {sensor_type}: {e}")
-
-    def obter_dados_brutos(self, sensor_type, horas=24):
-        with self.lock:
-            df = self.sensor_data.get(sensor_type, pd.DataFrame()).copy()
-        if df.empty:
-            return pd.DataFrame(columns=['datetime', 'value', 'is_interpolated'])
-        df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True).dt.tz_convert(LOCAL_TIMEZONE)
-        cutoff = datetime.now(pytz.UTC) - timedelta(hours=horas)
-        cutoff_local = cutoff.astimezone(LOCAL_TIMEZONE)
-        df = df[df['datetime'] >= cutoff_local].copy()
-        df['is_interpolated'] = False
-        return df[['datetime', 'value', 'is_interpolated']]
-
-    def obter_dados_interpolados(self, sensor_type, interval_seconds=60, horas=None):
-        with self.lock:
-            df = self.sensor_data.get(sensor_type, pd.DataFrame()).copy()
-        if df.empty or len(df) < 2:
-            return pd.DataFrame(columns=['datetime', 'value', 'is_interpolated'])
-        df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True).dt.tz_convert(LOCAL_TIMEZONE)
-        df = df.sort_values('datetime')
-        start = df['datetime'].min()
-        end = df['datetime'].max()
-        regular = pd.date_range(start=start, end=end, freq=f'{interval_seconds}S', tz=LOCAL_TIMEZONE)
-        x_known = df['datetime'].astype(np.int64) // 10**6
-        y_known = df['value'].values
-        x_new = regular.astype(np.int64) // 10**6
-        metodo = self.sensor_metadata.get(sensor_type, {}).get('interpolation', 'linear')
-        try:
-            y_new = InterpoladorSeletivo.interpolar(x_known, y_known, x_new, metodo)
-        except Exception as e:
-            logger.error(f"Erro na interpolação: {e}")
-            y_new = np.interp(x_new, x_known, y_known)
-        interp_df = pd.DataFrame({
-            'datetime': regular,
-            'value': y_new,
-            'is_interpolated': True
-        }).dropna(subset=['value'])
-        
-        # Filtrar pelo período, se especificado
-        if horas is not None:
-            cutoff = datetime.now(pytz.UTC) - timedelta(hours=horas)
-            cutoff_local = cutoff.astimezone(LOCAL_TIMEZONE)
-            interp_df = interp_df[interp_df['datetime'] >= cutoff_local].copy()
-        return interp_df
-
-    def obter_dados_combinados(self, sensor_type, horas=24, interval_seconds=60):
-        raw = self.obter_dados_brutos(sensor_type, horas)
-        interp = self.obter_dados_interpolados(sensor_type, interval_seconds, horas=horas)
-        combined = pd.concat([raw, interp], ignore_index=True)
-        return combined.sort_values('datetime', ascending=False)
-
-    def obter_valor_mais_recente(self, sensor_type):
-        with self.lock:
-            df = self.sensor_data.get(sensor_type, pd.DataFrame())
-        if df.empty:
-            return None
-        return df.sort_values('timestamp')['value'].iloc[-1]
-
-    def tem_dados(self):
-        with self.lock:
-            return any(len(df) > 0 for df in self.sensor_data.values())
-
-    def tipos_sensor(self):
-        with self.lock:
-            return list(self.sensor_data.keys())
-
-    def metadados(self, sensor_type):
-        return self.sensor_metadata.get(sensor_type, {})
-
-    def ultimo_timestamp_dado(self):
-        with self.lock:
-            max_ts = None
-            for df in self.sensor_data.values():
-                if not df.empty:
-                    ts = df['timestamp'].max()
-                    if max_ts is None or ts > max_ts:
-                        max_ts = ts
-        if max_ts is not None:
-            return pd.to_datetime(max_ts, unit='ms', utc=True).tz_convert(LOCAL_TIMEZONE)
-        return None
-
-# ==================== CLIENTE MQTT (CORRIGIDO) ====================
-class ClienteMQTT:
-    def __init__(self, gerenciador, broker, port):
-        self.gerenciador = gerenciador
-        self.broker = broker
-        self.port = port
-        self.client = mqtt.Client(client_id=f"cfe-dash-{int(time.time())}", clean_session=True)
-        self.client.on_connect = self._on_connect
-        self.client.on_message = self._on_message
-        self.client.on_disconnect = self._on_disconnect
-        self.connected = False
-        self.connection_error = None
-
-    def _on_connect(self, client, userdata, flags, rc):
-        if rc == 0:
-            self.connected = True
-            self.connection_error = None
-            logger.info(f"✅ Conectado ao broker {self.broker}:{self.port}")
-            client.subscribe(TOPIC_DATA)
-        else:
-            self.connected = False
-            self.connection_error = f"Código {rc}"
-            logger.error(f"❌ Falha na conexão MQTT: {rc}")
-
-    def _on_disconnect(self, client, userdata, rc):
-        self.connected = False
-        if rc != 0:
-            self.connection_error = "Conexão perdida"
-            logger.warning(f"Desconectado inesperadamente: {rc}")
-
-    def _on_message(self, client, userdata, msg):
-        try:
-            payload = msg.payload.decode('utf-8')
-            logger.info(f"Mensagem recebida no tópico {msg.topic}")
-            logger.debug(f"Payload: {payload[:200]}...")
-            data = json.loads(payload)
-
-            # Extrair timestamp global da mensagem
-            ts_str = data.get('transmission_timestamp')
-            if ts_str:
-                try:
-                    # Converte string ISO para datetime e depois para timestamp em ms
-                    dt = datetime.strptime(ts_str, '%Y-%m-%d %H:%M:%S.%f')
-                    # Assume que o timestamp está em UTC (ou ajuste conforme necessário)
-                    dt_utc = pytz.UTC.localize(dt)
-                    timestamp_ms = int(dt_utc.timestamp() * 1000)
-                except Exception as e:
-                    logger.error(f"Erro ao converter timestamp '{ts_str}': {e}")
-                    timestamp_ms = int(time.time() * 1000)  # fallback para agora
-            else:
-                timestamp_ms = int(time.time() * 1000)
-                logger.warning("Mensagem sem transmission_timestamp, usando horário atual")
-
-            if 'readings' in data:
-                self._processar_readings(data['readings'], timestamp_ms)
-        except Exception as e:
-            logger.error(f"Erro ao processar mensagem: {e}")
-
-    def _processar_readings(self, readings, timestamp_ms):
-        for idx, r in enumerate(readings):
-            try:
-                sensor_type = r.get('sensor_type')
-                value = r.get('value')
-                interpolation = r.get('interpolation', 'linear')
-                metadata = r.get('metadata', {})
-                if sensor_type and value is not None:
-                    self.gerenciador.adicionar_ponto(
-                        sensor_type, timestamp_ms, value, interpolation, metadata
-                    )
-                else:
-                    logger.warning(f"Leitura {idx} ignorada - campos ausentes: {r}")
-            except Exception as e:
-                logger.error(f"Erro ao processar leitura {idx}: {e}")
-
-    def conectar(self):
-        try:
-            logger.info(f"Tentando conectar a {self.broker}:{self.port}...")
-            self.client.connect(self.broker, self.port, 60)
-            self.client.loop_start()
-            time.sleep(2)
-            if not self.connected:
-                self.connection_error = "Timeout após connect"
-        except Exception as e:
-            self.connected = False
-            self.connection_error = str(e)
-            logger.error(f"Exceção na conexão: {e}")
-
-    def desconectar(self):
-        self.client.loop_stop()
-        self.client.disconnect()
-        self.connected = False
-
 # ==================== FUNÇÕES AUXILIARES ====================
 def testar_broker(broker, port):
     try:
@@ -310,7 +71,40 @@ def obter_cor(sensor_type):
     import hashlib
     return "#" + hashlib.md5(sensor_type.encode()).hexdigest()[:6]
 
-def criar_grafico(df_raw, df_interp, nome, unidade, cor, faixa=None):
+# Margens do layout dos gráficos; a área de plotagem tem a largura configurada menos l e r
+MARGENS_GRAFICO = dict(l=20, r=20, t=50, b=30)
+PONTOS_GRAFICO = LARGURA_GRAFICO_PX - MARGENS_GRAFICO['l'] - MARGENS_GRAFICO['r']
+
+def reduzir_para_grafico(df, largura=PONTOS_GRAFICO, metodo=METODO_REDUCAO):
+    """Mantém no máximo `largura` pontos da série, em baldes de tempo (um por pixel da área de plotagem)"""
+    if len(df) <= largura:
+        return df
+    x = df['datetime'].to_numpy(dtype='datetime64[ns]')
+    return df.iloc[reduzir(x, df['value'].to_numpy(dtype=float), largura, metodo)]
+
+def cor_transparente(cor, opacidade):
+    """'#rrggbb' -> 'rgba(r, g, b, opacidade)' (preenchimento da faixa de previsão)"""
+    r, g, b = (int(cor[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r}, {g}, {b}, {opacidade})"
+
+def calcular_faixa_y(df_raw, df_interp, df_prev=None):
+    if df_raw.empty and df_interp.empty:
+        return None
+    # Combina os valores não nulos de ambos os dataframes (e a média da previsão, se houver;
+    # a faixa de incerteza pode ser larga e não muda a escala)
+    series = [df_raw['value'], df_interp['value']]
+    if df_prev is not None and not df_prev.empty:
+        series.append(df_prev['value'])
+    valores = pd.concat(series, ignore_index=True).dropna()
+    if valores.empty:
+        return None
+    min_val = valores.min()
+    max_val = valores.max()
+    # Adiciona uma margem de 5% para melhor visualização
+    margin = (max_val - min_val) * 0.05 if max_val != min_val else 0.5
+    return [float(min_val - margin), float(max_val + margin)]
+
+def criar_grafico(df_raw, df_interp, nome, unidade, cor, faixa=None, df_prev=None):
     fig = go.Figure()
 
     # Adiciona a faixa ótima (apenas visual, não afeta o range do eixo Y)
@@ -321,10 +115,12 @@ def criar_grafico(df_raw, df_interp, nome, unidade, cor, faixa=None):
             layer='below'  # Garante que fique atrás dos dados
         )
 
-    # Adiciona traces (dados interpolados e brutos)
+    # Adiciona traces (dados interpolados e brutos). Só a série interpolada é reduzida:
+    # todo ponto recebido é desenhado, e o tamanho do payload do gráfico não cresce com a janela
     if not df_interp.empty:
+        df_interp_grafico = reduzir_para_grafico(df_interp)
         fig.add_trace(go.Scatter(
-            x=df_interp['datetime'], y=df_interp['value'],
+            x=df_interp_grafico['datetime'], y=df_interp_grafico['value'],
             mode='lines+markers', name='Interpolado',
             line=dict(color=cor, width=2, dash='dash'),
             marker=dict(size=6, color=cor), opacity=0.8
@@ -338,16 +134,26 @@ def criar_grafico(df_raw, df_interp, nome, unidade, cor, faixa=None):
             marker=dict(size=8, color=cor), opacity=0.9
         ))
 
+    # Previsão após a última leitura: limites da faixa de incerteza (o superior preenche até o
+    # inferior) e a média. Sempre depois dos dados, na ordem esperada por grafico_incremental
+    if df_prev is not None and not df_prev.empty:
+        fig.add_trace(go.Scatter(
+            x=df_prev['datetime'], y=df_prev['inferior'], mode='lines',
+            line=dict(width=0), showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_prev['datetime'], y=df_prev['superior'], mode='lines', name='Faixa de previsão',
+            line=dict(width=0), fill='tonexty', fillcolor=cor_transparente(cor, 0.2), hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_prev['datetime'], y=df_prev['value'], mode='lines', name='Previsão',
+            line=dict(color=cor, width=2, dash='dot')
+        ))
+
     # Ajusta o eixo Y com base apenas nos dados (ignora a faixa ótima)
-    if not df_raw.empty or not df_interp.empty:
-        # Combina os valores não nulos de ambos os dataframes
-        valores = pd.concat([df_raw['value'], df_interp['value']], ignore_index=True).dropna()
-        if not valores.empty:
-            min_val = valores.min()
-            max_val = valores.max()
-            # Adiciona uma margem de 5% para melhor visualização
-            margin = (max_val - min_val) * 0.05 if max_val != min_val else 0.5
-            fig.update_yaxes(range=[min_val - margin, max_val + margin])
+    faixa_y = calcular_faixa_y(df_raw, df_interp, df_prev)
+    if faixa_y is not None:
+        fig.update_yaxes(range=faixa_y)
 
     # Layout final
     fig.update_layout(
@@ -355,37 +161,47 @@ def criar_grafico(df_raw, df_interp, nome, unidade, cor, faixa=None):
         xaxis_title="Tempo",
         yaxis_title=f"{nome} ({unidade})",
         hovermode='x unified',
-        height=400,
-        margin=dict(l=20, r=20, t=50, b=30)
+        width=LARGURA_GRAFICO_PX,
+        height=ALTURA_GRAFICO_PX,
+        margin=MARGENS_GRAFICO
     )
     fig.update_traces(line_shape='spline')
     return fig
 
-def tabela_dados(df):
-    if df.empty:
-        st.info("Sem dados")
-        return
-    
-    df = df.copy()
+def preparar_tabela(df_raw, df_interp):
+    """
+    Tabela estilizada de "Ver dados" (leituras recebidas e pontos interpolados, mais recentes
+    primeiro), ou None sem dados. Calculada uma vez por versão dos dados (dados_sensor): as cores
+    das linhas saem de uma só operação vetorizada, e não de uma função chamada linha a linha.
+    """
+    partes = [d for d in (df_raw, df_interp) if not d.empty]
+    if not partes:
+        return None
+    df = pd.concat(partes, ignore_index=True)
     df = df.sort_values('datetime', ascending=False).reset_index(drop=True)
-    df.insert(0, 'ID', range(len(df), 0, -1))
-    df['Data/Hora'] = df['datetime'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    df['Valor'] = df['value'].apply(lambda x: f"{x:.3f}")
-    df['Tipo'] = df['is_interpolated'].apply(lambda x: 'Interpolado' if x else 'Recebido')
-    
-    # Seleciona apenas as colunas desejadas para exibição
-    df_display = df[['ID', 'Data/Hora', 'Valor', 'Tipo']]
+    recebido = ~df['is_interpolated'].to_numpy(dtype=bool)
 
-    # Função para colorir a linha inteira com base no valor da coluna 'Tipo'
-    def colorir_linha(linha):
-        cor = '#E8F5E9' if linha['Tipo'] == 'Recebido' else '#FFF3E0'
-        return [f'background-color: {cor}'] * len(linha)
-
-    # Aplica o estilo linha a linha
-    styled_df = df_display.style.apply(colorir_linha, axis=1)
+    # Seleciona apenas as colunas desejadas para exibição
+    df_display = pd.DataFrame({
+        'ID': np.arange(len(df), 0, -1),
+        'Data/Hora': df['datetime'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'Valor': df['value'].map('{:.3f}'.format),
+        'Tipo': np.where(recebido, 'Recebido', 'Interpolado'),
+    })
+
+    # Cor da linha inteira com base no valor da coluna 'Tipo'
+    cores = np.where(recebido, 'background-color: #E8F5E9', 'background-color: #FFF3E0')
+    estilos = pd.DataFrame(np.repeat(cores[:, None], df_display.shape[1], axis=1),
+                           index=df_display.index, columns=df_display.columns)
+    return df_display.style.apply(lambda _: estilos, axis=None)
+
+def tabela_dados(tabela):
+    if tabela is None:
+        st.info("Sem dados")
+        return
 
     # Exibe a tabela com estilo
-    st.dataframe(styled_df, use_container_width=True, height=400)
+    st.dataframe(tabela, use_container_width=True, height=400)
 
     # Legenda colorida no rodapé
     st.markdown(
@@ -394,7 +210,7 @@ def tabela_dados(df):
         unsafe_allow_html=True
     )
 
-def calcular_metricas_interpolacao(sensor_type, horas, interval_seconds, tolerancia_percentual=5):
+def calcular_metricas_interpolacao(df_raw, df_interp, tolerancia_percentual=5):
     """
     Retorna dicionário com métricas de qualidade da interpolação:
     - mae: erro absoluto médio
@@ -402,77 +218,118 @@ def calcular_metricas_interpolacao(sensor_type, horas, interval_seconds, toleran
     - acuracia: % de pontos com erro percentual <= tolerancia_percentual
     - total_pontos: número de pontos brutos usados na comparação
     """
-    df_raw = st.session_state.gerenciador.obter_dados_brutos(sensor_type, horas)
-    df_interp = st.session_state.gerenciador.obter_dados_interpolados(sensor_type, interval_seconds, horas=horas)
     if df_raw.empty or df_interp.empty:
         return None
     # Ordenar e mesclar pelo timestamp mais próximo
     df_raw = df_raw.sort_values('datetime').reset_index(drop=True)
     df_interp = df_interp.sort_values('datetime').reset_index(drop=True)
     merged = pd.merge_asof(df_raw, df_interp, on='datetime', direction='nearest', suffixes=('_raw', '_interp'))
-    # Erros
-    erro_abs = (merged['value_raw'] - merged['value_interp']).abs()
-    erro_percentual = (erro_abs / merged['value_raw'].abs()) * 100
-    erro_percentual = erro_percentual.replace([np.inf, -np.inf], np.nan)  # evitar divisão por zero
-    # Métricas
-    mae = erro_abs.mean()
-    mape = erro_percentual.mean(skipna=True)
-    acuracia = (erro_percentual <= tolerancia_percentual).mean() * 100 if not erro_percentual.isna().all() else 0
+    bruto = merged['value_raw'].to_numpy(dtype=float)
+    interpolado = merged['value_interp'].to_numpy(dtype=float)
+    metricas = calcular_metricas(bruto, interpolado, minimo_pares=1)
+    # Acurácia: % de pontos com erro percentual <= tolerância (valor bruto zero conta como fora)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        erro_percentual = np.abs(interpolado - bruto) / np.abs(bruto) * 100
+    validos = np.isfinite(erro_percentual)
+    acuracia = (validos & (erro_percentual <= tolerancia_percentual)).mean() * 100 if validos.any() else 0
     return {
-        'mae': mae,
-        'mape': mape,
+        'mae': metricas['mae'],
+        'mape': metricas['mape'],
         'acuracia': acuracia,
         'total_pontos': len(merged)
     }
 
+def dados_sensor(gerenciador, dispositivo, sensor, horas, interp_interval, horizonte_s=0):
+    """
+    Consultas e cálculos de um sensor para a renderização atual.
+
+    São reaproveitados da renderização anterior da sessão enquanto o dispositivo não recebe dados
+    novos (versão do GerenciadorDados) e a janela deslizante não avançou mais que
+    RECALCULO_OCIOSO_S: um autorefresh sem dados não consulta o armazenamento nem recalcula
+    interpolação, redução, previsão, métricas ou a tabela de "Ver dados".
+    """
+    chave = (dispositivo, horas, interp_interval, horizonte_s, gerenciador.versao(dispositivo),
+             int(time.time() // RECALCULO_OCIOSO_S))
+    cache = st.session_state.setdefault('dados_sensores', {})
+    dados = cache.get(sensor)
+    if dados is not None and dados['chave'] == chave:
+        return dados
+    df_raw = gerenciador.obter_dados_brutos(dispositivo, sensor, horas)
+    df_interp = gerenciador.obter_dados_interpolados(dispositivo, sensor, interp_interval, horas=horas)
+    df_prev = gerenciador.obter_previsao(dispositivo, sensor, horizonte_s, interp_interval)
+    dados = cache[sensor] = {
+        'chave': chave,
+        'df_raw': df_raw,
+        'df_interp': df_interp,
+        'df_interp_grafico': reduzir_para_grafico(df_interp) if not df_interp.empty else df_interp,
+        'df_prev': df_prev,
+        'faixa_y': calcular_faixa_y(df_raw, df_interp, df_prev),
+        'metricas': calcular_metricas_interpolacao(df_raw, df_interp, tolerancia_percentual=0.05),
+        'tabela': preparar_tabela(df_raw, df_interp),
+    }
+    return dados
+
+# ==================== SERVIÇO COMPARTILHADO ====================
+@st.cache_resource
+def obter_servico():
+    # Uma instância por processo: todas as sessões leem do mesmo cliente MQTT e do mesmo armazenamento
+    return ServicoIngestao()
+
 # ==================== APLICAÇÃO PRINCIPAL ====================
 def main():
     st.title("🌱 CFE-HYDRO - Monitoramento")
     # st.markdown("Monitoramento com **interpolação seletiva** – metadados extraídos automaticamente.")
     st.write("Monitoramento com **interpolação seletiva** – metadados extraídos automaticamente.")
 
-    # Estado da sessão
-    if 'gerenciador' not in st.session_state:
-        st.session_state.gerenciador = GerenciadorDados()
-        st.session_state.cliente = None
-        st.session_state.broker = DEFAULT_BROKER
-        st.session_state.port = DEFAULT_PORT
+    servico = obter_servico()
+    gerenciador = servico.gerenciador
+
+    # Estado da sessão (apenas preferências de visualização; os dados são compartilhados)
+    if 'ultima_atualizacao' not in st.session_state:
         st.session_state.ultima_atualizacao = datetime.now()
         st.session_state.intervalo = 30
+        st.session_state.dispositivo = None
 
     # Sidebar
     with st.sidebar:
         st.header("⚙️ Configurações")
         with st.expander("🔧 Broker MQTT", expanded=False):
-            broker = st.text_input("Servidor", value=st.session_state.broker)
-            port = st.number_input("Porta", min_value=1, max_value=65535, value=st.session_state.port)
+            broker = st.text_input("Servidor", value=servico.broker)
+            port = st.number_input("Porta", min_value=1, max_value=65535, value=servico.port)
             if st.button("Testar conexão"):
                 if testar_broker(broker, port):
                     st.success("Broker acessível")
                 else:
                     st.error("Não foi possível conectar")
             if st.button("Conectar"):
-                if st.session_state.cliente:
-                    st.session_state.cliente.desconectar()
-                st.session_state.broker = broker
-                st.session_state.port = port
-                st.session_state.cliente = ClienteMQTT(st.session_state.gerenciador, broker, port)
-                st.session_state.cliente.conectar()
+                # Afeta todas as sessões: a conexão é única por processo
+                servico.reconectar(broker, port)
                 st.rerun()
 
+        # Se o serviço ainda não conectou, conectar com os valores padrão
+        servico.iniciar()
+
         st.subheader("📡 Status")
-        if st.session_state.cliente and st.session_state.cliente.connected:
+        if servico.connected:
             st.success("✅ Conectado")
         else:
             st.error("❌ Desconectado")
-            if st.session_state.cliente and st.session_state.cliente.connection_error:
-                st.caption(f"Erro: {st.session_state.cliente.connection_error}")
+            if servico.connection_error:
+                st.caption(f"Erro: {servico.connection_error}")
 
-        col1, col2 = st.columns(2)
+        dispositivos = gerenciador.lista_dispositivos()
+        if dispositivos:
+            indice = dispositivos.index(st.session_state.dispositivo) if st.session_state.dispositivo in dispositivos else 0
+            st.session_state.dispositivo = st.selectbox("Dispositivo", dispositivos, index=indice)
+        dispositivo = st.session_state.dispositivo
+
+        col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Mensagens", st.session_state.gerenciador.messages_received)
+            st.metric("Mensagens", gerenciador.messages_received)
         with col2:
-            st.metric("Sensores", len(st.session_state.gerenciador.tipos_sensor()))
+            st.metric("Dispositivos", len(dispositivos))
+        with col3:
+            st.metric("Sensores", len(gerenciador.tipos_sensor(dispositivo)))
 
         st.subheader("👁️ Visualização")
         
@@ -481,13 +338,20 @@ def main():
 
         horas = st.slider("Período visualizado (h)", 1, 72, 1)
         interp_interval = st.slider("Intervalo de Interpolação (s)", 10, 300, 20, step=5)
+        horizonte_min = st.slider("Horizonte de previsão (min)", 0, 120, HORIZONTE_PREVISAO_S // 60, step=5)
 
-        if st.button("🧹 Limpar dados"):
-            st.session_state.gerenciador = GerenciadorDados()
+        if st.button("🧹 Limpar dados", help="Descarta os dados em memória; o histórico em disco é mantido"):
+            servico.limpar_dados()
             st.rerun()
+        # Apagar o disco afeta todas as sessões (o serviço é compartilhado): exige confirmação
+        if servico.armazenamento is not None:
+            confirmar = st.checkbox("Confirmo apagar o histórico em disco de todos os dispositivos")
+            if st.button("🗑️ Apagar histórico", disabled=not confirmar):
+                servico.apagar_historico()
+                st.rerun()
 
         # st.caption(f"Última atualização: {datetime.now().strftime('%H:%M:%S')}")
-        ultimo_dado = st.session_state.gerenciador.ultimo_timestamp_dado()
+        ultimo_dado = gerenciador.ultimo_timestamp_dado(dispositivo)
         with st.expander("🔍 Detalhes"):
             if ultimo_dado:
                 st.write(f"Última atualização: {ultimo_dado.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -501,25 +365,20 @@ def main():
     # Configura o auto refresh (em milissegundos) – usa o valor do slider
     st_autorefresh(interval=st.session_state.intervalo * 1000, key="auto-refresh")
 
-    # Se não há cliente, criar um com valores padrão
-    if st.session_state.cliente is None:
-        st.session_state.cliente = ClienteMQTT(st.session_state.gerenciador, st.session_state.broker, st.session_state.port)
-        st.session_state.cliente.conectar()
-
     # Verificar dados
-    if not st.session_state.gerenciador.tem_dados():
-        if st.session_state.cliente.connected:
+    if dispositivo is None or not gerenciador.tem_dados(dispositivo):
+        if servico.connected:
             st.info("📡 Conectado, aguardando dados...")
         else:
             st.warning("⚠️ Não conectado. Configure o broker na barra lateral.")
         with st.expander("🔍 Detalhes"):
-            st.write(f"Broker: {st.session_state.broker}:{st.session_state.port}")
-            st.write(f"Tópico: {TOPIC_DATA}")
-            st.write(f"Mensagens recebidas: {st.session_state.gerenciador.messages_received}")
-            st.write(f"Sensores com dados: {st.session_state.gerenciador.tipos_sensor()}")
+            st.write(f"Broker: {servico.broker}:{servico.port}")
+            st.write(f"Tópicos: {', '.join(TOPICOS_DADOS)}")
+            st.write(f"Mensagens recebidas: {gerenciador.messages_received}")
+            st.write(f"Dispositivos com dados: {gerenciador.lista_dispositivos()}")
     else:
         # ========== EXIBIÇÃO DOS DADOS ==========
-        sensores = st.session_state.gerenciador.tipos_sensor()
+        sensores = gerenciador.tipos_sensor(dispositivo)
         # st.write("Sensores detectados:", sensores)  # Debug
 
         # Últimos valores
@@ -528,12 +387,12 @@ def main():
         valores_recentes = {}
         for i, sensor in enumerate(sensores[:4]):
             with cols[i]:
-                meta = st.session_state.gerenciador.metadados(sensor)
+                meta = gerenciador.metadados(dispositivo, sensor)
                 unit = meta.get('unit', '')
                 desc = meta.get('description', sensor)
                 opt_min = meta.get('optimal_min')
                 opt_max = meta.get('optimal_max')
-                valor = st.session_state.gerenciador.obter_valor_mais_recente(sensor)
+                valor = gerenciador.obter_valor_mais_recente(dispositivo, sensor)
                 valores_recentes[sensor] = valor
                 if valor is not None:
                     if opt_min is not None and opt_max is not None:
@@ -553,7 +412,7 @@ def main():
             tabs = st.tabs([s.capitalize() for s in sensores])
             for tab, sensor in zip(tabs, sensores):
                 with tab:
-                    meta = st.session_state.gerenciador.metadados(sensor)
+                    meta = gerenciador.metadados(dispositivo, sensor)
                     unit = meta.get('unit', '')
                     desc = meta.get('description', sensor)
                     opt_min = meta.get('optimal_min')
@@ -561,12 +420,20 @@ def main():
                     faixa = (opt_min, opt_max) if opt_min is not None and opt_max is not None else None
                     cor = obter_cor(sensor)
 
-                    df_raw = st.session_state.gerenciador.obter_dados_brutos(sensor, horas)
-                    df_interp = st.session_state.gerenciador.obter_dados_interpolados(sensor, interp_interval, horas=horas)
+                    dados = dados_sensor(gerenciador, dispositivo, sensor, horas, interp_interval, horizonte_min * 60)
+                    df_raw, df_interp, df_prev = dados['df_raw'], dados['df_interp'], dados['df_prev']
 
                     if not df_raw.empty or not df_interp.empty:
-                        fig = criar_grafico(df_raw, df_interp, desc, unit, cor, faixa)
-                        st.plotly_chart(fig, use_container_width=True)
+                        if GRAFICOS_INCREMENTAIS:
+                            exibir_grafico_incremental(
+                                f"grafico_{dispositivo}_{sensor}", dados['chave'],
+                                lambda: criar_grafico(df_raw, dados['df_interp_grafico'], desc, unit, cor, faixa, df_prev),
+                                df_raw, dados['df_interp_grafico'],
+                                assinatura=(dispositivo, horas, interp_interval, desc, unit, cor, faixa),
+                                faixa_y=dados['faixa_y'], altura=ALTURA_GRAFICO_PX, df_prev=df_prev)
+                        else:
+                            fig = criar_grafico(df_raw, df_interp, desc, unit, cor, faixa, df_prev)
+                            st.plotly_chart(fig, use_container_width=False)
 
                         if not df_raw.empty:
                             vals = df_raw['value'].dropna()
@@ -577,8 +444,7 @@ def main():
                                 col3.metric("Máximo", f"{vals.max():.2f}{unit}")
 
                         with st.expander("📋 Ver dados"):
-                            df_comb = st.session_state.gerenciador.obter_dados_combinados(sensor, horas, interp_interval)
-                            tabela_dados(df_comb)
+                            tabela_dados(dados['tabela'])
                     else:
                         st.info("Sem dados no período")
 
@@ -587,7 +453,8 @@ def main():
             st.header("🔍 Qualidade da Interpolação")
             metricas_por_sensor = {}
             for sensor in sensores:
-                metricas = calcular_metricas_interpolacao(sensor, horas, interp_interval, tolerancia_percentual=0.05)
+                metricas = dados_sensor(gerenciador, dispositivo, sensor, horas, interp_interval,
+                                        horizonte_min * 60)['metricas']
                 if metricas:
                     metricas_por_sensor[sensor] = metricas
 
@@ -598,7 +465,7 @@ def main():
 
                 for i, (sensor, met) in enumerate(list(metricas_por_sensor.items())[:num_mostrar]):
                     with cols[i]:
-                        meta = st.session_state.gerenciador.metadados(sensor)
+                        meta = gerenciador.metadados(dispositivo, sensor)
                         desc = meta.get('description', sensor)
                         st.metric(f"{desc}", f"{met['mae']:.3f}", delta=None)
                         st.caption(f"MAE: {met['mae']:.3f} | MAPE: {met['mape']:.2f}%")
@@ -0,0 +1,143 @@
+"""
+Função: Estruturas de armazenamento em memória das séries recebidas pelo dashboard CFE-HYDRO
+"""
+import numpy as np
+
+CAPACIDADE_PADRAO = 1000
+
+
+class BufferCircular:
+    """
+    Buffer circular de capacidade fixa para uma série (timestamp em ms, valor).
+
+    Os dados ficam em dois arrays NumPy (int64 para timestamps, float64 para valores)
+    alocados uma única vez. Cada posição é gravada duas vezes (em i e em i + capacidade),
+    de modo que a janela com os pontos válidos é sempre contígua e pode ser devolvida
+    como visão, sem cópia. A inserção é O(1), independentemente do tamanho do histórico.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        if capacidade < 1:
+            raise ValueError("A capacidade do buffer deve ser >= 1")
+        self.capacidade = int(capacidade)
+        self._timestamps = np.zeros(2 * self.capacidade, dtype=np.int64)
+        self._valores = np.zeros(2 * self.capacidade, dtype=np.float64)
+        self._fim = 0          # próxima posição de escrita em [0, capacidade)
+        self._tamanho = 0
+        self._ordenado = True  # timestamps em ordem não decrescente?
+        self._ultimo_ts = None
+        self.total_inseridos = 0  # contador monotônico, usado como versão pelos caches
+
+    def __len__(self):
+        return self._tamanho
+
+    @property
+    def ordenado(self):
+        return self._ordenado
+
+    def adicionar(self, timestamp_ms, valor):
+        """Insere um ponto, descartando o mais antigo quando o buffer está cheio."""
+        pos = self._fim
+        espelho = pos + self.capacidade
+        self._timestamps[pos] = self._timestamps[espelho] = timestamp_ms
+        self._valores[pos] = self._valores[espelho] = valor
+        self._fim = pos + 1 if pos + 1 < self.capacidade else 0
+        if self._tamanho < self.capacidade:
+            self._tamanho += 1
+        if self._ultimo_ts is not None and timestamp_ms < self._ultimo_ts:
+            self._ordenado = False
+        self._ultimo_ts = timestamp_ms
+        self.total_inseridos += 1
+
+    def visao(self, desde_ms=None):
+        """
+        Retorna (timestamps, valores) como visões somente leitura, do mais antigo ao mais recente.
+
+        Args:
+            desde_ms: Se informado, restringe a janela aos pontos com timestamp >= desde_ms.
+                      Com timestamps ordenados o corte é feito por busca binária (sem cópia);
+                      caso contrário é aplicada uma máscara (com cópia).
+        """
+        inicio = self._fim - self._tamanho
+        if inicio < 0:
+            inicio += self.capacidade
+        ts = self._timestamps[inicio:inicio + self._tamanho]
+        vals = self._valores[inicio:inicio + self._tamanho]
+        if desde_ms is not None:
+            if self._ordenado:
+                corte = int(np.searchsorted(ts, desde_ms, side='left'))
+                ts, vals = ts[corte:], vals[corte:]
+            else:
+                mascara = ts >= desde_ms
+                ts, vals = ts[mascara], vals[mascara]
+        ts.flags.writeable = False
+        vals.flags.writeable = False
+        return ts, vals
+
+    def ultimo(self):
+        """Retorna (timestamp, valor) do ponto com maior timestamp, ou None se vazio."""
+        if self._tamanho == 0:
+            return None
+        ts, vals = self.visao()
+        idx = len(ts) - 1 if self._ordenado else int(np.argmax(ts))
+        return int(ts[idx]), float(vals[idx])
+
+    def limpar(self):
+        self._fim = 0
+        self._tamanho = 0
+        self._ordenado = True
+        self._ultimo_ts = None
+        self.total_inseridos += 1
+
+
+class SerieCrescente:
+    """
+    Série (x int64, y float64) ordenada por x, com crescimento amortizado.
+
+    Usada para manter a grade interpolada em cache: permite reescrever apenas a cauda
+    (substituir_cauda) e descartar o início (descartar_antes) sem copiar a série inteira.
+    """
+
+    def __init__(self, capacidade_inicial=256):
+        self._x = np.empty(capacidade_inicial, dtype=np.int64)
+        self._y = np.empty(capacidade_inicial, dtype=np.float64)
+        self._inicio = 0
+        self._fim = 0
+
+    def __len__(self):
+        return self._fim - self._inicio
+
+    def visao(self, desde_x=None):
+        """Retorna (x, y) como visões, opcionalmente a partir do primeiro x >= desde_x"""
+        x = self._x[self._inicio:self._fim]
+        y = self._y[self._inicio:self._fim]
+        if desde_x is not None:
+            corte = int(np.searchsorted(x, desde_x, side='left'))
+            x, y = x[corte:], y[corte:]
+        return x, y
+
+    def substituir_cauda(self, desde_x, x_novos, y_novos):
+        """Descarta os pontos com x >= desde_x e acrescenta (x_novos, y_novos) ao final"""
+        x_atual = self._x[self._inicio:self._fim]
+        self._fim = self._inicio + int(np.searchsorted(x_atual, desde_x, side='left'))
+        n = len(x_novos)
+        self._garantir_espaco(n)
+        self._x[self._fim:self._fim + n] = x_novos
+        self._y[self._fim:self._fim + n] = y_novos
+        self._fim += n
+
+    def descartar_antes(self, x_min):
+        x_atual = self._x[self._inicio:self._fim]
+        self._inicio += int(np.searchsorted(x_atual, x_min, side='left'))
+
+    def _garantir_espaco(self, extra):
+        if self._fim + extra <= len(self._x):
+            return
+        n = len(self)
+        capacidade = max(256, 2 * (n + extra))
+        x = np.empty(capacidade, dtype=np.int64)
+        y = np.empty(capacidade, dtype=np.float64)
+        x[:n] = self._x[self._inicio:self._fim]
+        y[:n] = self._y[self._inicio:self._fim]
+        self._x, self._y = x, y
+        self._inicio, self._fim = 0, n
@@ -0,0 +1,323 @@
+"""
+Função: Armazenamento persistente das séries em disco, em colunas mapeadas em memória (np.memmap)
+
+Cada série (device_id, sensor_type) ocupa um diretório com segmentos de tamanho fixo, nomeados
+pelo timestamp de início e gravados em pares de arquivos colunares:
+
+    <raiz>/<device_id>/<sensor_type>/<inicio_ms>.ts     int64, timestamps em ms (UTC)
+    <raiz>/<device_id>/<sensor_type>/<inicio_ms>.val    float32, valores
+    <raiz>/<device_id>/<sensor_type>/metadados.json     metadados e interpolação do sensor
+
+Os arquivos são pré-alocados com PONTOS_POR_SEGMENTO posições; as posições livres do .ts contêm
+TS_LIVRE (maior int64), de modo que o número de pontos gravados de um segmento é obtido por busca
+binária, sem cabeçalho nem varredura. Os timestamps são mantidos em ordem dentro e entre os
+segmentos: uma consulta a partir de um instante percorre os segmentos do fim para o início
+até o primeiro cujo último ponto é anterior a ele e corta cada um por busca binária, lendo do
+disco apenas as páginas da janela. Reabrir o armazenamento (reinício do
+dashboard) apenas lista os diretórios.
+
+Um único processo deve gravar em uma raiz de cada vez.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PONTOS_POR_SEGMENTO = 65536     # 512 KiB de timestamps + 256 KiB de valores por segmento
+TS_LIVRE = np.iinfo(np.int64).max
+ARQUIVO_METADADOS = 'metadados.json'
+
+
+def _nome_diretorio(nome):
+    """Codifica device_id/sensor_type como um único componente de caminho seguro"""
+    codificado = quote(str(nome), safe='')
+    if codificado in ('', '.', '..'):
+        codificado = codificado.replace('.', '%2E') or '%00'
+    return codificado
+
+
+def concatenar(partes):
+    """Junta as partes de SerieDisco.fatias em cópias (timestamps int64, valores float64)"""
+    if not partes:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return (np.concatenate([ts for ts, _ in partes]).astype(np.int64, copy=False),
+            np.concatenate([vals for _, vals in partes]).astype(np.float64, copy=False))
+
+
+class SerieDisco:
+    """
+    Série (timestamp em ms, valor) persistida em segmentos mapeados em memória.
+
+    Não é thread-safe: o chamador serializa gravações e leituras (DadosDispositivo usa o lock
+    do dispositivo).
+    """
+
+    def __init__(self, diretorio, pontos_por_segmento=PONTOS_POR_SEGMENTO):
+        self.diretorio = diretorio
+        self.pontos_por_segmento = int(pontos_por_segmento)
+        os.makedirs(diretorio, exist_ok=True)
+        self._inicios = sorted(int(nome[:-3]) for nome in os.listdir(diretorio) if nome.endswith('.ts'))
+        self._mapas = {}        # inicio -> (ts, valores) memmaps, abertos sob demanda
+        self._tamanhos = {}     # inicio -> pontos gravados
+        self.descartados = 0    # pontos mais antigos que o segmento ativo (não gravados)
+
+    def __len__(self):
+        return sum(self._tamanho(inicio) for inicio in self._inicios)
+
+    def _caminhos(self, inicio):
+        base = os.path.join(self.diretorio, f'{inicio:020d}')
+        return base + '.ts', base + '.val'
+
+    def _segmento(self, inicio):
+        mapas = self._mapas.get(inicio)
+        if mapas is None:
+            caminho_ts, caminho_val = self._caminhos(inicio)
+            mapas = (np.memmap(caminho_ts, dtype=np.int64, mode='r+'),
+                     np.memmap(caminho_val, dtype=np.float32, mode='r+'))
+            self._mapas[inicio] = mapas
+        return mapas
+
+    def _tamanho(self, inicio):
+        n = self._tamanhos.get(inicio)
+        if n is None:
+            n = self._tamanhos[inicio] = int(np.searchsorted(self._segmento(inicio)[0], TS_LIVRE, side='left'))
+        return n
+
+    def _novo_segmento(self, inicio):
+        caminho_ts, caminho_val = self._caminhos(inicio)
+        np.full(self.pontos_por_segmento, TS_LIVRE, dtype=np.int64).tofile(caminho_ts)
+        np.zeros(self.pontos_por_segmento, dtype=np.float32).tofile(caminho_val)
+        self._inicios.append(inicio)
+        self._tamanhos[inicio] = 0
+
+    @property
+    def ultimo_ts(self):
+        for inicio in reversed(self._inicios):
+            n = self._tamanho(inicio)
+            if n:
+                return int(self._segmento(inicio)[0][n - 1])
+        return None
+
+    def adicionar(self, timestamps, valores):
+        """
+        Grava um lote de pontos (arrays de mesmo tamanho, em qualquer ordem).
+
+        Pontos posteriores ao último gravado são anexados ao segmento ativo, abrindo novos
+        segmentos quando ele enche. Pontos atrasados são inseridos em ordem no segmento ativo
+        (deslocando a cauda dele); os anteriores ao segmento ativo são descartados.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        valores = np.asarray(valores, dtype=np.float32)
+        if len(timestamps) == 0:
+            return
+        ordem = np.argsort(timestamps, kind='stable')
+        timestamps, valores = timestamps[ordem], valores[ordem]
+        ultimo = self.ultimo_ts
+        corte = 0 if ultimo is None else int(np.searchsorted(timestamps, ultimo, side='right'))
+        if corte:
+            self._inserir_atrasados(timestamps[:corte], valores[:corte])
+        self._anexar(timestamps[corte:], valores[corte:])
+
+    def _anexar(self, timestamps, valores):
+        i = 0
+        while i < len(timestamps):
+            if not self._inicios or self._tamanho(self._inicios[-1]) >= self.pontos_por_segmento:
+                self._novo_segmento(int(timestamps[i]))
+            inicio = self._inicios[-1]
+            ts, vals = self._segmento(inicio)
+            n = self._tamanhos[inicio]
+            k = min(len(timestamps) - i, self.pontos_por_segmento - n)
+            # Valores antes dos timestamps: um ponto só "existe" quando seu timestamp é gravado
+            vals[n:n + k] = valores[i:i + k]
+            ts[n:n + k] = timestamps[i:i + k]
+            self._tamanhos[inicio] = n + k
+            i += k
+
+    def _inserir_atrasados(self, timestamps, valores):
+        inicio = self._inicios[-1]
+        ts, vals = self._segmento(inicio)
+        n = self._tamanhos[inicio]
+        limite = None
+        if len(self._inicios) > 1:
+            anterior = self._inicios[-2]
+            limite = int(self._segmento(anterior)[0][self._tamanho(anterior) - 1])
+        aceitos = np.ones(len(timestamps), dtype=bool) if limite is None else timestamps >= limite
+        livres = self.pontos_por_segmento - n
+        aceitos &= np.cumsum(aceitos) <= livres
+        if not aceitos.all():
+            descartados = int(len(aceitos) - aceitos.sum())
+            self.descartados += descartados
+            logger.warning("%d pontos atrasados descartados em %s", descartados, self.diretorio)
+        timestamps, valores = timestamps[aceitos], valores[aceitos]
+        if len(timestamps) == 0:
+            return
+        # Intercala com o segmento ativo: a cauda a partir do primeiro atrasado é regravada em ordem
+        p = int(np.searchsorted(ts[:n], timestamps[0], side='right'))
+        cauda_ts = np.concatenate([ts[p:n], timestamps])
+        cauda_vals = np.concatenate([vals[p:n], valores])
+        ordem = np.argsort(cauda_ts, kind='stable')
+        m = len(cauda_ts)
+        vals[p:p + m] = cauda_vals[ordem]
+        ts[p:p + m] = cauda_ts[ordem]
+        self._tamanhos[inicio] = n + len(timestamps)
+
+    def fatias(self, desde_ms=None):
+        """
+        Partes (timestamps, valores) dos pontos com t >= desde_ms, segmento a segmento, para
+        copiar fora do lock do chamador (concatenar): as dos segmentos anteriores ao ativo são
+        visões dos memmaps, que não mudam mais depois que o segmento seguinte é aberto; a do
+        segmento ativo, que ainda recebe inserções atrasadas, já é uma cópia.
+
+        Os segmentos são escolhidos pelos dados, não pelo nome: inserções atrasadas podem pôr no
+        segmento ativo pontos anteriores ao seu início.
+        """
+        i0 = 0
+        if desde_ms is not None:
+            i0 = len(self._inicios)
+            while i0 > 0 and self._ultimo_do_segmento(self._inicios[i0 - 1]) >= desde_ms:
+                i0 -= 1
+        partes = []
+        for inicio in self._inicios[i0:]:
+            ts, vals = self._segmento(inicio)
+            n = self._tamanho(inicio)
+            a = 0 if desde_ms is None else int(np.searchsorted(ts[:n], desde_ms, side='left'))
+            if n > a:
+                if inicio == self._inicios[-1]:
+                    partes.append((np.array(ts[a:n]), vals[a:n].astype(np.float64)))
+                else:
+                    partes.append((ts[a:n], vals[a:n]))
+        return partes
+
+    def _ultimo_do_segmento(self, inicio):
+        n = self._tamanho(inicio)
+        return int(self._segmento(inicio)[0][n - 1]) if n else TS_LIVRE
+
+    def ler(self, desde_ms=None):
+        """Retorna cópias (timestamps int64, valores float64) dos pontos com t >= desde_ms"""
+        return concatenar(self.fatias(desde_ms))
+
+    def ultimos(self, quantidade):
+        """Retorna cópias dos `quantidade` pontos mais recentes"""
+        partes_ts, partes_vals = [], []
+        restantes = int(quantidade)
+        for inicio in reversed(self._inicios):
+            if restantes <= 0:
+                break
+            ts, vals = self._segmento(inicio)
+            n = self._tamanho(inicio)
+            a = max(0, n - restantes)
+            partes_ts.append(np.array(ts[a:n]))
+            partes_vals.append(vals[a:n].astype(np.float64))
+            restantes -= n - a
+        if not partes_ts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.concatenate(partes_ts[::-1]), np.concatenate(partes_vals[::-1])
+
+    def sincronizar(self):
+        for ts, vals in self._mapas.values():
+            ts.flush()
+            vals.flush()
+
+    def fechar(self):
+        self.sincronizar()
+        self._mapas.clear()
+
+    def apagar(self):
+        """Remove os arquivos da série (apenas os criados por ela) e o diretório, se ficar vazio"""
+        self._mapas.clear()
+        for inicio in self._inicios:
+            for caminho in self._caminhos(inicio):
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+        metadados = os.path.join(self.diretorio, ARQUIVO_METADADOS)
+        if os.path.exists(metadados):
+            os.remove(metadados)
+        self._inicios = []
+        self._tamanhos.clear()
+        try:
+            os.rmdir(self.diretorio)
+        except OSError:
+            pass
+
+
+class ArmazenamentoDisco:
+    """
+    Conjunto de séries persistentes sob um diretório raiz, indexadas por (device_id, sensor_type).
+
+    O lock protege apenas o catálogo de séries; gravações e leituras de uma série são
+    serializadas pelo chamador.
+    """
+
+    def __init__(self, raiz, pontos_por_segmento=PONTOS_POR_SEGMENTO):
+        self.raiz = raiz
+        self.pontos_por_segmento = pontos_por_segmento
+        self.lock = threading.Lock()
+        self._series = {}       # (device_id, sensor_type) -> SerieDisco
+        os.makedirs(raiz, exist_ok=True)
+
+    def _diretorio(self, device_id, sensor_type):
+        return os.path.join(self.raiz, _nome_diretorio(device_id), _nome_diretorio(sensor_type))
+
+    def serie(self, device_id, sensor_type, criar=True):
+        chave = (device_id, sensor_type)
+        serie = self._series.get(chave)
+        if serie is None:
+            with self.lock:
+                serie = self._series.get(chave)
+                diretorio = self._diretorio(device_id, sensor_type)
+                if serie is None and (criar or os.path.isdir(diretorio)):
+                    serie = self._series[chave] = SerieDisco(diretorio, self.pontos_por_segmento)
+        return serie
+
+    def series(self):
+        """Lista os (device_id, sensor_type) com dados persistidos"""
+        encontradas = []
+        for dir_dispositivo in sorted(os.listdir(self.raiz)):
+            caminho = os.path.join(self.raiz, dir_dispositivo)
+            if not os.path.isdir(caminho):
+                continue
+            for dir_sensor in sorted(os.listdir(caminho)):
+                if os.path.isdir(os.path.join(caminho, dir_sensor)):
+                    encontradas.append((unquote(dir_dispositivo), unquote(dir_sensor)))
+        return encontradas
+
+    def ler_metadados(self, device_id, sensor_type):
+        caminho = os.path.join(self._diretorio(device_id, sensor_type), ARQUIVO_METADADOS)
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def gravar_metadados(self, device_id, sensor_type, metadados):
+        diretorio = self._diretorio(device_id, sensor_type)
+        os.makedirs(diretorio, exist_ok=True)
+        temporario = os.path.join(diretorio, ARQUIVO_METADADOS + '.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(metadados, f, ensure_ascii=False)
+        os.replace(temporario, os.path.join(diretorio, ARQUIVO_METADADOS))
+
+    def sincronizar(self):
+        for serie in list(self._series.values()):
+            serie.sincronizar()
+
+    def apagar(self):
+        """Remove todas as séries persistidas (inclusive as ainda não abertas nesta execução)"""
+        with self.lock:
+            for device_id, sensor_type in self.series():
+                chave = (device_id, sensor_type)
+                serie = self._series.pop(chave, None) or SerieDisco(
+                    self._diretorio(device_id, sensor_type), self.pontos_por_segmento)
+                serie.apagar()
+            self._series.clear()
+            for dir_dispositivo in os.listdir(self.raiz):
+                try:
+                    os.rmdir(os.path.join(self.raiz, dir_dispositivo))
+                except OSError:
+                    pass
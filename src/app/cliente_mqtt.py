@@ -0,0 +1,217 @@
+"""
+Função: Cliente MQTT do dashboard: assina os tópicos de dados CFE-HYDRO e repassa as leituras ao GerenciadorDados
+        em lotes, por meio da FilaIngestao
+"""
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+import paho.mqtt.client as mqtt
+
+from config import DISPOSITIVO_PADRAO, INTERVALO_LOG_RESUMO, TOPIC_CONTROLE, TOPIC_RECONSTRUCAO, TOPICOS_DADOS
+from fila_ingestao import FilaIngestao
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.codec import EsquemaBinario, decodificar_binario, decodificar_json, timestamp_para_ms  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class ClienteMQTT:
+    def __init__(self, gerenciador, broker, port, topicos=None):
+        self.gerenciador = gerenciador
+        self.broker = broker
+        self.port = port
+        self.topicos = list(topicos) if topicos else list(TOPICOS_DADOS)
+        self.client = mqtt.Client(client_id=f"cfe-dash-{int(time.time())}", clean_session=True)
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+        self.client.on_disconnect = self._on_disconnect
+        self.connected = False
+        self.connection_error = None
+        # Log de recepção agregado: um resumo a cada INTERVALO_LOG_RESUMO segundos
+        self._mensagens_desde_log = 0
+        self._ultimo_log = time.monotonic()
+        self.fila = FilaIngestao(self._processar_lote)
+        self.esquemas = {}  # device_id -> EsquemaBinario (acessado apenas pela thread consumidora)
+
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self.connected = True
+            self.connection_error = None
+            logger.info(f"✅ Conectado ao broker {self.broker}:{self.port}")
+            client.subscribe([(topico, 0) for topico in self.topicos])
+        else:
+            self.connected = False
+            self.connection_error = f"Código {rc}"
+            logger.error(f"❌ Falha na conexão MQTT: {rc}")
+
+    def _on_disconnect(self, client, userdata, rc):
+        self.connected = False
+        if rc != 0:
+            self.connection_error = "Conexão perdida"
+            logger.warning(f"Desconectado inesperadamente: {rc}")
+
+    def _on_message(self, client, userdata, msg):
+        # Thread de rede do paho: apenas enfileira; decodificação e gravação ficam com o consumidor
+        self.fila.publicar((msg.topic, msg.payload, int(time.time() * 1000)))
+
+    def _processar_lote(self, lote):
+        """Decodifica um lote de mensagens e grava os pontos com um lock por dispositivo"""
+        pontos_por_dispositivo = {}
+        for topico, payload, recebido_ms in lote:
+            self._registrar_recepcao(topico)
+            try:
+                self._processar_mensagem(topico, payload, recebido_ms, pontos_por_dispositivo)
+            except Exception as e:
+                logger.error("Erro ao processar mensagem: %s", e)
+        for device_id, pontos in pontos_por_dispositivo.items():
+            self.gerenciador.adicionar_lote(device_id, pontos)
+
+    def _processar_mensagem(self, topico, payload, recebido_ms, pontos_por_dispositivo):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload: %.200s...", payload)
+        tipo = topico.rsplit('/', 1)[-1]
+        if tipo == 'schema':
+            self._registrar_esquema(topico, payload)
+            return
+        if tipo == 'bin':
+            self._processar_binario(topico, payload, pontos_por_dispositivo)
+            return
+        data = decodificar_json(payload)
+
+        # Extrair timestamp global da mensagem
+        ts_str = data.get('transmission_timestamp')
+        if ts_str:
+            try:
+                # Assume que o timestamp está em UTC (ou ajuste conforme necessário)
+                timestamp_ms = timestamp_para_ms(ts_str)
+            except Exception as e:
+                logger.error("Erro ao converter timestamp '%s': %s", ts_str, e)
+                timestamp_ms = recebido_ms  # fallback para o horário de recepção
+        else:
+            timestamp_ms = recebido_ms
+            logger.warning("Mensagem sem transmission_timestamp, usando horário de recepção")
+
+        if 'readings' in data:
+            device_id = data.get('device_id') or self._dispositivo_do_topico(topico)
+            pontos = pontos_por_dispositivo.setdefault(device_id, [])
+            self._processar_readings(data['readings'], timestamp_ms, pontos)
+
+    def _registrar_esquema(self, topico, payload):
+        device_id = self._dispositivo_do_topico(topico)
+        if not payload:
+            # Mensagem retida apagada no broker
+            self.esquemas.pop(device_id, None)
+            return
+        esquema = EsquemaBinario.de_json(payload)
+        self.esquemas[device_id] = esquema
+        logger.info("Esquema binário %d registrado para %s (%d sensores)",
+                    esquema.schema_id, device_id, len(esquema.sensores))
+
+    def _processar_binario(self, topico, payload, pontos_por_dispositivo):
+        device_id = self._dispositivo_do_topico(topico)
+        esquema = self.esquemas.get(device_id)
+        if esquema is None:
+            logger.warning("Mensagem binária de %s descartada: esquema ainda não recebido", device_id)
+            return
+        sensores = esquema.sensores
+        pontos = pontos_por_dispositivo.setdefault(device_id, [])
+        for timestamp_ms, indice, valor in decodificar_binario(payload, esquema):
+            s = sensores[indice]
+            pontos.append((s['sensor_type'], timestamp_ms, valor, s['interpolation'], s['metadata']))
+
+    def _registrar_recepcao(self, topico):
+        self._mensagens_desde_log += 1
+        agora = time.monotonic()
+        decorrido = agora - self._ultimo_log
+        if decorrido >= INTERVALO_LOG_RESUMO:
+            logger.info("%d mensagens recebidas nos últimos %.0f s (último tópico: %s)",
+                        self._mensagens_desde_log, decorrido, topico)
+            self._mensagens_desde_log = 0
+            self._ultimo_log = agora
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Mensagem recebida no tópico %s", topico)
+
+    @staticmethod
+    def _dispositivo_do_topico(topico):
+        # cfe-hydro/<device_id>/{data,bin,schema} -> device_id
+        partes = topico.split('/')
+        if len(partes) == 3 and partes[2] in ('data', 'bin', 'schema') and partes[1]:
+            return partes[1]
+        return DISPOSITIVO_PADRAO
+
+    def _processar_readings(self, readings, timestamp_ms, pontos):
+        for idx, r in enumerate(readings):
+            try:
+                sensor_type = r.get('sensor_type')
+                value = r.get('value')
+                interpolation = r.get('interpolation', 'linear')
+                metadata = r.get('metadata', {})
+                amostras = r.get('samples')
+                if sensor_type and amostras:
+                    # Modo em lote: [deslocamento em ms relativo ao transmission_timestamp, valor]
+                    for deslocamento_ms, valor in amostras:
+                        if valor is not None:
+                            pontos.append((sensor_type, timestamp_ms + int(deslocamento_ms), valor,
+                                           interpolation, metadata))
+                elif sensor_type and value is not None:
+                    pontos.append((sensor_type, timestamp_ms, value, interpolation, metadata))
+                else:
+                    logger.warning("Leitura %d ignorada - campos ausentes: %s", idx, r)
+            except Exception as e:
+                logger.error("Erro ao processar leitura %d: %s", idx, e)
+
+    def publicar_reconstrucao(self, device_id, sensor_type, metodo, timestamps_ms, valores):
+        """
+        Publica um lote da reconstrução online em TOPIC_RECONSTRUCAO. A grade é regular: o payload
+        leva o primeiro timestamp e o passo, e não um timestamp por ponto.
+        """
+        if not self.connected or not len(timestamps_ms):
+            return
+        passo_ms = int(timestamps_ms[1] - timestamps_ms[0]) if len(timestamps_ms) > 1 else None
+        payload = json.dumps({
+            'device_id': device_id,
+            'sensor_type': sensor_type,
+            'interpolation': metodo,
+            'start_ms': int(timestamps_ms[0]),
+            'interval_ms': passo_ms,
+            'values': [v if math.isfinite(v) else None for v in map(float, valores)],
+        }, separators=(',', ':'))
+        self.client.publish(TOPIC_RECONSTRUCAO.format(device_id=device_id, sensor_type=sensor_type), payload, qos=0)
+
+    def publicar_controle(self, device_id, razoes):
+        """
+        Publica a fração das amostras que cada sensor deve transmitir em TOPIC_CONTROLE, retida: o
+        dispositivo a recebe também ao reconectar (cfe-hydro.h, applyControl).
+        """
+        if not self.connected:
+            return
+        payload = json.dumps({
+            'device_id': device_id,
+            'transmission_ratio': {sensor_type: round(razao, 4) for sensor_type, razao in razoes.items()},
+        }, separators=(',', ':'))
+        self.client.publish(TOPIC_CONTROLE.format(device_id=device_id), payload, qos=1, retain=True)
+
+    def conectar(self):
+        try:
+            logger.info(f"Tentando conectar a {self.broker}:{self.port}...")
+            self.fila.iniciar()
+            self.client.connect(self.broker, self.port, 60)
+            self.client.loop_start()
+            time.sleep(2)
+            if not self.connected:
+                self.connection_error = "Timeout após connect"
+        except Exception as e:
+            self.connected = False
+            self.connection_error = str(e)
+            logger.error(f"Exceção na conexão: {e}")
+
+    def desconectar(self):
+        self.client.loop_stop()
+        self.client.disconnect()
+        self.connected = False
+        self.fila.parar()
@@ -0,0 +1,62 @@
+"""
+Função: Configurações padrão do dashboard CFE-HYDRO (broker, tópicos, fuso horário e limites de memória)
+"""
+import os
+
+import pytz
+
+DEFAULT_BROKER = "test.mosquitto.org"
+DEFAULT_PORT = 1883
+TOPIC_DATA = "cfe-hydro/data"               # tópico legado, um único dispositivo
+TOPIC_DATA_DISPOSITIVOS = "cfe-hydro/+/data"  # cfe-hydro/<device_id>/data
+TOPIC_ESQUEMA_DISPOSITIVOS = "cfe-hydro/+/schema"  # esquema do formato binário (retido)
+TOPIC_BINARIO_DISPOSITIVOS = "cfe-hydro/+/bin"     # mensagens binárias compactas
+TOPICOS_DADOS = [TOPIC_DATA, TOPIC_DATA_DISPOSITIVOS, TOPIC_ESQUEMA_DISPOSITIVOS, TOPIC_BINARIO_DISPOSITIVOS]
+TOPIC_RECONSTRUCAO = "cfe-hydro/{device_id}/reconstruido/{sensor_type}"  # pontos da reconstrução online
+TOPIC_CONTROLE = "cfe-hydro/{device_id}/control"  # taxa de transmissão recomendada a cada sensor (retido)
+DISPOSITIVO_PADRAO = "desconhecido"          # usado quando nem o payload nem o tópico identificam o dispositivo
+INTERVALO_LOG_RESUMO = 30       # s entre logs INFO agregados de recepção (detalhe por mensagem só em DEBUG)
+INTERVALO_LOTE_MS = 200         # ms máximos que uma mensagem espera na fila de ingestão
+TAMANHO_LOTE = 500              # mensagens que antecipam a drenagem da fila (e máximo por lote)
+LOCAL_TIMEZONE = pytz.timezone('America/Sao_Paulo')
+CAPACIDADE_BUFFER = 1000        # pontos mantidos em memória por sensor
+# Histórico completo persistido em disco (armazenamento_disco); vazio desativa a persistência
+DIRETORIO_ARMAZENAMENTO = os.environ.get(
+    'CFE_HYDRO_ARMAZENAMENTO', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'armazenamento'))
+# Tamanho dos gráficos do dashboard, em px. A largura é uma SUPOSIÇÃO: o Streamlit não informa ao
+# servidor a largura real da página, então os gráficos são desenhados com essa largura fixa (rolagem
+# horizontal em telas mais estreitas) e a série interpolada é reduzida a um ponto por pixel da área
+# de plotagem (largura menos as margens). Os pontos recebidos são sempre enviados todos.
+LARGURA_GRAFICO_PX = 1200
+ALTURA_GRAFICO_PX = 400
+METODO_REDUCAO = 'lttb'         # 'lttb' (forma da curva) ou 'minmax' (picos exatos, 2 pontos por balde)
+GRAFICOS_INCREMENTAIS = True    # atualiza os gráficos no navegador só com os pontos novos (grafico_incremental)
+RECALCULO_OCIOSO_S = 60         # s: sem dados novos, a janela deslizante é recalculada no máximo nesse intervalo
+MAX_GRADES_CACHE = 64           # grades interpoladas mantidas em cache por dispositivo (sensor, intervalo, método)
+# Pontos conhecidos anteriores à cauda que são reinterpolados quando chegam novos dados.
+# Métodos locais (linear, logarítmico) não precisam de contexto; o sigmoidal usa os 2 vizinhos de
+# cada lado da janela de ajuste (cfe_hydro.interpolacao.JANELA_SIGMOIDAL). O spline cúbico é global:
+# uma leitura nova altera toda a curva, com efeito que cai ~3,7x por leitura; com 20 leituras a
+# cauda coincide com o recálculo completo (diferença < 1e-11).
+CONTEXTO_INTERPOLACAO = {'polynomial': 20, 'sigmoidal': 2}
+MAX_AJUSTES_SIGMOIDAIS = 8192   # janelas com parâmetros logísticos em cache (processo inteiro)
+# Reconstrução online (reconstrucao_online): pontos da grade emitidos a cada leitura recebida.
+# Métodos com contexto esperam CONTEXTO_RECONSTRUCAO leituras depois de cada lacuna; para o spline,
+# a janela curta troca a igualdade com a grade completa por latência menor.
+CONTEXTO_RECONSTRUCAO = {'polynomial': 3, 'sigmoidal': 2}
+INTERVALO_RECONSTRUCAO_S = 60           # s entre pontos da grade (o padrão do gráfico interpolado)
+MAX_PONTOS_LACUNA = 1440                # lacunas maiores (sensor desligado) não são preenchidas
+CAPACIDADE_FILA_RECONSTRUCAO = 10000    # lotes na fila local; os mais antigos são descartados
+PUBLICAR_RECONSTRUCAO = False           # publica os lotes no broker (TOPIC_RECONSTRUCAO)
+# Previsão de curto prazo (cfe_hydro.previsao): um modelo por sensor, escolhido pelo tipo de
+# interpolação e atualizado com as leituras novas a cada consulta; o gráfico a desenha com uma faixa
+HORIZONTE_PREVISAO_S = 1800     # s à frente da última leitura (padrão do dashboard; 0 desativa)
+Z_PREVISAO = 1.96               # meia-largura da faixa em desvios dos erros de um passo (~95%)
+# Controle da taxa de transmissão (controle_taxa, cfe_hydro.controle): o erro de reconstrução de cada
+# sensor, estimado com as leituras recebidas, define a fração das amostras que o firmware transmite
+# Desligado por padrão: com o broker público, o wildcard alcança dispositivos de terceiros e as
+# mensagens retidas mudariam a taxa deles; ligue só com um broker próprio
+CONTROLE_TAXA = False           # publica as recomendações em TOPIC_CONTROLE
+PASSO_MAXIMO_CONTROLE = 30      # recomenda no mínimo 1 a cada 30 amostras (o firmware tem seus próprios limites)
+TOLERANCIAS_CONTROLE = {'temperatura': 0.2, 'ph': 0.1, 'ec': 0.05, 'od': 0.1,  # erro aceito, na unidade do sensor
+                        'temperature': 0.2, 'do': 0.1}  # nomes usados pelo CFE-Hydro_send.ino
@@ -0,0 +1,91 @@
+"""
+Função: Malha de controle da taxa de transmissão no receptor: cada leitura recebida atualiza o
+        ControladorTaxa do sensor (cfe_hydro.controle), que estima online o erro de reconstrução
+        e recomenda o passo de transmissão (1 amostra a cada N). Quando a recomendação de algum
+        sensor muda, a de todos os sensores do dispositivo é entregue à função de publicação
+        (ClienteMQTT.publicar_controle, tópico de controle retido), que o firmware aplica dentro
+        dos seus limites (cfe-hydro.h, applyControl).
+
+Com leituras em lote (várias amostras por mensagem), todas as mudanças de um lote saem numa única
+publicação. Leituras fora de ordem são ignoradas pela malha (continuam gravadas no GerenciadorDados).
+"""
+import logging
+import os
+import sys
+import threading
+
+from config import PASSO_MAXIMO_CONTROLE, TOLERANCIAS_CONTROLE
+
+# Pacote cfe_hydro (em src/), compartilhado com os scripts de análise
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.controle import PASSO_MINIMO, ControladorTaxa, tolerancia_padrao  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class ControleTaxa:
+    """
+    Controladores de todos os sensores recebidos.
+
+    Args:
+        publicar: Função opcional publicar(device_id, razoes), com razoes = {sensor_type: fração das
+                  amostras a transmitir}, chamada quando a recomendação do dispositivo muda.
+        tolerancias: Erro de reconstrução aceito por sensor_type; os demais usam uma tolerância
+                     relativa ao primeiro valor recebido (cfe_hydro.controle.tolerancia_padrao).
+    """
+
+    def __init__(self, publicar=None, tolerancias=TOLERANCIAS_CONTROLE, passo_minimo=PASSO_MINIMO,
+                 passo_maximo=PASSO_MAXIMO_CONTROLE):
+        self.publicar = publicar
+        self.tolerancias = dict(tolerancias)
+        self.passo_minimo = passo_minimo
+        self.passo_maximo = passo_maximo
+        self.lock = threading.Lock()
+        self.controladores = {}     # device_id -> {sensor_type: ControladorTaxa}
+        self.publicacoes = 0
+
+    def adicionar_lote(self, device_id, pontos):
+        """Processa (sensor_type, timestamp_ms, value, interpolation, metadata) na ordem recebida"""
+        mudou = False
+        with self.lock:
+            sensores = self.controladores.setdefault(device_id, {})
+            for sensor_type, timestamp_ms, value, interpolation, _ in pontos:
+                try:
+                    timestamp_ms, value = int(timestamp_ms), float(value)
+                except (TypeError, ValueError):
+                    continue
+                controlador = sensores.get(sensor_type)
+                if controlador is None:
+                    tolerancia = tolerancia_padrao(sensor_type, value, self.tolerancias)
+                    controlador = sensores[sensor_type] = ControladorTaxa(
+                        tolerancia, interpolation or 'linear', self.passo_minimo, self.passo_maximo)
+                controlador.metodo = interpolation or 'linear'
+                mudou |= controlador.atualizar(timestamp_ms, value)
+            razoes = self._razoes(sensores) if mudou else None
+        # Publicação fora do lock: a rede pode demorar sem atrasar os outros dispositivos
+        if razoes is not None:
+            logger.info("Taxa de transmissão de %s: %s", device_id,
+                        ', '.join(f"{s} 1/{round(1 / r)}" for s, r in razoes.items()))
+            self._entregar(device_id, razoes)
+
+    def recomendacao(self, device_id):
+        """{sensor_type: fração das amostras a transmitir} recomendada ao dispositivo"""
+        with self.lock:
+            return self._razoes(self.controladores.get(device_id, {}))
+
+    @staticmethod
+    def _razoes(sensores):
+        return {sensor_type: c.razao for sensor_type, c in sensores.items()}
+
+    def _entregar(self, device_id, razoes):
+        if self.publicar is None:
+            return
+        try:
+            self.publicar(device_id, razoes)
+            self.publicacoes += 1
+        except Exception as e:
+            logger.error("Erro ao publicar a taxa de transmissão de %s: %s", device_id, e)
+
+    def limpar(self):
+        with self.lock:
+            self.controladores = {}
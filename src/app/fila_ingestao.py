@@ -0,0 +1,86 @@
+"""
+Função: Fila de ingestão entre a thread de rede do paho e o GerenciadorDados.
+        O callback MQTT apenas enfileira o payload bruto; uma thread consumidora drena a fila
+        em lotes (a cada INTERVALO_LOTE_MS ou ao acumular TAMANHO_LOTE mensagens).
+"""
+import logging
+import threading
+from collections import deque
+
+from config import INTERVALO_LOTE_MS, TAMANHO_LOTE
+
+logger = logging.getLogger(__name__)
+
+
+class FilaIngestao:
+    """
+    Fila sem lock no lado produtor: deque.append/popleft são atômicos no CPython, então a
+    thread do paho nunca espera pelo consumidor nem pelos leitores do dashboard.
+
+    Args:
+        processar_lote: Função chamada pela thread consumidora com a lista de itens do lote.
+        intervalo_ms: Tempo máximo que uma mensagem espera na fila antes de ser processada.
+        tamanho_lote: Número de mensagens que antecipa a drenagem (e limite de itens por lote).
+    """
+
+    def __init__(self, processar_lote, intervalo_ms=INTERVALO_LOTE_MS, tamanho_lote=TAMANHO_LOTE):
+        self.processar_lote = processar_lote
+        self.intervalo_ms = intervalo_ms
+        self.tamanho_lote = tamanho_lote
+        self._itens = deque()
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+        self.lotes_processados = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    def publicar(self, item):
+        """Chamado pela thread do paho: enfileira e só sinaliza o consumidor quando o lote enche"""
+        self._itens.append(item)
+        if len(self._itens) >= self.tamanho_lote:
+            self._acordar.set()
+
+    def iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="cfe-ingestao", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Encerra o consumidor e processa o que restou na fila"""
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.drenar()
+
+    def drenar(self):
+        """Processa todos os itens pendentes em lotes de até tamanho_lote; retorna quantos foram processados"""
+        total = 0
+        while self._itens:
+            lote = []
+            try:
+                while len(lote) < self.tamanho_lote:
+                    lote.append(self._itens.popleft())
+            except IndexError:
+                pass
+            if not lote:
+                break
+            try:
+                self.processar_lote(lote)
+            except Exception as e:
+                logger.error("Erro ao processar lote de %d mensagens: %s", len(lote), e)
+            self.lotes_processados += 1
+            total += len(lote)
+        return total
+
+    def _executar(self):
+        intervalo = self.intervalo_ms / 1000.0
+        while not self._parar.is_set():
+            self._acordar.wait(intervalo)
+            self._acordar.clear()
+            self.drenar()
@@ -0,0 +1,458 @@
+"""
+Função: Armazenamento das leituras recebidas por dispositivo e por sensor, com consultas para o dashboard
+"""
+import itertools
+import logging
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from armazenamento import BufferCircular, SerieCrescente
+from armazenamento_disco import concatenar
+from config import CAPACIDADE_BUFFER, CONTEXTO_INTERPOLACAO, LOCAL_TIMEZONE, MAX_GRADES_CACHE, Z_PREVISAO
+from interpolador import InterpoladorSeletivo
+
+# Pacote cfe_hydro (em src/), compartilhado com os scripts de análise
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.previsao import criar_previsor  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Versões dos dados, únicas no processo (um dispositivo recriado após limpar() não repete versões)
+_versoes = itertools.count(1)
+
+
+class DadosDispositivo:
+    """Séries, metadados e cache de interpolação de um dispositivo, protegidos por locks próprios"""
+
+    def __init__(self, device_id, capacidade=CAPACIDADE_BUFFER, armazenamento=None):
+        self.device_id = device_id
+        self.capacidade = capacidade
+        self.armazenamento = armazenamento  # ArmazenamentoDisco opcional (histórico completo)
+        self.lock = threading.Lock()
+        self.sensor_data = {}          # sensor_type -> BufferCircular
+        self.sensor_metadata = {}       # sensor_type -> dict
+        self.previsores = {}            # sensor_type -> {'metodo', 'versao', 'previsor'} (sob cache_lock)
+        self.cache_lock = threading.Lock()
+        self.cache_interpolacao = OrderedDict()  # (sensor_type, interval_seconds, metodo) -> dict
+        self.messages_received = 0
+        self.last_message_time = None
+        self.versao = 0                 # muda a cada lote gravado; usada pelo dashboard para evitar recálculos
+
+    def adicionar_ponto(self, sensor_type, timestamp_ms, value, interpolation, metadata):
+        self.adicionar_lote([(sensor_type, timestamp_ms, value, interpolation, metadata)])
+
+    def adicionar_lote(self, pontos):
+        """Grava uma lista de (sensor_type, timestamp_ms, value, interpolation, metadata) sob um único lock"""
+        adicionados = 0
+        persistir = {}                  # sensor_type -> ([timestamps], [valores]) para o disco
+        metadados_alterados = set()
+        with self.lock:
+            for sensor_type, timestamp_ms, value, interpolation, metadata in pontos:
+                try:
+                    timestamp_ms, value = int(timestamp_ms), float(value)
+                except (TypeError, ValueError):
+                    logger.warning("Leitura ignorada - valor inválido: %s/%s = %r", self.device_id, sensor_type, value)
+                    continue
+                # Metadados: só atualiza quando algo mudou (o firmware repete os mesmos a cada mensagem)
+                atual = self.sensor_metadata.get(sensor_type)
+                if atual is None:
+                    atual = self.sensor_metadata[sensor_type] = {}
+                if atual.get('interpolation') != interpolation or any(
+                        atual.get(k) != v for k, v in metadata.items()):
+                    atual.update(metadata)
+                    atual['interpolation'] = interpolation
+                    metadados_alterados.add(sensor_type)
+
+                # Dados (buffer circular: inserção O(1), descarta o ponto mais antigo quando cheio)
+                buffer = self.sensor_data.get(sensor_type)
+                if buffer is None:
+                    buffer = self.sensor_data[sensor_type] = BufferCircular(self.capacidade)
+                buffer.adicionar(timestamp_ms, value)
+                adicionados += 1
+                if self.armazenamento is not None:
+                    lote = persistir.setdefault(sensor_type, ([], []))
+                    lote[0].append(timestamp_ms)
+                    lote[1].append(value)
+
+            if self.armazenamento is not None:
+                self._persistir(persistir, metadados_alterados)
+            self.messages_received += adicionados
+            self.last_message_time = datetime.now()
+            if adicionados:
+                self.versao = next(_versoes)
+
+    def _persistir(self, persistir, metadados_alterados):
+        # Falhas de disco não interrompem a ingestão: os pontos continuam no buffer em memória
+        try:
+            for sensor_type in metadados_alterados:
+                self.armazenamento.gravar_metadados(self.device_id, sensor_type, self.sensor_metadata[sensor_type])
+            for sensor_type, (timestamps, valores) in persistir.items():
+                self.armazenamento.serie(self.device_id, sensor_type).adicionar(timestamps, valores)
+        except OSError as e:
+            logger.error("Erro ao persistir pontos de %s: %s", self.device_id, e)
+
+    def restaurar(self, sensor_type):
+        """Recarrega metadados e os pontos mais recentes de um sensor persistido em disco"""
+        serie = self.armazenamento.serie(self.device_id, sensor_type, criar=False)
+        if serie is None:
+            return
+        with self.lock:
+            self.sensor_metadata[sensor_type] = self.armazenamento.ler_metadados(self.device_id, sensor_type)
+            buffer = self.sensor_data[sensor_type] = BufferCircular(self.capacidade)
+            for timestamp_ms, value in zip(*serie.ultimos(self.capacidade)):
+                buffer.adicionar(int(timestamp_ms), float(value))
+            self.versao = next(_versoes)
+
+    def copiar_serie(self, sensor_type, desde_ms=None):
+        # Copia a janela sob o lock; o buffer continua sendo escrito pela thread de ingestão
+        with self.lock:
+            buffer = self.sensor_data.get(sensor_type)
+            if buffer is None:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            ts, vals = buffer.visao(desde_ms)
+            return ts.copy(), vals.copy()
+
+    def copiar_historico(self, sensor_type, desde_ms=None):
+        """Como copiar_serie, mas lendo do disco: sem o limite de pontos do buffer em memória"""
+        serie = None
+        armazenamento = self.armazenamento  # pode ser desligado por apagar_historico
+        if armazenamento is not None:
+            serie = armazenamento.serie(self.device_id, sensor_type, criar=False)
+        if serie is None:
+            return self.copiar_serie(sensor_type, desde_ms)
+        # Sob o lock, só a lista de segmentos (e a cópia do ativo); a leitura dos segmentos
+        # fechados, que pode ir ao disco, não bloqueia a ingestão do dispositivo
+        with self.lock:
+            partes = serie.fatias(desde_ms)
+        return concatenar(partes)
+
+    def grade_interpolada(self, sensor_type, interval_seconds, desde_ms=None):
+        """
+        Retorna (x_ms, valores) da grade regular interpolada, a partir de desde_ms.
+
+        A grade fica em cache por (sensor, intervalo, método) e é versionada pelo contador de
+        inserções do buffer: sem dados novos, nada é recalculado; com dados novos, apenas a cauda
+        (a partir do último ponto já incorporado) é interpolada e anexada.
+        """
+        passo = int(interval_seconds * 1000)
+        with self.cache_lock:
+            with self.lock:
+                buffer = self.sensor_data.get(sensor_type)
+                if buffer is None or len(buffer) < 2:
+                    return None
+                metodo = self.sensor_metadata.get(sensor_type, {}).get('interpolation', 'linear')
+                chave = (sensor_type, interval_seconds, metodo)
+                entrada = self.cache_interpolacao.get(chave)
+                versao = buffer.total_inseridos
+                ts, vals = buffer.visao()
+                primeiro_ts = int(ts[0]) if buffer.ordenado else int(ts.min())
+                incremental = (entrada is not None and buffer.ordenado
+                               and entrada['versao'] != versao and entrada['ultimo_ts'] >= primeiro_ts)
+                if entrada is None or (entrada['versao'] != versao and not incremental):
+                    # Recalculo completo: primeira consulta, chegada fora de ordem ou histórico renovado
+                    ordem = np.argsort(ts, kind='stable')
+                    x_known, y_known = ts[ordem], vals[ordem]
+                    recalc_ms = None
+                elif incremental:
+                    idx = int(np.searchsorted(ts, entrada['ultimo_ts'], side='left'))
+                    contexto = CONTEXTO_INTERPOLACAO.get(metodo, 0)
+                    i0 = max(0, idx - contexto)
+                    j0 = max(0, i0 - contexto)
+                    x_known, y_known = ts[j0:].copy(), vals[j0:].copy()
+                    recalc_ms = int(ts[i0])
+
+            if entrada is None or entrada['versao'] != versao:
+                if recalc_ms is None:
+                    origem = int(x_known[0])
+                    entrada = {'origem': origem, 'grade': SerieCrescente()}
+                    recalc_ms = origem
+                origem = entrada['origem']
+                # Pontos da grade alinhados em origem + k * passo, de recalc_ms até o último ponto conhecido
+                k0 = -((origem - recalc_ms) // passo)
+                k1 = (int(x_known[-1]) - origem) // passo
+                x_new = origem + passo * np.arange(k0, k1 + 1, dtype=np.int64)
+                try:
+                    y_new = InterpoladorSeletivo.interpolar(x_known, y_known, x_new, metodo)
+                except Exception as e:
+                    logger.error(f"Erro na interpolação: {e}")
+                    y_new = np.interp(x_new, x_known, y_known)
+                entrada['grade'].substituir_cauda(recalc_ms, x_new, y_new)
+                entrada['grade'].descartar_antes(primeiro_ts)
+                entrada['versao'] = versao
+                entrada['ultimo_ts'] = int(x_known[-1])
+                self._armazenar_grade(chave, entrada)
+            else:
+                self.cache_interpolacao.move_to_end(chave)
+
+            x, y = entrada['grade'].visao(desde_ms)
+            return x.copy(), y.copy()
+
+    def previsao(self, sensor_type, horizonte_ms, passo_ms, z=Z_PREVISAO):
+        """
+        Previsão após a última leitura (cfe_hydro.previsao.Previsor.prever_grade), ou None.
+
+        O modelo do sensor (escolhido pelo tipo de interpolação) é versionado como a grade
+        interpolada: a cada consulta ele incorpora, uma a uma e em O(1), as leituras inseridas no
+        buffer desde a consulta anterior. A ingestão não paga pela previsão e o custo total
+        continua O(1) por leitura. O modelo só é reajustado ao buffer inteiro quando o tipo de
+        interpolação muda ou quando chegaram mais leituras do que o buffer guarda.
+        """
+        with self.cache_lock:
+            with self.lock:
+                buffer = self.sensor_data.get(sensor_type)
+                if buffer is None or len(buffer) == 0:
+                    return None
+                metodo = self.sensor_metadata.get(sensor_type, {}).get('interpolation') or 'linear'
+                entrada = self.previsores.get(sensor_type)
+                versao = buffer.total_inseridos
+                ts, vals = buffer.visao()
+                novos = versao - entrada['versao'] if entrada is not None else -1
+                if entrada is None or entrada['metodo'] != metodo or not 0 <= novos <= len(ts):
+                    ordem = np.argsort(ts, kind='stable')
+                    x_novos, y_novos = ts[ordem], vals[ordem]
+                    entrada = {'metodo': metodo, 'previsor': criar_previsor(metodo)}
+                else:
+                    # Ordem de inserção: leituras fora de ordem são descartadas pelo modelo
+                    x_novos, y_novos = ts[len(ts) - novos:].copy(), vals[len(vals) - novos:].copy()
+
+            entrada['previsor'].ajustar(x_novos, y_novos)
+            entrada['versao'] = versao
+            self.previsores[sensor_type] = entrada
+            return entrada['previsor'].prever_grade(horizonte_ms, passo_ms, z)
+
+    def _armazenar_grade(self, chave, entrada):
+        sensor_type, _, metodo = chave
+        # Grades do mesmo sensor com outro método ficaram obsoletas (metadados mudaram)
+        for outra in [k for k in self.cache_interpolacao if k[0] == sensor_type and k[2] != metodo]:
+            del self.cache_interpolacao[outra]
+        self.cache_interpolacao[chave] = entrada
+        self.cache_interpolacao.move_to_end(chave)
+        while len(self.cache_interpolacao) > MAX_GRADES_CACHE:
+            self.cache_interpolacao.popitem(last=False)
+
+
+class GerenciadorDados:
+    """
+    Dados recebidos, indexados por (device_id, sensor_type).
+
+    Cada dispositivo tem seu próprio lock: a ingestão de um dispositivo não disputa com a de
+    outro nem com as consultas do dashboard a outros dispositivos. O lock global protege
+    apenas a criação de novos dispositivos.
+
+    Com um ArmazenamentoDisco, cada lote também é gravado em disco: o histórico sobrevive a
+    reinícios (os sensores persistidos são recarregados na criação) e obter_dados_brutos lê a
+    janela pedida do disco, sem o limite de pontos do buffer em memória. limpar descarta só a
+    memória; o disco é apagado apenas por apagar_historico.
+
+    Com uma ReconstrucaoOnline, cada lote gravado também alimenta a reconstrução em fluxo
+    (pontos interpolados emitidos a cada leitura, independentemente das consultas). Com um
+    ControleTaxa, alimenta também a malha que recomenda a taxa de transmissão de cada sensor.
+
+    Cada sensor tem um modelo de previsão de curto prazo (cfe_hydro.previsao, escolhido pelo tipo
+    de interpolação), que obter_previsao atualiza com as leituras novas antes de avaliá-lo.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_BUFFER, armazenamento=None, reconstrucao=None, controle=None):
+        self.lock = threading.Lock()
+        self.capacidade = capacidade
+        self.armazenamento = armazenamento
+        self.reconstrucao = reconstrucao
+        self.controle = controle
+        self.dispositivos = {}          # device_id -> DadosDispositivo
+        self._com_disco = weakref.WeakSet()  # instâncias ligadas ao disco, inclusive as já descartadas
+        if armazenamento is not None:
+            self._restaurar()
+
+    def _restaurar(self):
+        for device_id, sensor_type in self.armazenamento.series():
+            self._dispositivo(device_id, criar=True).restaurar(sensor_type)
+        if self.dispositivos:
+            logger.info("Histórico recarregado de %s: %d dispositivos", self.armazenamento.raiz, len(self.dispositivos))
+
+    def _dispositivo(self, device_id, criar=False):
+        disp = self.dispositivos.get(device_id)
+        if disp is None and criar:
+            with self.lock:
+                disp = self.dispositivos.get(device_id)
+                if disp is None:
+                    disp = DadosDispositivo(device_id, self.capacidade, self.armazenamento)
+                    self.dispositivos[device_id] = disp
+                    if self.armazenamento is not None:
+                        self._com_disco.add(disp)
+        return disp
+
+    @property
+    def messages_received(self):
+        return sum(d.messages_received for d in list(self.dispositivos.values()))
+
+    @property
+    def last_message_time(self):
+        tempos = [d.last_message_time for d in list(self.dispositivos.values()) if d.last_message_time]
+        return max(tempos) if tempos else None
+
+    def adicionar_ponto(self, device_id, sensor_type, timestamp_ms, value, interpolation, metadata):
+        self.adicionar_lote(device_id, [(sensor_type, timestamp_ms, value, interpolation, metadata)])
+
+    def adicionar_lote(self, device_id, pontos):
+        """Grava os pontos de um dispositivo adquirindo o lock dele uma única vez"""
+        if not pontos:
+            return
+        try:
+            self._dispositivo(device_id, criar=True).adicionar_lote(pontos)
+            logger.debug("✅ %d pontos adicionados: %s", len(pontos), device_id)
+        except Exception as e:
+            logger.error("Erro ao adicionar pontos para %s: %s", device_id, e)
+        if self.reconstrucao is not None:
+            try:
+                self.reconstrucao.adicionar_lote(device_id, pontos)
+            except Exception as e:
+                logger.error("Erro na reconstrução online de %s: %s", device_id, e)
+        if self.controle is not None:
+            try:
+                self.controle.adicionar_lote(device_id, pontos)
+            except Exception as e:
+                logger.error("Erro no controle de taxa de %s: %s", device_id, e)
+
+    def versao(self, device_id):
+        """Versão dos dados do dispositivo: igual entre duas consultas se nada chegou nesse intervalo"""
+        disp = self._dispositivo(device_id)
+        return disp.versao if disp is not None else 0
+
+    def lista_dispositivos(self):
+        return sorted(self.dispositivos.keys())
+
+    def limpar(self):
+        # Descarta os dados em memória; o histórico em disco é mantido (ver apagar_historico)
+        with self.lock:
+            self._descartar()
+
+    def apagar_historico(self):
+        """Descarta os dados em memória e apaga o histórico persistido em disco"""
+        with self.lock:
+            self._descartar()
+            if self.armazenamento is None:
+                return
+            # Desliga o disco das instâncias antigas (também as descartadas por limpar) antes de
+            # apagar: um lote em andamento nelas recriaria os segmentos. Sob o lock de cada uma,
+            # nenhum lote grava depois disto.
+            for disp in list(self._com_disco):
+                with disp.lock:
+                    disp.armazenamento = None
+            self._com_disco = weakref.WeakSet()
+            self.armazenamento.apagar()
+        logger.info("Histórico em disco apagado: %s", self.armazenamento.raiz)
+
+    def _descartar(self):
+        # Chamado sob self.lock; leituras em andamento vão para as instâncias descartadas
+        self.dispositivos = {}
+        if self.reconstrucao is not None:
+            self.reconstrucao.limpar()
+        if self.controle is not None:
+            self.controle.limpar()
+
+    def obter_dados_brutos(self, device_id, sensor_type, horas=24):
+        disp = self._dispositivo(device_id)
+        cutoff = datetime.now(pytz.UTC) - timedelta(hours=horas)
+        if disp is None:
+            return pd.DataFrame(columns=['datetime', 'value', 'is_interpolated'])
+        ts, vals = disp.copiar_historico(sensor_type, desde_ms=int(cutoff.timestamp() * 1000))
+        if len(ts) == 0:
+            return pd.DataFrame(columns=['datetime', 'value', 'is_interpolated'])
+        return pd.DataFrame({
+            'datetime': pd.to_datetime(ts, unit='ms', utc=True).tz_convert(LOCAL_TIMEZONE),
+            'value': vals,
+            'is_interpolated': False
+        })
+
+    def obter_dados_interpolados(self, device_id, sensor_type, interval_seconds=60, horas=None):
+        disp = self._dispositivo(device_id)
+        desde_ms = None
+        if horas is not None:
+            cutoff = datetime.now(pytz.UTC) - timedelta(hours=horas)
+            desde_ms = int(cutoff.timestamp() * 1000)
+        grade = disp.grade_interpolada(sensor_type, interval_seconds, desde_ms) if disp else None
+        if grade is None:
+            return pd.DataFrame(columns=['datetime', 'value', 'is_interpolated'])
+        x_new, y_new = grade
+        return pd.DataFrame({
+            'datetime': pd.to_datetime(x_new, unit='ms', utc=True).tz_convert(LOCAL_TIMEZONE),
+            'value': y_new,
+            'is_interpolated': True
+        }).dropna(subset=['value'])
+
+    def obter_previsao(self, device_id, sensor_type, horizonte_s, interval_seconds=60, z=Z_PREVISAO):
+        """
+        Previsão do sensor após a última leitura, na grade de interval_seconds, até horizonte_s
+        depois dela: DataFrame com datetime, value (média), inferior e superior (faixa de z
+        desvios; NaN até haver erros de previsão suficientes para estimá-la).
+        """
+        disp = self._dispositivo(device_id)
+        previsao = None
+        if disp is not None and horizonte_s > 0:
+            previsao = disp.previsao(sensor_type, int(horizonte_s * 1000), int(interval_seconds * 1000), z)
+        if previsao is None or len(previsao[0]) == 0:
+            return pd.DataFrame(columns=['datetime', 'value', 'inferior', 'superior'])
+        x, media, inferior, superior = previsao
+        return pd.DataFrame({
+            'datetime': pd.to_datetime(x, unit='ms', utc=True).tz_convert(LOCAL_TIMEZONE),
+            'value': media,
+            'inferior': inferior,
+            'superior': superior,
+        })
+
+    def obter_dados_combinados(self, device_id, sensor_type, horas=24, interval_seconds=60):
+        raw = self.obter_dados_brutos(device_id, sensor_type, horas)
+        interp = self.obter_dados_interpolados(device_id, sensor_type, interval_seconds, horas=horas)
+        combined = pd.concat([raw, interp], ignore_index=True)
+        return combined.sort_values('datetime', ascending=False)
+
+    def obter_valor_mais_recente(self, device_id, sensor_type):
+        disp = self._dispositivo(device_id)
+        if disp is None:
+            return None
+        with disp.lock:
+            buffer = disp.sensor_data.get(sensor_type)
+            ultimo = buffer.ultimo() if buffer is not None else None
+        if ultimo is None:
+            return None
+        return ultimo[1]
+
+    def tem_dados(self, device_id=None):
+        ids = [device_id] if device_id is not None else list(self.dispositivos.keys())
+        for disp in filter(None, (self._dispositivo(d) for d in ids)):
+            with disp.lock:
+                if any(len(buffer) > 0 for buffer in disp.sensor_data.values()):
+                    return True
+        return False
+
+    def tipos_sensor(self, device_id):
+        disp = self._dispositivo(device_id)
+        if disp is None:
+            return []
+        with disp.lock:
+            return list(disp.sensor_data.keys())
+
+    def metadados(self, device_id, sensor_type):
+        disp = self._dispositivo(device_id)
+        return disp.sensor_metadata.get(sensor_type, {}) if disp else {}
+
+    def ultimo_timestamp_dado(self, device_id=None):
+        ids = [device_id] if device_id is not None else list(self.dispositivos.keys())
+        max_ts = None
+        for disp in filter(None, (self._dispositivo(d) for d in ids)):
+            with disp.lock:
+                for buffer in disp.sensor_data.values():
+                    ultimo = buffer.ultimo()
+                    if ultimo is not None and (max_ts is None or ultimo[0] > max_ts):
+                        max_ts = ultimo[0]
+        if max_ts is not None:
+            return pd.to_datetime(max_ts, unit='ms', utc=True).tz_convert(LOCAL_TIMEZONE)
+        return None
@@ -0,0 +1,154 @@
+"""
+Função: Gráfico Plotly com atualização incremental no dashboard (componente Streamlit em
+        componentes/grafico_incremental).
+
+A figura completa é enviada ao navegador uma vez por sessão, e de novo quando muda a configuração
+do gráfico. Nas atualizações seguintes vão só estas coisas:
+    - os pontos recebidos depois do último já desenhado, anexados com Plotly.extendTraces
+      (o navegador descarta os que saíram da janela);
+    - a série interpolada, já reduzida à largura configurada (config.LARGURA_GRAFICO_PX),
+      substituída com Plotly.restyle;
+    - a previsão (limites da faixa e média, poucos pontos após a última leitura), também com restyle;
+    - a faixa do eixo Y.
+Cada envio tem uma revisão e o navegador ignora as que já aplicou. Se perder a sequência (iframe
+recriado), ele pede a figura completa pelo valor do componente.
+
+O plotly.js carregado pelo componente é o do pacote plotly instalado, copiado para o diretório do
+componente: o gráfico funciona sem acesso à internet e na mesma versão que gera as figuras.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+import streamlit as st
+import streamlit.components.v1 as components
+
+_DIRETORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'componentes', 'grafico_incremental')
+
+
+def _copiar_plotlyjs():
+    # Só copia quando falta ou mudou (outra versão do pacote plotly)
+    origem = os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+    destino = os.path.join(_DIRETORIO, 'plotly.min.js')
+    if not os.path.exists(destino) or os.path.getsize(destino) != os.path.getsize(origem):
+        temporario = destino + '.tmp'
+        shutil.copyfile(origem, temporario)
+        os.replace(temporario, destino)
+
+
+_copiar_plotlyjs()
+_componente = components.declare_component('grafico_incremental', path=_DIRETORIO)
+
+
+def _timestamps_ms(df):
+    return df['datetime'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+
+
+def _datas(df):
+    # Datas serializadas pelo Plotly, no mesmo formato da figura completa (com fuso)
+    return json.loads(go.Figure(go.Scatter(x=df['datetime'])).to_json())['data'][0].get('x', [])
+
+
+def _valores(df, coluna='value'):
+    # Listas simples, que extendTraces aceita (e não arrays codificados em base64)
+    return [v if np.isfinite(v) else None for v in df[coluna].to_numpy(dtype=float).tolist()]
+
+
+def _serie(df, indice, **extra):
+    return {'x': _datas(df), 'y': _valores(df), 'indice': indice, **extra}
+
+
+class EstadoGrafico:
+    """O que o navegador de uma sessão já recebeu de um gráfico"""
+
+    def __init__(self):
+        self.revisao = 0
+        self.assinatura = None
+        self.versao = None
+        self.recebidos_ms = np.empty(0, dtype=np.int64)  # timestamps dos pontos recebidos já desenhados
+        self.args = None
+        self.pedido_atendido = None
+        self.completo_pendente = False
+
+
+def _delta(estado, df_raw, df_interp, faixa_y, df_prev):
+    """Args de atualização sobre a revisão atual, ou None se a mudança não é só um acréscimo"""
+    ts = _timestamps_ms(df_raw)
+    if len(ts) and (np.diff(ts) < 0).any():
+        return None
+    enviados = estado.recebidos_ms
+    ultimo = enviados[-1] if len(enviados) else None
+    antigos = ts if ultimo is None else ts[ts <= ultimo]
+    # Os pontos já desenhados que continuam na janela devem ser um sufixo do que foi enviado
+    if len(antigos) > len(enviados) or not np.array_equal(enviados[len(enviados) - len(antigos):], antigos):
+        return None
+    novos = df_raw.iloc[len(antigos):]
+    indice_raw = 1 if not df_interp.empty else 0
+    delta = {'faixa_y': faixa_y}
+    if len(novos) or len(antigos) < len(enviados):
+        delta['recebidos'] = _serie(novos, indice_raw, manter=len(ts))
+    if not df_interp.empty:
+        delta['interpolados'] = _serie(df_interp, 0)
+    if not df_prev.empty:
+        # Traços da previsão logo depois dos dados: limite inferior, superior (preenchido) e média
+        primeiro = int(not df_interp.empty) + int(not df_raw.empty)
+        x = _datas(df_prev)
+        delta['previsao'] = {'x': [x, x, x], 'y': [_valores(df_prev, c) for c in ('inferior', 'superior', 'value')],
+                             'indices': [primeiro, primeiro + 1, primeiro + 2]}
+    estado.recebidos_ms = ts
+    return {'tipo': 'delta', 'base': estado.revisao, 'delta': delta}
+
+
+def exibir_grafico_incremental(chave, versao, criar_figura, df_raw, df_interp, assinatura, faixa_y, altura=400,
+                               df_prev=None):
+    """
+    Exibe o gráfico enviando ao navegador apenas o que mudou desde a renderização anterior.
+
+    Args:
+        chave: Chave do componente, estável entre renderizações (uma por gráfico).
+        versao: Identifica os dados (df_raw, df_interp); repetida, nada é recalculado nem reenviado.
+        criar_figura: Callable que monta a go.Figure completa (chamado só quando ela é enviada),
+                      com a série interpolada como primeiro traço, a recebida como segundo e,
+                      havendo previsão, os limites inferior e superior da faixa e a média.
+        df_raw, df_interp: Séries recebida e interpolada (já reduzida), em ordem de tempo.
+        df_prev: Previsão (GerenciadorDados.obter_previsao), opcional.
+        assinatura: Configuração do gráfico (janela, unidade, cor...); mudando, a figura é reenviada.
+        faixa_y: [mínimo, máximo] do eixo Y, ou None.
+    """
+    estados = st.session_state.setdefault('graficos_incrementais', {})
+    estado = estados.get(chave)
+    if estado is None:
+        estado = estados[chave] = EstadoGrafico()
+
+    if df_prev is None:
+        df_prev = pd.DataFrame(columns=['datetime', 'value', 'inferior', 'superior'])
+    estrutura = (assinatura, df_interp.empty, df_raw.empty, df_prev.empty)
+    completo = estado.args is None or estado.assinatura != estrutura or estado.completo_pendente
+    if completo or estado.versao != versao:
+        args = None if completo else _delta(estado, df_raw, df_interp, faixa_y, df_prev)
+        if args is None:
+            args = {'tipo': 'completo', 'figura': json.loads(criar_figura().to_json())}
+            estado.recebidos_ms = _timestamps_ms(df_raw)
+        estado.revisao += 1
+        args['revisao'] = estado.revisao
+        args['altura'] = altura
+        estado.args = args
+        estado.assinatura = estrutura
+        estado.versao = versao
+        estado.completo_pendente = False
+    else:
+        # Sem mudanças: envia só a revisão atual, que o navegador já aplicou (nada a redesenhar)
+        estado.args = {'tipo': 'delta', 'base': estado.revisao, 'revisao': estado.revisao, 'delta': {},
+                       'altura': altura}
+
+    valor = _componente(key=chave, default=None, **estado.args)
+    pedido = valor.get('ressincronizar') if isinstance(valor, dict) else None
+    if pedido is not None and pedido != estado.pedido_atendido:
+        # O navegador perdeu a sequência (iframe recriado): reenvia a figura completa já
+        estado.pedido_atendido = pedido
+        estado.completo_pendente = True
+        st.rerun()
@@ -0,0 +1,44 @@
+"""
+Função: Interpolação seletiva das séries recebidas, escolhida pelo campo "interpolation" dos metadados
+"""
+import os
+import sys
+
+import numpy as np
+from scipy import interpolate
+
+from config import MAX_AJUSTES_SIGMOIDAIS
+
+# Pacote cfe_hydro (em src/), compartilhado com os scripts de análise
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.interpolacao import CacheAjustes, interpolar_ph, interpolar_sigmoidal  # noqa: E402
+
+# Parâmetros logísticos por janela de pontos conhecidos, compartilhados por todas as séries e
+# consultas: o refresh do dashboard reajusta apenas os segmentos cujas janelas mudaram
+CACHE_SIGMOIDAL = CacheAjustes(MAX_AJUSTES_SIGMOIDAIS)
+
+
+class InterpoladorSeletivo:
+    @staticmethod
+    def interpolar(x_known, y_known, x_new, metodo='linear'):
+        if len(x_known) < 2:
+            return np.full(len(x_new), y_known[0] if len(y_known) > 0 else np.nan, dtype=np.float64)
+        
+        x_known = np.asarray(x_known, dtype=np.float64)
+        y_known = np.asarray(y_known, dtype=np.float64)
+        x_new = np.asarray(x_new, dtype=np.float64)
+        
+        if metodo == 'logarithmic':
+            # pH: interpolação no espaço da concentração [H+], a mesma dos scripts de análise
+            return interpolar_ph(x_known, y_known, x_new)
+        elif metodo == 'sigmoidal':
+            return interpolar_sigmoidal(x_known, y_known, x_new, cache=CACHE_SIGMOIDAL)
+        elif metodo == 'polynomial':
+            try:
+                k = min(3, len(x_known)-1)
+                tck = interpolate.splrep(x_known, y_known, s=0, k=k)
+                return interpolate.splev(x_new, tck, der=0)
+            except Exception:
+                return np.interp(x_new, x_known, y_known)
+        else:
+            return np.interp(x_new, x_known, y_known)
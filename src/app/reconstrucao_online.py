@@ -0,0 +1,185 @@
+"""
+Função: Reconstrução online das séries: a cada leitura recebida, emite os pontos da grade regular
+        interpolados entre a leitura anterior e a nova, para consumidores que precisam da série
+        densa em fluxo (alertas, malhas de controle, exportação), sem esperar uma consulta do
+        dashboard.
+
+Cada série (device_id, sensor_type) guarda apenas as últimas leituras necessárias à interpolação,
+pelo método declarado no campo "interpolation" do sensor (o mesmo InterpoladorSeletivo do gráfico).
+A grade é alinhada à época (múltiplos de passo_ms), de modo que os pontos emitidos não dependem de
+quando o serviço começou. O trabalho por leitura é O(lacuna): a janela de leituras tem tamanho fixo
+e só os pontos da grade da lacuna nova são calculados.
+
+Métodos locais (linear, logarithmic) emitem a lacuna assim que a leitura que a fecha chega, com o
+mesmo resultado da grade completa. Métodos com contexto (CONTEXTO_RECONSTRUCAO: polynomial e
+sigmoidal) esperam esse número de leituras depois da lacuna, para que a janela tenha vizinhos dos
+dois lados; a latência fica limitada a essas leituras. O spline (polynomial) é global e, com essa
+janela curta, só aproxima a grade completa (até ~0,015 de pH em bench_reconstrucao_online.py).
+Leituras fora de ordem não são reemitidas (continuam gravadas no GerenciadorDados) e lacunas com
+mais de MAX_PONTOS_LACUNA pontos (sensor desligado, por exemplo) não são preenchidas.
+
+Os pontos de cada lacuna são entregues como um lote (device_id, sensor_type, metodo, timestamps_ms,
+valores) a uma fila local limitada (os lotes mais antigos são descartados quando ela enche, para
+que um consumidor lento não atrase os demais) e/ou a uma função de publicação (ClienteMQTT.publicar_reconstrucao).
+"""
+import logging
+import queue
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import (CAPACIDADE_FILA_RECONSTRUCAO, CONTEXTO_RECONSTRUCAO, INTERVALO_RECONSTRUCAO_S,
+                    MAX_PONTOS_LACUNA)
+from interpolador import InterpoladorSeletivo
+
+logger = logging.getLogger(__name__)
+
+# Leituras mantidas por série: a leitura da última lacuna emitida, o contexto antes dela e as
+# lacunas ainda pendentes (até o maior contexto) com o contexto depois delas
+_LEITURAS_POR_SERIE = 3 * max(CONTEXTO_RECONSTRUCAO.values(), default=0) + 3
+
+
+class SerieOnline:
+    """Estado da reconstrução online de uma série; não é thread-safe (ReconstrucaoOnline serializa)"""
+
+    def __init__(self, passo_ms):
+        self.passo_ms = passo_ms
+        self.timestamps = deque(maxlen=_LEITURAS_POR_SERIE)
+        self.valores = deque(maxlen=_LEITURAS_POR_SERIE)
+        self.emitido_ate = None     # ms: pontos da grade até aqui já emitidos
+        self.fora_de_ordem = 0
+        self.lacunas_ignoradas = 0
+
+    def adicionar(self, timestamp_ms, valor, metodo):
+        """
+        Registra uma leitura e retorna (timestamps_ms, valores) dos pontos da grade que ela
+        permite emitir, ou None.
+        """
+        if self.timestamps and timestamp_ms <= self.timestamps[-1]:
+            self.fora_de_ordem += 1
+            return None
+        self.timestamps.append(timestamp_ms)
+        self.valores.append(valor)
+        if self.emitido_ate is None:
+            # Primeira leitura: o ponto da grade coincidente com ela sai junto com a primeira lacuna
+            self.emitido_ate = timestamp_ms - 1
+        return self._emitir(CONTEXTO_RECONSTRUCAO.get(metodo, 0), metodo)
+
+    def descarregar(self, metodo):
+        """Emite as lacunas pendentes sem esperar o contexto posterior (encerramento)"""
+        return self._emitir(0, metodo)
+
+    def _emitir(self, contexto, metodo):
+        n = len(self.timestamps)
+        direita = n - 1 - contexto          # leitura que fecha a última lacuna emitível
+        if direita < 1 or self.timestamps[direita] <= self.emitido_ate:
+            return None
+        ts = np.fromiter(self.timestamps, dtype=np.int64, count=n)
+        fim_ms = int(ts[direita])
+        esquerda = max(0, int(np.searchsorted(ts, self.emitido_ate, side='right')) - 1)
+        inicio = max(0, esquerda - contexto)
+        passo = self.passo_ms
+        k0, k1 = self.emitido_ate // passo + 1, fim_ms // passo
+        self.emitido_ate = fim_ms
+        if k1 < k0:
+            return None
+        if k1 - k0 + 1 > MAX_PONTOS_LACUNA:
+            # Como na primeira leitura: a série recomeça na leitura que fecha a lacuna, e o ponto
+            # da grade coincidente com ela sai com a lacuna seguinte
+            self.lacunas_ignoradas += 1
+            self.emitido_ate = fim_ms - 1
+            return None
+        x_new = passo * np.arange(k0, k1 + 1, dtype=np.int64)
+        valores = np.fromiter(self.valores, dtype=np.float64, count=n)
+        try:
+            y_new = InterpoladorSeletivo.interpolar(ts[inicio:], valores[inicio:], x_new, metodo)
+        except Exception as e:
+            logger.error(f"Erro na interpolação online: {e}")
+            y_new = np.interp(x_new, ts[inicio:], valores[inicio:])
+        return x_new, np.asarray(y_new, dtype=np.float64)
+
+
+class ReconstrucaoOnline:
+    """
+    Reconstrução online de todas as séries recebidas.
+
+    Args:
+        intervalo_s: Espaçamento da grade regular, em segundos.
+        publicar: Função opcional publicar(device_id, sensor_type, metodo, timestamps_ms, valores),
+                  chamada a cada lote (ex.: ClienteMQTT.publicar_reconstrucao).
+        capacidade_fila: Lotes mantidos na fila local (0 desativa a fila).
+    """
+
+    def __init__(self, intervalo_s=INTERVALO_RECONSTRUCAO_S, publicar=None,
+                 capacidade_fila=CAPACIDADE_FILA_RECONSTRUCAO):
+        self.passo_ms = int(intervalo_s * 1000)
+        self.publicar = publicar
+        self.fila = queue.Queue(capacidade_fila) if capacidade_fila else None
+        self.lock = threading.Lock()
+        self.series = {}            # (device_id, sensor_type) -> SerieOnline
+        self.metodos = {}           # (device_id, sensor_type) -> último método declarado
+        self.lotes_emitidos = 0
+        self.pontos_emitidos = 0
+        self.lotes_descartados = 0  # fila cheia
+
+    def adicionar_lote(self, device_id, pontos):
+        """Processa (sensor_type, timestamp_ms, value, interpolation, metadata) na ordem recebida"""
+        emitidos = []
+        with self.lock:
+            for sensor_type, timestamp_ms, value, interpolation, _ in pontos:
+                try:
+                    timestamp_ms, value = int(timestamp_ms), float(value)
+                except (TypeError, ValueError):
+                    continue
+                chave = (device_id, sensor_type)
+                serie = self.series.get(chave)
+                if serie is None:
+                    serie = self.series[chave] = SerieOnline(self.passo_ms)
+                metodo = self.metodos[chave] = interpolation or 'linear'
+                lote = serie.adicionar(timestamp_ms, value, metodo)
+                if lote is not None:
+                    emitidos.append((device_id, sensor_type, metodo) + lote)
+        # Entrega fora do lock: a publicação pode demorar sem atrasar as outras séries
+        for lote in emitidos:
+            self._entregar(lote)
+
+    def descarregar(self):
+        """Emite o que está pendente em todas as séries (ao encerrar a ingestão)"""
+        with self.lock:
+            emitidos = []
+            for chave, serie in self.series.items():
+                lote = serie.descarregar(self.metodos[chave])
+                if lote is not None:
+                    emitidos.append(chave + (self.metodos[chave],) + lote)
+        for lote in emitidos:
+            self._entregar(lote)
+
+    def _entregar(self, lote):
+        # Chamado fora do lock, por várias threads de ingestão ao mesmo tempo: os contadores são
+        # atualizados sob o lock (a fila já é thread-safe)
+        with self.lock:
+            self.lotes_emitidos += 1
+            self.pontos_emitidos += len(lote[3])
+        if self.fila is not None:
+            while True:
+                try:
+                    self.fila.put_nowait(lote)
+                    break
+                except queue.Full:
+                    try:
+                        self.fila.get_nowait()      # descarta o lote mais antigo
+                    except queue.Empty:
+                        continue
+                    with self.lock:
+                        self.lotes_descartados += 1
+        if self.publicar is not None:
+            try:
+                self.publicar(*lote)
+            except Exception as e:
+                logger.error("Erro ao publicar pontos reconstruídos de %s/%s: %s", lote[0], lote[1], e)
+
+    def limpar(self):
+        with self.lock:
+            self.series = {}
+            self.metodos = {}
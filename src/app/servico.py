@@ -0,0 +1,88 @@
+"""
+Função: Serviço de ingestão compartilhado pelo processo do dashboard.
+        Uma única conexão MQTT e um único GerenciadorDados atendem todas as sessões do Streamlit;
+        as sessões apenas consultam os dados, sem abrir conexões nem duplicar o armazenamento.
+"""
+import logging
+import threading
+
+from armazenamento_disco import ArmazenamentoDisco
+from cliente_mqtt import ClienteMQTT
+from config import (CONTROLE_TAXA, DEFAULT_BROKER, DEFAULT_PORT, DIRETORIO_ARMAZENAMENTO, PUBLICAR_RECONSTRUCAO,
+                    TOPICOS_DADOS)
+from controle_taxa import ControleTaxa
+from gerenciador import GerenciadorDados
+from reconstrucao_online import ReconstrucaoOnline
+
+logger = logging.getLogger(__name__)
+
+
+class ServicoIngestao:
+    def __init__(self, broker=DEFAULT_BROKER, port=DEFAULT_PORT, topicos=None, diretorio=DIRETORIO_ARMAZENAMENTO):
+        self.lock = threading.Lock()
+        self.armazenamento = ArmazenamentoDisco(diretorio) if diretorio else None
+        # Pontos interpolados em fluxo: fila local (reconstrucao.fila) e, opcionalmente, o broker
+        self.reconstrucao = ReconstrucaoOnline(publicar=self._publicar_reconstrucao if PUBLICAR_RECONSTRUCAO else None)
+        # Taxa de transmissão recomendada a cada sensor; publicada no tópico de controle só com CONTROLE_TAXA
+        self.controle = ControleTaxa(publicar=self._publicar_controle if CONTROLE_TAXA else None)
+        self.gerenciador = GerenciadorDados(armazenamento=self.armazenamento, reconstrucao=self.reconstrucao,
+                                            controle=self.controle)
+        self.broker = broker
+        self.port = port
+        self.topicos = list(topicos) if topicos else list(TOPICOS_DADOS)
+        self.cliente = None
+
+    def iniciar(self):
+        """Conecta ao broker na primeira chamada; as seguintes apenas retornam o cliente existente"""
+        with self.lock:
+            if self.cliente is None:
+                self._conectar()
+            return self.cliente
+
+    def reconectar(self, broker, port):
+        """Troca o broker de todas as sessões, mantendo os dados já recebidos"""
+        with self.lock:
+            if self.cliente is not None:
+                self.cliente.desconectar()
+            self.broker = broker
+            self.port = port
+            self._conectar()
+            return self.cliente
+
+    def _conectar(self):
+        logger.info(f"Iniciando ingestão compartilhada em {self.broker}:{self.port}")
+        self.cliente = ClienteMQTT(self.gerenciador, self.broker, self.port, self.topicos)
+        self.cliente.conectar()
+
+    def _publicar_reconstrucao(self, *lote):
+        cliente = self.cliente
+        if cliente is not None:
+            cliente.publicar_reconstrucao(*lote)
+
+    def _publicar_controle(self, device_id, razoes):
+        cliente = self.cliente
+        if cliente is not None:
+            cliente.publicar_controle(device_id, razoes)
+
+    @property
+    def connected(self):
+        return self.cliente is not None and self.cliente.connected
+
+    @property
+    def connection_error(self):
+        return self.cliente.connection_error if self.cliente is not None else None
+
+    def limpar_dados(self):
+        self.gerenciador.limpar()
+
+    def apagar_historico(self):
+        self.gerenciador.apagar_historico()
+
+    def encerrar(self):
+        with self.lock:
+            if self.cliente is not None:
+                self.cliente.desconectar()
+            self.reconstrucao.descarregar()
+            self.cliente = None
+            if self.armazenamento is not None:
+                self.armazenamento.sincronizar()
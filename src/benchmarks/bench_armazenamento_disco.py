@@ -0,0 +1,103 @@
+"""
+Função: Benchmark do armazenamento persistente em colunas mapeadas em memória (ArmazenamentoDisco).
+        Grava um histórico longo de um dispositivo (4 sensores, amostragem a cada 10 s) pelo
+        GerenciadorDados, em lotes como os da ingestão MQTT, e mede: vazão de gravação, tempo de
+        reinício (recriar o GerenciadorDados a partir do disco) e o tempo de obter_dados_brutos
+        para a janela de 72 h, comparado à leitura completa dos arquivos seguida de filtro.
+        Com busca binária sobre os segmentos, a consulta não depende do tamanho do histórico.
+
+Uso: python benchmarks/bench_armazenamento_disco.py [dias_de_historico]   (a partir de ./src)
+"""
+import glob
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from armazenamento_disco import ArmazenamentoDisco  # noqa: E402
+from gerenciador import GerenciadorDados  # noqa: E402
+
+DIAS = 120
+INTERVALO_MS = 10_000
+PONTOS_POR_LOTE = 60  # amostras por sensor em cada lote gravado
+DEVICE_ID = 'dispositivo_001'
+SENSORES = [('temperatura', 'linear'), ('ph', 'logarithmic'), ('ec', 'polynomial'), ('od', 'polynomial')]
+HORAS = 72
+
+
+def gerar_lotes(n, t0):
+    ts = t0 + INTERVALO_MS * np.arange(n, dtype=np.int64)
+    rng = np.random.default_rng(0)
+    valores = 20 + np.cumsum(rng.normal(0, 0.05, (n, len(SENSORES))), axis=0)
+    for i in range(0, n, PONTOS_POR_LOTE):
+        yield [(sensor, int(ts[k]), float(valores[k, j]), interp, {'unit': 'u'})
+               for k in range(i, min(i + PONTOS_POR_LOTE, n)) for j, (sensor, interp) in enumerate(SENSORES)]
+
+
+def leitura_completa(diretorio, desde_ms):
+    """Referência: lê todos os segmentos do sensor e filtra a janela"""
+    ts = np.concatenate([np.fromfile(c, dtype=np.int64) for c in sorted(glob.glob(os.path.join(diretorio, '*.ts')))])
+    vals = np.concatenate([np.fromfile(c, dtype=np.float32) for c in sorted(glob.glob(os.path.join(diretorio, '*.val')))])
+    mascara = (ts >= desde_ms) & (ts < np.iinfo(np.int64).max)
+    return ts[mascara], vals[mascara].astype(np.float64)
+
+
+def medir(funcao, repeticoes=20):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else DIAS
+    n = dias * 86_400_000 // INTERVALO_MS
+    agora_ms = int(time.time() * 1000)
+    t0 = agora_ms - (n - 1) * INTERVALO_MS
+
+    with tempfile.TemporaryDirectory() as raiz:
+        gerenciador = GerenciadorDados(armazenamento=ArmazenamentoDisco(raiz))
+        inicio = time.perf_counter()
+        for lote in gerar_lotes(n, t0):
+            gerenciador.adicionar_lote(DEVICE_ID, lote)
+        gravacao = time.perf_counter() - inicio
+        gerenciador.armazenamento.sincronizar()
+        tamanho_mb = sum(os.path.getsize(c) for c in glob.glob(os.path.join(raiz, '**', '*.*'), recursive=True)) / 1e6
+
+        reinicio = float('inf')
+        for _ in range(5):
+            inicio = time.perf_counter()
+            reaberto = GerenciadorDados(armazenamento=ArmazenamentoDisco(raiz))
+            reinicio = min(reinicio, time.perf_counter() - inicio)
+
+        sensor = SENSORES[1][0]
+        df, consulta = medir(lambda: reaberto.obter_dados_brutos(DEVICE_ID, sensor, horas=HORAS))
+        desde_ms = agora_ms - HORAS * 3_600_000
+        serie = reaberto.armazenamento.serie(DEVICE_ID, sensor)
+        (ts, vals), leitura_mmap = medir(lambda: serie.ler(desde_ms))
+        (ts_ref, vals_ref), leitura_ref = medir(lambda: leitura_completa(serie.diretorio, desde_ms), repeticoes=3)
+        em_memoria = len(reaberto._dispositivo(DEVICE_ID).copiar_serie(sensor, desde_ms)[0])
+
+        print("=" * 78)
+        print(f"ARMAZENAMENTO EM DISCO: {dias} dias x {len(SENSORES)} sensores a cada {INTERVALO_MS // 1000} s "
+              f"({n:,} pontos por sensor, {tamanho_mb:.0f} MB)")
+        print("=" * 78)
+        print(f"Gravação pelo GerenciadorDados:        {n * len(SENSORES) / gravacao:>12,.0f} pontos/s")
+        print(f"Reinício (recarregar do disco):        {reinicio * 1000:>12.1f} ms")
+        print(f"Janela de {HORAS} h: obter_dados_brutos    {consulta * 1000:>12.2f} ms ({len(df):,} pontos)")
+        print(f"           busca binária no mmap       {leitura_mmap * 1000:>12.2f} ms")
+        print(f"           leitura completa + filtro   {leitura_ref * 1000:>12.2f} ms "
+              f"({leitura_ref / leitura_mmap:.0f}x mais lento)")
+        print(f"Pontos da janela no buffer em memória: {em_memoria:>12,} (antes: limite do dashboard)")
+        print(f"Íntegro: {np.array_equal(ts, ts_ref) and np.array_equal(vals, vals_ref)}")
+
+
+if __name__ == "__main__":
+    main()
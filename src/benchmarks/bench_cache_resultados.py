@@ -0,0 +1,64 @@
+"""
+Função: Benchmark do cache de resultados (cfe_hydro.cache) na varredura de simulações
+        (cfe_hydro.varredura). Gera datasets sintéticos no formato de data/dataset_cfe-hydro.csv,
+        executa a mesma varredura sem cache, com o cache vazio e com o cache preenchido, e
+        verifica que as três produzem o mesmo CSV. Em seguida, repete a varredura com um limite de
+        tamanho menor que o necessário e reporta o tamanho final do diretório (despejo LRU).
+
+Uso: python benchmarks/bench_cache_resultados.py [n_dispositivos] [intervalo_maximo]   (a partir de ./src)
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bench_varredura import gerar_datasets  # noqa: E402  (mesmo diretório deste script)
+from cfe_hydro.cache import CacheResultados  # noqa: E402
+from cfe_hydro.varredura import executar_varredura  # noqa: E402
+
+N_DISPOSITIVOS = 4
+INTERVALO_MAXIMO = 100
+LIMITE_REDUZIDO = 256 * 1024  # bytes, para forçar o despejo
+
+
+def main():
+    n_dispositivos = int(sys.argv[1]) if len(sys.argv) > 1 else N_DISPOSITIVOS
+    intervalo_maximo = int(sys.argv[2]) if len(sys.argv) > 2 else INTERVALO_MAXIMO
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = gerar_datasets(diretorio, n_dispositivos, np.random.default_rng(3))
+        intervalos = range(1, intervalo_maximo + 1)
+        cache = CacheResultados(os.path.join(diretorio, 'cache'))
+
+        print("=" * 72)
+        print(f"CACHE DE RESULTADOS: varredura de {n_dispositivos} dispositivos, intervalos 1-{intervalo_maximo}, "
+              f"{len(pd.read_csv(caminhos[0], sep=';'))} amostras cada")
+        print("=" * 72)
+        print(f"{'execução':<16} | {'tempo (s)':>9} | {'do cache':>8} | {'cache (KiB)':>11}")
+        referencia = None
+        for nome, usar in [('sem cache', False), ('cache vazio', True), ('cache preenchido', True)]:
+            saida = os.path.join(diretorio, f'resultados_{len(nome)}.csv')
+            acertos = cache.acertos
+            inicio = time.perf_counter()
+            total = executar_varredura(caminhos, intervalos, arquivo=saida, cache=cache if usar else None)
+            duracao = time.perf_counter() - inicio
+            resultado = pd.read_csv(saida)
+            if referencia is None:
+                referencia = resultado
+            elif not resultado.equals(referencia):
+                print("  resultados divergentes entre execuções!")
+            do_cache = f"{cache.acertos - acertos}/{total}" if usar else '-'
+            print(f"{nome:<16} | {duracao:>9.2f} | {do_cache:>8} | {cache.tamanho_bytes() / 1024:>11.0f}")
+
+        reduzido = CacheResultados(os.path.join(diretorio, 'cache_reduzido'), limite_bytes=LIMITE_REDUZIDO)
+        executar_varredura(caminhos, intervalos, arquivo=os.path.join(diretorio, 'reduzido.csv'), cache=reduzido)
+        print(f"\nLimite de {LIMITE_REDUZIDO // 1024} KiB: {reduzido.tamanho_bytes() / 1024:.0f} KiB no diretório "
+              f"após {total} gravações (entradas menos recentes removidas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Função: Benchmark da recepção de mensagens no ClienteMQTT (mensagens/s).
+        Compara o caminho anterior (decode UTF-8 + json.loads + strptime/pytz + log INFO por
+        mensagem e por ponto) com o caminho atual (orjson opcional, parser de timestamp de
+        layout fixo e log agregado), sobre payloads no formato gerado por CFEHydro::buildJson.
+
+Uso: python benchmarks/bench_decodificacao.py [n_mensagens]   (a partir de ./src)
+"""
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from cfe_hydro.codec import ORJSON_AVAILABLE  # noqa: E402
+from cliente_mqtt import ClienteMQTT  # noqa: E402
+
+N_MENSAGENS = 20000
+SENSORES = [
+    ("temperatura", "°C", "Temperatura", 18.0, 30.0, "linear"),
+    ("ph", "pH", "Nível de pH", 5.5, 7.0, "logarithmic"),
+    ("ec", "mS/cm", "EC", 0.0, 5.0, "polynomial"),
+    ("od", "mg/L", "OD", 0.0, 6.0, "polynomial"),
+]
+logger = logging.getLogger("bench_antigo")
+
+
+class GerenciadorNulo:
+    """Descarta os pontos: o benchmark mede apenas a decodificação"""
+
+    def adicionar_ponto(self, device_id, sensor_type, timestamp_ms, value, interpolation, metadata):
+        # O caminho anterior registrava um log INFO por ponto em adicionar_ponto
+        if self.log_por_ponto:
+            logger.info(f"✅ Ponto adicionado: {sensor_type} = {value:.3f} em {timestamp_ms}")
+
+    def adicionar_lote(self, device_id, pontos):
+        pass
+
+
+def gerar_payloads(n):
+    """Payloads no layout de CFEHydro::buildJson (src/protocolo/cfe-hydro.h)"""
+    inicio = datetime(2026, 2, 27, 16, 15, 0)
+    payloads = []
+    for i in range(n):
+        ts = (inicio + timedelta(seconds=60 * i, milliseconds=i % 1000)).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        doc = {
+            "device_id": "dispositivo_001",
+            "transmission_timestamp": ts,
+            "sampling_interval": 10,
+            "transmission_interval": 60,
+            "readings": [
+                {"sensor_type": tipo, "value": round(20 + (i % 50) * 0.01 + k, 2), "interpolation": interp,
+                 "metadata": {"unit": unid, "description": desc, "optimal_min": omin, "optimal_max": omax}}
+                for k, (tipo, unid, desc, omin, omax, interp) in enumerate(SENSORES)
+            ],
+            "system": {"free_heap": 214363, "wifi_rssi": -31, "uptime": 3600 + 60 * i},
+        }
+        payloads.append(SimpleNamespace(topic="cfe-hydro/data", payload=json.dumps(doc).encode('utf-8')))
+    return payloads
+
+
+def on_message_antigo(gerenciador, msg):
+    """Reprodução do ClienteMQTT._on_message anterior (sem a gravação dos pontos)"""
+    payload = msg.payload.decode('utf-8')
+    logger.info(f"Mensagem recebida no tópico {msg.topic}")
+    logger.debug(f"Payload: {payload[:200]}...")
+    data = json.loads(payload)
+    ts_str = data.get('transmission_timestamp')
+    dt = datetime.strptime(ts_str, '%Y-%m-%d %H:%M:%S.%f')
+    timestamp_ms = int(pytz.UTC.localize(dt).timestamp() * 1000)
+    for r in data['readings']:
+        gerenciador.adicionar_ponto(data.get('device_id'), r.get('sensor_type'), timestamp_ms,
+                                    r.get('value'), r.get('interpolation', 'linear'), r.get('metadata', {}))
+
+
+def medir(funcao, payloads):
+    inicio = time.perf_counter()
+    for msg in payloads:
+        funcao(msg)
+    return len(payloads) / (time.perf_counter() - inicio)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_MENSAGENS
+    # Logs vão para /dev/null em nível INFO, como no dashboard (o custo de formatação é medido)
+    logging.basicConfig(level=logging.INFO, stream=open(os.devnull, 'w'),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    payloads = gerar_payloads(n)
+    tamanho_medio = sum(len(m.payload) for m in payloads) / n
+
+    nulo = GerenciadorNulo()
+    nulo.log_por_ponto = True
+    antes = medir(lambda m: on_message_antigo(nulo, m), payloads)
+
+    nulo_atual = GerenciadorNulo()
+    nulo_atual.log_por_ponto = False
+    cliente = ClienteMQTT(nulo_atual, 'localhost', 1883)
+    inicio = time.perf_counter()
+    for msg in payloads:
+        cliente._on_message(None, None, msg)
+    cliente.fila.drenar()  # decodificação em lotes, fora da thread do paho
+    depois = n / (time.perf_counter() - inicio)
+
+    print("=" * 60)
+    print("BENCHMARK DE DECODIFICAÇÃO DE MENSAGENS")
+    print("=" * 60)
+    print(f"Mensagens: {n} ({tamanho_medio:.0f} bytes em média, {len(SENSORES)} leituras cada)")
+    print(f"orjson disponível: {'sim' if ORJSON_AVAILABLE else 'não'}")
+    print(f"Antes : {antes:>10,.0f} mensagens/s")
+    print(f"Depois: {depois:>10,.0f} mensagens/s  ({depois / antes:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
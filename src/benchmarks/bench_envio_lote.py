@@ -0,0 +1,130 @@
+"""
+Função: Benchmark do envio em lote (K amostras por transmissão) contra o envio de um instantâneo por mensagem.
+        As amostras de data/dataset_cfe-hydro.csv são agrupadas em lotes de K, codificadas como
+        CFEHydro::buildJson (campo "samples") e CFEHydro::buildBinaryBatch, e ingeridas pelo
+        ClienteMQTT. Mede bytes por amostra (com cabeçalho MQTT), mensagens por hora e vazão de
+        ingestão, e confere que cada amostra chega como um ponto com o seu próprio timestamp.
+
+Uso: python benchmarks/bench_envio_lote.py   (a partir de ./src)
+"""
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from cfe_hydro.codec import EsquemaBinario, codificar_binario  # noqa: E402
+from cliente_mqtt import ClienteMQTT  # noqa: E402
+from gerenciador import GerenciadorDados  # noqa: E402
+
+DATASET = os.path.join('data', 'dataset_cfe-hydro.csv')
+DEVICE_ID = 'dispositivo_001'
+TAMANHOS_LOTE = [1, 3, 6, 12]
+REPETICOES = 20  # o dataset é curto: repete a série (deslocada no tempo) para medir a vazão
+SENSORES = [
+    {'sensor_type': 'temperatura', 'interpolation': 'linear',
+     'metadata': {'unit': '°C', 'description': 'Temperatura', 'optimal_min': 18.0, 'optimal_max': 30.0}},
+    {'sensor_type': 'ph', 'interpolation': 'logarithmic',
+     'metadata': {'unit': 'pH', 'description': 'Nível de pH', 'optimal_min': 5.5, 'optimal_max': 7.0}},
+    {'sensor_type': 'ec', 'interpolation': 'polynomial', 'scale': 0.001,
+     'metadata': {'unit': 'mS/cm', 'description': 'EC', 'optimal_min': 0.0, 'optimal_max': 5.0}},
+    {'sensor_type': 'od', 'interpolation': 'polynomial',
+     'metadata': {'unit': 'mg/L', 'description': 'OD', 'optimal_min': 0.0, 'optimal_max': 6.0}},
+]
+
+
+def bytes_publish(topico, payload):
+    """Tamanho do pacote MQTT PUBLISH com QoS 0: cabeçalho fixo + tópico + payload"""
+    restante = 2 + len(topico.encode('utf-8')) + len(payload)
+    return 1 + (1 if restante < 128 else 2 if restante < 16384 else 3) + restante
+
+
+def payload_json_lote(epochs, valores):
+    """CFEHydro::buildJson no modo em lote: timestamp do envio = última amostra"""
+    envio = int(epochs[-1])
+    doc = {
+        'device_id': DEVICE_ID,
+        'transmission_timestamp': pd.Timestamp(envio, unit='ms').strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+        'sampling_interval': 300,
+        'transmission_interval': 300 * len(epochs),
+        'readings': [
+            {'sensor_type': s['sensor_type'], 'value': float(valores[-1, i]), 'interpolation': s['interpolation'],
+             'metadata': s['metadata'],
+             'samples': [[int(t) - envio, float(v)] for t, v in zip(epochs, valores[:, i])]}
+            for i, s in enumerate(SENSORES)
+        ],
+        'system': {'free_heap': 214363, 'wifi_rssi': -31, 'uptime': 3600},
+    }
+    return json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def payload_binario_lote(esquema, epochs, valores):
+    base = int(epochs[0])
+    return codificar_binario(esquema, base, [(i, int(t) - base, float(valores[k, i]))
+                                             for k, t in enumerate(epochs) for i in range(len(SENSORES))])
+
+
+def ingerir(topico, mensagens, capacidade, esquema_json=None, execucoes=5):
+    """Ingere as mensagens num GerenciadorDados novo a cada execução; retorna o último e o melhor tempo"""
+    melhor = float('inf')
+    for _ in range(execucoes):
+        gerenciador = GerenciadorDados(capacidade=capacidade)
+        cliente = ClienteMQTT(gerenciador, 'localhost', 1883)
+        if esquema_json is not None:
+            cliente._registrar_esquema(f'cfe-hydro/{DEVICE_ID}/schema', esquema_json)
+        agora = int(time.time() * 1000)
+        itens = [(topico, m, agora) for m in mensagens]
+        inicio = time.perf_counter()
+        cliente._processar_lote(itens)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return gerenciador, melhor
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    df = pd.read_csv(DATASET, sep=';', decimal='.')
+    epochs0 = (pd.to_datetime(df['timestamp'], format='%d/%m/%Y %H:%M').astype('datetime64[ms]')
+               .astype('int64').to_numpy())
+    duracao_serie = epochs0[-1] - epochs0[0] + (epochs0[1] - epochs0[0])
+    epochs = np.concatenate([epochs0 + r * duracao_serie for r in range(REPETICOES)])
+    valores = np.tile(df[[s['sensor_type'] for s in SENSORES]].to_numpy(dtype=float), (REPETICOES, 1))
+    n_amostras = len(epochs)
+    intervalo_s = (epochs0[1] - epochs0[0]) / 1000
+    esquema = EsquemaBinario(SENSORES, device_id=DEVICE_ID, sampling_interval=int(intervalo_s))
+    esquema_json = esquema.para_json()
+
+    print("=" * 86)
+    print(f"ENVIO EM LOTE: {n_amostras} amostras x {len(SENSORES)} sensores, amostragem a cada {intervalo_s:.0f} s")
+    print("=" * 86)
+    print(f"{'formato':<8} | {'K':>3} | {'msgs/h':>7} | {'B/amostra c/ MQTT':>17} | {'ingestão pontos/s':>17} | íntegro")
+    for formato in ('json', 'binário'):
+        for k in TAMANHOS_LOTE:
+            lotes = [slice(i, min(i + k, n_amostras)) for i in range(0, n_amostras, k)]
+            if formato == 'json':
+                topico = 'cfe-hydro/data'
+                mensagens = [payload_json_lote(epochs[s], valores[s]) for s in lotes]
+                gerenciador, duracao = ingerir(topico, mensagens, n_amostras)
+            else:
+                topico = f'cfe-hydro/{DEVICE_ID}/bin'
+                mensagens = [payload_binario_lote(esquema, epochs[s], valores[s]) for s in lotes]
+                gerenciador, duracao = ingerir(topico, mensagens, n_amostras, esquema_json)
+            total = sum(bytes_publish(topico, m) for m in mensagens)
+            pontos = n_amostras * len(SENSORES)
+
+            # Cada amostra deve virar um ponto com o timestamp original
+            integro = gerenciador.messages_received == pontos
+            disp = gerenciador._dispositivo(DEVICE_ID)
+            for i, s in enumerate(SENSORES):
+                ts, vals = disp.copiar_serie(s['sensor_type'])
+                integro &= np.array_equal(ts, epochs) and np.allclose(vals, valores[:, i], atol=s.get('scale', 0.01))
+            print(f"{formato:<8} | {k:>3} | {3600 / (intervalo_s * k):>7.1f} | {total / n_amostras:>17.1f} | "
+                  f"{pontos / duracao:>17,.0f} | {integro}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Função: Benchmark da ingestão em lotes sob carga em rajadas.
+        Rajadas de mensagens são entregues ao callback MQTT enquanto threads "dashboard" consultam
+        os mesmos dispositivos. Compara a gravação direta no callback (um lock por leitura, como
+        antes da FilaIngestao) com a fila + consumidor em lotes, medindo a vazão de ponta a ponta
+        e o tempo em que a thread de rede fica ocupada em cada callback.
+
+Uso: python benchmarks/bench_ingestao_lotes.py [n_rajadas] [mensagens_por_rajada]   (a partir de ./src)
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from cfe_hydro.codec import decodificar_json, timestamp_para_ms  # noqa: E402
+from cliente_mqtt import ClienteMQTT  # noqa: E402
+from gerenciador import GerenciadorDados  # noqa: E402
+
+N_RAJADAS = 20
+MENSAGENS_POR_RAJADA = 2000
+N_DISPOSITIVOS = 20
+N_LEITORES = 4
+PAUSA_ENTRE_RAJADAS = 0.05  # s
+SENSORES = [
+    ('temperatura', 'linear', '°C'),
+    ('ph', 'logarithmic', 'pH'),
+    ('ec', 'polynomial', 'mS/cm'),
+    ('od', 'polynomial', 'mg/L'),
+]
+
+
+def gerar_rajadas(n_rajadas, por_rajada, t0):
+    rajadas = []
+    for r in range(n_rajadas):
+        rajada = []
+        for m in range(por_rajada):
+            i = r * por_rajada + m
+            device_id = f'estufa_{i % N_DISPOSITIVOS:03d}'
+            ts = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(t0 + i)) + '.000'
+            payload = {
+                'device_id': device_id,
+                'transmission_timestamp': ts,
+                'readings': [
+                    {'sensor_type': nome, 'value': 20 + s + (i % 100) * 0.01, 'interpolation': interp,
+                     'metadata': {'unit': unidade}}
+                    for s, (nome, interp, unidade) in enumerate(SENSORES)
+                ]
+            }
+            rajada.append(SimpleNamespace(topic=f'cfe-hydro/{device_id}/data',
+                                          payload=json.dumps(payload).encode('utf-8')))
+        rajadas.append(rajada)
+    return rajadas
+
+
+def callback_direto(gerenciador):
+    """Callback anterior à fila: decodifica e grava leitura a leitura na própria thread de rede"""
+    def on_message(client, userdata, msg):
+        data = decodificar_json(msg.payload)
+        timestamp_ms = timestamp_para_ms(data['transmission_timestamp'])
+        for r in data['readings']:
+            gerenciador.adicionar_ponto(data['device_id'], r['sensor_type'], timestamp_ms,
+                                        r['value'], r.get('interpolation', 'linear'), r.get('metadata', {}))
+    return on_message
+
+
+def leitor(gerenciador, parar):
+    while not parar.is_set():
+        dispositivos = gerenciador.lista_dispositivos()
+        if not dispositivos:
+            time.sleep(0.001)
+            continue
+        device_id = random.choice(dispositivos)
+        sensor = random.choice(SENSORES)[0]
+        gerenciador.obter_dados_brutos(device_id, sensor, horas=24 * 365)
+        gerenciador.obter_dados_interpolados(device_id, sensor, 20)
+
+
+def executar(nome, rajadas, em_lotes):
+    gerenciador = GerenciadorDados()
+    cliente = ClienteMQTT(gerenciador, 'localhost', 1883)
+    on_message = cliente._on_message if em_lotes else callback_direto(gerenciador)
+    if em_lotes:
+        cliente.fila.iniciar()
+
+    parar = threading.Event()
+    leitores = [threading.Thread(target=leitor, args=(gerenciador, parar), daemon=True) for _ in range(N_LEITORES)]
+    for t in leitores:
+        t.start()
+
+    tempos_callback = []
+    inicio = time.perf_counter()
+    for rajada in rajadas:
+        for msg in rajada:
+            t = time.perf_counter()
+            on_message(None, None, msg)
+            tempos_callback.append(time.perf_counter() - t)
+        time.sleep(PAUSA_ENTRE_RAJADAS)
+    if em_lotes:
+        cliente.fila.parar()
+    duracao = time.perf_counter() - inicio - PAUSA_ENTRE_RAJADAS * len(rajadas)
+    parar.set()
+    for t in leitores:
+        t.join()
+
+    tempos_us = np.array(tempos_callback) * 1e6
+    total_pontos = sum(len(r) for r in rajadas) * len(SENSORES)
+    print(f"{nome:<8} | {total_pontos / duracao:>12,.0f} | {np.mean(tempos_us):>11.1f} | "
+          f"{np.percentile(tempos_us, 99):>11.1f} | {np.max(tempos_us):>11.0f} | "
+          f"{gerenciador.messages_received == total_pontos}")
+
+
+def main():
+    n_rajadas = int(sys.argv[1]) if len(sys.argv) > 1 else N_RAJADAS
+    por_rajada = int(sys.argv[2]) if len(sys.argv) > 2 else MENSAGENS_POR_RAJADA
+    logging.basicConfig(level=logging.WARNING)
+    rajadas = gerar_rajadas(n_rajadas, por_rajada, time.time() - n_rajadas * por_rajada)
+
+    print("=" * 78)
+    print(f"INGESTÃO EM RAJADAS: {n_rajadas} x {por_rajada} mensagens, {N_DISPOSITIVOS} dispositivos, "
+          f"{N_LEITORES} leitores")
+    print("=" * 78)
+    print(f"{'modo':<8} | {'pontos/s':>12} | {'cb médio µs':>11} | {'cb p99 µs':>11} | {'cb máx µs':>11} | completo")
+    executar("direto", rajadas, em_lotes=False)
+    executar("lotes", rajadas, em_lotes=True)
+
+
+if __name__ == "__main__":
+    main()
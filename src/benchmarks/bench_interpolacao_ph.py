@@ -0,0 +1,100 @@
+"""
+Função: Benchmark da interpolação logarítmica do pH (cfe_hydro.interpolacao.interpolar_ph), agora
+        a mesma no dashboard e nos scripts. Compara, em pH sintético com correções ácidas e
+        básicas amostrado em tempos irregulares e transmitido 1 a cada N amostras:
+            - o erro da interpolação no espaço [H+], da linear no pH e do método que o dashboard
+              usava (log do eixo de tempo, sem relação com a química do pH);
+            - o tempo da versão vetorizada contra o laço por leitura dos scripts.
+
+Uso: python benchmarks/bench_interpolacao_ph.py   (a partir de ./src)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.interpolacao import interpolar_ph  # noqa: E402
+from cfe_hydro.metricas import calcular_metricas  # noqa: E402
+
+HORAS = 48
+AMOSTRAGEM_S = 10
+INTERVALOS = [6, 12, 30, 60]
+N_LACO = 10_000  # leituras medidas no laço (a versão anterior leva ~10 µs por leitura)
+
+
+def ph_sintetico(rng):
+    # Tempos irregulares (jitter de até 3 s) e correções de pH por mistura de soluções: a
+    # concentração [H+] varia linearmente durante a mistura, o pH não
+    t = np.cumsum(rng.uniform(AMOSTRAGEM_S - 3, AMOSTRAGEM_S + 3, HORAS * 3600 // AMOSTRAGEM_S)) * 1000
+    concentracao = np.full(len(t), 10.0 ** -6.5)
+    for inicio in np.cumsum(rng.uniform(3, 6, HORAS // 3) * 3_600_000):
+        alvo = 10.0 ** -rng.uniform(5.0, 7.5)
+        mistura = rng.uniform(1800, 7200) * 1000
+        fracao = np.clip((t - inicio) / mistura, 0, 1)
+        concentracao = np.where(t >= inicio, concentracao + fracao * (alvo - concentracao), concentracao)
+    return t, -np.log10(concentracao) + rng.normal(0, 0.005, len(t))
+
+
+def log_tempo(xk, yk, x):
+    """Método logarítmico anterior do dashboard: interpolação sobre log(t - t0 + 1)"""
+    return np.clip(np.interp(np.log(x - xk.min() + 1), np.log(xk - xk.min() + 1), yk), 0, 14)
+
+
+def laco(ph, espacamento):
+    """Versão anterior dos scripts: uma leitura por iteração"""
+    n = len(ph)
+    resultado = np.zeros(n)
+    for i in range(n):
+        if i % espacamento == 0:
+            resultado[i] = ph[i]
+        else:
+            anterior = i - (i % espacamento)
+            proximo = anterior + espacamento
+            if proximo >= n:
+                resultado[i] = ph[anterior]
+            else:
+                h_anterior, h_proximo = 10 ** (-ph[anterior]), 10 ** (-ph[proximo])
+                fator = (i - anterior) / espacamento
+                resultado[i] = -np.log10(h_anterior + fator * (h_proximo - h_anterior))
+    return resultado
+
+
+def medir(funcao, repeticoes=5):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+def main():
+    rng = np.random.default_rng(3)
+    t, ph = ph_sintetico(rng)
+
+    print("=" * 78)
+    print(f"INTERPOLAÇÃO DO pH: {HORAS} h a cada ~{AMOSTRAGEM_S} s (tempos irregulares), {len(t):,} leituras")
+    print("=" * 78)
+    print(f"{'N':>3} | {'método':<14} | {'RMSE':>7} | {'MAE':>7} | {'erro máx.':>9} | {'tempo (ms)':>10}")
+    for n in INTERVALOS:
+        xk, yk = t[::n], ph[::n]
+        metodos = [('[H+]', lambda: interpolar_ph(xk, yk, t)),
+                   ('linear no pH', lambda: np.interp(t, xk, yk)),
+                   ('log do tempo', lambda: log_tempo(xk, yk, t))]
+        resultados = [medir(funcao) for _, funcao in metodos]
+        erros = calcular_metricas(ph, np.vstack([r for r, _ in resultados]))
+        for i, ((nome, _), (_, duracao)) in enumerate(zip(metodos, resultados)):
+            print(f"{n:>3} | {nome:<14} | {erros['rmse'][i]:>7.4f} | {erros['mae'][i]:>7.4f} | "
+                  f"{erros['erro_max'][i]:>9.4f} | {duracao * 1000:>10.2f}")
+
+    ids = np.arange(N_LACO)
+    esperado, t_laco = medir(lambda: laco(ph[:N_LACO], 5), repeticoes=1)
+    obtido, t_vetor = medir(lambda: interpolar_ph(ids[::5], ph[:N_LACO:5], ids))
+    print(f"\nScripts ({N_LACO:,} leituras, 1 a cada 5): laço {t_laco * 1000:.1f} ms, vetorizado "
+          f"{t_vetor * 1000:.2f} ms ({t_laco / t_vetor:.0f}x); maior diferença {np.abs(esperado - obtido).max():.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Função: Benchmark da interpolação sigmoidal (cfe_hydro.interpolacao.interpolar_sigmoidal) contra a
+        linear em respostas sintéticas a dosagens de nutrientes: EC com consumo lento, degraus
+        logísticos a cada dosagem (mistura em 3 a 10 min) e ruído de medição, amostrada a cada
+        10 s e transmitida 1 a cada N amostras. Mede o erro (série inteira e só nas transições)
+        e o tempo de reconstrução, sem cache, com cache vazio e com o cache já preenchido
+        (refresh do dashboard).
+
+Uso: python benchmarks/bench_interpolacao_sigmoidal.py   (a partir de ./src)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.interpolacao import CacheAjustes, interpolar_sigmoidal  # noqa: E402
+from cfe_hydro.metricas import calcular_metricas  # noqa: E402
+
+HORAS = 48
+AMOSTRAGEM_S = 10
+INTERVALOS = [6, 12, 30, 60]    # 1 amostra transmitida a cada N (1, 2, 5 e 10 min)
+JANELA_TRANSICAO_S = 1800       # erro "nas transições": até 30 min de cada dosagem
+
+
+def resposta_dosagens(rng):
+    t = np.arange(0, HORAS * 3600, AMOSTRAGEM_S, dtype=np.float64)
+    ec = 1.2 - 0.02 * t / 3600                      # consumo pelas plantas (mS/cm por hora)
+    dosagens = np.cumsum(rng.uniform(4, 8, HORAS // 4) * 3600)
+    dosagens = dosagens[dosagens < t[-1] - 3600]
+    for inicio in dosagens:
+        mistura = rng.uniform(180, 600)             # tempo de mistura (s)
+        ec += rng.uniform(0.3, 0.6) * 0.5 * (1 + np.tanh((t - inicio - 2 * mistura) / (mistura / 3)))
+    return t * 1000, ec + rng.normal(0, 0.005, len(t)), dosagens * 1000
+
+
+def medir(funcao, repeticoes=5):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+def main():
+    rng = np.random.default_rng(7)
+    t, ec, dosagens = resposta_dosagens(rng)
+    transicao = (np.abs(t[:, None] - dosagens[None, :]) <= JANELA_TRANSICAO_S * 1000).any(axis=1)
+
+    print("=" * 100)
+    print(f"INTERPOLAÇÃO SIGMOIDAL x LINEAR: {HORAS} h de EC a cada {AMOSTRAGEM_S} s, {len(dosagens)} dosagens")
+    print("=" * 100)
+    print(f"{'N':>3} | {'método':<9} | {'RMSE':>7} | {'MAE':>7} | {'erro máx.':>9} | {'RMSE transições':>15} | "
+          f"{'tempo (ms)':>10} | {'c/ cache (ms)':>13}")
+    for n in INTERVALOS:
+        xk, yk = t[::n], ec[::n]
+        linear, t_linear = medir(lambda: np.interp(t, xk, yk))
+        sigmoidal, t_sigmoidal = medir(lambda: interpolar_sigmoidal(xk, yk, t), repeticoes=3)
+        cache = CacheAjustes(capacidade=len(xk))
+        interpolar_sigmoidal(xk, yk, t, cache=cache)
+        _, t_cache = medir(lambda: interpolar_sigmoidal(xk, yk, t, cache=cache))
+
+        resultado = calcular_metricas(ec, np.vstack([linear, sigmoidal]))
+        nas_transicoes = calcular_metricas(ec[transicao], np.vstack([linear, sigmoidal])[:, transicao])
+        for i, (nome, duracao, com_cache) in enumerate([('linear', t_linear, None),
+                                                        ('sigmoidal', t_sigmoidal, t_cache)]):
+            cache_txt = f"{com_cache * 1000:>13.2f}" if com_cache is not None else f"{'-':>13}"
+            print(f"{n:>3} | {nome:<9} | {resultado['rmse'][i]:>7.4f} | {resultado['mae'][i]:>7.4f} | "
+                  f"{resultado['erro_max'][i]:>9.4f} | {nas_transicoes['rmse'][i]:>15.4f} | "
+                  f"{duracao * 1000:>10.2f} | {cache_txt}")
+    print(f"\nSegmentos por reconstrução: {len(t) // INTERVALOS[0]} (N={INTERVALOS[0]}) a "
+          f"{len(t) // INTERVALOS[-1]} (N={INTERVALOS[-1]}); o cache evita o ajuste de janelas já vistas.")
+
+
+if __name__ == "__main__":
+    main()
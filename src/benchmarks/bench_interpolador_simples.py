@@ -0,0 +1,163 @@
+"""
+Função: Benchmark do SimpleInterpolator vetorizado (Analise_estatistica_dados_sensoriados.py) contra a
+        implementação anterior em laços Python.
+        Confere que os resultados são idênticos nas simulações de intervalo do dataset
+        data/dataset_cfe-hydro.csv e mede o ganho numa série sintética de um milhão de amostras,
+        contra a meta de META_GANHO (100x) do pedido.
+
+A meta NÃO é atingida com linear e max_gap=8 (20-40x; só max_gap=2, quase sem nada a preencher,
+passa de 100x) e o benchmark termina com status 1 enquanto isso. A coluna "np.interp" mede o teto
+de uma passada única de np.interp sobre as lacunas (lacunas longas anuladas por nós NaN), que
+dispensa a igualdade bit a bit: mesmo ela fica em 75-90x, porque o próprio np.interp custa ~6,5 ms
+no milhão de amostras (a versão em laços, ~0,65 s). A meta pede um laço compilado (Numba ou
+extensão em C), fora das dependências do projeto, ou uma revisão da meta.
+
+Uso: python benchmarks/bench_interpolador_simples.py [n_amostras]   (a partir de ./src)
+"""
+import contextlib
+import io
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Analise_estatistica_dados_sensoriados import AnalisadorInterpolacaoCorrigido, SimpleInterpolator  # noqa: E402
+
+DATASET = os.path.join('data', 'dataset_cfe-hydro.csv')
+N_AMOSTRAS = 1_000_000
+INTERVALO_SINTETICO = 4
+INTERVALOS = range(1, 11)
+META_GANHO = 100
+
+
+class InterpoladorLacos:
+    """Implementação anterior do SimpleInterpolator, mantida como referência"""
+
+    @staticmethod
+    def linear_interpolation(ids, values):
+        ids = [float(x) for x in ids]
+        values = [float(x) if x is not None and str(x).replace(',', '').replace('.', '').isdigit() else float('nan')
+                  for x in values]
+        result = values.copy()
+        known_indices = [i for i, val in enumerate(values) if not math.isnan(val)]
+        for i in range(len(known_indices) - 1):
+            start_idx = known_indices[i]
+            end_idx = known_indices[i + 1]
+            if end_idx - start_idx > 1:
+                start_id, end_id = ids[start_idx], ids[end_idx]
+                start_val, end_val = values[start_idx], values[end_idx]
+                for j in range(start_idx + 1, end_idx):
+                    factor = (ids[j] - start_id) / (end_id - start_id)
+                    result[j] = start_val + (end_val - start_val) * factor
+        return result
+
+    @staticmethod
+    def conservative_interpolation(ids, values, max_gap=2):
+        ids = [float(x) for x in ids]
+        values = [float(x) if x is not None and str(x).replace(',', '').replace('.', '').isdigit() else float('nan')
+                  for x in values]
+        result = values.copy()
+        known_indices = [i for i, val in enumerate(values) if not math.isnan(val)]
+        for i in range(len(known_indices) - 1):
+            start_idx = known_indices[i]
+            end_idx = known_indices[i + 1]
+            gap_size = end_idx - start_idx
+            if 1 < gap_size <= max_gap:
+                start_id, end_id = ids[start_idx], ids[end_idx]
+                start_val, end_val = values[start_idx], values[end_idx]
+                for j in range(start_idx + 1, end_idx):
+                    factor = (ids[j] - start_id) / (end_id - start_id)
+                    result[j] = start_val + (end_val - start_val) * factor
+        return result
+
+
+def np_interp_lacunas(ids, valores, max_gap=None):
+    """Uma passada de np.interp; lacunas maiores que max_gap ficam NaN por nós NaN nas suas bordas"""
+    conhecido = ~np.isnan(valores)
+    nos = np.flatnonzero(conhecido)
+    if max_gap is not None:
+        longas = np.flatnonzero(np.diff(nos) > max_gap)
+        conhecido[nos[longas] + 1] = True
+        conhecido[nos[longas + 1] - 1] = True
+        nos = np.flatnonzero(conhecido)
+    return np.interp(ids, ids[nos], valores[nos], left=np.nan, right=np.nan)
+
+
+def identicos(a, b):
+    return np.array_equal(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64), equal_nan=True)
+
+
+def conferir_dataset():
+    with contextlib.redirect_stdout(io.StringIO()):
+        analisador = AnalisadorInterpolacaoCorrigido(DATASET)
+    vetorizado = analisador.interpolator
+    total = iguais = 0
+    for intervalo in INTERVALOS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = analisador.simular_transmissao_intervalo(intervalo)
+        ids = [analisador._converter_para_float(v) for v in df['id'].values]
+        for parametro in ['temperatura', 'ph', 'ec', 'od']:
+            valores = [analisador._converter_para_float(v) for v in df[parametro].values]
+            for metodo, kwargs in (('linear_interpolation', {}), ('conservative_interpolation', {'max_gap': 2})):
+                antes = getattr(InterpoladorLacos, metodo)(ids, valores, **kwargs)
+                depois = getattr(vetorizado, metodo)(ids, valores, **kwargs)
+                total += 1
+                iguais += identicos(antes, depois)
+    return iguais, total
+
+
+def cronometrar(funcao, *args, execucoes=1, **kwargs):
+    """Resultado e melhor tempo entre as execuções"""
+    melhor = float('inf')
+    for _ in range(execucoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_AMOSTRAS
+    iguais, total = conferir_dataset()
+
+    print("=" * 78)
+    print(f"SIMPLEINTERPOLATOR VETORIZADO: dataset ({len(INTERVALOS)} intervalos) e série sintética de {n:,} amostras")
+    print("=" * 78)
+    print(f"Dataset: {iguais}/{total} interpolações idênticas à implementação anterior")
+
+    rng = np.random.default_rng(7)
+    ids = np.arange(1, n + 1, dtype=np.float64)
+    serie = 20 + 5 * np.sin(ids * 2 * np.pi / 1440) + rng.normal(0, 0.2, n)
+    transmitida = np.where(np.arange(n) % INTERVALO_SINTETICO == 0, serie, np.nan)
+    # Lacunas irregulares: amostras transmitidas perdidas
+    transmitida[rng.random(n) < 0.1] = np.nan
+
+    # A versão em laços recebe listas, como em interpolar_parametro; a vetorizada, arrays float64
+    ids_lista, transmitida_lista = ids.tolist(), transmitida.tolist()
+    print(f"{'método':<38} | {'laços (s)':>9} | {'NumPy (ms)':>10} | {'ganho':>6} | idêntico | np.interp")
+    abaixo_da_meta = []
+    for metodo, kwargs in (('linear_interpolation', {}), ('conservative_interpolation', {'max_gap': 2}),
+                           ('conservative_interpolation', {'max_gap': 8})):
+        antes, t_antes = cronometrar(getattr(InterpoladorLacos, metodo), ids_lista, transmitida_lista, **kwargs)
+        depois, t_depois = cronometrar(getattr(SimpleInterpolator, metodo), ids, transmitida, execucoes=5, **kwargs)
+        teto, t_teto = cronometrar(np_interp_lacunas, ids, transmitida, execucoes=5, **kwargs)
+        assert np.allclose(teto, depois, rtol=0, atol=1e-12, equal_nan=True)
+        nome = metodo + (f" (max_gap={kwargs['max_gap']})" if kwargs else '')
+        print(f"{nome:<38} | {t_antes:>9.3f} | {t_depois * 1e3:>10.1f} | {t_antes / t_depois:>5.0f}x | "
+              f"{str(identicos(antes, depois)):<8} | {t_antes / t_teto:>5.0f}x")
+        if t_antes / t_depois < META_GANHO:
+            abaixo_da_meta.append(nome)
+
+    negativos = [-2.5, float('nan'), -0.5]
+    print(f"Valores negativos {negativos}: antes {InterpoladorLacos.linear_interpolation([1, 2, 3], negativos)} | "
+          f"agora {SimpleInterpolator.linear_interpolation([1, 2, 3], negativos).tolist()}")
+    if abaixo_da_meta:
+        print(f"META DE {META_GANHO}x NÃO ATINGIDA: {', '.join(abaixo_da_meta)}")
+    return 0 if iguais == total and not abaixo_da_meta else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Função: Benchmark da leitura do dataset (cfe_hydro.dados) em uma exportação sintética longa no
+        formato de data/dataset_cfe-hydro.csv, com vírgula decimal. Compara tempo, vazão e pico de
+        memória (acréscimo ao RSS máximo, cada leitor em um processo novo) de:
+            - leitura bruta do arquivo (referência de E/S);
+            - carregar_dataframe (strings, str.replace e pd.to_numeric por coluna, como o
+              carregamento anterior do AnalisadorInterpolacaoCorrigido);
+            - ler_blocos percorrendo o arquivo em blocos (memória limitada ao bloco);
+            - carregar_colunas (arquivo inteiro em arrays int64/float32).
+
+Uso: python benchmarks/bench_leitura_dataset.py [n_linhas]   (a partir de ./src)
+"""
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd  # noqa: F401  (já carregado na base da medição de memória)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.dados import carregar_colunas, carregar_dataframe, ler_blocos  # noqa: E402
+
+N_LINHAS = 2_000_000
+LINHAS_POR_BLOCO = 250_000
+
+
+def gerar_exportacao(caminho, n, rng):
+    """CSV de n linhas a cada 5 minutos, com vírgula decimal, escrito em partes"""
+    inicio = np.datetime64('2025-01-01T00:00')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write('id;timestamp;temperatura;ph;ec;od\n')
+        for parte in range(0, n, 500_000):
+            i = np.arange(parte, min(n, parte + 500_000))
+            datas = (inicio + i * np.timedelta64(5, 'm')).astype('datetime64[m]').astype(str)
+            datas = [f'{d[8:10]}/{d[5:7]}/{d[:4]} {d[11:16]}' for d in datas]
+            colunas = [22 + 4 * np.sin(i / 288 * 2 * np.pi) + rng.normal(0, 0.2, len(i)),
+                       6.2 + rng.normal(0, 0.05, len(i)), 1.8 + rng.normal(0, 0.02, len(i)),
+                       5 + rng.normal(0, 0.1, len(i))]
+            texto = [np.char.replace(np.char.mod('%.2f', c), '.', ',') for c in colunas]
+            f.writelines(f'{a};{b};{c};{d};{e};{g}\n' for a, b, c, d, e, g in zip(i + 1, datas, *texto))
+
+
+def leitura_bruta(caminho):
+    with open(caminho, 'rb') as f:
+        while f.read(16 * 1024 * 1024):
+            pass
+
+
+def percorrer_blocos(caminho):
+    linhas = 0
+    soma_ph = 0.0
+    for bloco in ler_blocos(caminho, linhas_por_bloco=LINHAS_POR_BLOCO):
+        linhas += len(bloco['id'])
+        soma_ph += float(np.nansum(bloco['ph'], dtype=np.float64))
+    return linhas, soma_ph
+
+
+LEITORES = {
+    'leitura bruta': leitura_bruta,
+    'carregar_dataframe': carregar_dataframe,
+    f'ler_blocos ({LINHAS_POR_BLOCO:,})': percorrer_blocos,
+    'carregar_colunas': carregar_colunas,
+}
+
+
+def medir(nome, caminho):
+    """Executado em um processo novo: (tempo, acréscimo ao RSS máximo em bytes, resultado)"""
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    resultado = LEITORES[nome](caminho)
+    duracao = time.perf_counter() - inicio
+    pico = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) * 1024  # ru_maxrss em KiB (Linux)
+    return duracao, pico, resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_LINHAS
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'exportacao.csv')
+        gerar_exportacao(caminho, n, np.random.default_rng(5))
+        tamanho_mb = os.path.getsize(caminho) / 1e6
+        contexto = multiprocessing.get_context('spawn')
+
+        print("=" * 78)
+        print(f"LEITURA DO DATASET: {n:,} linhas, {tamanho_mb:.0f} MB, vírgula decimal")
+        print("=" * 78)
+        print(f"{'leitor':<22} | {'tempo (s)':>9} | {'MB/s':>7} | {'linhas/s':>12} | {'pico (MB)':>9}")
+        resultados = {}
+        for nome in LEITORES:
+            with contexto.Pool(1) as pool:
+                duracao, pico, resultados[nome] = pool.apply(medir, (nome, caminho))
+            print(f"{nome:<22} | {duracao:>9.2f} | {tamanho_mb / duracao:>7.0f} | {n / duracao:>12,.0f} | "
+                  f"{pico / 1e6:>9.0f}")
+
+        df = resultados['carregar_dataframe']
+        colunas = resultados['carregar_colunas']
+        iguais = all(np.array_equal(df[c].to_numpy(np.float32), colunas[c], equal_nan=True)
+                     for c in ('temperatura', 'ph', 'ec', 'od'))
+        datas = df['timestamp'].to_numpy('datetime64[ms]').view(np.int64)
+        print(f"\nValores iguais aos de carregar_dataframe (em float32): {iguais}; "
+              f"timestamps iguais: {np.array_equal(datas, colunas['timestamp'])}")
+
+
+if __name__ == "__main__":
+    main()
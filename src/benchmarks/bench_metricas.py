@@ -0,0 +1,82 @@
+"""
+Função: Benchmark do kernel de métricas em lote (cfe_hydro.metricas) contra o cálculo anterior do
+        MetricCalculator (R² e RMSE elemento a elemento, com conversão por str/float), para uma
+        matriz de reconstruções (intervalos x amostras) de uma série sintética.
+
+Uso: python benchmarks/bench_metricas.py [n_intervalos] [n_amostras]   (a partir de ./src)
+"""
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.interpolacao import preencher_lacunas  # noqa: E402
+from cfe_hydro.metricas import calcular_metricas  # noqa: E402
+
+N_INTERVALOS = 50
+N_AMOSTRAS = 20_000
+
+
+def limpar(y_true, y_pred):
+    """Conversão e filtragem do MetricCalculator anterior"""
+    y_true_clean, y_pred_clean = [], []
+    for i in range(min(len(y_true), len(y_pred))):
+        try:
+            val_true = float(str(y_true[i]).replace(',', '.')) if y_true[i] is not None else float('nan')
+            val_pred = float(str(y_pred[i]).replace(',', '.')) if y_pred[i] is not None else float('nan')
+            if not math.isnan(val_true) and not math.isnan(val_pred):
+                y_true_clean.append(val_true)
+                y_pred_clean.append(val_pred)
+        except (ValueError, TypeError):
+            continue
+    return y_true_clean, y_pred_clean
+
+
+def r2_rmse_anterior(y_true, y_pred):
+    t, p = limpar(y_true, y_pred)
+    if len(t) < 2:
+        return float('nan'), float('nan')
+    media = statistics.mean(t)
+    ss_tot = sum((y - media) ** 2 for y in t)
+    ss_res = sum((t[i] - p[i]) ** 2 for i in range(len(t)))
+    r2 = (1.0 if ss_res == 0 else 0.0) if ss_tot == 0 else 1 - ss_res / ss_tot
+    # rmse() do MetricCalculator repetia a conversão e a filtragem
+    t, p = limpar(y_true, y_pred)
+    return r2, math.sqrt(sum((t[i] - p[i]) ** 2 for i in range(len(t))) / len(t))
+
+
+def main():
+    n_intervalos = int(sys.argv[1]) if len(sys.argv) > 1 else N_INTERVALOS
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else N_AMOSTRAS
+    rng = np.random.default_rng(5)
+    ids = np.arange(1, n + 1, dtype=np.float64)
+    original = 22 + 4 * np.sin(ids * 2 * np.pi / 288) + rng.normal(0, 0.2, n)
+    reconstrucoes = np.vstack([preencher_lacunas(ids, np.where(np.arange(n) % i == 0, original, np.nan))
+                               for i in range(1, n_intervalos + 1)])
+
+    inicio = time.perf_counter()
+    anterior = [r2_rmse_anterior(original, r) for r in reconstrucoes]
+    t_anterior = time.perf_counter() - inicio
+
+    melhor = float('inf')
+    for _ in range(5):
+        inicio = time.perf_counter()
+        metricas = calcular_metricas(original, reconstrucoes)
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    r2_ant, rmse_ant = np.array(anterior).T
+    print("=" * 70)
+    print(f"MÉTRICAS EM LOTE: {n_intervalos} intervalos x {n:,} amostras")
+    print("=" * 70)
+    print(f"MetricCalculator (R², RMSE):       {t_anterior:>8.3f} s")
+    print(f"Kernel (R², RMSE, MAE, MAPE, máx): {melhor:>8.4f} s  ({t_anterior / melhor:,.0f}x)")
+    print(f"Iguais: R² {np.allclose(r2_ant, metricas['r2'], rtol=1e-12, atol=1e-12, equal_nan=True)} | "
+          f"RMSE {np.allclose(rmse_ant, metricas['rmse'], rtol=1e-12, atol=1e-12, equal_nan=True)}")
+
+
+if __name__ == "__main__":
+    main()
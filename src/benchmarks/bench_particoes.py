@@ -0,0 +1,67 @@
+"""
+Função: Benchmark do dataset Parquet particionado por dispositivo e dia (cfe_hydro.particoes) em
+        uma exportação sintética longa no formato de data/dataset_cfe-hydro.csv (amostras a cada 5
+        minutos). Mede a ingestão e compara com o CSV (cfe_hydro.dados.carregar_colunas):
+            - todas as colunas;
+            - um parâmetro;
+            - um mês de um parâmetro (arquivos e bytes abertos no Parquet).
+        Verifica que o Parquet devolve os mesmos valores que o CSV.
+
+Uso: python benchmarks/bench_particoes.py [n_linhas]   (a partir de ./src)
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bench_leitura_dataset import gerar_exportacao  # noqa: E402  (mesmo diretório deste script)
+from cfe_hydro.dados import carregar_colunas  # noqa: E402
+from cfe_hydro.particoes import arquivos_particoes, ingerir_csv  # noqa: E402
+
+N_LINHAS = 1_000_000
+MES = ('2026-03-01', '2026-04-01')
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_LINHAS
+    with tempfile.TemporaryDirectory() as diretorio:
+        csv = os.path.join(diretorio, 'exportacao.csv')
+        raiz = os.path.join(diretorio, 'parquet')
+        gerar_exportacao(csv, n, np.random.default_rng(5))
+        resumo, duracao = cronometrar(lambda: ingerir_csv(csv, raiz, dispositivo='estufa-1'))
+        arquivos = arquivos_particoes(raiz)
+        tamanho_parquet = sum(os.path.getsize(arquivo) for arquivo in arquivos)
+
+        print("=" * 78)
+        print(f"DATASET PARTICIONADO: {n:,} linhas, CSV de {os.path.getsize(csv) / 1e6:.0f} MB")
+        print("=" * 78)
+        print(f"Ingestão: {duracao:.2f} s, {resumo['dias']} dias em {resumo['arquivos']} arquivos, "
+              f"{tamanho_parquet / 1e6:.0f} MB")
+        print(f"\n{'leitura':<28} | {'CSV (s)':>8} | {'Parquet (s)':>11} | {'arquivos':>8} | {'MB abertos':>10}")
+        casos = [
+            ('todas as colunas', {}),
+            ('pH', {'colunas': ['ph']}),
+            (f'pH de {MES[0][:7]}', {'colunas': ['ph'], 'inicio': MES[0], 'fim': MES[1]}),
+        ]
+        iguais = True
+        for nome, filtros in casos:
+            do_csv, tempo_csv = cronometrar(lambda: carregar_colunas(csv, **filtros))
+            do_parquet, tempo_parquet = cronometrar(lambda: carregar_colunas(raiz, **filtros))
+            iguais &= all(np.array_equal(do_csv[c], do_parquet[c], equal_nan=True) for c in do_csv)
+            abertos = arquivos_particoes(raiz, inicio=filtros.get('inicio'), fim=filtros.get('fim'))
+            megabytes = sum(os.path.getsize(arquivo) for arquivo in abertos) / 1e6
+            print(f"{nome:<28} | {tempo_csv:>8.2f} | {tempo_parquet:>11.3f} | {len(abertos):>8} | {megabytes:>10.2f}")
+        print(f"\nValores iguais aos do CSV: {iguais}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Função: Benchmark do formato binário compacto contra o JSON de CFEHydro::buildJson.
+        Reenvia as leituras de data/dataset_cfe-hydro.csv nos dois formatos e compara bytes por
+        leitura (payload e payload + cabeçalho MQTT PUBLISH), o erro de quantização e a vazão
+        de decodificação no ClienteMQTT.
+
+Uso: python benchmarks/bench_payload_binario.py   (a partir de ./src)
+"""
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from cfe_hydro.codec import EsquemaBinario, codificar_binario, decodificar_binario  # noqa: E402
+from cliente_mqtt import ClienteMQTT  # noqa: E402
+
+DATASET = os.path.join('data', 'dataset_cfe-hydro.csv')
+DEVICE_ID = 'dispositivo_001'
+# Mesma configuração de sensores de protocolo/cfe-hydro_publisher.ino
+SENSORES = [
+    {'sensor_type': 'temperatura', 'interpolation': 'linear',
+     'metadata': {'unit': '°C', 'description': 'Temperatura', 'optimal_min': 18.0, 'optimal_max': 30.0}},
+    {'sensor_type': 'ph', 'interpolation': 'logarithmic',
+     'metadata': {'unit': 'pH', 'description': 'Nível de pH', 'optimal_min': 5.5, 'optimal_max': 7.0}},
+    {'sensor_type': 'ec', 'interpolation': 'polynomial', 'scale': 0.001,
+     'metadata': {'unit': 'mS/cm', 'description': 'EC', 'optimal_min': 0.0, 'optimal_max': 5.0}},
+    {'sensor_type': 'od', 'interpolation': 'polynomial',
+     'metadata': {'unit': 'mg/L', 'description': 'OD', 'optimal_min': 0.0, 'optimal_max': 6.0}},
+]
+REPETICOES_DECODIFICACAO = 200
+
+
+class GerenciadorContador:
+    def __init__(self):
+        self.pontos = 0
+
+    def adicionar_lote(self, device_id, pontos):
+        self.pontos += len(pontos)
+
+
+def bytes_publish(topico, payload):
+    """Tamanho do pacote MQTT PUBLISH com QoS 0: cabeçalho fixo + tópico + payload"""
+    restante = 2 + len(topico.encode('utf-8')) + len(payload)
+    return 1 + (1 if restante < 128 else 2 if restante < 16384 else 3) + restante
+
+
+def payload_json(epoch_ms, valores):
+    """Equivalente ao CFEHydro::buildJson (serializeJson compacto, UTF-8)"""
+    ts = pd.Timestamp(epoch_ms, unit='ms').strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    doc = {
+        'device_id': DEVICE_ID,
+        'transmission_timestamp': ts,
+        'sampling_interval': 10,
+        'transmission_interval': 60,
+        'readings': [
+            {'sensor_type': s['sensor_type'], 'value': float(v), 'interpolation': s['interpolation'],
+             'metadata': s['metadata']}
+            for s, v in zip(SENSORES, valores)
+        ],
+        'system': {'free_heap': 214363, 'wifi_rssi': -31, 'uptime': 3600},
+    }
+    return json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def vazao(cliente, mensagens):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES_DECODIFICACAO):
+        cliente._processar_lote(mensagens)
+    return REPETICOES_DECODIFICACAO * len(mensagens) / (time.perf_counter() - inicio)
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    df = pd.read_csv(DATASET, sep=';', decimal='.')
+    epochs = (pd.to_datetime(df['timestamp'], format='%d/%m/%Y %H:%M').astype('datetime64[ms]')
+              .astype('int64').to_numpy())
+    tipos = [s['sensor_type'] for s in SENSORES]
+    valores = df[tipos].to_numpy(dtype=float)
+    n_msgs, n_sens = valores.shape
+    n_leituras = n_msgs * n_sens
+
+    esquema = EsquemaBinario(SENSORES, device_id=DEVICE_ID, sampling_interval=10, transmission_interval=60)
+    topico_json = 'cfe-hydro/data'
+    topico_bin = f'cfe-hydro/{DEVICE_ID}/bin'
+    topico_schema = f'cfe-hydro/{DEVICE_ID}/schema'
+    esquema_json = esquema.para_json()
+
+    msgs_json = [payload_json(t, v) for t, v in zip(epochs, valores)]
+    msgs_bin = [codificar_binario(esquema, t, [(i, 0, x) for i, x in enumerate(v)]) for t, v in zip(epochs, valores)]
+
+    # Erro de quantização (ida e volta pelo decodificador)
+    decodificados = np.array([[v for _, _, v in decodificar_binario(b, esquema)] for b in msgs_bin])
+    erro_max = np.abs(decodificados - valores).max(axis=0)
+
+    print("=" * 70)
+    print(f"PAYLOAD BINÁRIO vs JSON ({n_msgs} mensagens x {n_sens} sensores do dataset)")
+    print("=" * 70)
+    print(f"{'formato':<22} | {'payload B/leitura':>17} | {'c/ MQTT B/leitura':>17}")
+    b_json = sum(map(len, msgs_json)) / n_leituras
+    m_json = sum(bytes_publish(topico_json, m) for m in msgs_json) / n_leituras
+    print(f"{'JSON (buildJson)':<22} | {b_json:>17.1f} | {m_json:>17.1f}")
+    b_bin = sum(map(len, msgs_bin)) / n_leituras
+    m_bin = sum(bytes_publish(topico_bin, m) for m in msgs_bin) / n_leituras
+    print(f"{'binário':<22} | {b_bin:>17.1f} | {m_bin:>17.1f}")
+    b_total = (sum(map(len, msgs_bin)) + len(esquema_json)) / n_leituras
+    m_total = (sum(bytes_publish(topico_bin, m) for m in msgs_bin)
+               + bytes_publish(topico_schema, esquema_json)) / n_leituras
+    print(f"{'binário + esquema 1x':<22} | {b_total:>17.1f} | {m_total:>17.1f}")
+    print(f"Redução (com esquema, com MQTT): {m_json / m_total:.1f}x "
+          f"(esquema: {len(esquema_json)} bytes, enviado uma vez por conexão)")
+    print("Erro máximo de quantização: " + ", ".join(
+        f"{s['sensor_type']}={e:.4f} (escala {esquema.sensores[i]['scale']})"
+        for i, (s, e) in enumerate(zip(SENSORES, erro_max))))
+
+    # Vazão de decodificação no cliente (lote inteiro, como a thread consumidora)
+    cliente = ClienteMQTT(GerenciadorContador(), 'localhost', 1883)
+    cliente._registrar_esquema(topico_schema, esquema_json)
+    agora = int(time.time() * 1000)
+    v_json = vazao(cliente, [(topico_json, m, agora) for m in msgs_json])
+    v_bin = vazao(cliente, [(topico_bin, m, agora) for m in msgs_bin])
+    print(f"Decodificação no ClienteMQTT: JSON {v_json:,.0f} msg/s | binário {v_bin:,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
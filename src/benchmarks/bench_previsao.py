@@ -0,0 +1,121 @@
+"""
+Função: Backtest da previsão de curto prazo (cfe_hydro.previsao) em avanço contínuo (walk-forward):
+        cada leitura é incorporada ao modelo só depois de ele prever os horizontes seguintes a
+        partir da anterior, como no dashboard. Para cada sensor e modelo, compara com a
+        persistência (último valor recebido):
+            - MAE por horizonte (valor real interpolado nas leituras no instante previsto);
+            - cobertura da faixa (fração dos valores reais dentro dela);
+            - tempo por leitura (atualizar + prever).
+        Séries: data/dataset_cfe-hydro.csv e uma série sintética longa com leituras irregulares
+        (ciclo diário de temperatura e OD, dosagens de pH em transições sigmoidais, deriva e
+        reposições de EC). O modelo padrão de cada sensor (MODELOS_POR_INTERPOLACAO) é marcado com *.
+
+Uso: python benchmarks/bench_previsao.py [dias_sinteticos] [dataset]   (a partir de ./src)
+"""
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.dados import DATASET_PADRAO, carregar_colunas  # noqa: E402
+from cfe_hydro.previsao import MODELOS_POR_INTERPOLACAO, Z_PADRAO, criar_previsor  # noqa: E402
+
+DIAS_SINTETICOS = 30
+HORIZONTES_MIN = (5, 15, 30, 60)
+AQUECIMENTO = 12                # leituras antes de começar a medir
+MODELOS = ('tendencia', 'ph', 'amortecido', 'holt_winters')
+# Tipo de interpolação de cada sensor, como declarado pelo firmware (cfe-hydro_publisher.ino)
+INTERPOLACAO = {'temperatura': 'linear', 'ph': 'logarithmic', 'ec': 'polynomial', 'od': 'polynomial'}
+
+
+def gerar_series(dias, rng):
+    """Leituras a cada ~5 min (jitter e 0,5% de lacunas de 30 min); dict sensor -> (ts_ms, valores)"""
+    n = dias * 288
+    passos = rng.normal(300, 15, n).clip(240, 360) + np.where(rng.random(n) < 0.005, 1800, 0)
+    ts = (1_767_225_600 + np.cumsum(passos)).astype(np.int64) * 1000
+    dia = (ts % 86_400_000) / 86_400_000
+    # Dosagens de pH: a cada ~8 h o pH (que sobe devagar) volta ao alvo numa transição logística
+    horas = (ts - ts[0]) / 3_600_000
+    dosagens = np.arange(8, horas[-1], 8) + rng.normal(0, 1, len(np.arange(8, horas[-1], 8)))
+    transicoes = 1 / (1 + np.exp(np.clip((dosagens[None, :] - horas[:, None]) * 6, -50, 50)))
+    ph = 5.8 + 0.06 * horas - 0.45 * transicoes.sum(axis=1) + rng.normal(0, 0.015, n)
+    ec = 1.8 - 0.004 * (horas % 72) + 0.05 * np.sin(horas / 5) + rng.normal(0, 0.01, n)
+    return {
+        'temperatura': (ts, 22 + 4 * np.sin(2 * np.pi * (dia - 0.3)) + rng.normal(0, 0.15, n)),
+        'ph': (ts, ph),
+        'ec': (ts, ec),
+        'od': (ts, 6 + 1.2 * np.sin(2 * np.pi * (dia - 0.4)) + 0.3 * np.sin(horas / 3) + rng.normal(0, 0.08, n)),
+    }
+
+
+def series_dataset(caminho):
+    dados = carregar_colunas(caminho, ['timestamp'] + list(INTERPOLACAO), np.float64)
+    return {sensor: (dados['timestamp'], dados[sensor]) for sensor in INTERPOLACAO if sensor in dados}
+
+
+def backtest(ts, valores, modelo, z=Z_PADRAO):
+    """(MAE por horizonte, cobertura por horizonte, µs por leitura) em avanço contínuo"""
+    horizontes = np.array(HORIZONTES_MIN, dtype=np.int64) * 60_000
+    previsor = criar_previsor(modelo) if modelo != 'persistência' else None
+    erros = np.zeros(len(horizontes))
+    dentro = np.zeros(len(horizontes))
+    contagem = np.zeros(len(horizontes))
+    faixas = np.zeros(len(horizontes))
+    tempo = 0.0
+    for i, (t, v) in enumerate(zip(ts.tolist(), valores.tolist())):
+        inicio = time.perf_counter()
+        if previsor is not None:
+            previsor.atualizar(t, v)
+            media, inferior, superior = previsor.prever(t + horizontes, z)
+        else:
+            media = np.full(len(horizontes), v)
+            inferior = superior = np.full(len(horizontes), np.nan)
+        tempo += time.perf_counter() - inicio
+        if i < AQUECIMENTO:
+            continue
+        validos = t + horizontes <= ts[-1]
+        real = np.interp(t + horizontes, ts, valores)
+        erros += np.where(validos, np.abs(real - media), 0)
+        com_faixa = validos & np.isfinite(inferior)
+        dentro += com_faixa & (real >= inferior) & (real <= superior)
+        faixas += com_faixa
+        contagem += validos
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return erros / contagem, dentro / faixas, tempo / len(ts) * 1e6
+
+
+def imprimir(titulo, series):
+    print("=" * 100)
+    print(titulo)
+    print("=" * 100)
+    colunas = ' | '.join(f"{f'MAE {h} min':>10}" for h in HORIZONTES_MIN)
+    print(f"{'sensor':<12} | {'modelo':<14} | {colunas} | {'cobertura 30 min':>16} | {'µs/leitura':>10}")
+    for sensor, (ts, valores) in series.items():
+        validos = np.isfinite(valores) & (ts > 0)
+        ts, valores = ts[validos], valores[validos]
+        padrao = MODELOS_POR_INTERPOLACAO[INTERPOLACAO[sensor]]
+        for modelo in ('persistência',) + MODELOS:
+            if modelo == 'ph' and sensor != 'ph':
+                continue
+            mae, cobertura, us = backtest(ts, valores, modelo)
+            nome = modelo + (' *' if modelo == padrao else '')
+            maes = ' | '.join(f"{e:>10.4f}" for e in mae)
+            print(f"{sensor:<12} | {nome:<14} | {maes} | {cobertura[2]:>16.1%} | {us:>10.1f}")
+        print('-' * 100)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else DIAS_SINTETICOS
+    dataset = sys.argv[2] if len(sys.argv) > 2 else DATASET_PADRAO
+    if os.path.exists(dataset):
+        imprimir(f"DATASET {dataset}", series_dataset(dataset))
+    imprimir(f"SÉRIE SINTÉTICA: {dias} dias, leituras a cada ~5 min", gerar_series(dias, np.random.default_rng(3)))
+    print(f"\n* modelo usado pelo dashboard para o tipo de interpolação do sensor. Faixa: ±{Z_PADRAO} sigma.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Função: Benchmark da reconstrução esparsa (cfe_hydro.reconstrucao) contra as interpolações linear e
+        logarítmica de Graficos_Estimativa_de_Campo_Compressiva.py, sobre data/dataset_cfe-hydro.csv.
+
+        Dois cenários por taxa de transmissão:
+          grade      1 amostra a cada N (o cenário do script): as funções originais do script
+                     contra FISTA e OMP com a mesma máscara;
+          aleatório  máscaras sorteadas com a mesma taxa: as funções do script só aceitam grade,
+                     então as referências são as mesmas interpolações (linear e em [H+] para o pH)
+                     sobre posições arbitrárias, via np.interp.
+        Reporta RMSE e MAE nas amostras não transmitidas e o tempo por reconstrução.
+
+Uso: python benchmarks/bench_reconstrucao_compressiva.py [n_mascaras]   (a partir de ./src)
+"""
+import ast
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.reconstrucao import mascaras_aleatorias, reconstruir_lote  # noqa: E402
+
+DATASET = os.path.join('data', 'dataset_cfe-hydro.csv')
+SCRIPT = 'Graficos_Estimativa_de_Campo_Compressiva.py'
+SENSORES = ['temperatura', 'ph', 'ec', 'od']
+ESPACAMENTOS = [2, 3, 5]
+N_MASCARAS = 200
+SEMENTE = 2024
+
+
+def carregar_interpoladores_script():
+    """
+    Extrai interpolar_linear_npontos e interpolar_logaritmica_npontos do script sem executá-lo
+    (o script lê o CSV e abre janelas do matplotlib no nível do módulo).
+    """
+    with open(SCRIPT, encoding='utf-8') as f:
+        arvore = ast.parse(f.read())
+    nomes = {'interpolar_linear_npontos', 'interpolar_logaritmica_npontos'}
+    corpo = [n for n in arvore.body
+             if isinstance(n, ast.FunctionDef) and n.name in nomes
+             or isinstance(n, ast.Assign) and any(getattr(t, 'id', None) == 'ESPACAMENTO' for t in n.targets)]
+    escopo = {'np': np}
+    exec(compile(ast.Module(body=corpo, type_ignores=[]), SCRIPT, 'exec'), escopo)
+    return escopo['interpolar_linear_npontos'], escopo['interpolar_logaritmica_npontos']
+
+
+def linear_posicoes(y, mascara):
+    obs = np.flatnonzero(mascara)
+    return np.interp(np.arange(len(y)), obs, y[obs])
+
+
+def logaritmica_posicoes(y, mascara):
+    """Interpolação linear da concentração [H+] = 10^-pH entre as posições transmitidas"""
+    obs = np.flatnonzero(mascara)
+    return -np.log10(np.interp(np.arange(len(y)), obs, 10.0 ** -y[obs]))
+
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) / repeticoes
+
+
+def erros(y, reconstruidos, mascaras):
+    """RMSE e MAE médios sobre as amostras não transmitidas"""
+    faltantes = ~mascaras
+    diff = np.where(faltantes, reconstruidos - y, 0.0)
+    n = np.maximum(faltantes.sum(axis=1), 1)
+    rmse = np.sqrt((diff ** 2).sum(axis=1) / n).mean()
+    mae = (np.abs(diff).sum(axis=1) / n).mean()
+    return rmse, mae
+
+
+def imprimir(sensor, cenario, taxa, metodo, y, reconstruidos, mascaras, duracao):
+    rmse, mae = erros(y, reconstruidos, mascaras)
+    print(f"{sensor:<11} | {cenario:<9} | {taxa:>5.2f} | {metodo:<20} | {rmse:>8.4f} | {mae:>8.4f} | "
+          f"{duracao * 1e6:>10.1f}")
+
+
+def main():
+    n_mascaras = int(sys.argv[1]) if len(sys.argv) > 1 else N_MASCARAS
+    linear_script, logaritmica_script = carregar_interpoladores_script()
+    df = pd.read_csv(DATASET, sep=';', decimal='.')
+    n = len(df)
+
+    print("=" * 88)
+    print(f"RECONSTRUÇÃO COMPRESSIVA: {n} leituras, {n_mascaras} máscaras aleatórias por taxa")
+    print("=" * 88)
+    print(f"{'sensor':<11} | {'cenário':<9} | {'taxa':>5} | {'método':<20} | {'RMSE':>8} | {'MAE':>8} | "
+          f"{'µs/recons.':>10}")
+    for sensor in SENSORES:
+        y = df[sensor].to_numpy(dtype=float)
+        referencia_script = logaritmica_script if sensor == 'ph' else linear_script
+        referencia_posicoes = logaritmica_posicoes if sensor == 'ph' else linear_posicoes
+        nome_ref = 'logarítmica' if sensor == 'ph' else 'linear'
+        for espacamento in ESPACAMENTOS:
+            taxa = 1 / espacamento
+            grade = (np.arange(n) % espacamento == 0)[None, :]
+            r, t = cronometrar(lambda: referencia_script(y, espacamento)[None, :], 1)
+            imprimir(sensor, 'grade', taxa, f'{nome_ref} (script)', y, r, grade, t)
+            for metodo in ('fista', 'omp'):
+                r, t = cronometrar(lambda: reconstruir_lote(y, grade[0], metodo=metodo)[None, :], 1)
+                imprimir(sensor, 'grade', taxa, f'{metodo} (DCT)', y, r, grade, t)
+
+            mascaras = mascaras_aleatorias(n, taxa, n_mascaras, rng=SEMENTE, incluir_extremos=True)
+            lote = np.broadcast_to(y, mascaras.shape)
+            r, t = cronometrar(lambda: np.array([referencia_posicoes(y, m) for m in mascaras]), n_mascaras)
+            imprimir(sensor, 'aleatório', taxa, nome_ref, y, r, mascaras, t)
+            for metodo in ('fista', 'omp'):
+                for dic in ('dct', 'haar'):
+                    r, t = cronometrar(lambda: reconstruir_lote(lote, mascaras, dicionario_tipo=dic,
+                                                                metodo=metodo), n_mascaras)
+                    imprimir(sensor, 'aleatório', taxa, f'{metodo} ({dic.upper()}, lote)', y, r, mascaras, t)
+        print("-" * 88)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Função: Benchmark da reconstrução online (app/reconstrucao_online.py). Uma série de leituras
+        irregulares (a cada ~5 min, com lacunas ocasionais) chega uma a uma; para cada método de
+        interpolação mede o tempo por leitura no início e no fim do fluxo (o custo não deve
+        crescer com o histórico), compara com consultar a grade do GerenciadorDados a cada leitura
+        (grade_interpolada, incremental) e verifica os pontos emitidos contra a interpolação da
+        série inteira na mesma grade.
+
+Uso: python benchmarks/bench_reconstrucao_online.py [n_leituras]   (a partir de ./src)
+"""
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from config import CONTEXTO_RECONSTRUCAO  # noqa: E402
+from gerenciador import GerenciadorDados  # noqa: E402
+from interpolador import InterpoladorSeletivo  # noqa: E402
+from reconstrucao_online import ReconstrucaoOnline  # noqa: E402
+
+N_LEITURAS = 5000
+INTERVALO_S = 60
+METODOS = ['linear', 'logarithmic', 'sigmoidal', 'polynomial']
+
+
+def gerar_leituras(n, rng):
+    """Timestamps (ms) a cada ~5 min com jitter e 1% de lacunas de 1 h; valores de pH com degraus"""
+    passos = rng.normal(300, 20, n).clip(240, 360) + np.where(rng.random(n) < 0.01, 3600, 0)
+    ts = (1_767_225_600 + np.cumsum(passos)).astype(np.int64) * 1000
+    ph = 6.2 + 0.3 * np.sin(np.arange(n) / 150) + 0.4 * (np.arange(n) // 400 % 2) + rng.normal(0, 0.02, n)
+    return ts, ph
+
+
+def percentil_ms(tempos, q):
+    return np.percentile(tempos, q) * 1000
+
+
+def main():
+    logging.disable(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_LEITURAS
+    ts, valores = gerar_leituras(n, np.random.default_rng(11))
+    leituras = [(int(t), float(v)) for t, v in zip(ts, valores)]
+    bloco = min(1000, n // 2)
+
+    print("=" * 96)
+    print(f"RECONSTRUÇÃO ONLINE: {n} leituras, grade de {INTERVALO_S} s")
+    print("=" * 96)
+    print(f"{'método':<12} | {'atraso':>6} | {'início (ms)':>11} | {'fim (ms)':>8} | {'p99 (ms)':>8} | "
+          f"{'consulta (ms)':>13} | {'pontos':>7} | {'dif. máx. (série inteira)':>25}")
+    for metodo in METODOS:
+        reconstrucao = ReconstrucaoOnline(INTERVALO_S, capacidade_fila=0)
+        emitidos = []
+        reconstrucao.publicar = lambda d, s, m, x, y: emitidos.append((x, y))
+        tempos = np.empty(n)
+        for i, (t, v) in enumerate(leituras):
+            inicio = time.perf_counter()
+            reconstrucao.adicionar_lote('estufa', [('ph', t, v, metodo, {})])
+            tempos[i] = time.perf_counter() - inicio
+        reconstrucao.descarregar()
+
+        # Alternativa: consultar a grade do gerenciador a cada leitura (mesmo trabalho incremental do gráfico)
+        gerenciador = GerenciadorDados(capacidade=n)
+        consultas = []
+        for t, v in leituras[-bloco:]:
+            gerenciador.adicionar_ponto('estufa', 'ph', t, v, metodo, {})
+            inicio = time.perf_counter()
+            gerenciador.dispositivos['estufa'].grade_interpolada('ph', INTERVALO_S)
+            consultas.append(time.perf_counter() - inicio)
+
+        x = np.concatenate([e[0] for e in emitidos])
+        y = np.concatenate([e[1] for e in emitidos])
+        completo = InterpoladorSeletivo.interpolar(ts, valores, x, metodo)
+        # Nas bordas da série, a janela online é mais curta; compara-se o interior
+        margem = (CONTEXTO_RECONSTRUCAO.get(metodo, 0) + 1) * 30
+        interior = slice(margem, len(x) - margem)
+        diferenca = np.max(np.abs(y[interior] - completo[interior]))
+        grade_ok = np.all(np.diff(x) == INTERVALO_S * 1000)
+        print(f"{metodo:<12} | {CONTEXTO_RECONSTRUCAO.get(metodo, 0):>6} | "
+              f"{np.mean(tempos[:bloco]) * 1000:>11.3f} | {np.mean(tempos[-bloco:]) * 1000:>8.3f} | "
+              f"{percentil_ms(tempos, 99):>8.3f} | {np.mean(consultas) * 1000:>13.3f} | {len(x):>7} | "
+              f"{diferenca:>25.2e}{'' if grade_ok else '  (grade com falhas!)'}")
+    print("\natraso: leituras esperadas depois de cada lacuna (CONTEXTO_RECONSTRUCAO). "
+          "Lacunas de 1 h: 60 pontos cada.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Função: Benchmark da redução da série interpolada antes do Plotly (cfe_hydro.reducao).
+        Para janelas de 1 a 72 h com interpolação a cada 10 s, mede o número de pontos e o tamanho
+        do JSON da figura (o que vai pelo websocket do Streamlit), o tempo de redução e de
+        serialização, e a fidelidade da curva reduzida: maior desvio, em % da amplitude, entre a
+        série completa e a reduzida reinterpolada linearmente.
+
+Uso: python benchmarks/bench_reducao_grafico.py   (a partir de ./src)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.reducao import reduzir  # noqa: E402
+
+JANELAS_H = [1, 6, 24, 72]
+INTERVALO_INTERPOLACAO_S = 10
+INTERVALO_RECEBIDO_S = 300
+LARGURA_PX = 1200
+
+
+def serie(horas, passo_s, rng):
+    x = np.arange(0, horas * 3600, passo_s, dtype=np.int64) * 1000 + 1_700_000_000_000
+    t = (x - x[0]) / 3_600_000
+    y = 6.0 + 0.4 * np.sin(2 * np.pi * t / 24) + 0.05 * np.sin(2 * np.pi * t / 0.7) + rng.normal(0, 0.01, len(x))
+    return x, y
+
+
+def figura(x_raw, y_raw, x_interp, y_interp):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x_interp.astype('datetime64[ms]'), y=y_interp, mode='lines+markers', name='Interpolado'))
+    fig.add_trace(go.Scatter(x=x_raw.astype('datetime64[ms]'), y=y_raw, mode='lines+markers', name='Recebido'))
+    fig.update_traces(line_shape='spline')
+    return fig
+
+
+def main():
+    rng = np.random.default_rng(0)
+    x, y = serie(1, INTERVALO_INTERPOLACAO_S, rng)
+    figura(x, y, x[reduzir(x, y, 10)], y[:10]).to_json()  # aquecimento (importações do Plotly)
+    print("=" * 92)
+    print(f"REDUÇÃO DA SÉRIE INTERPOLADA: interpolação a cada {INTERVALO_INTERPOLACAO_S} s, "
+          f"recebidos a cada {INTERVALO_RECEBIDO_S} s, {LARGURA_PX} px")
+    print("=" * 92)
+    print(f"{'janela':>6} | {'método':<8} | {'pts interp.':>11} | {'JSON (KB)':>9} | {'redução (ms)':>12} | "
+          f"{'to_json (ms)':>12} | {'desvio máx.':>11}")
+    for horas in JANELAS_H:
+        x_raw, y_raw = serie(horas, INTERVALO_RECEBIDO_S, rng)
+        x, y = serie(horas, INTERVALO_INTERPOLACAO_S, rng)
+        amplitude = y.max() - y.min()
+        for metodo in ('completo', 'lttb', 'minmax'):
+            inicio = time.perf_counter()
+            idx = np.arange(len(x)) if metodo == 'completo' else reduzir(x, y, LARGURA_PX, metodo)
+            reducao = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            payload = figura(x_raw, y_raw, x[idx], y[idx]).to_json()
+            serializacao = time.perf_counter() - inicio
+            desvio = np.abs(np.interp(x, x[idx], y[idx]) - y).max() / amplitude * 100
+            print(f"{horas:>5}h | {metodo:<8} | {len(idx):>11,} | {len(payload) / 1024:>9.0f} | "
+                  f"{reducao * 1000:>12.2f} | {serializacao * 1000:>12.1f} | {desvio:>10.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Função: Simulação da malha de controle da taxa de transmissão (cfe_hydro.controle): reproduz o envio
+        em lotes do firmware sobre uma série amostrada e compara, com os passos fixos (1 amostra a
+        cada N para todos os sensores), os bytes transmitidos no formato binário e o erro da
+        reconstrução de cada sensor contra a série completa (MAE e erro máximo).
+        O controle adaptativo é avaliado com a tolerância padrão de cada sensor
+        (TOLERANCIAS_PADRAO) multiplicada por 0,5, 1 e 2.
+        Séries: data/dataset_cfe-hydro.csv e uma série sintética na cadência do firmware (10 s,
+        lotes de 6 amostras), quantizada como no formato binário, com longos trechos de variação lenta e
+        episódios de variação rápida (ventilação, dosagens de pH, reposição de EC, aerador).
+
+Uso: python benchmarks/bench_taxa_adaptativa.py [dias_sinteticos] [dataset]   (a partir de ./src)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.controle import TOLERANCIAS_PADRAO, simular  # noqa: E402
+from cfe_hydro.dados import DATASET_PADRAO, carregar_colunas  # noqa: E402
+
+DIAS_SINTETICOS = 7
+PASSOS_FIXOS = (1, 2, 3, 6, 12, 30)
+FATORES_TOLERANCIA = (0.5, 1.0, 2.0)
+# Tipo de interpolação e resolução (formato binário) de cada sensor, como no cfe-hydro_publisher.ino
+INTERPOLACAO = {'temperatura': 'linear', 'ph': 'logarithmic', 'ec': 'polynomial', 'od': 'polynomial'}
+ESCALA = {'temperatura': 0.01, 'ph': 0.01, 'ec': 0.001, 'od': 0.01}
+
+
+def _episodios(horas, inicios, duracao_h):
+    """Envelope suave (0 a 1) que vale 1 durante cada episódio [inicio, inicio + duracao_h]"""
+    z = np.clip((horas[:, None] - inicios[None, :]) / 0.02, -50, 50)
+    z_fim = np.clip((horas[:, None] - inicios[None, :] - duracao_h) / 0.02, -50, 50)
+    return (1 / (1 + np.exp(-z)) - 1 / (1 + np.exp(-z_fim))).sum(axis=1)
+
+
+def _oscilacao(horas, periodo_min):
+    return np.sin(2 * np.pi * horas * 60 / periodo_min)
+
+
+def gerar_series(dias, rng):
+    """
+    Amostras a cada 10 s; dict sensor -> valores, quantizados como no formato binário. Cada sensor
+    passa a maior parte do tempo variando devagar e tem episódios curtos de variação rápida.
+    """
+    n = dias * 8640
+    ts = 1_767_225_600_000 + np.arange(n, dtype=np.int64) * 10_000
+    horas = (ts - ts[0]) / 3_600_000
+    dia = horas / 24 % 1
+
+    def inicios(intervalo_h, desvio_h):
+        base = np.arange(intervalo_h / 2, horas[-1], intervalo_h)
+        return base + rng.normal(0, desvio_h, len(base))
+
+    # Temperatura: ciclo diário; ventilação ligando e desligando por ~2 h no meio do dia
+    temperatura = (22 + 4 * np.sin(2 * np.pi * (dia - 0.3))
+                   + 0.8 * _episodios(horas, np.arange(12.5, horas[-1], 24), 2) * _oscilacao(horas, 12.7))
+    # pH: sobe devagar; a cada ~8 h, 40 min de dosagens em pulsos (queda e recuperação a cada ~7 min)
+    dosagem = _episodios(horas, inicios(8, 1), 40 / 60)
+    ph = 5.9 + 0.3 * np.sin(2 * np.pi * horas / 8) + 0.15 * dosagem * _oscilacao(horas, 7.3)
+    # EC: consumo lento; a cada ~36 h, 30 min de reposição com mistura oscilando
+    ec = 1.9 - 0.003 * (horas % 36) + 0.2 * _episodios(horas, inicios(36, 2), 0.5) * _oscilacao(horas, 4.7)
+    # OD: ciclo diário; aerador intermitente (período de ~11 min) por ~1 h a cada ~6 h
+    od = (5.5 + 0.6 * np.sin(2 * np.pi * (dia - 0.4))
+          + 0.5 * _episodios(horas, inicios(6, 1), 1) * _oscilacao(horas, 11.3))
+    series = {'temperatura': temperatura, 'ph': ph, 'ec': ec, 'od': od}
+    for s, v in series.items():
+        ruido = rng.normal(0, ESCALA[s], n)
+        series[s] = np.round((v + ruido) / ESCALA[s]) * ESCALA[s]
+    return ts, series
+
+
+def serie_dataset(caminho):
+    dados = carregar_colunas(caminho, ['timestamp'] + list(INTERPOLACAO), np.float64)
+    validos = dados['timestamp'] > 0
+    return dados['timestamp'][validos], {s: dados[s][validos] for s in INTERPOLACAO if s in dados}
+
+
+def imprimir(titulo, ts, series):
+    print("=" * 118)
+    print(titulo)
+    print("=" * 118)
+    colunas = ' | '.join(f"{s[:11]:>17}" for s in series)
+    print(f"{'transmissão':<16} | {'bytes':>9} | {'economia':>8} | {colunas} | {'s':>5}")
+    print(f"{'':<16} | {'':>9} | {'':>8} | " + ' | '.join(f"{'MAE / máx':>17}" for _ in series) + " |")
+    referencia = None
+    configuracoes = [(f"fixo 1/{p}", {'passo_fixo': p}) for p in PASSOS_FIXOS]
+    configuracoes += [(f"adaptativo x{f:g}", {'tolerancias': {s: t * f for s, t in TOLERANCIAS_PADRAO.items()}})
+                      for f in FATORES_TOLERANCIA]
+    for nome, opcoes in configuracoes:
+        inicio = time.perf_counter()
+        r = simular(ts, series, INTERPOLACAO, **opcoes)
+        duracao = time.perf_counter() - inicio
+        referencia = referencia or r['bytes']
+        erros = ' | '.join(f"{m['mae']:>8.4f} / {m['erro_max']:>6.3f}" for m in r['sensores'].values())
+        print(f"{nome:<16} | {r['bytes']:>9,} | {1 - r['bytes'] / referencia:>8.1%} | {erros} | {duracao:>5.2f}")
+        if 'tolerancias' in opcoes:
+            passos = ', '.join(f"{s} {m['passo_medio']:.1f} ({m['mudancas']} mudanças)"
+                               for s, m in r['sensores'].items())
+            print(f"{'':<16}   passo médio: {passos}")
+    print('-' * 118)
+
+
+def main():
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else DIAS_SINTETICOS
+    dataset = sys.argv[2] if len(sys.argv) > 2 else DATASET_PADRAO
+    if os.path.exists(dataset):
+        imprimir(f"DATASET {dataset}", *serie_dataset(dataset))
+    imprimir(f"SÉRIE SINTÉTICA: {dias} dias, amostras a cada 10 s, lotes de 6", *gerar_series(dias, np.random.default_rng(5)))
+    print(f"\nTolerâncias padrão: {TOLERANCIAS_PADRAO}. Economia relativa à transmissão de todas as amostras.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Função: Benchmark da varredura paralela (cfe_hydro.varredura) em função do número de processos.
+        Gera datasets sintéticos de vários dispositivos (meses de amostras a cada 5 minutos, no
+        formato de data/dataset_cfe-hydro.csv), executa a varredura de intervalos com 1, 2, 4, ...
+        processos e reporta a vazão de simulações e a eficiência de escala.
+
+Uso: python benchmarks/bench_varredura.py [n_dispositivos] [intervalo_maximo]   (a partir de ./src)
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.varredura import executar_varredura  # noqa: E402
+
+N_DISPOSITIVOS = 8
+INTERVALO_MAXIMO = 100
+DIAS = 60
+AMOSTRAS_POR_DIA = 24 * 12  # a cada 5 minutos
+
+
+def gerar_datasets(diretorio, n_dispositivos, rng):
+    caminhos = []
+    n = DIAS * AMOSTRAS_POR_DIA
+    t = np.arange(n)
+    dia = 2 * np.pi * t / AMOSTRAS_POR_DIA
+    for d in range(n_dispositivos):
+        df = pd.DataFrame({
+            'id': t + 1,
+            'timestamp': pd.date_range('2025-01-01', periods=n, freq='5min').strftime('%d/%m/%Y %H:%M'),
+            'temperatura': 22 + 4 * np.sin(dia + d) + rng.normal(0, 0.2, n),
+            'ph': 6.2 + 0.3 * np.sin(dia / 3 + d) + rng.normal(0, 0.05, n),
+            'ec': 1.8 + 0.2 * np.sin(dia / 7) + rng.normal(0, 0.02, n),
+            'od': 5 + 0.8 * np.cos(dia + d) + rng.normal(0, 0.1, n),
+        })
+        caminho = os.path.join(diretorio, f'estufa_{d:03d}.csv')
+        df.round(3).to_csv(caminho, sep=';', index=False)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def main():
+    n_dispositivos = int(sys.argv[1]) if len(sys.argv) > 1 else N_DISPOSITIVOS
+    intervalo_maximo = int(sys.argv[2]) if len(sys.argv) > 2 else INTERVALO_MAXIMO
+    cpus = os.cpu_count() or 1
+    contagens = sorted({1, 2, 4, cpus} | {p for p in (8, 16) if p <= cpus})
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = gerar_datasets(diretorio, n_dispositivos, np.random.default_rng(3))
+        intervalos = range(1, intervalo_maximo + 1)
+        saida = os.path.join(diretorio, 'resultados_varredura.csv')
+
+        print("=" * 72)
+        print(f"VARREDURA PARALELA: {n_dispositivos} dispositivos x {DIAS * AMOSTRAS_POR_DIA} amostras, "
+              f"intervalos 1-{intervalo_maximo}, {cpus} CPU(s)")
+        print("=" * 72)
+        print(f"{'processos':>9} | {'tempo (s)':>9} | {'simulações/s':>12} | {'speedup':>7} | {'eficiência':>10}")
+        base = None
+        referencia = None
+        for processos in contagens:
+            inicio = time.perf_counter()
+            total = executar_varredura(caminhos, intervalos, arquivo=saida, processos=processos)
+            duracao = time.perf_counter() - inicio
+            resultado = pd.read_csv(saida)
+            if referencia is None:
+                referencia = resultado
+            elif not resultado.equals(referencia):
+                print("  resultados divergentes entre execuções!")
+            base = base or duracao
+            print(f"{processos:>9} | {duracao:>9.2f} | {total / duracao:>12,.1f} | {base / duracao:>6.2f}x | "
+                  f"{base / duracao / processos:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Função: Teste de carga da ingestão multi-dispositivo do dashboard.
+        Um broker local (substituto em memória do Mosquitto) entrega mensagens publicadas por
+        500 dispositivos simulados em cfe-hydro/<device_id>/data ao ClienteMQTT, enquanto threads
+        "dashboard" consultam o GerenciadorDados em paralelo. Ao final, verifica que cada
+        (dispositivo, sensor) recebeu exatamente as suas leituras, sem mistura entre dispositivos.
+
+Uso: python benchmarks/carga_multidispositivo.py [n_dispositivos] [mensagens_por_dispositivo]   (a partir de ./src)
+"""
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from cliente_mqtt import ClienteMQTT  # noqa: E402
+from gerenciador import GerenciadorDados  # noqa: E402
+
+N_DISPOSITIVOS = 500
+MENSAGENS_POR_DISPOSITIVO = 20
+N_PUBLICADORES = 8
+N_LEITORES = 4
+SENSORES = [
+    ('temperatura', 'linear', '°C'),
+    ('ph', 'logarithmic', 'pH'),
+    ('ec', 'polynomial', 'mS/cm'),
+    ('od', 'polynomial', 'mg/L'),
+]
+
+
+def topico_corresponde(filtro, topico):
+    """Casamento de tópicos MQTT com os curingas '+' (um nível) e '#' (demais níveis)"""
+    partes_filtro = filtro.split('/')
+    partes_topico = topico.split('/')
+    for i, parte in enumerate(partes_filtro):
+        if parte == '#':
+            return True
+        if i >= len(partes_topico) or (parte != '+' and parte != partes_topico[i]):
+            return False
+    return len(partes_filtro) == len(partes_topico)
+
+
+class BrokerLocal:
+    """Broker em memória: fila de publicação e uma thread de entrega, como a thread de rede do paho"""
+
+    def __init__(self):
+        self.fila = queue.Queue()
+        self.assinaturas = []  # (filtro, callback)
+        self._thread = threading.Thread(target=self._entregar, daemon=True)
+        self._thread.start()
+
+    def cliente(self, on_message):
+        """Objeto com a interface de subscribe() usada em ClienteMQTT._on_connect"""
+        broker = self
+
+        class _Cliente:
+            def subscribe(self, topicos):
+                for filtro, _qos in topicos:
+                    broker.assinaturas.append((filtro, on_message))
+        return _Cliente()
+
+    def publicar(self, topico, payload):
+        self.fila.put((topico, payload))
+
+    def _entregar(self):
+        while True:
+            topico, payload = self.fila.get()
+            msg = SimpleNamespace(topic=topico, payload=payload)
+            for filtro, callback in self.assinaturas:
+                if topico_corresponde(filtro, topico):
+                    callback(None, None, msg)
+                    break  # o paho entrega uma vez por mensagem mesmo com assinaturas sobrepostas
+            self.fila.task_done()
+
+
+def valor_esperado(idx_dispositivo, idx_sensor, idx_msg):
+    # Codifica (dispositivo, sensor, mensagem) no valor para detectar séries misturadas
+    return idx_dispositivo * 1000 + idx_sensor * 100 + idx_msg * 0.001
+
+
+def publicador(broker, dispositivos, n_mensagens, t0):
+    for m in range(n_mensagens):
+        ts = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(t0 + m * 60)) + '.000'
+        for idx, device_id in dispositivos:
+            payload = {
+                'device_id': device_id,
+                'transmission_timestamp': ts,
+                'readings': [
+                    {'sensor_type': nome, 'value': valor_esperado(idx, s, m), 'interpolation': interp,
+                     'metadata': {'unit': unidade}}
+                    for s, (nome, interp, unidade) in enumerate(SENSORES)
+                ]
+            }
+            broker.publicar(f'cfe-hydro/{device_id}/data', json.dumps(payload).encode('utf-8'))
+
+
+def leitor(gerenciador, parar, consultas):
+    while not parar.is_set():
+        dispositivos = gerenciador.lista_dispositivos()
+        if not dispositivos:
+            time.sleep(0.001)
+            continue
+        device_id = random.choice(dispositivos)
+        sensor = random.choice(SENSORES)[0]
+        gerenciador.obter_dados_brutos(device_id, sensor, horas=24 * 365)
+        gerenciador.obter_dados_interpolados(device_id, sensor, 20)
+        consultas[0] += 1
+
+
+def main():
+    n_dispositivos = int(sys.argv[1]) if len(sys.argv) > 1 else N_DISPOSITIVOS
+    n_mensagens = int(sys.argv[2]) if len(sys.argv) > 2 else MENSAGENS_POR_DISPOSITIVO
+    logging.basicConfig(level=logging.WARNING)
+
+    gerenciador = GerenciadorDados()
+    cliente = ClienteMQTT(gerenciador, 'localhost', 1883)
+    broker = BrokerLocal()
+    cliente._on_connect(broker.cliente(cliente._on_message), None, None, 0)
+    cliente.fila.iniciar()
+
+    dispositivos = [(i, f'estufa_{i:04d}') for i in range(n_dispositivos)]
+    t0 = time.time() - n_mensagens * 60
+    parar = threading.Event()
+    consultas = [0]
+    leitores = [threading.Thread(target=leitor, args=(gerenciador, parar, consultas), daemon=True)
+                for _ in range(N_LEITORES)]
+    for t in leitores:
+        t.start()
+
+    print("=" * 60)
+    print(f"CARGA: {n_dispositivos} dispositivos x {n_mensagens} mensagens x {len(SENSORES)} sensores")
+    print("=" * 60)
+    inicio = time.perf_counter()
+    publicadores = [
+        threading.Thread(target=publicador, args=(broker, dispositivos[i::N_PUBLICADORES], n_mensagens, t0))
+        for i in range(N_PUBLICADORES)
+    ]
+    for t in publicadores:
+        t.start()
+    for t in publicadores:
+        t.join()
+    broker.fila.join()
+    cliente.fila.parar()  # processa o último lote pendente
+    duracao = time.perf_counter() - inicio
+    parar.set()
+
+    total_pontos = n_dispositivos * n_mensagens * len(SENSORES)
+    print(f"Mensagens entregues : {n_dispositivos * n_mensagens}")
+    print(f"Pontos armazenados  : {gerenciador.messages_received} (esperado {total_pontos})")
+    print(f"Tempo total         : {duracao:.2f} s")
+    print(f"Vazão               : {total_pontos / duracao:,.0f} pontos/s "
+          f"({n_dispositivos * n_mensagens / duracao:,.0f} mensagens/s)")
+    print(f"Consultas paralelas : {consultas[0]} (com {N_LEITORES} leitores)")
+    print(f"Lotes de ingestão   : {cliente.fila.lotes_processados}")
+
+    erros = 0
+    for idx, device_id in dispositivos:
+        for s, (nome, _, _) in enumerate(SENSORES):
+            df = gerenciador.obter_dados_brutos(device_id, nome, horas=24 * 365)
+            esperado = [valor_esperado(idx, s, m) for m in range(n_mensagens)]
+            if len(df) != n_mensagens or any(abs(v - e) > 1e-9 for v, e in zip(df['value'], esperado)):
+                erros += 1
+    print(f"Séries inconsistentes: {erros} de {n_dispositivos * len(SENSORES)}")
+    return 0 if erros == 0 and gerenciador.messages_received == total_pontos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
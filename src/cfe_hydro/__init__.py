@@ -0,0 +1,42 @@
+"""
+Função: Núcleo de processamento do CFE-HYDRO reutilizável fora do dashboard (scripts de análise,
+        benchmarks e jobs sem interface gráfica).
+
+Módulos:
+    cache: cache LRU em disco de reconstruções e métricas, endereçado pelo conteúdo das entradas
+    controle: controle adaptativo da taxa de transmissão por sensor (erro de reconstrução estimado
+              online) e simulação da malha sobre séries amostradas
+    codec: payloads MQTT (decodificação de JSON e timestamps, formato binário com esquema)
+    dados: leitura do dataset CSV (separador ';', vírgula ou ponto decimal), inteira ou em blocos
+    interpolacao: preenchimento vetorizado de lacunas (linear e conservador), pH no espaço [H+] e
+                  interpolação sigmoidal
+    metricas: R², RMSE, MAE, MAPE e erro máximo em lote (reconstruções x amostras) ou acumulados
+             bloco a bloco
+    particoes: exportações CSV em Parquet particionado por dispositivo e dia, leitura com poda de
+               partições e de colunas (requer o pyarrow)
+    previsao: previsão de curto prazo em fluxo (tendência linear, pH no espaço [H+], Holt-Winters
+              com tendência amortecida), com faixa de incerteza
+    reducao: redução de séries longas para gráficos (LTTB e mínimo/máximo por balde de tempo)
+    reconstrucao: simulação de transmissão compressiva e reconstrução esparsa (FISTA/OMP)
+    varredura: simulações de transmissão por intervalo em um pool de processos
+
+Os módulos são carregados sob demanda (cfe_hydro.metricas só é importado quando acessado), e
+dependências pesadas como o pandas só quando uma função precisa delas. Nenhum módulo do pacote
+importa matplotlib, scipy ou streamlit; o pyarrow é opcional (apenas cfe_hydro.particoes).
+"""
+import importlib
+
+MODULOS = ('cache', 'codec', 'controle', 'dados', 'interpolacao', 'metricas', 'particoes', 'previsao',
+           'reducao', 'reconstrucao', 'varredura')
+
+__all__ = list(MODULOS)
+
+
+def __getattr__(nome):
+    if nome in MODULOS:
+        return importlib.import_module(f'{__name__}.{nome}')
+    raise AttributeError(f"módulo {__name__!r} não tem o atributo {nome!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULOS))
@@ -0,0 +1,244 @@
+"""
+Função: Cache em disco, por conteúdo, dos resultados de simulações e interpolações (reconstruções
+        e métricas), compartilhado pelos scripts de análise e pela varredura.
+
+A chave de uma entrada é o hash (SHA-256) de:
+    - o nome do cálculo;
+    - o conteúdo dos arrays de entrada (dtype, forma e bytes);
+    - os parâmetros (método, intervalo, ...), serializados em JSON com as chaves ordenadas; funções
+      entram pelo nome e pelo bytecode, de modo que alterar um método invalida as suas entradas;
+    - o código-fonte do pacote cfe_hydro e VERSAO_CACHE.
+
+Cada entrada é um arquivo com um dict nome -> array, gravado de forma atômica, e pode ser lida e
+gravada por vários processos ao mesmo tempo (pool da varredura). O arquivo é um cabeçalho JSON
+(nome, dtype e forma de cada array) seguido dos bytes dos arrays: uma entrada com dezenas de
+métricas escalares é lida com um único json.loads, sem o custo por array de um .npz, e sem pickle. A
+data de modificação dos arquivos é a ordem LRU: uma leitura a renova, e as entradas menos recentes
+são removidas quando o diretório passa de limite_bytes. Para não listar o diretório a cada gravação,
+cada processo soma o tamanho do que grava e só o relê ao passar do limite (ou a cada
+GRAVACOES_POR_VARREDURA gravações, para contar o que os outros processos gravaram).
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import math
+import uuid
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VERSAO_CACHE = 1                                    # incrementar ao mudar o formato das entradas
+DIRETORIO_CACHE = os.path.join('data', 'cache')     # relativo ao diretório de execução (./src)
+LIMITE_BYTES = 256 * 1024 * 1024                    # tamanho máximo do diretório do cache
+GRAVACOES_POR_VARREDURA = 256                       # gravações entre releituras do diretório
+EXTENSAO = '.res'
+ASSINATURA = b'CFE-HYDRO-CACHE\n'
+
+_DIGITAL_PACOTE = None
+
+
+def _digital_pacote():
+    """Hash do código-fonte do cfe_hydro, calculado uma vez por processo"""
+    global _DIGITAL_PACOTE
+    if _DIGITAL_PACOTE is None:
+        h = hashlib.sha256()
+        for caminho in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+            with open(caminho, 'rb') as f:
+                h.update(os.path.basename(caminho).encode('utf-8') + b'\0' + f.read())
+        _DIGITAL_PACOTE = h.hexdigest()
+    return _DIGITAL_PACOTE
+
+
+def _hash_codigo(codigo, h):
+    # Constantes aninhadas (lambdas, compreensões) entram pelo próprio bytecode: o repr de um
+    # objeto de código traz o endereço de memória, diferente a cada processo
+    h.update(codigo.co_code)
+    for constante in codigo.co_consts:
+        if hasattr(constante, 'co_code'):
+            _hash_codigo(constante, h)
+        else:
+            h.update(repr(constante).encode('utf-8'))
+
+
+def _serializar(valor):
+    """Serialização JSON dos parâmetros que não são tipos básicos (funções, tipos do numpy)"""
+    codigo = getattr(valor, '__code__', None)
+    if codigo is not None:
+        h = hashlib.sha256()
+        _hash_codigo(codigo, h)
+        return f'{valor.__module__}.{valor.__qualname__}:{h.hexdigest()}'
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    if isinstance(valor, (np.ndarray, range)):
+        return np.asarray(valor).tolist()
+    return repr(valor)
+
+
+def digital_arrays(*arrays):
+    """Hash do conteúdo (dtype, forma e bytes) de arrays; aceito em entradas no lugar dos arrays"""
+    h = hashlib.sha256()
+    for array in arrays:
+        array = np.asarray(array)
+        h.update(f'{array.dtype.str}{array.shape}'.encode('utf-8'))
+        h.update(np.ascontiguousarray(array).data)
+    return h.hexdigest()
+
+
+def _codificar(resultado):
+    arrays = {nome: np.asarray(valor) for nome, valor in resultado.items()}
+    for nome, array in arrays.items():
+        if array.dtype.hasobject:
+            raise TypeError(f"Valor '{nome}' não é um array numérico ou de texto ({array.dtype})")
+    cabecalho = json.dumps([[nome, array.dtype.str, list(array.shape)] for nome, array in arrays.items()])
+    return b''.join([ASSINATURA, cabecalho.encode('utf-8'), b'\n'] + [array.tobytes() for array in arrays.values()])
+
+
+def _decodificar(conteudo):
+    """Dict nome -> array de uma entrada (arrays graváveis, sobre o próprio buffer lido)"""
+    if not conteudo.startswith(ASSINATURA):
+        raise ValueError("assinatura ausente")
+    fim = conteudo.index(b'\n', len(ASSINATURA))
+    posicao = fim + 1
+    resultado = {}
+    for nome, dtype, forma in json.loads(conteudo[len(ASSINATURA):fim]):
+        dtype = np.dtype(dtype)
+        quantidade = math.prod(forma)
+        resultado[nome] = np.frombuffer(conteudo, dtype, quantidade, posicao).reshape(forma)
+        posicao += quantidade * dtype.itemsize
+    if posicao != len(conteudo):
+        raise ValueError("tamanho incompatível com o cabeçalho")
+    return resultado
+
+
+class CacheResultados:
+    """
+    Cache LRU em disco de dicts de arrays, endereçado pelo conteúdo das entradas.
+
+    O objeto guarda apenas o diretório e o limite, e pode ser enviado aos processos de um pool.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_CACHE, limite_bytes=LIMITE_BYTES):
+        self.diretorio = diretorio
+        self.limite_bytes = int(limite_bytes)
+        self.acertos = 0
+        self.falhas = 0
+        self._total = None      # bytes estimados no diretório (None: ainda não lido)
+        self._gravacoes = 0
+
+    def chave(self, nome, entradas=(), parametros=None):
+        """
+        Chave de um cálculo.
+
+        Args:
+            nome: Identificação do cálculo (ex.: 'varredura.simular_intervalo').
+            entradas: Arrays de entrada, ou hashes já calculados com digital_arrays().
+            parametros: Dict serializável em JSON (funções e tipos do numpy são aceitos).
+        """
+        h = hashlib.sha256(f'{VERSAO_CACHE}|{_digital_pacote()}|{nome}'.encode('utf-8'))
+        for entrada in entradas:
+            h.update((entrada if isinstance(entrada, str) else digital_arrays(entrada)).encode('utf-8'))
+        h.update(json.dumps(parametros or {}, sort_keys=True, default=_serializar).encode('utf-8'))
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f'{chave}{EXTENSAO}')
+
+    def obter(self, chave):
+        """Dict nome -> array da entrada, ou None se não estiver no cache"""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as f:
+                conteudo = bytearray(f.read())
+            resultado = _decodificar(conteudo)
+            os.utime(caminho)
+        except FileNotFoundError:
+            self.falhas += 1
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            # Entrada corrompida (ex.: disco cheio durante uma gravação antiga): recalcular
+            logger.warning(f"Entrada inválida no cache {caminho}: {e}")
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        return resultado
+
+    def gravar(self, chave, resultado):
+        """Grava um dict nome -> array (escalares viram arrays 0-d) e aplica o limite de tamanho"""
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(chave)
+        temporario = f'{caminho}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(temporario, 'wb') as f:
+                f.write(_codificar(resultado))
+            tamanho = os.path.getsize(temporario)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar no cache {caminho}: {e}")
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            return
+        self._gravacoes += 1
+        if self._total is not None and self._gravacoes % GRAVACOES_POR_VARREDURA:
+            self._total += tamanho
+            if self._total <= self.limite_bytes:
+                return
+        self._aplicar_limite()
+
+    def memorizar(self, nome, entradas, parametros, calcular):
+        """
+        Resultado de calcular() para estas entradas e parâmetros, do cache quando disponível.
+
+        Args:
+            calcular: Função sem argumentos que devolve um dict nome -> array (ou escalar).
+        Returns:
+            Dict nome -> array (arrays 0-d para escalares, tanto no acerto quanto na falha).
+        """
+        chave = self.chave(nome, entradas, parametros)
+        resultado = self.obter(chave)
+        if resultado is None:
+            resultado = {nome_valor: np.asarray(valor) for nome_valor, valor in calcular().items()}
+            self.gravar(chave, resultado)
+        return resultado
+
+    def _entradas(self):
+        """(mtime, tamanho, caminho) das entradas do cache"""
+        entradas = []
+        for caminho in glob.glob(os.path.join(self.diretorio, f'*{EXTENSAO}')):
+            try:
+                estado = os.stat(caminho)
+            except FileNotFoundError:
+                continue  # removida por outro processo
+            entradas.append((estado.st_mtime, estado.st_size, caminho))
+        return entradas
+
+    def tamanho_bytes(self):
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def _aplicar_limite(self):
+        entradas = self._entradas()
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.limite_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+        self._total = total
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        for _, _, caminho in self._entradas():
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+        self._total = 0
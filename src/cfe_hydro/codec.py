@@ -0,0 +1,215 @@
+"""
+Função: Codificação dos payloads MQTT do CFE-HYDRO: decodificação rápida das mensagens JSON (e dos
+        seus timestamps) e o formato binário compacto (esquema enviado uma vez + mensagens de
+        dados). Usado pelo dashboard, pelos benchmarks e por jobs sem interface gráfica.
+
+Formato binário: os metadados estáticos dos sensores (tipo, unidade, descrição, faixa ótima, interpolação e
+escala de quantização) são publicados uma única vez, em JSON, no tópico retido
+cfe-hydro/<device_id>/schema. As mensagens em cfe-hydro/<device_id>/bin trazem apenas:
+
+    cabeçalho (10 bytes, little-endian)
+        B  versão do formato (VERSAO_BINARIO)
+        H  schema_id (identifica o esquema vigente; ver id_esquema)
+        I  epoch base em segundos (UTC)
+        H  milissegundos do epoch base
+        B  número de leituras
+    leitura (5 bytes cada)
+        B  índice do sensor no esquema
+        H  deslocamento em relação ao epoch base, em décimos de segundo
+        h  valor quantizado: valor = q * escala do sensor (VALOR_AUSENTE = leitura ausente)
+
+O codificador equivalente do firmware é CFEHydro::buildBinary (instantâneo) / buildBinaryBatch
+(lote de amostras, cada uma com seu deslocamento) em src/protocolo/cfe-hydro.h.
+"""
+import json
+import struct
+from datetime import datetime, timezone
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+FORMATO_TIMESTAMP = '%Y-%m-%d %H:%M:%S.%f'
+_MAX_DATAS_CACHE = 4096
+_cache_datas = {}  # 'YYYY-mm-dd' -> epoch (s) da meia-noite UTC
+
+
+def decodificar_json(payload):
+    """Decodifica o payload (bytes UTF-8) com orjson, se disponível, ou com o módulo json"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _epoch_data(data_str):
+    epoch = _cache_datas.get(data_str)
+    if epoch is None:
+        # datetime valida a data (mês, dia, ano bissexto); o resultado é reutilizado para o dia inteiro
+        dia = datetime(int(data_str[0:4]), int(data_str[5:7]), int(data_str[8:10]), tzinfo=timezone.utc)
+        epoch = int(dia.timestamp())
+        if len(_cache_datas) >= _MAX_DATAS_CACHE:
+            _cache_datas.clear()
+        _cache_datas[data_str] = epoch
+    return epoch
+
+
+def timestamp_para_ms(valor):
+    """
+    Converte o transmission_timestamp para epoch em milissegundos (UTC).
+
+    Aceita o layout fixo 'YYYY-mm-dd HH:MM:SS.fff' emitido pelo firmware (analisado por posição,
+    sem strptime) e epoch numérico em ms (CFE-Hydro_send.ino). Outros formatos caem no strptime.
+    Levanta ValueError se o valor não puder ser convertido.
+    """
+    if isinstance(valor, bool):
+        raise ValueError(f"timestamp inválido: {valor!r}")
+    if isinstance(valor, (int, float)):
+        return int(valor)
+    s = valor
+    if (len(s) >= 21 and s[4] == '-' and s[7] == '-' and s[10] == ' '
+            and s[13] == ':' and s[16] == ':' and s[19] == '.'):
+        hora, minuto, segundo = int(s[11:13]), int(s[14:16]), int(s[17:19])
+        frac = s[20:]
+        if hora > 23 or minuto > 59 or segundo > 59 or len(frac) > 6 or not frac.isdigit():
+            raise ValueError(f"timestamp inválido: {s!r}")
+        ms = int(frac[:3].ljust(3, '0'))
+        return (_epoch_data(s[:10]) + hora * 3600 + minuto * 60 + segundo) * 1000 + ms
+    dt = datetime.strptime(s, FORMATO_TIMESTAMP).replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+VERSAO_BINARIO = 1
+ESCALA_PADRAO = 0.01        # resolução padrão da quantização (unidade do sensor)
+VALOR_AUSENTE = -32768
+RESOLUCAO_DELTA_MS = 100    # deslocamentos em décimos de segundo (até ~109 min)
+
+_CABECALHO = struct.Struct('<BHIHB')
+_LEITURA = struct.Struct('<BHh')
+
+
+def id_esquema(sensores):
+    """
+    Identificador de 16 bits do esquema: FNV-1a 32 bits dobrado, sobre os campos de cada sensor
+    (strings UTF-8 terminadas em zero e float32 de optimal_min, optimal_max e escala).
+    Deve coincidir com CFEHydro::schemaId do firmware.
+    """
+    h = 0x811C9DC5
+    for s in sensores:
+        meta = s.get('metadata', {})
+        dados = b''.join(str(campo).encode('utf-8') + b'\0' for campo in (
+            s['sensor_type'], meta.get('unit', ''), meta.get('description', ''), s.get('interpolation', 'linear')))
+        dados += struct.pack('<fff', meta.get('optimal_min', 0.0), meta.get('optimal_max', 0.0),
+                             s.get('scale', ESCALA_PADRAO))
+        for byte in dados:
+            h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return (h >> 16) ^ (h & 0xFFFF)
+
+
+class EsquemaBinario:
+    """
+    Metadados estáticos de um dispositivo, como publicados no tópico de esquema.
+
+    Args:
+        sensores: Lista de dicts {'sensor_type', 'interpolation', 'scale', 'metadata': {...}},
+                  na ordem dos índices usados nas mensagens binárias.
+        schema_id: Identificador anunciado; calculado com id_esquema se omitido.
+    """
+
+    def __init__(self, sensores, device_id=None, sampling_interval=None, transmission_interval=None,
+                 schema_id=None):
+        if not sensores or len(sensores) > 255:
+            raise ValueError("O esquema deve ter entre 1 e 255 sensores")
+        self.sensores = []
+        for s in sensores:
+            if not s.get('sensor_type'):
+                raise ValueError(f"Sensor sem sensor_type no esquema: {s}")
+            escala = float(s.get('scale') or ESCALA_PADRAO)
+            if escala <= 0:
+                raise ValueError(f"Escala inválida para {s['sensor_type']}: {escala}")
+            self.sensores.append({
+                'sensor_type': s['sensor_type'],
+                'interpolation': s.get('interpolation', 'linear'),
+                'scale': escala,
+                'metadata': dict(s.get('metadata', {})),
+            })
+        self.device_id = device_id
+        self.sampling_interval = sampling_interval
+        self.transmission_interval = transmission_interval
+        self.schema_id = id_esquema(self.sensores) if schema_id is None else int(schema_id)
+        self.escalas = [s['scale'] for s in self.sensores]
+
+    @classmethod
+    def de_json(cls, payload):
+        """Constrói o esquema a partir do payload (bytes ou str) publicado no tópico de esquema"""
+        data = json.loads(payload)
+        return cls(data['sensors'], device_id=data.get('device_id'),
+                   sampling_interval=data.get('sampling_interval'),
+                   transmission_interval=data.get('transmission_interval'),
+                   schema_id=data.get('schema_id'))
+
+    def para_json(self):
+        return json.dumps({
+            'schema_id': self.schema_id,
+            'device_id': self.device_id,
+            'sampling_interval': self.sampling_interval,
+            'transmission_interval': self.transmission_interval,
+            'sensors': self.sensores,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def indice(self, sensor_type):
+        for i, s in enumerate(self.sensores):
+            if s['sensor_type'] == sensor_type:
+                return i
+        raise KeyError(sensor_type)
+
+
+def codificar_binario(esquema, epoch_ms, leituras):
+    """
+    Codifica uma mensagem de dados.
+
+    Args:
+        esquema: EsquemaBinario vigente.
+        epoch_ms: Timestamp base (UTC, ms).
+        leituras: Iterável de (índice do sensor, deslocamento em ms, valor); valores NaN ou fora
+                  da faixa de int16 são enviados como VALOR_AUSENTE.
+    """
+    leituras = list(leituras)
+    if len(leituras) > 255:
+        raise ValueError("Uma mensagem binária comporta no máximo 255 leituras")
+    segundos, ms = divmod(int(epoch_ms), 1000)
+    partes = [_CABECALHO.pack(VERSAO_BINARIO, esquema.schema_id, segundos, ms, len(leituras))]
+    for indice, delta_ms, valor in leituras:
+        q = round(valor / esquema.sensores[indice]['scale']) if valor == valor else VALOR_AUSENTE
+        partes.append(_LEITURA.pack(indice, round(delta_ms / RESOLUCAO_DELTA_MS),
+                                    q if VALOR_AUSENTE < q <= 32767 else VALOR_AUSENTE))
+    return b''.join(partes)
+
+
+def decodificar_binario(payload, esquema):
+    """
+    Decodifica uma mensagem de dados.
+
+    Returns:
+        Lista de (timestamp_ms, índice do sensor, valor), sem as leituras ausentes.
+    Raises:
+        ValueError: versão desconhecida, schema_id diferente do esquema ou tamanho inconsistente.
+    """
+    if len(payload) < _CABECALHO.size:
+        raise ValueError(f"Mensagem binária truncada ({len(payload)} bytes)")
+    versao, schema_id, segundos, ms, n = _CABECALHO.unpack_from(payload)
+    if versao != VERSAO_BINARIO:
+        raise ValueError(f"Versão de formato binário desconhecida: {versao}")
+    if schema_id != esquema.schema_id:
+        raise ValueError(f"schema_id {schema_id} não corresponde ao esquema vigente ({esquema.schema_id})")
+    if len(payload) != _CABECALHO.size + n * _LEITURA.size:
+        raise ValueError(f"Tamanho inconsistente: {len(payload)} bytes para {n} leituras")
+    base_ms = segundos * 1000 + ms
+    escalas = esquema.escalas
+    if len(payload) > _CABECALHO.size and max(payload[_CABECALHO.size::_LEITURA.size]) >= len(escalas):
+        raise ValueError("Índice de sensor fora do esquema")
+    # struct é mais rápido que np.frombuffer para as poucas leituras de uma mensagem
+    return [(base_ms + delta * RESOLUCAO_DELTA_MS, indice, q * escalas[indice])
+            for indice, delta, q in _LEITURA.iter_unpack(memoryview(payload)[_CABECALHO.size:])
+            if q != VALOR_AUSENTE]
@@ -0,0 +1,200 @@
+"""
+Função: Controle adaptativo da taxa de transmissão por sensor. O receptor estima online o erro de
+        reconstrução de cada sensor e recomenda o passo de transmissão (1 amostra a cada N), que o
+        firmware aplica dentro dos seus limites (cfe-hydro.h, applyControl): a banda é gasta só
+        quando o sinal muda rápido.
+
+O erro é estimado apenas com as leituras recebidas, deixando uma de fora: cada leitura é comparada
+à interpolação entre a anterior e a seguinte (no espaço [H+] para o pH, como
+cfe_hydro.interpolacao.interpolar_ph; linear para os demais métodos). É o erro que a reconstrução
+teria com o dobro do passo atual, portanto um limite superior para o erro com o passo atual + 1.
+
+A regra é AIMD (aumento aditivo, redução multiplicativa), como no controle de congestionamento:
+com LEITURAS_POR_DECISAO erros seguidos dentro da tolerância o passo cresce de 1; um único erro
+acima de FATOR_REACAO x tolerância (o sinal mudou de ritmo) corta o passo pela metade. Entre os
+dois, o passo se mantém. É a versão em malha fechada da escolha offline do melhor intervalo por
+parâmetro (AnalisadorInterpolacaoCorrigido._encontrar_melhores_intervalos_eficiencia).
+
+Como toda decisão vem de leituras já transmitidas, o início de um episódio rápido só é percebido
+na leitura seguinte, e oscilações com período próximo de um múltiplo do passo (ou menor que o
+dobro dele) podem passar despercebidas (aliasing); PASSO_MAXIMO limita esse espaçamento.
+
+simular() reproduz a malha sobre uma série amostrada (dataset ou sintética) no formato binário do
+firmware, para comparar os bytes transmitidos e o erro com os passos fixos.
+"""
+import math
+
+import numpy as np
+
+from cfe_hydro.interpolacao import H_MINIMO, interpolar_ph, preencher_lacunas
+from cfe_hydro.metricas import calcular_metricas
+
+PASSO_MINIMO = 1                # todas as amostras (CFE_PASSO_MINIMO no firmware)
+PASSO_MAXIMO = 30               # 1 a cada 30 amostras (CFE_PASSO_MAXIMO no firmware)
+LEITURAS_POR_DECISAO = 3        # erros seguidos dentro da tolerância para aumentar o passo
+FATOR_REACAO = 2.0              # erro acima de FATOR_REACAO x tolerância reduz o passo à metade
+# Erro de reconstrução aceito por sensor, na unidade da leitura (ordem da exatidão das sondas);
+# sensores sem entrada usam TOLERANCIA_RELATIVA do primeiro valor recebido
+TOLERANCIAS_PADRAO = {'temperatura': 0.2, 'ph': 0.1, 'ec': 0.05, 'od': 0.1}
+TOLERANCIA_RELATIVA = 0.01
+
+# Formato binário do firmware (cfe-hydro.h)
+BYTES_CABECALHO = 10
+BYTES_LEITURA = 5
+AMOSTRAS_POR_LOTE = 6           # amostras por envio no cfe-hydro_publisher.ino (60 s / 10 s)
+
+
+def tolerancia_padrao(sensor_type, valor, tolerancias=None):
+    """Tolerância configurada para o sensor ou, sem configuração, relativa ao valor informado"""
+    tolerancias = TOLERANCIAS_PADRAO if tolerancias is None else tolerancias
+    if sensor_type in tolerancias:
+        return float(tolerancias[sensor_type])
+    return max(abs(float(valor)) * TOLERANCIA_RELATIVA, 1e-9)
+
+
+class ControladorTaxa:
+    """
+    Malha de um sensor: recebe as leituras transmitidas, em ordem, e recomenda o passo.
+
+    Args:
+        tolerancia: Erro de reconstrução aceito, na unidade da leitura.
+        metodo: Tipo de interpolação declarado pelo sensor ('logarithmic' estima no espaço [H+]).
+        passo_minimo, passo_maximo: Limites do passo recomendado.
+    """
+
+    def __init__(self, tolerancia, metodo='linear', passo_minimo=PASSO_MINIMO, passo_maximo=PASSO_MAXIMO,
+                 leituras_por_decisao=LEITURAS_POR_DECISAO, fator_reacao=FATOR_REACAO):
+        if tolerancia <= 0:
+            raise ValueError("A tolerância deve ser > 0")
+        self.tolerancia = float(tolerancia)
+        self.metodo = metodo
+        self.passo_minimo = max(1, int(passo_minimo))
+        self.passo_maximo = max(self.passo_minimo, int(passo_maximo))
+        self.leituras_por_decisao = leituras_por_decisao
+        self.fator_reacao = fator_reacao
+        self.passo = self.passo_minimo
+        self.ultimo_erro = math.nan
+        self._leituras = []         # até 3 leituras (t, v): anterior, central e seguinte
+        self._dentro = 0            # erros seguidos dentro da tolerância
+
+    @property
+    def razao(self):
+        """Fração das amostras transmitidas (o campo transmission_ratio da mensagem de controle)"""
+        return 1.0 / self.passo
+
+    def atualizar(self, timestamp_ms, valor):
+        """Incorpora uma leitura recebida; retorna True se o passo recomendado mudou"""
+        if not math.isfinite(valor) or (self._leituras and timestamp_ms <= self._leituras[-1][0]):
+            return False
+        leituras = self._leituras
+        leituras.append((timestamp_ms, valor))
+        if len(leituras) < 3:
+            return False
+        if len(leituras) > 3:
+            del leituras[0]
+        erro = self.ultimo_erro = _erro_deixando_um_de_fora(leituras, self.metodo == 'logarithmic')
+
+        if erro > self.fator_reacao * self.tolerancia:
+            novo = max(self.passo_minimo, self.passo // 2)
+        elif erro <= self.tolerancia:
+            self._dentro += 1
+            if self._dentro < self.leituras_por_decisao:
+                return False
+            novo = min(self.passo_maximo, self.passo + 1)
+        else:
+            self._dentro = 0
+            return False
+        self._dentro = 0
+        if novo == self.passo:
+            return False
+        self.passo = novo
+        # As próximas leituras chegam com o novo espaçamento: a janela recomeça da última
+        del leituras[:-1]
+        return True
+
+
+def _erro_deixando_um_de_fora(leituras, log):
+    (t0, v0), (t1, v1), (t2, v2) = leituras
+    fracao = (t1 - t0) / (t2 - t0)
+    if log:
+        h0, h2 = 10.0 ** -v0, 10.0 ** -v2
+        estimado = -math.log10(max(h0 + (h2 - h0) * fracao, H_MINIMO))
+    else:
+        estimado = v0 + (v2 - v0) * fracao
+    return abs(v1 - estimado)
+
+
+def reconstruir(timestamps_ms, valores, transmitidas, metodo='linear'):
+    """Reconstrução das amostras não transmitidas, sem extrapolar além das transmitidas das bordas"""
+    simulados = np.where(transmitidas, valores, np.nan)
+    if metodo != 'logarithmic':
+        return preencher_lacunas(timestamps_ms, simulados)
+    conhecidas = np.flatnonzero(np.isfinite(simulados))
+    resultado = np.full(len(valores), np.nan)
+    if len(conhecidas):
+        faixa = slice(conhecidas[0], conhecidas[-1] + 1)
+        resultado[faixa] = interpolar_ph(timestamps_ms[conhecidas], simulados[conhecidas], timestamps_ms[faixa])
+    return resultado
+
+
+def simular(timestamps_ms, series, metodos=None, tolerancias=None, passo_fixo=None,
+            amostras_por_lote=AMOSTRAS_POR_LOTE, passo_minimo=PASSO_MINIMO, passo_maximo=PASSO_MAXIMO):
+    """
+    Reproduz o envio em lotes do firmware com a malha de controle (ou com um passo fixo).
+
+    As amostras são numeradas como no firmware (a amostra j leva o sensor quando j % passo == 0) e
+    cada lote usa os passos recomendados depois do lote anterior, como quando a mensagem de
+    controle chega entre dois envios. Lotes sem nenhuma leitura não são enviados.
+
+    Args:
+        timestamps_ms: Instante de cada amostra (n,), crescente.
+        series: Dict sensor_type -> valores (n,), amostrados juntos (NaN = leitura inválida).
+        metodos: Dict sensor_type -> tipo de interpolação ('linear' para os ausentes).
+        tolerancias: Dict sensor_type -> tolerância (padrão: TOLERANCIAS_PADRAO).
+        passo_fixo: Se informado, todos os sensores usam esse passo, sem controle.
+    Returns:
+        Dict com 'bytes', 'mensagens', 'leituras' e 'sensores': sensor_type -> dict com
+        'transmitidas', 'passo_medio' (amostras por leitura transmitida), 'mudancas' de passo e as
+        métricas de calcular_metricas da reconstrução contra a série completa.
+    """
+    timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+    n = len(timestamps_ms)
+    metodos = metodos or {}
+    nomes = list(series)
+    valores = {s: np.asarray(series[s], dtype=np.float64) for s in nomes}
+    controladores = {}
+    if passo_fixo is None:
+        for s in nomes:
+            finitos = valores[s][np.isfinite(valores[s])]
+            tolerancia = tolerancia_padrao(s, finitos[0] if len(finitos) else 0.0, tolerancias)
+            controladores[s] = ControladorTaxa(tolerancia, metodos.get(s, 'linear'), passo_minimo, passo_maximo)
+    transmitidas = {s: np.zeros(n, dtype=bool) for s in nomes}
+    mudancas = dict.fromkeys(nomes, 0)
+    total_bytes = mensagens = 0
+
+    indices = np.arange(n)
+    for inicio in range(0, n, amostras_por_lote):
+        lote = indices[inicio:inicio + amostras_por_lote]
+        leituras = 0
+        for s in nomes:
+            passo = passo_fixo if passo_fixo is not None else controladores[s].passo
+            enviadas = lote[lote % passo == 0]
+            transmitidas[s][enviadas] = True
+            leituras += len(enviadas)
+            controlador = controladores.get(s)
+            if controlador is not None:
+                for t, v in zip(timestamps_ms[enviadas].tolist(), valores[s][enviadas].tolist()):
+                    mudancas[s] += controlador.atualizar(t, v)
+        if leituras:
+            mensagens += 1
+            total_bytes += BYTES_CABECALHO + leituras * BYTES_LEITURA
+
+    resultado = {'bytes': total_bytes, 'mensagens': mensagens,
+                 'leituras': int(sum(m.sum() for m in transmitidas.values())), 'sensores': {}}
+    for s in nomes:
+        reconstrucao = reconstruir(timestamps_ms, valores[s], transmitidas[s], metodos.get(s, 'linear'))
+        enviadas = int(transmitidas[s].sum())
+        resultado['sensores'][s] = dict(
+            calcular_metricas(valores[s], reconstrucao),
+            transmitidas=enviadas, passo_medio=n / enviadas if enviadas else math.inf, mudancas=mudancas[s])
+    return resultado
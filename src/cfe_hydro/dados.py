@@ -0,0 +1,268 @@
+"""
+Função: Leitura do dataset do CFE-HYDRO (data/dataset_cfe-hydro.csv e exportações no mesmo
+        formato: separador ';', colunas id;timestamp;temperatura;ph;ec;od, ponto ou vírgula
+        decimal e timestamps dd/mm/YYYY HH:MM), compartilhada pelos scripts de análise e pela
+        varredura de simulações.
+
+ler_blocos() lê exportações de qualquer tamanho com memória limitada: o arquivo é lido em pedaços
+de TAMANHO_LEITURA bytes cortados em fim de linha, a vírgula decimal vira ponto com um único
+bytes.replace por pedaço (';' é o separador, então toda vírgula é decimal) e cada pedaço é
+convertido pelo parser em C do pandas direto para os tipos finais (id e timestamp int64, parâmetros
+float32), sem a etapa intermediária de strings. Os dados saem em blocos de linhas_por_bloco linhas.
+
+carregar_colunas(), carregar_matriz() e ler_parametro() também aceitam, no lugar do CSV, a raiz de
+um dataset Parquet particionado por dispositivo e dia (cfe_hydro.particoes), e então leem apenas as
+colunas pedidas e os dias do intervalo [inicio, fim). O caminho padrão dos scripts de análise
+(DATASET_PADRAO) pode ser trocado pela variável de ambiente CFE_HYDRO_DATASET.
+
+O pandas é importado apenas quando um arquivo é lido, para que importar este módulo (ou o pacote)
+não pese no início de jobs que não leem CSV.
+"""
+import io
+import os
+
+import numpy as np
+
+PARAMETROS = ['temperatura', 'ph', 'ec', 'od']
+COLUNAS_NUMERICAS = ['id'] + PARAMETROS
+FORMATO_TIMESTAMP = '%d/%m/%Y %H:%M'
+DATASET_PADRAO = os.environ.get('CFE_HYDRO_DATASET', './data/dataset_cfe-hydro.csv')  # CSV ou raiz Parquet
+
+LINHAS_POR_BLOCO = 1_000_000            # linhas de cada bloco de ler_blocos
+TAMANHO_LEITURA = 16 * 1024 * 1024      # bytes lidos do arquivo por vez
+ID_INVALIDO = -1                        # id vazio ou não numérico
+TIMESTAMP_INVALIDO = np.iinfo(np.int64).min  # timestamp vazio ou fora de FORMATO_TIMESTAMP (= NaT)
+
+
+def carregar_dataframe(caminho=DATASET_PADRAO, converter_timestamp=True):
+    """
+    Lê um CSV do CFE-HYDRO como DataFrame, com as colunas numéricas convertidas para float
+    (vírgula decimal aceita; valores inválidos viram NaN).
+
+    Args:
+        caminho: Arquivo CSV.
+        converter_timestamp: Converte a coluna timestamp (FORMATO_TIMESTAMP) para datetime;
+                             valores fora do formato viram NaT.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(caminho, sep=';', dtype=str, encoding='utf-8')
+    for coluna in COLUNAS_NUMERICAS:
+        if coluna in df.columns:
+            df[coluna] = pd.to_numeric(df[coluna].str.replace(',', '.', regex=False), errors='coerce')
+    if converter_timestamp and 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format=FORMATO_TIMESTAMP, errors='coerce')
+    return df
+
+
+def _ler_cabecalho(arquivo):
+    """Nomes das colunas (minúsculas) da primeira linha de um arquivo aberto em modo binário"""
+    return [nome.strip().lower() for nome in arquivo.readline().decode('utf-8-sig').split(';')]
+
+
+def _ler_pedacos(arquivo, tamanho_leitura):
+    """Pedaços (bytes) do restante do arquivo, cada um terminado em fim de linha"""
+    resto = b''
+    while True:
+        dados = arquivo.read(tamanho_leitura)
+        if not dados:
+            break
+        dados = resto + dados
+        corte = dados.rfind(b'\n') + 1
+        resto = dados[corte:]
+        if corte:
+            yield dados[:corte]
+    if resto.strip():
+        yield resto
+
+
+def _timestamps_ms(textos):
+    """
+    ms desde a época (int64, UTC) de textos no FORMATO_TIMESTAMP. O layout fixo dd/mm/YYYY HH:MM é
+    analisado por posição, vetorizado; os demais textos (ex.: sem zeros à esquerda) passam pelo
+    pd.to_datetime, e os inválidos viram TIMESTAMP_INVALIDO.
+    """
+    import pandas as pd
+
+    textos = np.asarray(textos, dtype=object)
+    resultado = np.full(len(textos), TIMESTAMP_INVALIDO, dtype=np.int64)
+    try:
+        # 17 bytes: o 17º é zero apenas nos textos com no máximo 16 caracteres
+        brutos = textos.astype('S17').view(np.uint8).reshape(len(textos), 17)
+    except (UnicodeEncodeError, ValueError):
+        fixo = np.zeros(len(textos), dtype=bool)
+    else:
+        d = brutos[:, :16].astype(np.int64) - ord('0')
+        fixo = ((brutos[:, 16] == 0) & (brutos[:, 2] == ord('/')) & (brutos[:, 5] == ord('/'))
+                & (brutos[:, 10] == ord(' ')) & (brutos[:, 13] == ord(':')))
+        fixo &= ((d[:, [0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15]] >= 0)
+                 & (d[:, [0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15]] <= 9)).all(axis=1)
+        dia, mes = d[:, 0] * 10 + d[:, 1], d[:, 3] * 10 + d[:, 4]
+        ano = d[:, 6] * 1000 + d[:, 7] * 100 + d[:, 8] * 10 + d[:, 9]
+        hora, minuto = d[:, 11] * 10 + d[:, 12], d[:, 14] * 10 + d[:, 15]
+        fixo &= (mes >= 1) & (mes <= 12) & (dia >= 1) & (hora <= 23) & (minuto <= 59)
+        meses = np.where(fixo, (ano - 1970) * 12 + mes - 1, 0)
+        inicio_mes = meses.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+        fim_mes = (meses + 1).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+        fixo &= dia <= fim_mes - inicio_mes
+        ms = ((inicio_mes + dia - 1) * 86400 + hora * 3600 + minuto * 60) * 1000
+        resultado[fixo] = ms[fixo]
+    outros = np.flatnonzero(~fixo)
+    if len(outros):
+        datas = pd.to_datetime(pd.Series(textos[outros]), format=FORMATO_TIMESTAMP, errors='coerce')
+        resultado[outros] = datas.to_numpy(dtype='datetime64[ms]').view(np.int64)
+    return resultado
+
+
+def _converter_pedaco(pedaco, nomes, colunas, dtype_valores):
+    """Dict coluna -> array de um pedaço do CSV (sem cabeçalho); linhas com campos a mais são ignoradas"""
+    import pandas as pd
+
+    pedaco = pedaco.replace(b',', b'.')
+    presentes = [coluna for coluna in colunas if coluna in nomes]
+    opcoes = dict(sep=';', header=None, names=nomes, usecols=presentes, on_bad_lines='skip', engine='c')
+    tipos = {coluna: np.int64 if coluna == 'id' else dtype_valores for coluna in presentes if coluna != 'timestamp'}
+    try:
+        # Caminho rápido: o parser converte direto para os tipos finais
+        df = pd.read_csv(io.BytesIO(pedaco), dtype={**tipos, 'timestamp': str}, **opcoes)
+    except ValueError:
+        # Algum valor vazio ou não numérico (ex.: id ausente, 'erro'): conversão tolerante, com NaN
+        df = pd.read_csv(io.BytesIO(pedaco), dtype=str, **opcoes)
+        for coluna in tipos:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce')
+
+    blocos = {}
+    for coluna in presentes:
+        if coluna == 'timestamp':
+            blocos[coluna] = _timestamps_ms(df[coluna].to_numpy(dtype=object))
+        elif coluna == 'id' and df[coluna].dtype != np.int64:
+            blocos[coluna] = df[coluna].fillna(ID_INVALIDO).to_numpy(dtype=np.int64)
+        else:
+            blocos[coluna] = df[coluna].to_numpy(dtype=tipos[coluna])
+    return blocos, len(df)
+
+
+def ler_blocos(caminho=DATASET_PADRAO, colunas=None, linhas_por_bloco=LINHAS_POR_BLOCO, dtype_valores=np.float32,
+               tamanho_leitura=TAMANHO_LEITURA):
+    """
+    Lê um CSV do CFE-HYDRO em blocos de tamanho fixo, com memória limitada ao tamanho dos pedaços.
+
+    Args:
+        caminho: Arquivo CSV (cabeçalho na primeira linha; nomes sem diferenciar maiúsculas).
+        colunas: Colunas desejadas (padrão: id, timestamp e PARAMETROS); as ausentes no arquivo são
+                 omitidas, exceto id, numerado a partir de 1 quando não existe.
+        linhas_por_bloco: Linhas de cada bloco (o último pode ter menos).
+        dtype_valores: Tipo dos parâmetros (float32 por padrão; float64 para as simulações).
+    Yields:
+        Dict coluna -> array: id (int64, ID_INVALIDO se inválido), timestamp (int64, ms desde a
+        época tratando FORMATO_TIMESTAMP como UTC; TIMESTAMP_INVALIDO se inválido) e parâmetros
+        (dtype_valores, NaN se inválidos).
+    """
+    if linhas_por_bloco < 1:
+        raise ValueError(f"linhas_por_bloco deve ser positivo: {linhas_por_bloco}")
+    colunas = ['id', 'timestamp'] + PARAMETROS if colunas is None else list(colunas)
+    with open(caminho, 'rb') as arquivo:
+        nomes = _ler_cabecalho(arquivo)
+        numerar_ids = 'id' in colunas and 'id' not in nomes
+        linhas = 0
+        pendentes = []
+        n_pendentes = 0
+        for pedaco in _ler_pedacos(arquivo, tamanho_leitura):
+            blocos, n = _converter_pedaco(pedaco, nomes, colunas, dtype_valores)
+            if numerar_ids:
+                blocos['id'] = np.arange(linhas + 1, linhas + n + 1, dtype=np.int64)
+            linhas += n
+            pendentes.append(blocos)
+            n_pendentes += n
+            if n_pendentes < linhas_por_bloco:
+                continue
+            juntos = {coluna: np.concatenate([p[coluna] for p in pendentes]) for coluna in pendentes[0]}
+            inicio = 0
+            while n_pendentes - inicio >= linhas_por_bloco:
+                yield {coluna: valores[inicio:inicio + linhas_por_bloco] for coluna, valores in juntos.items()}
+                inicio += linhas_por_bloco
+            pendentes = [{coluna: valores[inicio:] for coluna, valores in juntos.items()}]
+            n_pendentes -= inicio
+        if n_pendentes:
+            yield {coluna: np.concatenate([p[coluna] for p in pendentes]) for coluna in pendentes[0]}
+
+
+def instante_ms(valor):
+    """ms desde a época (UTC) de uma data/instante: texto ISO, datetime, np.datetime64 ou ms (int)"""
+    if valor is None:
+        return None
+    if isinstance(valor, (int, np.integer)):
+        return int(valor)
+    return int(np.datetime64(valor, 'ms').astype(np.int64))
+
+
+def _nomes_colunas(caminho):
+    """Colunas de um CSV (cabeçalho) ou de um dataset particionado"""
+    if os.path.isdir(caminho):
+        from .particoes import COLUNAS
+        return list(COLUNAS)
+    with open(caminho, 'rb') as arquivo:
+        return _ler_cabecalho(arquivo)
+
+
+def carregar_colunas(caminho=DATASET_PADRAO, colunas=None, dtype_valores=np.float32, inicio=None, fim=None,
+                     dispositivos=None):
+    """
+    Arquivo inteiro como dict coluna -> array, nos tipos de ler_blocos (sem DataFrame nem strings
+    intermediárias). Um arquivo sem linhas de dados devolve arrays vazios.
+
+    Args:
+        caminho: CSV ou raiz de um dataset particionado (cfe_hydro.particoes.ler_particoes).
+        inicio, fim: Intervalo de tempo [inicio, fim) (texto ISO, datetime, np.datetime64 ou ms);
+                     em um CSV, as linhas fora dele são descartadas depois da leitura.
+        dispositivos: Dispositivos a ler (apenas datasets particionados).
+    """
+    if os.path.isdir(caminho):
+        from .particoes import ler_particoes
+        return ler_particoes(caminho, colunas, dispositivos, inicio, fim, dtype_valores)
+    colunas = ['id', 'timestamp'] + PARAMETROS if colunas is None else list(colunas)
+    filtrar = inicio is not None or fim is not None
+    lidas = colunas + ['timestamp'] if filtrar and 'timestamp' not in colunas else colunas
+    partes = list(ler_blocos(caminho, lidas, dtype_valores=dtype_valores))
+    if not partes:
+        nomes = _nomes_colunas(caminho)
+        return {coluna: np.empty(0, dtype=dtype_valores if coluna in PARAMETROS else np.int64)
+                for coluna in colunas if coluna in nomes or coluna == 'id'}
+    if len(partes) == 1:
+        dados = partes[0]
+    else:
+        dados = {coluna: np.concatenate([parte[coluna] for parte in partes]) for coluna in partes[0]}
+    if filtrar and 'timestamp' in dados:
+        manter = dados['timestamp'] != TIMESTAMP_INVALIDO
+        if inicio is not None:
+            manter &= dados['timestamp'] >= instante_ms(inicio)
+        if fim is not None:
+            manter &= dados['timestamp'] < instante_ms(fim)
+        dados = {coluna: valores[manter] for coluna, valores in dados.items() if coluna in colunas}
+    return dados
+
+
+def carregar_matriz(caminho=DATASET_PADRAO, parametros=PARAMETROS, inicio=None, fim=None, dispositivos=None):
+    """
+    Lê um CSV do CFE-HYDRO (ou um dataset particionado) como matriz para as simulações.
+
+    Returns:
+        Matriz float64 (1 + len(parametros), n): linha 0 com os ids, demais com os parâmetros
+        (NaN para colunas ausentes).
+    """
+    dados = carregar_colunas(caminho, ['id'] + list(parametros), np.float64, inicio, fim, dispositivos)
+    n = len(dados['id'])
+    matriz = np.full((1 + len(parametros), n), np.nan)
+    matriz[0] = np.where(dados['id'] == ID_INVALIDO, np.nan, dados['id'])
+    for linha, coluna in enumerate(parametros, start=1):
+        if coluna in dados:
+            matriz[linha] = dados[coluna]
+    return matriz
+
+
+def ler_parametro(caminho=DATASET_PADRAO, parametro='ph', inicio=None, fim=None, dispositivos=None):
+    """Valores (float64) de um parâmetro do dataset (CSV ou particionado); o nome da coluna não diferencia maiúsculas"""
+    dados = carregar_colunas(caminho, [parametro.lower()], np.float64, inicio, fim, dispositivos)
+    if parametro.lower() not in dados:
+        raise KeyError(f"Coluna '{parametro}' não encontrada em '{caminho}' (colunas: {_nomes_colunas(caminho)})")
+    return dados[parametro.lower()]
@@ -0,0 +1,282 @@
+"""
+Função: Interpolação vetorizada (NumPy) compartilhada pelo dashboard, pelos scripts de análise e
+        pela varredura de simulações: lacunas de séries com amostras ausentes (NaN), pH no espaço
+        da concentração [H+] e interpolação sigmoidal (ajuste logístico por janelas deslizantes),
+        as duas últimas sobre tempos irregulares.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+JANELA_SIGMOIDAL = 6            # pontos conhecidos por ajuste: o segmento e 2 vizinhos de cada lado
+R2_MINIMO_SIGMOIDAL = 0.9       # ajustes piores que isso usam interpolação linear no segmento
+_GRADE_T0 = np.linspace(-0.25, 1.25, 13)    # centro da logística, relativo à janela [0, 1]
+# Inclinação, na escala da janela normalizada, até K_MAXIMO * (W - 1): a transição mais abrupta
+# ocupa cerca de meio segmento. Sem esse limite, uma transição entre duas amostras vira um degrau
+# em posição arbitrária dentro do segmento (o ajuste não tem como localizá-lo).
+_GRADE_K = np.geomspace(1.0 / 9.0, 1.0, 8)
+K_MAXIMO = 9.0
+_REFINAMENTOS = 2              # passadas de grade 5 x 5, cada uma com metade do passo da anterior
+_LOTE_AJUSTE = 1024             # janelas ajustadas por vez (limita a memória da grade)
+H_MINIMO = 1e-14                # [H+] de pH 14: piso antes de voltar ao pH (evita log10(0) = -inf)
+
+
+def para_float64(valores):
+    """Converte para float64; strings com vírgula decimal são aceitas e valores inválidos viram NaN"""
+    try:
+        return np.asarray(valores, dtype=np.float64)
+    except (ValueError, TypeError):
+        convertidos = []
+        for x in valores:
+            try:
+                convertidos.append(float(str(x).replace(',', '.')) if x is not None else float('nan'))
+            except ValueError:
+                convertidos.append(float('nan'))
+        return np.array(convertidos, dtype=np.float64)
+
+
+def preencher_lacunas(ids, valores, max_gap=None):
+    """
+    Interpola linearmente (em função de ids) as lacunas entre valores conhecidos consecutivos,
+    sem extrapolar antes do primeiro nem depois do último valor conhecido.
+
+    Args:
+        ids: Abscissas de cada amostra (mesmo comprimento de valores).
+        valores: Série com NaN nas amostras ausentes.
+        max_gap: Se informado, só preenche lacunas cujos valores conhecidos estão a no máximo
+                 max_gap posições de distância (interpolação conservadora).
+    Returns:
+        Novo array float64.
+    """
+    ids = para_float64(ids)
+    valores = para_float64(valores)
+    resultado = valores.copy()
+    conhecidos = np.flatnonzero(~np.isnan(valores))
+    if len(conhecidos) < 2:
+        return resultado
+
+    tamanho = np.diff(conhecidos)
+    preencher = tamanho > 1 if max_gap is None else (tamanho > 1) & (tamanho <= max_gap)
+    inicio = conhecidos[:-1][preencher]
+    fim = conhecidos[1:][preencher]
+    faltantes = tamanho[preencher] - 1
+    if len(faltantes) == 0:
+        return resultado
+
+    # Posições de cada lacuna (inicio+1 .. fim-1) e os parâmetros do seu segmento repetidos
+    deslocamento = inicio + 1 - (np.cumsum(faltantes) - faltantes)
+    posicoes = np.arange(faltantes.sum()) + np.repeat(deslocamento, faltantes)
+    id_inicio, valor_inicio = ids[inicio], valores[inicio]
+
+    # Mesma ordem de operações da versão escalar: v0 + (v1 - v0) * ((id - id0) / (id1 - id0)),
+    # para resultados idênticos bit a bit
+    fator = ids[posicoes] - np.repeat(id_inicio, faltantes)
+    fator /= np.repeat(ids[fim] - id_inicio, faltantes)
+    fator *= np.repeat(valores[fim] - valor_inicio, faltantes)
+    fator += np.repeat(valor_inicio, faltantes)
+    resultado[posicoes] = fator
+    return resultado
+
+
+def interpolar_ph(x_known, ph_known, x_new):
+    """
+    Interpolação logarítmica do pH: converte para concentração [H+] = 10^-pH, interpola
+    linearmente no tempo e volta para pH, em uma passada sobre tempos irregulares.
+
+    O pH é o logaritmo da concentração, e é ela que varia de forma aproximadamente linear
+    entre duas leituras (mistura de soluções); interpolar o pH diretamente superestima o pH
+    entre uma leitura ácida e uma básica. Pontos conhecidos não finitos são ignorados; fora do
+    intervalo conhecido repete o valor da borda (como np.interp). A concentração é limitada a
+    H_MINIMO: leituras acima de pH 14 (10^-pH chega a 0 em float64) não produzem infinitos.
+
+    Args:
+        x_known: Tempos (ou ids) conhecidos, em ordem crescente.
+        ph_known: pH em cada x_known.
+        x_new: Tempos a estimar.
+    """
+    x_known = para_float64(x_known)
+    ph_known = para_float64(ph_known)
+    x_new = para_float64(x_new)
+    validos = np.isfinite(x_known) & np.isfinite(ph_known)
+    if not validos.any():
+        return np.full(x_new.shape, np.nan)
+    concentracao = np.power(10.0, -ph_known[validos])
+    return -np.log10(np.maximum(np.interp(x_new, x_known[validos], concentracao), H_MINIMO))
+
+
+class CacheAjustes:
+    """
+    Cache LRU, thread-safe, dos parâmetros logísticos por janela de pontos conhecidos.
+
+    A chave é o conteúdo da janela (tempos relativos ao primeiro ponto e valores): um segmento só
+    é reajustado quando algum ponto da sua janela muda, em qualquer série ou consulta.
+    """
+
+    def __init__(self, capacidade=4096):
+        self.capacidade = capacidade
+        self.lock = threading.Lock()
+        self._dados = OrderedDict()
+        self.acertos = 0
+        self.ajustes = 0
+
+    def __len__(self):
+        return len(self._dados)
+
+    def obter(self, chaves):
+        """Parâmetros (k, t0, r2) de cada chave, ou None"""
+        with self.lock:
+            encontrados = []
+            for chave in chaves:
+                valor = self._dados.get(chave)
+                if valor is not None:
+                    self._dados.move_to_end(chave)
+                    self.acertos += 1
+                encontrados.append(valor)
+            return encontrados
+
+    def gravar(self, chaves, parametros):
+        with self.lock:
+            for chave, valor in zip(chaves, parametros):
+                self._dados[chave] = valor
+                self._dados.move_to_end(chave)
+            self.ajustes += len(chaves)
+            while len(self._dados) > self.capacidade:
+                self._dados.popitem(last=False)
+
+
+def _sigmoide(z):
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def _melhor_da_grade(u, y, grade_t0, grade_k):
+    """
+    Para cada janela (linhas de u, y), a logística a + b * sigma(k * (u - t0)) de menor erro
+    quadrático entre os candidatos (t0, k) da grade; a e b saem por mínimos quadrados.
+
+    Args:
+        u, y: (lote, W). grade_t0, grade_k: (lote, G) candidatos por janela.
+    Returns:
+        (t0, k, sse) de cada janela.
+    """
+    s = _sigmoide(grade_k[:, :, None] * (u[:, None, :] - grade_t0[:, :, None]))   # (lote, G, W)
+    s_c = s - s.mean(axis=2, keepdims=True)
+    y_c = y - y.mean(axis=1, keepdims=True)
+    sss = (s_c * s_c).sum(axis=2)
+    ssy = (s_c * y_c[:, None, :]).sum(axis=2)
+    syy = (y_c * y_c).sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sse = np.where(sss > 1e-12, syy - ssy * ssy / sss, np.inf)
+    melhor = sse.argmin(axis=1)
+    linhas = np.arange(len(u))
+    return grade_t0[linhas, melhor], grade_k[linhas, melhor], sse[linhas, melhor]
+
+
+def ajustar_logisticas(x, y):
+    """
+    Ajusta y ~ a + b * sigma(k * (u - t0)) a cada janela, com u = tempo normalizado para [0, 1]
+    na janela, por busca em grade (grossa e depois refinada em torno do melhor candidato),
+    vetorizada sobre todas as janelas. A inclinação é limitada a K_MAXIMO * (W - 1).
+
+    Args:
+        x, y: (lote, W) tempos crescentes e valores de cada janela.
+    Returns:
+        (k, t0, r2) arrays (lote,), na escala normalizada da janela; r2 = 1 - SSE / SST
+        (1.0 para janela constante).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    k = np.empty(len(x))
+    t0 = np.empty(len(x))
+    r2 = np.empty(len(x))
+    g0, gk = np.meshgrid(_GRADE_T0, _GRADE_K * K_MAXIMO * (x.shape[1] - 1), indexing='ij')
+    g0, gk = g0.ravel(), gk.ravel()
+    passo_t0 = _GRADE_T0[1] - _GRADE_T0[0]
+    razao_k = _GRADE_K[1] / _GRADE_K[0]
+    fino = np.linspace(-1.0, 1.0, 5)
+    for i in range(0, len(x), _LOTE_AJUSTE):
+        xb, yb = x[i:i + _LOTE_AJUSTE], y[i:i + _LOTE_AJUSTE]
+        extensao = xb[:, -1:] - xb[:, :1]
+        u = (xb - xb[:, :1]) / np.where(extensao > 0, extensao, 1.0)
+        lote = len(u)
+        t0b, kb, sse = _melhor_da_grade(u, yb, np.broadcast_to(g0, (lote, len(g0))),
+                                        np.broadcast_to(gk, (lote, len(gk))))
+        for passada in range(_REFINAMENTOS):
+            # Grade 5 x 5 entre os vizinhos do melhor candidato (que continua entre os candidatos)
+            escala = 0.5 ** passada
+            f0, fk = np.meshgrid(fino * passo_t0 * escala, razao_k ** (fino * escala), indexing='ij')
+            kf = np.minimum(kb[:, None] * fk.ravel()[None, :], gk.max())
+            t0b, kb, sse = _melhor_da_grade(u, yb, t0b[:, None] + f0.ravel()[None, :], kf)
+        sst = ((yb - yb.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2[i:i + lote] = np.where(sst > 0, 1.0 - sse / sst, 1.0)
+        k[i:i + lote], t0[i:i + lote] = kb, t0b
+    return k, t0, r2
+
+
+def _janelas(n, janela):
+    """Índices (n - 1, W) dos pontos de cada janela: o segmento i e seus vizinhos, deslocada nas bordas"""
+    janela = min(janela, n)
+    antes = (janela - 2) // 2
+    inicio = np.clip(np.arange(n - 1) - antes, 0, n - janela)
+    return inicio[:, None] + np.arange(janela)[None, :]
+
+
+def interpolar_sigmoidal(x_known, y_known, x_new, janela=JANELA_SIGMOIDAL, r2_minimo=R2_MINIMO_SIGMOIDAL, cache=None):
+    """
+    Interpolação sigmoidal de pontos irregulares, em uma passada vetorizada.
+
+    Cada segmento entre pontos conhecidos consecutivos usa a logística ajustada à janela de
+    `janela` pontos em torno dele, normalizada para passar exatamente pelos dois extremos:
+        y(t) = y_i + (y_i+1 - y_i) * (sigma(t) - sigma(x_i)) / (sigma(x_i+1) - sigma(x_i))
+    de modo que o resultado é monótono no segmento e não ultrapassa os valores conhecidos.
+    Segmentos com ajuste ruim (R² < r2_minimo) ou em trecho plano da logística são lineares.
+    Fora do intervalo conhecido, repete o valor da borda (como np.interp).
+
+    Args:
+        x_known: Tempos conhecidos, em ordem crescente.
+        cache: CacheAjustes opcional; janelas já ajustadas não são reajustadas.
+    """
+    x_known = np.asarray(x_known, dtype=np.float64)
+    y_known = np.asarray(y_known, dtype=np.float64)
+    x_new = np.asarray(x_new, dtype=np.float64)
+    n = len(x_known)
+    if n < 4:
+        return np.interp(x_new, x_known, y_known)
+
+    idx = _janelas(n, janela)
+    xj, yj = x_known[idx], y_known[idx]
+    if cache is None:
+        k, t0, r2 = ajustar_logisticas(xj, yj)
+    else:
+        chaves = [linha.tobytes() for linha in np.hstack([xj - xj[:, :1], yj])]
+        encontrados = cache.obter(chaves)
+        faltando = [i for i, p in enumerate(encontrados) if p is None]
+        if faltando:
+            novos = np.column_stack(ajustar_logisticas(xj[faltando], yj[faltando]))
+            cache.gravar([chaves[i] for i in faltando], [tuple(p) for p in novos.tolist()])
+            for i, p in zip(faltando, novos.tolist()):
+                encontrados[i] = p
+        k, t0, r2 = np.array(encontrados, dtype=np.float64).T
+
+    seg = np.clip(np.searchsorted(x_known, x_new, side='right') - 1, 0, n - 2)
+    base = xj[:, 0]
+    extensao = xj[:, -1] - base
+    extensao = np.where(extensao > 0, extensao, 1.0)
+
+    def sigma(t, s):
+        return _sigmoide(k[s] * ((t - base[s]) / extensao[s] - t0[s]))
+
+    s0 = sigma(x_known[seg], seg)
+    s1 = sigma(x_known[seg + 1], seg)
+    dt = x_known[seg + 1] - x_known[seg]
+    linear = np.clip((x_new - x_known[seg]) / np.where(dt > 0, dt, 1.0), 0.0, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peso = np.clip((sigma(x_new, seg) - s0) / (s1 - s0), 0.0, 1.0)
+    usar_linear = (r2[seg] < r2_minimo) | (np.abs(s1 - s0) < 1e-6)
+    peso = np.where(usar_linear, linear, peso)
+    resultado = y_known[seg] + (y_known[seg + 1] - y_known[seg]) * peso
+    # Fora do intervalo conhecido: valor da borda
+    resultado[x_new <= x_known[0]] = y_known[0]
+    resultado[x_new >= x_known[-1]] = y_known[-1]
+    return resultado
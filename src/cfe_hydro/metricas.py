@@ -0,0 +1,123 @@
+"""
+Função: Métricas de qualidade de reconstrução (R², RMSE, MAE, MAPE e erro máximo) calculadas em
+        lote: cada linha de uma matriz (reconstruções x amostras) contra a série original,
+        numa única passada NumPy que ignora os pares com NaN.
+
+AcumuladorMetricas calcula as mesmas métricas sobre uma série recebida em blocos (ler_blocos do
+cfe_hydro.dados), guardando apenas somas: a média e a soma dos quadrados dos desvios do original
+(denominador do R²) são combinadas bloco a bloco pela fórmula de Chan et al., sem uma segunda
+passada pela série.
+"""
+import numpy as np
+
+METRICAS = ('r2', 'rmse', 'mae', 'mape', 'erro_max')
+
+
+def calcular_metricas(original, reconstrucoes, minimo_pares=2):
+    """
+    Args:
+        original: Série original (n,) comum a todas as linhas, ou uma por linha (lote, n).
+        reconstrucoes: (lote, n) ou (n,).
+        minimo_pares: Linhas com menos pares válidos (ambos finitos) ficam NaN em todas as métricas.
+    Returns:
+        Dict {métrica: array (lote,)} com as chaves de METRICAS e 'pares' (pares válidos por linha);
+        para entradas 1-D, valores escalares.
+        R² segue sklearn.metrics.r2_score sobre os pares válidos (1.0 para série constante
+        reconstruída sem erro, 0.0 com erro). MAPE (%) exclui os pares com original igual a zero.
+    """
+    original = np.asarray(original, dtype=np.float64)
+    reconstrucoes = np.asarray(reconstrucoes, dtype=np.float64)
+    unico = original.ndim == 1 and reconstrucoes.ndim == 1
+    y = np.atleast_2d(original)
+    y_est = np.atleast_2d(reconstrucoes)
+    y, y_est = np.broadcast_arrays(y, y_est)
+
+    validos = np.isfinite(y) & np.isfinite(y_est)
+    pares = validos.sum(axis=1)
+    n = np.maximum(pares, 1)
+    erro = np.where(validos, y_est - y, 0.0)
+    erro_abs = np.abs(erro)
+    ss_res = (erro * erro).sum(axis=1)
+
+    media = np.where(validos, y, 0.0).sum(axis=1) / n
+    desvio = np.where(validos, y - media[:, None], 0.0)
+    ss_tot = (desvio * desvio).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_tot > 0, 1.0 - ss_res / ss_tot, np.where(ss_res == 0, 1.0, 0.0))
+        nao_nulos = validos & (y != 0)
+        mape = np.where(nao_nulos, erro_abs / np.abs(y), 0.0).sum(axis=1) / nao_nulos.sum(axis=1) * 100
+
+    resultado = {
+        'r2': r2,
+        'rmse': np.sqrt(ss_res / n),
+        'mae': erro_abs.sum(axis=1) / n,
+        'mape': mape,
+        'erro_max': erro_abs.max(axis=1, initial=0.0),
+    }
+    insuficientes = pares < minimo_pares
+    for valores in resultado.values():
+        valores[insuficientes] = np.nan
+    resultado['pares'] = pares
+    if unico:
+        return {chave: valores[0].item() for chave, valores in resultado.items()}
+    return resultado
+
+
+class AcumuladorMetricas:
+    """
+    Métricas de uma reconstrução (as mesmas de calcular_metricas, para uma série) acumuladas em
+    blocos: adicionar(original, reconstrucao) para cada bloco e resultado() ao final.
+    """
+
+    def __init__(self, minimo_pares=2):
+        self.minimo_pares = minimo_pares
+        self.pares = 0
+        self.media = 0.0            # média do original nos pares válidos
+        self.ss_tot = 0.0           # soma dos quadrados dos desvios do original em relação à média
+        self.ss_res = 0.0
+        self.soma_erro_abs = 0.0
+        self.soma_erro_pct = 0.0
+        self.nao_nulos = 0
+        self.erro_max = 0.0
+
+    def adicionar(self, original, reconstrucao):
+        y = np.asarray(original, dtype=np.float64)
+        y_est = np.asarray(reconstrucao, dtype=np.float64)
+        validos = np.isfinite(y) & np.isfinite(y_est)
+        n = int(validos.sum())
+        if n == 0:
+            return
+        y, y_est = y[validos], y_est[validos]
+        erro_abs = np.abs(y_est - y)
+        self.ss_res += float(np.dot(erro_abs, erro_abs))
+        self.soma_erro_abs += float(erro_abs.sum())
+        self.erro_max = max(self.erro_max, float(erro_abs.max()))
+        nao_nulos = y != 0
+        self.nao_nulos += int(nao_nulos.sum())
+        self.soma_erro_pct += float((erro_abs[nao_nulos] / np.abs(y[nao_nulos])).sum())
+
+        media = float(y.mean())
+        desvio = y - media
+        ss_tot = float(np.dot(desvio, desvio))
+        total = self.pares + n
+        delta = media - self.media
+        self.ss_tot += ss_tot + delta * delta * self.pares * n / total
+        self.media += delta * n / total
+        self.pares = total
+
+    def resultado(self):
+        """Dict {métrica: valor} com as chaves de METRICAS e 'pares', como calcular_metricas em 1-D"""
+        if self.pares < self.minimo_pares:
+            return {**{nome: float('nan') for nome in METRICAS}, 'pares': self.pares}
+        if self.ss_tot > 0:
+            r2 = 1.0 - self.ss_res / self.ss_tot
+        else:
+            r2 = 1.0 if self.ss_res == 0 else 0.0
+        return {
+            'r2': r2,
+            'rmse': float(np.sqrt(self.ss_res / self.pares)),
+            'mae': self.soma_erro_abs / self.pares,
+            'mape': self.soma_erro_pct / self.nao_nulos * 100 if self.nao_nulos else float('nan'),
+            'erro_max': self.erro_max,
+            'pares': self.pares,
+        }
@@ -0,0 +1,262 @@
+"""
+Função: Conversão das exportações CSV do CFE-HYDRO para Parquet particionado por dispositivo e
+        dia, e leitura com poda de partições e de colunas.
+
+Layout (partições no formato hive):
+
+    <raiz>/dispositivo=<id>/data=YYYY-MM-DD/<origem>-NNNN.parquet
+
+Cada arquivo tem colunas tipadas (esquema()): id int64, timestamp em ms (UTC) e os parâmetros em
+float32, com compressão zstd. O timestamp é convertido uma única vez, na ingestão; as leituras não
+analisam texto. Uma leitura escolhe os diretórios de dispositivo e de dia pelo nome, de modo que um
+mês de um parâmetro abre apenas os ~30 arquivos do mês e lê deles apenas as colunas pedidas (e o
+timestamp, quando há intervalo de tempo); nos dias das bordas, os grupos de linhas fora do intervalo
+são descartados pelas estatísticas do Parquet.
+
+Reingerir a mesma exportação (mesma <origem>, o nome do CSV) substitui os arquivos gravados da
+vez anterior; exportações diferentes de um mesmo dispositivo coexistem. Linhas com timestamp
+inválido não têm dia e são descartadas (a contagem é informada).
+
+Requer o pyarrow (opcional para o restante do pacote).
+
+Uso: python -m cfe_hydro.particoes exportacao.csv [...] [--destino data/parquet] [--dispositivo ID]
+"""
+import argparse
+import logging
+import os
+import time
+import uuid
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from .dados import LINHAS_POR_BLOCO, PARAMETROS, TIMESTAMP_INVALIDO, instante_ms, ler_blocos
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_PARQUET = os.path.join('data', 'parquet')     # relativo ao diretório de execução (./src)
+COLUNAS = ['id', 'timestamp'] + PARAMETROS
+MS_POR_DIA = 86_400_000
+COMPRESSAO = 'zstd'
+
+
+def _exigir_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("O dataset particionado requer o pyarrow (pip install pyarrow)")
+
+
+def esquema():
+    """Esquema Arrow dos arquivos das partições"""
+    _exigir_pyarrow()
+    return pa.schema([('id', pa.int64()), ('timestamp', pa.timestamp('ms', tz='UTC'))]
+                     + [(parametro, pa.float32()) for parametro in PARAMETROS])
+
+
+def _particao(nome, valor):
+    """Componente de caminho hive (nome=valor), com o valor codificado como em uma URL"""
+    return f'{nome}={quote(str(valor), safe="")}'
+
+
+def _gravar_atomico(tabela, caminho):
+    temporario = f'{caminho}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+    try:
+        pq.write_table(tabela, temporario, compression=COMPRESSAO)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def ingerir_csv(caminho, destino=DIRETORIO_PARQUET, dispositivo=None, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Converte uma exportação CSV (formato de data/dataset_cfe-hydro.csv) para a árvore particionada.
+
+    O CSV é lido em blocos (cfe_hydro.dados.ler_blocos); as linhas de cada dia se acumulam até que
+    um bloco chegue a um dia posterior, de modo que uma exportação em ordem de tempo gera um arquivo
+    por dia, com memória limitada ao bloco.
+
+    Args:
+        caminho: Arquivo CSV.
+        destino: Raiz do dataset particionado.
+        dispositivo: Identificação do dispositivo (padrão: nome do arquivo, sem extensão).
+        linhas_por_bloco: Linhas lidas do CSV por vez.
+    Returns:
+        Dict com 'linhas' gravadas, 'descartadas' (timestamp inválido), 'dias' e 'arquivos'.
+    """
+    _exigir_pyarrow()
+    origem = quote(os.path.splitext(os.path.basename(caminho))[0], safe='')
+    dispositivo = os.path.splitext(os.path.basename(caminho))[0] if dispositivo is None else dispositivo
+    diretorio = os.path.join(destino, _particao('dispositivo', dispositivo))
+    tipos = esquema()
+
+    anteriores = set()
+    if os.path.isdir(diretorio):
+        for pasta in os.listdir(diretorio):
+            for nome in os.listdir(os.path.join(diretorio, pasta)):
+                if nome.startswith(f'{origem}-') and nome.endswith('.parquet'):
+                    anteriores.add(os.path.join(diretorio, pasta, nome))
+
+    pendentes = {}      # dia (desde a época) -> [dict coluna -> array]
+    partes = {}         # dia -> arquivos já gravados
+    gravados = set()
+    resumo = {'linhas': 0, 'descartadas': 0}
+
+    def gravar(dia):
+        blocos = pendentes.pop(dia)
+        colunas = {coluna: np.concatenate([bloco[coluna] for bloco in blocos]) for coluna in COLUNAS}
+        tabela = pa.table([pa.array(colunas[campo.name], type=campo.type) for campo in tipos], schema=tipos)
+        pasta = os.path.join(diretorio, _particao('data', np.datetime64(dia, 'D')))
+        os.makedirs(pasta, exist_ok=True)
+        n = partes.get(dia, 0)
+        partes[dia] = n + 1
+        arquivo = os.path.join(pasta, f'{origem}-{n:04d}.parquet')
+        _gravar_atomico(tabela, arquivo)
+        gravados.add(arquivo)
+        resumo['linhas'] += tabela.num_rows
+
+    for bloco in ler_blocos(caminho, COLUNAS, linhas_por_bloco):
+        validos = bloco['timestamp'] != TIMESTAMP_INVALIDO
+        resumo['descartadas'] += int(len(validos) - validos.sum())
+        if not validos.all():
+            bloco = {coluna: valores[validos] for coluna, valores in bloco.items()}
+        if not len(bloco['timestamp']):
+            continue
+        dias = bloco['timestamp'] // MS_POR_DIA
+        ordem = np.argsort(dias, kind='stable')
+        unicos, inicios = np.unique(dias[ordem], return_index=True)
+        for dia, indices in zip(unicos.tolist(), np.split(ordem, inicios[1:])):
+            pendentes.setdefault(dia, []).append({coluna: bloco[coluna][indices] for coluna in COLUNAS})
+        # Os dias anteriores ao último dia do bloco estão completos (exportação em ordem de tempo)
+        for dia in sorted(pendentes):
+            if dia != int(dias[-1]):
+                gravar(dia)
+    for dia in sorted(pendentes):
+        gravar(dia)
+
+    for arquivo in anteriores - gravados:
+        os.remove(arquivo)
+        try:
+            os.rmdir(os.path.dirname(arquivo))      # apenas se o dia ficou vazio
+        except OSError:
+            pass
+    if resumo['descartadas']:
+        logger.warning(f"{caminho}: {resumo['descartadas']} linhas com timestamp inválido descartadas")
+    return {**resumo, 'dias': len(partes), 'arquivos': len(gravados)}
+
+
+def _arquivos_por_dispositivo(raiz, dispositivos, inicio, fim):
+    """[(dispositivo, arquivos)] escolhidos pelos nomes dos diretórios, em ordem de dispositivo, dia e nome"""
+    inicio_ms, fim_ms = instante_ms(inicio), instante_ms(fim)
+    nomes = None if dispositivos is None else {_particao('dispositivo', d) for d in dispositivos}
+    selecionados = []
+    for pasta_dispositivo in sorted(os.listdir(raiz)):
+        if not pasta_dispositivo.startswith('dispositivo=') or (nomes is not None and pasta_dispositivo not in nomes):
+            continue
+        arquivos = []
+        for pasta_dia in sorted(os.listdir(os.path.join(raiz, pasta_dispositivo))):
+            if not pasta_dia.startswith('data='):
+                continue
+            dia = int(np.datetime64(pasta_dia[len('data='):], 'D').astype(np.int64))
+            if inicio_ms is not None and (dia + 1) * MS_POR_DIA <= inicio_ms:
+                continue
+            if fim_ms is not None and dia * MS_POR_DIA >= fim_ms:
+                continue
+            pasta = os.path.join(raiz, pasta_dispositivo, pasta_dia)
+            arquivos += [os.path.join(pasta, nome) for nome in sorted(os.listdir(pasta)) if nome.endswith('.parquet')]
+        if arquivos:
+            selecionados.append((unquote(pasta_dispositivo[len('dispositivo='):]), arquivos))
+    return selecionados
+
+
+def arquivos_particoes(raiz=DIRETORIO_PARQUET, dispositivos=None, inicio=None, fim=None):
+    """Arquivos das partições que podem conter linhas dos dispositivos e do intervalo [inicio, fim)"""
+    return [arquivo for _, arquivos in _arquivos_por_dispositivo(raiz, dispositivos, inicio, fim)
+            for arquivo in arquivos]
+
+
+def ler_particoes(raiz=DIRETORIO_PARQUET, colunas=None, dispositivos=None, inicio=None, fim=None,
+                  dtype_valores=np.float32):
+    """
+    Lê o dataset particionado nos tipos de cfe_hydro.dados.carregar_colunas.
+
+    Args:
+        raiz: Raiz do dataset particionado (ingerir_csv).
+        colunas: Colunas desejadas (padrão: id, timestamp e PARAMETROS); 'dispositivo' devolve a
+                 identificação do dispositivo de cada linha. Colunas inexistentes são omitidas.
+        dispositivos: Dispositivos a ler (padrão: todos).
+        inicio, fim: Intervalo de tempo [inicio, fim) (texto ISO, datetime, np.datetime64 ou ms).
+        dtype_valores: Tipo dos parâmetros devolvidos (gravados em float32).
+    Returns:
+        Dict coluna -> array (timestamp em ms, int64), em ordem de dispositivo, dia e da exportação.
+    """
+    _exigir_pyarrow()
+    colunas = COLUNAS if colunas is None else list(colunas)
+    tipos = esquema()
+    lidas = [coluna for coluna in colunas if coluna in tipos.names]
+    inicio_ms, fim_ms = instante_ms(inicio), instante_ms(fim)
+    filtro = None
+    if inicio_ms is not None:
+        filtro = ds.field('timestamp') >= pa.scalar(inicio_ms, type=tipos.field('timestamp').type)
+    if fim_ms is not None:
+        condicao = ds.field('timestamp') < pa.scalar(fim_ms, type=tipos.field('timestamp').type)
+        filtro = condicao if filtro is None else filtro & condicao
+
+    # Arquivos locais e pequenos (um dia): ler cada um de uma vez, sem a pré-leitura em paralelo das
+    # colunas pensada para armazenamento remoto
+    formato = ds.ParquetFileFormat(default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=False))
+    # Um dataset sem partições hive por dispositivo: o dispositivo vem do diretório, sem uma coluna
+    # de partição a montar por arquivo (o custo dominante com milhares de arquivos de um dia)
+    partes = {coluna: [] for coluna in lidas}
+    nomes_dispositivos = []
+    for dispositivo, arquivos in _arquivos_por_dispositivo(raiz, dispositivos, inicio, fim):
+        tabela = ds.dataset(arquivos, schema=tipos, format=formato).to_table(columns=lidas, filter=filtro)
+        for coluna in lidas:
+            valores = tabela.column(coluna).to_numpy()
+            if coluna == 'timestamp':
+                valores = valores.astype('datetime64[ms]').view(np.int64)
+            elif coluna in PARAMETROS:
+                valores = valores.astype(dtype_valores, copy=False)
+            partes[coluna].append(valores)
+        nomes_dispositivos.append(np.full(tabela.num_rows, dispositivo, dtype=object))
+
+    resultado = {}
+    for coluna in colunas:
+        if coluna == 'dispositivo':
+            resultado[coluna] = np.concatenate(nomes_dispositivos) if nomes_dispositivos else np.empty(0, dtype=object)
+        elif coluna in lidas:
+            vazio = np.empty(0, dtype=dtype_valores if coluna in PARAMETROS else np.int64)
+            resultado[coluna] = np.concatenate(partes[coluna]) if partes[coluna] else vazio
+    return resultado
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+    parser = argparse.ArgumentParser(description="Converte exportações CSV para Parquet particionado por dispositivo e dia")
+    parser.add_argument('csvs', nargs='+', help="CSVs no formato de data/dataset_cfe-hydro.csv")
+    parser.add_argument('--destino', default=DIRETORIO_PARQUET, help=f"Raiz do dataset (padrão: {DIRETORIO_PARQUET})")
+    parser.add_argument('--dispositivo', default=None,
+                        help="Identificação do dispositivo (padrão: nome de cada CSV, sem extensão)")
+    parser.add_argument('--blocos', type=int, default=LINHAS_POR_BLOCO, metavar='LINHAS',
+                        help=f"Linhas lidas do CSV por vez (padrão: {LINHAS_POR_BLOCO})")
+    args = parser.parse_args()
+    if not PYARROW_AVAILABLE:
+        parser.error("o pyarrow não está instalado (pip install pyarrow)")
+
+    for caminho in args.csvs:
+        inicio = time.perf_counter()
+        resumo = ingerir_csv(caminho, args.destino, args.dispositivo, args.blocos)
+        print(f"{caminho}: {resumo['linhas']} linhas em {resumo['dias']} dias ({resumo['arquivos']} arquivos), "
+              f"{resumo['descartadas']} descartadas, em {time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Função: Previsão de curto prazo das séries dos sensores (a "capacidade preditiva" do sinal
+        transmitido): modelos de extrapolação ajustados em fluxo, com atualização O(1) a cada
+        leitura e previsão com faixa de incerteza para horizontes após a última leitura.
+
+Modelos (todos com tempos irregulares, em ms):
+    TendenciaLinear: regressão linear por mínimos quadrados ponderados com esquecimento
+                     exponencial (meia-vida em tempo), mantida por somas que são decaídas e
+                     recentradas na última leitura a cada atualização.
+    TendenciaPH: a mesma regressão no espaço da concentração [H+] = 10^-pH (como a interpolação
+                 logarítmica); previsão e faixa voltam para pH pela transformação inversa.
+    HoltWinters: suavização exponencial de nível e tendência (Holt), com amortecimento opcional da
+                 tendência (phi < 1: equivalente a um ARIMA(1,1,2), os incrementos decaem como um
+                 AR(1) e a previsão satura, como nas transições sigmoidais) e componente sazonal
+                 opcional em baldes da hora do dia. Os fatores de suavização são ajustados ao
+                 intervalo entre leituras, medido em fluxo.
+
+A faixa de cada previsão é media ± z * sigma * fator(h): sigma vem dos erros de previsão de um
+passo (erro de cada leitura contra a previsão feita antes de incorporá-la, variância com
+esquecimento exponencial) e fator(h) >= 1 cresce com o horizonte, pela fórmula de cada modelo.
+
+O modelo de cada sensor segue o seu tipo de interpolação (MODELOS_POR_INTERPOLACAO; criar_previsor).
+"""
+import math
+
+import numpy as np
+
+from cfe_hydro.interpolacao import H_MINIMO
+
+MS_POR_HORA = 3_600_000
+Z_PADRAO = 1.96                 # faixa de ~95% com erros aproximadamente normais
+MEIA_VIDA_PADRAO_S = 900        # esquecimento da regressão: leituras de 15 min atrás pesam metade
+PESO_ERRO = 0.05                # peso de cada erro novo na variância dos erros de um passo
+VARIACAO_MAXIMA_PH = 1.0        # previsão e faixa de pH limitadas a ± isso em torno do nível atual
+
+# Tipo de interpolação do sensor (campo "interpolation") -> modelo de previsão
+MODELOS_POR_INTERPOLACAO = {
+    'linear': 'tendencia',
+    'logarithmic': 'ph',
+    'sigmoidal': 'amortecido',
+    'polynomial': 'holt_winters',
+}
+
+
+class Previsor:
+    """
+    Base dos modelos: erros de um passo, intervalo típico entre leituras e transformação do domínio.
+
+    As subclasses implementam _incorporar(t_ms, y, dt_ms), que atualiza o estado e retorna o erro
+    da previsão de um passo (None enquanto o modelo não prevê), _media(h_ms) e _fator(h_ms), com y
+    e _media no domínio transformado (_direta) e h_ms contado a partir da última leitura. O modelo
+    não é atualizado na ingestão: no dashboard, cada consulta de previsão (DadosDispositivo.previsao,
+    sob o lock do cache do dispositivo, fora do lock de ingestão) incorpora de uma vez as leituras
+    que chegaram desde a consulta anterior, em O(1) por leitura (o caminho de _incorporar é escalar).
+    """
+
+    def __init__(self, peso_erro=PESO_ERRO):
+        self.peso_erro = peso_erro
+        self.n = 0
+        self.ultimo_ms = None
+        self.dt_medio_ms = None     # intervalo típico entre leituras (média com esquecimento)
+        self.variancia = None       # dos erros de previsão de um passo, no domínio transformado
+        self.fora_de_ordem = 0
+
+    @staticmethod
+    def _direta(valor):
+        return float(valor)
+
+    @staticmethod
+    def _inversa(valores):
+        return valores
+
+    @property
+    def sigma(self):
+        """Desvio padrão dos erros de um passo (domínio transformado), ou NaN antes do 2º erro"""
+        return math.sqrt(self.variancia) if self.variancia is not None and self.n > 2 else math.nan
+
+    def atualizar(self, timestamp_ms, valor):
+        """Incorpora uma leitura em O(1); leituras fora de ordem e valores não finitos são ignorados"""
+        timestamp_ms = int(timestamp_ms)
+        ultimo = self.ultimo_ms
+        if ultimo is not None and timestamp_ms <= ultimo:
+            self.fora_de_ordem += 1
+            return
+        # O valor é conferido antes e depois da transformação: pH infinito daria [H+] = 0 finito
+        valor = float(valor)
+        if not math.isfinite(valor):
+            return
+        try:
+            y = self._direta(valor)
+        except OverflowError:
+            return
+        if not math.isfinite(y):
+            return
+        dt_ms = 0 if ultimo is None else timestamp_ms - ultimo
+        if dt_ms > 0:
+            self.dt_medio_ms = dt_ms if self.dt_medio_ms is None else self.dt_medio_ms + 0.1 * (dt_ms - self.dt_medio_ms)
+        erro = self._incorporar(timestamp_ms, y, dt_ms)
+        if erro is not None:
+            if self.variancia is None:
+                self.variancia = erro * erro
+            else:
+                self.variancia += self.peso_erro * (erro * erro - self.variancia)
+        self.ultimo_ms = timestamp_ms
+        self.n += 1
+
+    def ajustar(self, timestamps_ms, valores):
+        """Incorpora uma série inteira, em ordem (equivale a chamar atualizar em cada leitura)"""
+        for timestamp_ms, valor in zip(np.asarray(timestamps_ms).tolist(), np.asarray(valores, dtype=np.float64).tolist()):
+            self.atualizar(timestamp_ms, valor)
+        return self
+
+    def prever(self, timestamps_ms, z=Z_PADRAO):
+        """
+        Previsão nos instantes pedidos (ms, a partir da última leitura).
+
+        Returns:
+            (media, inferior, superior) em arrays float64; NaN antes da primeira leitura. A faixa
+            é NaN enquanto não há erros de um passo suficientes para estimá-la.
+        """
+        t = np.asarray(timestamps_ms, dtype=np.int64)
+        if self.n == 0:
+            vazio = np.full(t.shape, np.nan)
+            return vazio, vazio.copy(), vazio.copy()
+        h = np.maximum(t - self.ultimo_ms, 0).astype(np.float64)
+        media = self._media(h)
+        largura = z * self.sigma * self._fator(h)
+        a, b = self._inversa(media - largura), self._inversa(media + largura)
+        return self._inversa(media), np.minimum(a, b), np.maximum(a, b)
+
+    def prever_grade(self, horizonte_ms, passo_ms, z=Z_PADRAO):
+        """
+        Previsão nos pontos da grade alinhada à época (múltiplos de passo_ms) após a última
+        leitura, até horizonte_ms depois dela.
+
+        Returns:
+            (timestamps_ms, media, inferior, superior); arrays vazios antes da primeira leitura.
+        """
+        if self.n == 0:
+            vazio = np.empty(0)
+            return np.empty(0, dtype=np.int64), vazio, vazio, vazio
+        k0 = self.ultimo_ms // passo_ms + 1
+        k1 = (self.ultimo_ms + horizonte_ms) // passo_ms
+        x = passo_ms * np.arange(k0, k1 + 1, dtype=np.int64)
+        return (x,) + self.prever(x, z)
+
+    def _incorporar(self, timestamp_ms, y, dt_ms):
+        raise NotImplementedError
+
+    def _media(self, h_ms):
+        raise NotImplementedError
+
+    def _fator(self, h_ms):
+        raise NotImplementedError
+
+
+class TendenciaLinear(Previsor):
+    """
+    Reta y = a + b * tau (tau em horas a partir da última leitura) por mínimos quadrados
+    ponderados, com peso 2^(-idade / meia_vida) para cada leitura.
+
+    O estado são as somas ponderadas (S_w, S_t, S_tt, S_y, S_ty): a cada leitura elas são
+    multiplicadas pelo decaimento do intervalo, deslocadas para a nova origem (tau' = tau - d) e
+    recebem a leitura nova, em O(1). Com uma única leitura (ou tempos degenerados), a previsão é
+    o nível médio ponderado.
+    """
+
+    def __init__(self, meia_vida_s=MEIA_VIDA_PADRAO_S, peso_erro=PESO_ERRO):
+        super().__init__(peso_erro)
+        self.meia_vida_h = meia_vida_s / 3600
+        self.s_w = self.s_t = self.s_tt = self.s_y = self.s_ty = 0.0
+
+    def _incorporar(self, timestamp_ms, y, dt_ms):
+        d = dt_ms / MS_POR_HORA
+        erro = None
+        if self.n >= 2:
+            a, b, _, _ = self._coeficientes()
+            erro = y - (a + b * d)
+        if d > 0:
+            decaimento = 0.5 ** (d / self.meia_vida_h)
+            s_w, s_t, s_tt = self.s_w * decaimento, self.s_t * decaimento, self.s_tt * decaimento
+            s_y, s_ty = self.s_y * decaimento, self.s_ty * decaimento
+            # Origem na nova leitura: os tempos antigos passam a ser tau - d
+            self.s_tt = s_tt - 2 * d * s_t + d * d * s_w
+            self.s_t = s_t - d * s_w
+            self.s_ty = s_ty - d * s_y
+            self.s_w, self.s_y = s_w, s_y
+        self.s_w += 1.0
+        self.s_y += y
+        return erro
+
+    def _coeficientes(self):
+        """(a, b, média ponderada dos tempos, soma dos quadrados centrada dos tempos)"""
+        t_medio = self.s_t / self.s_w
+        s_xx = self.s_tt - self.s_t * t_medio
+        if s_xx <= 1e-12 * max(self.s_tt, 1e-300):
+            return self.s_y / self.s_w, 0.0, t_medio, 0.0
+        b = (self.s_ty - self.s_y * t_medio) / s_xx
+        return self.s_y / self.s_w - b * t_medio, b, t_medio, s_xx
+
+    def _media(self, h_ms):
+        a, b, _, _ = self._coeficientes()
+        return a + b * (h_ms / MS_POR_HORA)
+
+    def _fator(self, h_ms):
+        # Erro de previsão da regressão ponderada: 1 + 1/S_w + (tau - t_medio)² / S_xx
+        _, _, t_medio, s_xx = self._coeficientes()
+        tau = np.asarray(h_ms, dtype=np.float64) / MS_POR_HORA
+        alavanca = (tau - t_medio) ** 2 / s_xx if s_xx > 0 else 0.0
+        return np.sqrt(1.0 + 1.0 / self.s_w + alavanca)
+
+
+class TendenciaPH(TendenciaLinear):
+    """
+    TendenciaLinear no espaço [H+] = 10^-pH; previsão e faixa convertidas de volta para pH.
+
+    Uma reta em [H+] cruza o zero quando o pH sobe (a previsão iria para pH 14): previsão e faixa
+    ficam limitadas a VARIACAO_MAXIMA_PH em torno do nível atual ajustado.
+    """
+
+    def prever(self, timestamps_ms, z=Z_PADRAO):
+        media, inferior, superior = super().prever(timestamps_ms, z)
+        if self.n:
+            nivel = float(self._inversa(self._coeficientes()[0]))
+            limites = (nivel - VARIACAO_MAXIMA_PH, nivel + VARIACAO_MAXIMA_PH)
+            media, inferior, superior = (np.clip(v, *limites) for v in (media, inferior, superior))
+        return media, inferior, superior
+
+    @staticmethod
+    def _direta(valor):
+        return 10.0 ** -float(valor)
+
+    @staticmethod
+    def _inversa(valores):
+        return -np.log10(np.maximum(valores, H_MINIMO))
+
+
+class HoltWinters(Previsor):
+    """
+    Nível, tendência (por intervalo típico entre leituras) e, opcionalmente, sazonalidade aditiva
+    em `estacoes` baldes de um período (a hora do dia, para periodo_s = 86400), com o perfil
+    interpolado linearmente entre os baldes.
+
+    Na forma de correção de erro, com k = dt / dt_medio passos desde a leitura anterior e
+    alfa_k = 1 - (1 - alfa)^k:
+        nivel     <- nivel + tendencia * A(k) + alfa_k * e
+        tendencia <- phi^k * tendencia + beta * alfa_k * e / max(k, 1)
+        sazonal   <- sazonal + gama * (1 - alfa_k) * e       (dois baldes vizinhos da leitura)
+    onde e é o erro de previsão de um passo e A(h) = phi + ... + phi^h é a soma do amortecimento.
+    """
+
+    def __init__(self, alfa=0.3, beta=0.2, phi=1.0, gama=0.02, periodo_s=None, estacoes=24, peso_erro=PESO_ERRO):
+        super().__init__(peso_erro)
+        self.alfa, self.beta, self.phi, self.gama = alfa, beta, phi, gama
+        self.periodo_ms = int(periodo_s * 1000) if periodo_s else None
+        self.sazonal = [0.0] * estacoes if periodo_s else None
+        self.nivel = 0.0
+        self.tendencia = 0.0
+
+    def _pesos_sazonais(self, timestamps_ms):
+        """Baldes vizinhos (i0, i1) e peso f de i1: o perfil sazonal é interpolado entre os baldes"""
+        m = len(self.sazonal)
+        posicao = (np.asarray(timestamps_ms, dtype=np.int64) % self.periodo_ms) * (m / self.periodo_ms)
+        i0 = np.floor(posicao).astype(np.int64)
+        return i0 % m, (i0 + 1) % m, posicao - i0
+
+    def _amortecimento(self, passos):
+        if self.phi == 1.0:
+            return passos
+        return self.phi * (1.0 - self.phi ** passos) / (1.0 - self.phi)
+
+    def _passos(self, h_ms):
+        return h_ms / self.dt_medio_ms if self.dt_medio_ms else 0.0 * h_ms
+
+    def _incorporar(self, timestamp_ms, y, dt_ms):
+        if self.n == 0:
+            self.nivel = y
+            return None
+        sazonal = 0.0
+        if self.sazonal is not None:
+            m = len(self.sazonal)
+            posicao = (timestamp_ms % self.periodo_ms) * m / self.periodo_ms
+            i0 = int(posicao)
+            i1, f = (i0 + 1) % m, posicao - i0
+            sazonal = (1 - f) * self.sazonal[i0] + f * self.sazonal[i1]
+        k = dt_ms / self.dt_medio_ms
+        amortecimento = self._amortecimento(k)
+        erro = y - (self.nivel + self.tendencia * amortecimento + sazonal)
+        alfa_k = 1.0 - (1.0 - self.alfa) ** max(k, 1e-9)
+        self.nivel += self.tendencia * amortecimento + alfa_k * erro
+        self.tendencia = self.phi ** k * self.tendencia + self.beta * alfa_k * erro / max(k, 1.0)
+        if self.sazonal is not None:
+            correcao = self.gama * (1.0 - alfa_k) * erro
+            self.sazonal[i0] += (1 - f) * correcao
+            self.sazonal[i1] += f * correcao
+        return erro if self.n >= 2 else None
+
+    def _media(self, h_ms):
+        media = self.nivel + self.tendencia * self._amortecimento(self._passos(h_ms))
+        if self.sazonal is not None:
+            i0, i1, f = self._pesos_sazonais(self.ultimo_ms + np.asarray(h_ms, dtype=np.int64))
+            sazonal = np.asarray(self.sazonal)
+            media = media + (1 - f) * sazonal[i0] + f * sazonal[i1]
+        return media
+
+    def _fator(self, h_ms):
+        # Variância da previsão de h passos do Holt aditivo, em relação à de um passo:
+        # 1 + soma_{j=1}^{h-1} (alfa * (1 + j * beta))², em forma fechada (contínua em h)
+        m = np.maximum(self._passos(h_ms) - 1.0, 0.0)
+        a, b = self.alfa, self.beta
+        return np.sqrt(1.0 + a * a * (m + b * m * (m + 1) + b * b * m * (m + 1) * (2 * m + 1) / 6))
+
+
+def criar_previsor(modelo_ou_interpolacao='linear', **parametros):
+    """
+    Novo previsor pelo nome do modelo ('tendencia', 'ph', 'amortecido', 'holt_winters') ou pelo
+    tipo de interpolação do sensor (MODELOS_POR_INTERPOLACAO); tipos desconhecidos usam a tendência.
+    """
+    modelo = MODELOS_POR_INTERPOLACAO.get(modelo_ou_interpolacao, modelo_ou_interpolacao)
+    if modelo == 'ph':
+        return TendenciaPH(**parametros)
+    if modelo == 'amortecido':
+        return HoltWinters(**{'alfa': 0.5, 'beta': 0.3, 'phi': 0.8, 'gama': 0.0, **parametros})
+    if modelo == 'holt_winters':
+        return HoltWinters(**{'periodo_s': 86400, **parametros})
+    return TendenciaLinear(**parametros)
@@ -0,0 +1,235 @@
+"""
+Função: Simulação de transmissão compressiva (subconjuntos aleatórios de amostras) e reconstrução
+        esparsa das séries em um dicionário DCT ou Haar, a partir de posições arbitrárias.
+
+A série é modelada como x = Psi @ c, com c esparso. Dado o subconjunto transmitido (máscara M),
+a reconstrução resolve  min_c 0.5 * ||M * (Psi @ c - y)||² + lam * ||w * c||_1  por FISTA, vetorizado
+sobre um lote de sinais (várias máscaras, sensores ou janelas de uma série longa de uma vez),
+ou escolhe os átomos gulosamente por OMP. Os pesos w crescem com a frequência do átomo.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+DICIONARIOS = ('dct', 'haar')
+METODOS = ('fista', 'omp')
+
+
+@lru_cache(maxsize=32)
+def matriz_dct(n):
+    """Base DCT-II ortonormal (n x n): coluna k é o átomo de frequência k"""
+    t = np.arange(n)[:, None] + 0.5
+    k = np.arange(n)[None, :]
+    psi = np.cos(np.pi * t * k / n) * np.sqrt(2.0 / n)
+    psi[:, 0] = 1.0 / np.sqrt(n)
+    psi.flags.writeable = False
+    return psi
+
+
+@lru_cache(maxsize=32)
+def matriz_haar(n):
+    """
+    Dicionário de Haar (n x m, m = próxima potência de 2): base ortonormal de tamanho m truncada
+    nas n primeiras linhas. A norma de operador continua <= 1.
+    """
+    m = 1 << max(0, int(np.ceil(np.log2(max(n, 1)))))
+    h = np.ones((1, 1))
+    while h.shape[0] < m:
+        # Recursão de Haar: médias (escala) e diferenças (detalhe) do nível anterior
+        h = np.vstack([np.kron(h, [1.0, 1.0]), np.kron(np.eye(h.shape[0]), [1.0, -1.0])])
+    h /= np.linalg.norm(h, axis=1, keepdims=True)
+    psi = np.ascontiguousarray(h.T[:n])
+    psi.flags.writeable = False
+    return psi
+
+
+def dicionario(n, tipo='dct'):
+    if tipo == 'dct':
+        return matriz_dct(n)
+    if tipo == 'haar':
+        return matriz_haar(n)
+    raise ValueError(f"Dicionário desconhecido: {tipo} (opções: {', '.join(DICIONARIOS)})")
+
+
+@lru_cache(maxsize=32)
+def pesos_frequencia(m, tipo='dct'):
+    """
+    Peso de cada átomo na penalização L1, proporcional à sua frequência (0 para o átomo constante).
+    Sem ele, máscaras regulares (1 a cada N) não distinguem um átomo de seus "aliases" de alta
+    frequência e a reconstrução oscila entre as amostras; com ele, vence o átomo mais suave.
+    """
+    j = np.arange(m, dtype=np.float64)
+    if tipo == 'haar':
+        # Átomos de Haar no nível l (colunas 2^l .. 2^(l+1)-1) têm escala m / 2^l
+        j[1:] = 2.0 ** np.floor(np.log2(j[1:]))
+    pesos = j / m
+    pesos.flags.writeable = False
+    return pesos
+
+
+def mascaras_aleatorias(n, taxa, quantidade=1, rng=None, incluir_extremos=False):
+    """
+    Sorteia máscaras de transmissão (quantidade x n) com round(taxa * n) amostras cada,
+    escolhidas uniformemente sem reposição.
+
+    Args:
+        taxa: Fração de amostras transmitidas, em (0, 1].
+        incluir_extremos: Força a transmissão da primeira e da última amostra da janela.
+    """
+    if not 0 < taxa <= 1:
+        raise ValueError("A taxa de transmissão deve estar em (0, 1]")
+    rng = np.random.default_rng(rng)
+    k = min(n, max(1, int(round(taxa * n))))
+    prioridade = rng.random((quantidade, n))
+    if incluir_extremos:
+        prioridade[:, [0, n - 1]] = -1.0
+        k = max(k, min(n, 2))
+    escolhidos = np.argpartition(prioridade, k - 1, axis=1)[:, :k]
+    mascaras = np.zeros((quantidade, n), dtype=bool)
+    np.put_along_axis(mascaras, escolhidos, True, axis=1)
+    return mascaras
+
+
+def _normalizar(y, mascaras):
+    """Centraliza e escala cada linha pelas amostras observadas; a regularização fica relativa ao sinal"""
+    contagem = mascaras.sum(axis=1, keepdims=True)
+    obs = np.where(mascaras, y, 0.0)
+    media = obs.sum(axis=1, keepdims=True) / np.maximum(contagem, 1)
+    desvio = np.sqrt((np.where(mascaras, y - media, 0.0) ** 2).sum(axis=1, keepdims=True) / np.maximum(contagem, 1))
+    desvio = np.where(desvio > 0, desvio, 1.0)
+    return np.where(mascaras, (y - media) / desvio, 0.0), media, desvio
+
+
+def fista(y, mascaras, psi, pesos, lam=0.05, max_iter=300, tol=1e-4):
+    """
+    Recuperação esparsa por FISTA para um lote de sinais.
+
+    Args:
+        y: (lote, n) valores; posições fora da máscara são ignoradas.
+        mascaras: (lote, n) bool, amostras transmitidas.
+        psi: (n, m) dicionário com norma de operador <= 1 (passo unitário).
+        pesos: (m,) peso de cada átomo no termo L1 (ver pesos_frequencia).
+        lam: Peso do termo L1, relativo a max|Psi^T y| de cada sinal.
+        tol: Para quando a maior variação de um coeficiente fica abaixo de tol.
+    Returns:
+        Coeficientes (lote, m).
+    """
+    alvo = np.where(mascaras, y, 0.0)
+    limiar = lam * np.abs(alvo @ psi).max(axis=1, keepdims=True) * pesos
+    c = np.zeros((y.shape[0], psi.shape[1]))
+    z = c
+    t = 1.0
+    for _ in range(max_iter):
+        residuo = np.where(mascaras, z @ psi.T - alvo, 0.0)
+        u = z - residuo @ psi
+        c_novo = np.sign(u) * np.maximum(np.abs(u) - limiar, 0.0)
+        t_novo = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t * t))
+        z = c_novo + ((t - 1.0) / t_novo) * (c_novo - c)
+        delta = np.abs(c_novo - c).max()
+        c, t = c_novo, t_novo
+        if delta < tol:
+            break
+    return c
+
+
+def omp(y, mascaras, psi, pesos, max_atomos=None, tol=1e-2):
+    """
+    Orthogonal Matching Pursuit, sinal a sinal (o suporte difere entre linhas). A correlação de
+    cada átomo é dividida por (1 + pesos), favorecendo os mais suaves em caso de ambiguidade.
+
+    Args:
+        max_atomos: Número máximo de átomos; padrão: metade das amostras observadas.
+        tol: Para quando a norma do resíduo cai abaixo de tol * ||y observado||.
+    Returns:
+        Coeficientes (lote, m).
+    """
+    coef = np.zeros((y.shape[0], psi.shape[1]))
+    for i in range(y.shape[0]):
+        linhas = np.flatnonzero(mascaras[i])
+        if len(linhas) == 0:
+            continue
+        a = psi[linhas]
+        normas = np.linalg.norm(a, axis=0) * (1.0 + pesos)
+        normas[normas == 0] = np.inf
+        b = y[i, linhas]
+        limite = max_atomos or max(1, len(linhas) // 2)
+        suporte = []
+        residuo = b
+        x = np.zeros(0)
+        alvo = tol * np.linalg.norm(b)
+        while len(suporte) < min(limite, len(linhas)) and np.linalg.norm(residuo) > alvo:
+            correlacao = np.abs(a.T @ residuo) / normas
+            correlacao[suporte] = 0.0
+            suporte.append(int(np.argmax(correlacao)))
+            x, *_ = np.linalg.lstsq(a[:, suporte], b, rcond=None)
+            residuo = b - a[:, suporte] @ x
+        coef[i, suporte] = x
+    return coef
+
+
+def reconstruir_lote(y, mascaras, dicionario_tipo='dct', metodo='fista', **kwargs):
+    """
+    Reconstrói um lote de sinais de mesmo comprimento a partir das amostras transmitidas.
+
+    Args:
+        y: (lote, n) ou (n,) valores; posições não transmitidas são ignoradas (podem ser NaN).
+        mascaras: Mesmo formato de y, bool.
+        kwargs: Repassados a fista() (lam, max_iter, tol) ou omp() (max_atomos, tol).
+    Returns:
+        Array com o formato de y. Sinais sem nenhuma amostra transmitida ficam NaN.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    mascaras = np.asarray(mascaras, dtype=bool)
+    unico = y.ndim == 1
+    y, mascaras = np.atleast_2d(y), np.atleast_2d(mascaras)
+    if y.shape != mascaras.shape:
+        raise ValueError("y e mascaras devem ter o mesmo formato")
+    mascaras = mascaras & np.isfinite(y)
+    psi = dicionario(y.shape[1], dicionario_tipo)
+    pesos = pesos_frequencia(psi.shape[1], dicionario_tipo)
+    yn, media, desvio = _normalizar(y, mascaras)
+    if metodo == 'fista':
+        coef = fista(yn, mascaras, psi, pesos, **kwargs)
+    elif metodo == 'omp':
+        coef = omp(yn, mascaras, psi, pesos, **kwargs)
+    else:
+        raise ValueError(f"Método desconhecido: {metodo} (opções: {', '.join(METODOS)})")
+    resultado = (coef @ psi.T) * desvio + media
+    resultado[~mascaras.any(axis=1)] = np.nan
+    return resultado[0] if unico else resultado
+
+
+def reconstruir_serie(valores, mascara, janela=256, margem=32, **kwargs):
+    """
+    Reconstrói uma série longa processando janelas sobrepostas como um único lote.
+
+    Cada janela tem `janela` amostras; apenas o miolo (descartando `margem` amostras de cada lado,
+    exceto nas bordas da série) é aproveitado, o que evita artefatos de borda do dicionário.
+    Trechos sem nenhuma amostra transmitida são preenchidos por interpolação linear.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    mascara = np.asarray(mascara, dtype=bool)
+    n = len(valores)
+    if n <= janela:
+        resultado = reconstruir_lote(valores, mascara, **kwargs)
+    else:
+        passo = janela - 2 * margem
+        if passo <= 0:
+            raise ValueError("A margem deve ser menor que metade da janela")
+        inicios = np.arange(0, n - janela + passo, passo)
+        inicios[-1] = min(inicios[-1], n - janela)
+        idx = inicios[:, None] + np.arange(janela)[None, :]
+        blocos = reconstruir_lote(valores[idx], mascara[idx], **kwargs)
+        resultado = np.full(n, np.nan)
+        # Só o miolo de cada janela; os miolos de janelas vizinhas se encostam (a última,
+        # alinhada ao fim da série, pode sobrepor o miolo da anterior e prevalece)
+        ultima = len(inicios) - 1
+        for b in range(len(inicios)):
+            a = 0 if b == 0 else margem
+            z = janela if b == ultima else janela - margem
+            resultado[inicios[b] + a:inicios[b] + z] = blocos[b, a:z]
+    faltando = ~np.isfinite(resultado)
+    obs = np.flatnonzero(mascara & np.isfinite(valores))
+    if faltando.any() and len(obs):
+        resultado[faltando] = np.interp(np.flatnonzero(faltando), obs, valores[obs])
+    return resultado
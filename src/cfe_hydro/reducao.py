@@ -0,0 +1,99 @@
+"""
+Função: Redução de séries longas para exibição: seleciona no máximo `limite` pontos por janelas de
+        tempo (baldes de mesma duração, tipicamente um por pixel do gráfico), por LTTB
+        (Largest-Triangle-Three-Buckets) ou por mínimo/máximo de cada balde.
+
+As funções retornam os índices dos pontos escolhidos (em ordem crescente), de modo que o chamador
+pode reduzir várias colunas ou um DataFrame com .iloc. O primeiro e o último ponto são sempre
+mantidos (limite >= 2); valores NaN nunca são escolhidos.
+"""
+import numpy as np
+
+METODOS = ('lttb', 'minmax')
+
+
+def _baldes(x, quantidade):
+    """Início e fim (exclusivo) dos baldes não vazios que dividem [x[0], x[-1]] em `quantidade` partes iguais"""
+    bordas = np.linspace(x[0], x[-1], quantidade + 1)
+    limites = np.unique(np.searchsorted(x, bordas[1:-1], side='left'))
+    inicios = np.concatenate([[0], limites[(limites > 0) & (limites < len(x))]])
+    fins = np.append(inicios[1:], len(x))
+    return inicios, fins
+
+
+def _preparar(x, y, limite):
+    if limite < 2:
+        raise ValueError("O limite de pontos deve ser >= 2")
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    validos = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    # Relativo ao início: timestamps em ms (~1e12) perdem precisão nos produtos da área
+    xv = x[validos]
+    return (xv - xv[0] if len(xv) else xv), y[validos], validos
+
+
+def lttb(x, y, limite):
+    """
+    Largest-Triangle-Three-Buckets: em cada balde, mantém o ponto que forma o maior triângulo
+    com o ponto escolhido no balde anterior e a média do balde seguinte. Preserva a forma da
+    curva com um ponto por balde.
+
+    Args:
+        x: Abscissas em ordem crescente (números ou datetime64).
+        y: Valores.
+        limite: Número máximo de pontos devolvidos.
+    Returns:
+        Índices (int64) dos pontos escolhidos.
+    """
+    x, y, validos = _preparar(x, y, limite)
+    n = len(x)
+    if n <= limite:
+        return validos
+    if limite == 2:
+        return validos[[0, -1]]
+    inicios, fins = _baldes(x[1:-1], limite - 2)
+    inicios, fins = inicios + 1, fins + 1
+    contagens = fins - inicios
+    # Média de cada balde; o "seguinte" do último balde é o último ponto. reduceat soma o último
+    # balde até o fim do array: o último ponto fica de fora da soma, como da contagem
+    medias_x = np.append(np.add.reduceat(x[:-1], inicios) / contagens, x[-1])
+    medias_y = np.append(np.add.reduceat(y[:-1], inicios) / contagens, y[-1])
+    escolhidos = np.empty(len(inicios) + 2, dtype=np.int64)
+    escolhidos[0] = a = 0
+    for b, (i0, i1) in enumerate(zip(inicios.tolist(), fins.tolist())):
+        ax, ay = x[a], y[a]
+        cx, cy = medias_x[b + 1], medias_y[b + 1]
+        area = np.abs((ax - cx) * (y[i0:i1] - ay) - (ax - x[i0:i1]) * (cy - ay))
+        a = escolhidos[b + 1] = i0 + int(area.argmax())
+    escolhidos[-1] = n - 1
+    return validos[escolhidos]
+
+
+def minmax(x, y, limite):
+    """
+    Mínimo e máximo de cada balde (até 2 pontos por balde, limite // 2 baldes), além do primeiro
+    e do último ponto. Preserva os picos exatamente; totalmente vetorizado.
+    """
+    x, y, validos = _preparar(x, y, limite)
+    n = len(x)
+    if n <= limite:
+        return validos
+    if limite < 4:
+        return validos[[0, -1]]
+    inicios, fins = _baldes(x, (limite - 2) // 2)
+    balde = np.repeat(np.arange(len(inicios)), fins - inicios)
+    ordem = np.lexsort((y, balde))  # por balde e, dentro dele, por valor
+    escolhidos = np.concatenate([[0, n - 1], ordem[inicios], ordem[fins - 1]])
+    return validos[np.unique(escolhidos)]
+
+
+def reduzir(x, y, limite, metodo='lttb'):
+    """Índices de no máximo `limite` pontos de (x, y), pelo método escolhido (ver METODOS)"""
+    if metodo == 'lttb':
+        return lttb(x, y, limite)
+    if metodo == 'minmax':
+        return minmax(x, y, limite)
+    raise ValueError(f"Método desconhecido: {metodo} (opções: {', '.join(METODOS)})")
@@ -0,0 +1,342 @@
+"""
+Função: Varredura paralela das simulações de transmissão por intervalo (1 amostra a cada N), sobre
+        vários datasets e métodos de interpolação, em um pool de processos.
+
+Cada dataset é lido uma única vez pelo processo principal e copiado para um bloco de memória
+compartilhada (ids + uma linha por parâmetro, float64); os processos do pool apenas mapeiam esse
+bloco, somente leitura, sem serializar os dados a cada tarefa. Uma tarefa é o par
+(dataset, método, intervalo) e avalia todos os parâmetros, que compartilham a mesma máscara de
+transmissão. As linhas de resultado são gravadas no CSV à medida que as tarefas terminam e o arquivo é
+reordenado ao final. O padrão é data/resultados_varredura.csv: o formato é o de
+data/resultados_simulacao.csv acrescido das colunas dataset e metodo e das demais métricas, e a
+varredura não sobrescreve o arquivo distribuído.
+
+Para exportações maiores que a memória, simular_em_blocos() faz todas as simulações de um dataset
+numa única leitura em blocos (cfe_hydro.dados.ler_blocos), com métricas acumuladas por bloco
+(AcumuladorMetricas): cada simulação guarda apenas as amostras desde o seu último ponto
+transmitido, e os resultados são os mesmos da simulação em memória.
+
+Com um cache (cfe_hydro.cache), as tarefas cujo dataset (conteúdo), método, intervalo e parâmetros
+já foram simulados são respondidas pelo processo principal, sem passar pelo pool; repetir a
+varredura sobre os mesmos dados custa só a leitura dos CSVs.
+
+Uso (a partir de ./src):
+    python -m cfe_hydro.varredura data/dataset_cfe-hydro.csv --intervalos 1 500 --processos 8
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cfe_hydro.cache import CacheResultados, digital_arrays
+from cfe_hydro.dados import ID_INVALIDO, LINHAS_POR_BLOCO, PARAMETROS, carregar_matriz, ler_blocos
+from cfe_hydro.interpolacao import preencher_lacunas
+from cfe_hydro.metricas import METRICAS, AcumuladorMetricas, calcular_metricas
+
+ARQUIVO_RESULTADOS = os.path.join('data', 'resultados_varredura.csv')
+
+
+def _linear(ids, valores, parametro):
+    return preencher_lacunas(ids, valores)
+
+
+def _conservador(ids, valores, parametro):
+    return preencher_lacunas(ids, valores, max_gap=2)
+
+
+def _seletivo(ids, valores, parametro):
+    # Mesma escolha de AnalisadorInterpolacaoCorrigido.interpolar_parametro
+    return preencher_lacunas(ids, valores, max_gap=2 if parametro == 'ph' else None)
+
+
+METODOS = {
+    'seletivo': _seletivo,
+    'linear': _linear,
+    'conservador': _conservador,
+}
+
+# Blocos de memória compartilhada mapeados em cada processo do pool: nome do dataset -> (shm, matriz)
+_DATASETS = {}
+
+
+def _anexar_datasets(descritores):
+    """Inicializador do pool: mapeia os blocos compartilhados como arrays somente leitura"""
+    for nome, (nome_shm, forma) in descritores.items():
+        shm = shared_memory.SharedMemory(name=nome_shm)
+        matriz = np.ndarray(forma, dtype=np.float64, buffer=shm.buf)
+        matriz.flags.writeable = False
+        _DATASETS[nome] = (shm, matriz)
+
+
+def simular_intervalo(matriz, intervalo, metodo, parametros=PARAMETROS):
+    """
+    Simula a transmissão de 1 amostra a cada `intervalo` (por posição) e reconstrói cada parâmetro.
+
+    Returns:
+        Dict no formato de uma linha de ARQUIVO_RESULTADOS (sem as colunas dataset e metodo).
+    """
+    ids = matriz[0]
+    n = len(ids)
+    interpolar = METODOS[metodo]
+    transmitidos = np.zeros(n, dtype=bool)
+    transmitidos[::intervalo] = True
+
+    originais = matriz[1:1 + len(parametros)]
+    simulados = np.where(transmitidos, originais, np.nan)
+    reconstrucoes = np.vstack([interpolar(ids, simulados[i], p) for i, p in enumerate(parametros)])
+    # Uma passada do kernel para todos os parâmetros (cada linha contra o seu original)
+    metricas = calcular_metricas(originais, reconstrucoes)
+
+    linha = {
+        'intervalo': intervalo,
+        'pontos_transmitidos': int(transmitidos.sum()),
+        'percentual_transmitido': transmitidos.sum() / n * 100 if n else 0.0,
+    }
+    for i, parametro in enumerate(parametros):
+        for nome in METRICAS:
+            linha[f'{parametro}_{nome}'] = float(metricas[nome][i])
+    return linha
+
+
+class SimulacaoBlocos:
+    """
+    simular_intervalo sobre uma série recebida em blocos (matrizes como as de carregar_matriz).
+
+    Cada parâmetro mantém uma janela (ids e valores) a partir do seu último ponto transmitido com
+    valor: as amostras até esse ponto já têm a reconstrução definitiva e são avaliadas, e as
+    seguintes esperam o próximo ponto conhecido. A memória fica limitada ao bloco mais a maior
+    lacuna de cada parâmetro (o intervalo, se não há valores ausentes nos pontos transmitidos).
+    """
+
+    def __init__(self, intervalo, metodo, parametros=PARAMETROS):
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconhecido: {metodo} (opções: {', '.join(METODOS)})")
+        self.intervalo = intervalo
+        self.metodo = metodo
+        self.parametros = list(parametros)
+        self.acumuladores = [AcumuladorMetricas() for _ in self.parametros]
+        self.amostras = 0
+        self.transmitidos = 0
+        self._janelas = [np.empty((2, 0)) for _ in self.parametros]  # ids e valores de cada parâmetro
+        self._inicios = [0] * len(self.parametros)      # posição (na série) da primeira coluna da janela
+        self._avaliadas = [0] * len(self.parametros)    # colunas iniciais da janela já avaliadas
+
+    def _avaliar(self, i, fim):
+        """Avalia as colunas ainda não avaliadas da janela do parâmetro i, até fim (exclusivo)"""
+        ids, originais = self._janelas[i]
+        inicio = self._inicios[i]
+        transmitidos = (np.arange(inicio, inicio + len(ids)) % self.intervalo) == 0
+        reconstrucao = METODOS[self.metodo](ids, np.where(transmitidos, originais, np.nan), self.parametros[i])
+        self.acumuladores[i].adicionar(originais[self._avaliadas[i]:fim], reconstrucao[self._avaliadas[i]:fim])
+        self._avaliadas[i] = max(self._avaliadas[i], fim)
+
+    def adicionar(self, matriz):
+        posicoes = np.arange(self.amostras, self.amostras + matriz.shape[1])
+        self.transmitidos += int((posicoes % self.intervalo == 0).sum())
+        self.amostras += matriz.shape[1]
+
+        for i in range(len(self.parametros)):
+            janela = self._janelas[i] = np.hstack([self._janelas[i], matriz[[0, 1 + i]]])
+            inicio = self._inicios[i]
+            transmitidos = (np.arange(inicio, inicio + janela.shape[1]) % self.intervalo) == 0
+            conhecidos = np.flatnonzero(transmitidos & ~np.isnan(janela[1]))
+            # Sem ponto conhecido, nada antes do primeiro pode ser reconstruído: avalia tudo
+            corte = conhecidos[-1] if len(conhecidos) else janela.shape[1] - 1
+            if corte >= self._avaliadas[i]:
+                self._avaliar(i, corte + 1)
+            self._janelas[i] = janela[:, corte:]
+            self._inicios[i] += corte
+            self._avaliadas[i] -= corte
+
+    def linha(self):
+        """Resultado no formato de simular_intervalo (avalia as amostras ainda pendentes)"""
+        for i in range(len(self.parametros)):
+            self._avaliar(i, self._janelas[i].shape[1])
+        n = self.amostras
+        linha = {
+            'intervalo': self.intervalo,
+            'pontos_transmitidos': self.transmitidos,
+            'percentual_transmitido': self.transmitidos / n * 100 if n else 0.0,
+        }
+        for parametro, acumulador in zip(self.parametros, self.acumuladores):
+            metricas = acumulador.resultado()
+            for nome in METRICAS:
+                linha[f'{parametro}_{nome}'] = float(metricas[nome])
+        return linha
+
+
+def simular_em_blocos(caminho, intervalos=range(1, 11), metodos=('seletivo',), parametros=PARAMETROS,
+                      linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Todas as simulações (método, intervalo) de um dataset numa única leitura em blocos, com memória
+    limitada ao bloco (mais `intervalo` amostras por simulação).
+
+    Returns:
+        Lista de linhas no formato de simular_intervalo, acrescidas da coluna metodo.
+    """
+    parametros = list(parametros)
+    simulacoes = [SimulacaoBlocos(intervalo, metodo, parametros) for metodo in metodos for intervalo in intervalos]
+    for bloco in ler_blocos(caminho, ['id'] + parametros, linhas_por_bloco, dtype_valores=np.float64):
+        matriz = np.full((1 + len(parametros), len(bloco['id'])), np.nan)
+        matriz[0] = np.where(bloco['id'] == ID_INVALIDO, np.nan, bloco['id'])
+        for linha, parametro in enumerate(parametros, start=1):
+            if parametro in bloco:
+                matriz[linha] = bloco[parametro]
+        for simulacao in simulacoes:
+            simulacao.adicionar(matriz)
+    return [{'metodo': simulacao.metodo, **simulacao.linha()} for simulacao in simulacoes]
+
+
+def _executar_tarefa(dataset, metodo, intervalo, parametros):
+    _, matriz = _DATASETS[dataset]
+    linha = simular_intervalo(matriz, intervalo, metodo, parametros)
+    return {'dataset': dataset, 'metodo': metodo, **linha}
+
+
+def executar_varredura(caminhos, intervalos=range(1, 11), metodos=('seletivo',), parametros=PARAMETROS,
+                       arquivo=ARQUIVO_RESULTADOS, processos=None, ordenar=True, progresso=None, cache=None,
+                       linhas_por_bloco=None):
+    """
+    Executa as simulações (dataset, método, intervalo) em um pool de processos.
+
+    Args:
+        caminhos: CSVs de entrada; o nome do dataset é o nome do arquivo sem extensão.
+        processos: Tamanho do pool (padrão: os.cpu_count()).
+        ordenar: Reordena o CSV por (dataset, metodo, intervalo) ao final.
+        progresso: Callback opcional chamado com (concluídas, total) a cada linha gravada.
+        cache: CacheResultados opcional com as linhas de simulações anteriores.
+        linhas_por_bloco: Se informado, cada dataset é lido em blocos desse tamanho e simulado por
+                          simular_em_blocos, no processo principal e sem cache (datasets maiores
+                          que a memória).
+    Returns:
+        Número de linhas gravadas.
+    """
+    for metodo in metodos:
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconhecido: {metodo} (opções: {', '.join(METODOS)})")
+    parametros = list(parametros)
+    colunas = (['dataset', 'metodo', 'intervalo', 'pontos_transmitidos', 'percentual_transmitido']
+               + [f'{p}_{m}' for p in parametros for m in METRICAS])
+
+    if linhas_por_bloco is not None:
+        total = 0
+        with open(arquivo, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=colunas)
+            escritor.writeheader()
+            nomes = set()
+            for caminho in caminhos:
+                nome = os.path.splitext(os.path.basename(caminho))[0]
+                if nome in nomes:
+                    raise ValueError(f"Dataset repetido: {nome}")
+                nomes.add(nome)
+                for linha in simular_em_blocos(caminho, intervalos, metodos, parametros, linhas_por_bloco):
+                    escritor.writerow({'dataset': nome, **linha})
+                    total += 1
+                f.flush()
+                if progresso is not None:
+                    progresso(total, len(caminhos) * len(metodos) * len(intervalos))
+        tarefas = range(total)
+    else:
+        tarefas = _varredura_em_memoria(caminhos, intervalos, metodos, parametros, arquivo, colunas, processos,
+                                        progresso, cache)
+
+    if ordenar and tarefas:
+        import pandas as pd
+        df = pd.read_csv(arquivo)
+        df.sort_values(['dataset', 'metodo', 'intervalo'], kind='stable').to_csv(arquivo, index=False)
+    return len(tarefas)
+
+
+def _varredura_em_memoria(caminhos, intervalos, metodos, parametros, arquivo, colunas, processos, progresso, cache):
+    """Datasets em memória compartilhada e tarefas no pool; devolve a lista de tarefas"""
+    blocos = []
+    descritores = {}
+    digitais = {}
+    try:
+        for caminho in caminhos:
+            nome = os.path.splitext(os.path.basename(caminho))[0]
+            if nome in descritores:
+                raise ValueError(f"Dataset repetido: {nome}")
+            matriz = carregar_matriz(caminho, parametros)
+            shm = shared_memory.SharedMemory(create=True, size=max(matriz.nbytes, 1))
+            blocos.append(shm)
+            np.ndarray(matriz.shape, dtype=np.float64, buffer=shm.buf)[:] = matriz
+            descritores[nome] = (shm.name, matriz.shape)
+            if cache is not None:
+                digitais[nome] = digital_arrays(matriz)
+
+        tarefas = [(nome, metodo, intervalo) for nome in descritores for metodo in metodos for intervalo in intervalos]
+        with open(arquivo, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=colunas)
+            escritor.writeheader()
+            concluidas = 0
+            pendentes = {}  # tarefa -> chave no cache (None sem cache)
+            for tarefa in tarefas:
+                nome, metodo, intervalo = tarefa
+                if cache is None:
+                    pendentes[tarefa] = None
+                    continue
+                chave = cache.chave('varredura.simular_intervalo', [digitais[nome]],
+                                    {'metodo': METODOS[metodo], 'intervalo': intervalo, 'parametros': parametros})
+                linha = cache.obter(chave)
+                if linha is None:
+                    pendentes[tarefa] = chave
+                    continue
+                escritor.writerow({'dataset': nome, 'metodo': metodo,
+                                   **{coluna: valor.item() for coluna, valor in linha.items()}})
+                concluidas += 1
+                if progresso is not None:
+                    progresso(concluidas, len(tarefas))
+
+            if pendentes:
+                with ProcessPoolExecutor(max_workers=processos, initializer=_anexar_datasets,
+                                         initargs=(descritores,)) as pool:
+                    futuros = {pool.submit(_executar_tarefa, nome, metodo, intervalo, parametros): chave
+                               for (nome, metodo, intervalo), chave in pendentes.items()}
+                    for futuro in as_completed(futuros):
+                        linha = futuro.result()
+                        escritor.writerow(linha)
+                        f.flush()
+                        if cache is not None:
+                            cache.gravar(futuros[futuro], {coluna: valor for coluna, valor in linha.items()
+                                                           if coluna not in ('dataset', 'metodo')})
+                        concluidas += 1
+                        if progresso is not None:
+                            progresso(concluidas, len(tarefas))
+    finally:
+        for shm in blocos:
+            shm.close()
+            shm.unlink()
+    return tarefas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura paralela das simulações de transmissão por intervalo")
+    parser.add_argument('datasets', nargs='+', help="CSVs no formato de data/dataset_cfe-hydro.csv")
+    parser.add_argument('--intervalos', nargs=2, type=int, default=[1, 10], metavar=('INICIO', 'FIM'),
+                        help="Faixa de intervalos, inclusiva (padrão: 1 10)")
+    parser.add_argument('--metodos', nargs='+', default=['seletivo'], choices=list(METODOS))
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--saida', default=ARQUIVO_RESULTADOS)
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Refaz todas as simulações, sem ler nem gravar o cache")
+    parser.add_argument('--blocos', type=int, default=None, metavar='LINHAS',
+                        help="Lê cada dataset em blocos de LINHAS linhas, numa única passada e com memória "
+                             "limitada (sem pool nem cache)")
+    args = parser.parse_args()
+
+    cache = None if args.sem_cache or args.blocos else CacheResultados()
+    inicio = time.perf_counter()
+    total = executar_varredura(args.datasets, range(args.intervalos[0], args.intervalos[1] + 1), args.metodos,
+                               arquivo=args.saida, processos=args.processos, cache=cache,
+                               linhas_por_bloco=args.blocos)
+    em_cache = f" ({cache.acertos} do cache)" if cache is not None else ""
+    print(f"{total} simulações gravadas em '{args.saida}'{em_cache} em {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
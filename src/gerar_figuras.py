@@ -0,0 +1,210 @@
+"""
+Função: Gera em arquivo, sem interface gráfica, os gráficos dos scripts de análise
+        (Analise_estatistica_dados_sensoriados, Graficos_Resultados e
+        Graficos_Estimativa_de_Campo_Compressiva), um gráfico por tarefa de um pool de processos.
+
+Cada script expõe FIGURAS (nome do arquivo -> função que monta a figura a partir de
+preparar_dados()), ENTRADAS (arquivos de dados de que os gráficos dependem, ou diretórios, como
+um dataset Parquet particionado) e DIRETORIO_FIGURAS.
+Os dados de cada script são preparados uma única vez, no processo principal, e enviados às
+tarefas; com processos suficientes, o tempo total fica próximo ao do gráfico mais lento, e não à
+soma de todos. As tarefas mais demoradas na execução anterior são submetidas primeiro.
+
+Com --incremental, um gráfico só é refeito se mudou alguma de suas entradas: o conteúdo dos
+arquivos de ENTRADAS, o código do script e do pacote cfe_hydro, o formato, o dpi ou a versão do
+matplotlib. As impressões digitais ficam em <diretório de saída>/.figuras.json.
+
+Uso (a partir de ./src):
+    python gerar_figuras.py --formato png --dpi 150 --incremental
+    python gerar_figuras.py --scripts Graficos_Resultados --figuras evolucao_rmse evolucao_r2 --saida /tmp/figuras
+"""
+import argparse
+import contextlib
+import glob
+import hashlib
+import importlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Backend sem interface gráfica, antes de qualquer importação do matplotlib (herdado pelo pool)
+os.environ['MPLBACKEND'] = 'Agg'
+
+SCRIPTS = ('Analise_estatistica_dados_sensoriados', 'Graficos_Resultados', 'Graficos_Estimativa_de_Campo_Compressiva')
+FORMATOS = ('png', 'pdf', 'svg')
+ARQUIVO_DIGITAIS = '.figuras.json'
+DIRETORIO_PACOTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cfe_hydro')
+
+
+def _arquivos(caminho):
+    """O próprio arquivo, ou os arquivos de um diretório (dataset Parquet particionado), em ordem"""
+    if not os.path.isdir(caminho):
+        return [(os.path.basename(caminho), caminho)]
+    return sorted((os.path.relpath(os.path.join(raiz, nome), caminho), os.path.join(raiz, nome))
+                  for raiz, _, nomes in os.walk(caminho) for nome in nomes)
+
+
+def _hash_arquivos(caminhos):
+    h = hashlib.sha256()
+    for nome, caminho in (item for caminho in caminhos for item in _arquivos(caminho)):
+        h.update(nome.encode('utf-8') + b'\0')
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloco)
+    return h.hexdigest()
+
+
+def digital_script(modulo):
+    """Impressão digital do que define os gráficos de um script: dados, código do script e do cfe_hydro"""
+    import matplotlib
+
+    codigo = [modulo.__file__] + sorted(glob.glob(os.path.join(DIRETORIO_PACOTE, '*.py')))
+    return hashlib.sha256('|'.join([_hash_arquivos(modulo.ENTRADAS), _hash_arquivos(codigo),
+                                    matplotlib.__version__]).encode('utf-8')).hexdigest()
+
+
+def ler_digitais(diretorio):
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_DIGITAIS), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def gravar_digitais(diretorio, digitais):
+    caminho = os.path.join(diretorio, ARQUIVO_DIGITAIS)
+    with open(caminho + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(digitais, f, indent=1, sort_keys=True)
+    os.replace(caminho + '.tmp', caminho)
+
+
+def _renderizar(script, nome, dados, caminho, dpi):
+    """Tarefa do pool: monta uma figura e a salva; retorna o tempo gasto, ou None se não há figura"""
+    import matplotlib.pyplot as plt
+
+    modulo = importlib.import_module(script)
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fig = modulo.FIGURAS[nome](dados)
+    if fig is None:
+        return None
+    fig.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return time.perf_counter() - inicio
+
+
+def gerar_figuras(scripts=SCRIPTS, figuras=None, formato='png', dpi=300, saida=None, processos=None,
+                  incremental=False, progresso=print):
+    """
+    Gera os gráficos dos scripts em um pool de processos.
+
+    Args:
+        scripts: Módulos (nomes) com FIGURAS, ENTRADAS, DIRETORIO_FIGURAS e preparar_dados().
+        figuras: Nomes a gerar (padrão: todos os dos scripts).
+        formato: Extensão dos arquivos (FORMATOS).
+        dpi: Resolução dos arquivos rasterizados.
+        saida: Diretório de saída; padrão, o DIRETORIO_FIGURAS de cada script.
+        processos: Tamanho do pool (padrão: um por gráfico, até os.cpu_count()).
+        incremental: Pula os gráficos cujas entradas não mudaram desde a última geração.
+        progresso: Função que recebe as mensagens de andamento (ou None).
+    Returns:
+        Dict com as listas 'gerados', 'inalterados' e 'vazios' (caminhos).
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato} (opções: {', '.join(FORMATOS)})")
+    avisar = progresso or (lambda mensagem: None)
+    resultado = {'gerados': [], 'inalterados': [], 'vazios': []}
+    pendentes = {}   # script -> [(nome, caminho, diretorio, digital)]
+    digitais = {}    # diretorio -> impressões digitais gravadas
+    destinos = set()
+    for script in scripts:
+        modulo = importlib.import_module(script)
+        diretorio = saida or modulo.DIRETORIO_FIGURAS
+        os.makedirs(diretorio, exist_ok=True)
+        anteriores = digitais.setdefault(diretorio, ler_digitais(diretorio))
+        base = digital_script(modulo)
+        for nome in modulo.FIGURAS:
+            if figuras is not None and nome not in figuras:
+                continue
+            caminho = os.path.join(diretorio, f'{nome}.{formato}')
+            if caminho in destinos:
+                raise ValueError(f"Dois gráficos com o mesmo arquivo de saída: {caminho}")
+            destinos.add(caminho)
+            digital = hashlib.sha256(f'{base}|{script}|{nome}|{formato}|{dpi}'.encode('utf-8')).hexdigest()
+            anterior = anteriores.get(os.path.basename(caminho), {})
+            if incremental and anterior.get('digital') == digital and os.path.exists(caminho):
+                resultado['inalterados'].append(caminho)
+                avisar(f"  inalterado {caminho}")
+                continue
+            pendentes.setdefault(script, []).append((nome, caminho, diretorio, digital))
+
+    if figuras is not None:
+        desconhecidas = set(figuras) - {os.path.splitext(os.path.basename(c))[0] for c in destinos}
+        if desconhecidas:
+            raise ValueError(f"Gráficos desconhecidos: {', '.join(sorted(desconhecidas))} (ver --listar)")
+
+    tarefas = []
+    for script, itens in pendentes.items():
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dados = importlib.import_module(script).preparar_dados()
+        avisar(f"  dados de {script} preparados em {time.perf_counter() - inicio:.2f} s")
+        tarefas += [(script, dados) + item for item in itens]
+    # Mais demoradas (na execução anterior) primeiro: o pool termina mais perto do gráfico mais lento
+    tarefas.sort(key=lambda t: -digitais[t[4]].get(os.path.basename(t[3]), {}).get('segundos', float('inf')))
+
+    if tarefas:
+        processos = processos or min(len(tarefas), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            futuros = {pool.submit(_renderizar, script, nome, dados, caminho, dpi): (caminho, diretorio, digital)
+                       for script, dados, nome, caminho, diretorio, digital in tarefas}
+            for futuro in as_completed(futuros):
+                caminho, diretorio, digital = futuros[futuro]
+                segundos = futuro.result()
+                if segundos is None:
+                    resultado['vazios'].append(caminho)
+                    avisar(f"  sem dados  {caminho}")
+                    continue
+                digitais[diretorio][os.path.basename(caminho)] = {'digital': digital, 'segundos': round(segundos, 3)}
+                resultado['gerados'].append(caminho)
+                avisar(f"  gerado     {caminho} ({segundos:.2f} s)")
+        for diretorio, registro in digitais.items():
+            gravar_digitais(diretorio, registro)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os gráficos dos scripts de análise em arquivo, em paralelo")
+    parser.add_argument('--scripts', nargs='+', default=list(SCRIPTS), choices=SCRIPTS)
+    parser.add_argument('--figuras', nargs='+', default=None, help="Nomes dos gráficos (padrão: todos; ver --listar)")
+    parser.add_argument('--formato', default='png', choices=FORMATOS)
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--saida', default=None, help="Diretório de saída (padrão: o de cada script)")
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--incremental', action='store_true',
+                        help="Não refaz os gráficos cujas entradas não mudaram desde a última geração")
+    parser.add_argument('--listar', action='store_true', help="Lista os gráficos disponíveis e sai")
+    args = parser.parse_args()
+
+    if args.listar:
+        for script in args.scripts:
+            modulo = importlib.import_module(script)
+            print(f"{script} ({modulo.DIRETORIO_FIGURAS}):")
+            for nome in modulo.FIGURAS:
+                print(f"  {nome}")
+        return
+
+    inicio = time.perf_counter()
+    try:
+        resultado = gerar_figuras(args.scripts, args.figuras, args.formato, args.dpi, args.saida, args.processos,
+                                  args.incremental)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{len(resultado['gerados'])} gráficos gerados, {len(resultado['inalterados'])} inalterados, "
+          f"{len(resultado['vazios'])} sem dados, em {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
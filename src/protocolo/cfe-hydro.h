@@ -12,6 +12,18 @@
   #include <ESP8266WiFi.h>
 #endif
 
+// Formato binário compacto (decodificador: src/cfe_hydro/codec.py)
+#define CFE_VERSAO_BINARIO 1
+#define CFE_ESCALA_PADRAO 0.01f
+#define CFE_VALOR_AUSENTE (-32768)
+#define CFE_CABECALHO_BINARIO 10   // versão, schema_id, epoch (s), ms, n_leituras
+#define CFE_BYTES_LEITURA 5        // índice, deslocamento (décimos de s), valor quantizado
+
+// Taxa de transmissão por sensor (malha de controle: src/app/controle_taxa.py): cada sensor envia
+// 1 a cada N amostras do lote, com N limitado a [CFE_PASSO_MINIMO, CFE_PASSO_MAXIMO] por padrão
+#define CFE_PASSO_MINIMO 1
+#define CFE_PASSO_MAXIMO 30
+
 class CFEHydro {
 public:
     struct SensorConfig {
@@ -22,6 +34,7 @@ public:
         float optimal_max;
         const char* interpolation; // "linear", "logarithmic", "polynomial", "sigmoidal"
         float value;               // leitura atual
+        float scale;               // resolução da quantização no formato binário (0 = CFE_ESCALA_PADRAO)
     };
 
     // Construtor para configuração dinâmica (sensores adicionados via addSensor)
@@ -30,6 +43,10 @@ public:
           _sensors(nullptr), _num_sensors(0), _max_sensors(0), _dynamic(true) {
         _device_id = strdup(device_id);
         _timestamp[0] = '\0';
+        _epoch_s = 0;
+        _epoch_ms = 0;
+        initBatch();
+        initSteps();
     }
 
     // Construtor com array estático de sensores (apenas configuração, valores podem ser atualizados)
@@ -39,6 +56,11 @@ public:
           _sensors(sensors), _num_sensors(num_sensors), _max_sensors(num_sensors), _dynamic(false) {
         _device_id = strdup(device_id);
         _timestamp[0] = '\0';
+        _epoch_s = 0;
+        _epoch_ms = 0;
+        initBatch();
+        initSteps();
+        resizeSteps(num_sensors);
     }
 
     // Destrutor libera memória alocada
@@ -54,14 +76,19 @@ public:
             }
             free(_sensors);
         }
+        free(_batch_values);
+        free(_batch_millis);
+        free(_steps);
     }
 
     // Adiciona um novo sensor (apenas modo dinâmico)
     int addSensor(const char* type, const char* unit, const char* description,
-                  float optimal_min, float optimal_max, const char* interpolation = "linear") {
+                  float optimal_min, float optimal_max, const char* interpolation = "linear",
+                  float scale = CFE_ESCALA_PADRAO) {
         if (!_dynamic) return -1; // não permitido em modo estático
 
         int new_count = _num_sensors + 1;
+        if (!resizeSteps(new_count)) return -1;
         SensorConfig* new_sensors = (SensorConfig*)realloc(_sensors, new_count * sizeof(SensorConfig));
         if (!new_sensors) return -1;
 
@@ -75,7 +102,9 @@ public:
         s.optimal_max = optimal_max;
         s.interpolation = strdup(interpolation);
         s.value = 0.0f;
+        s.scale = scale;
         _num_sensors = new_count;
+        if (_batch_capacity > 0) beginBatch(_batch_capacity); // realoca o lote para o novo número de sensores
         return _num_sensors - 1;
     }
 
@@ -105,16 +134,162 @@ public:
         _timestamp[sizeof(_timestamp) - 1] = '\0';
     }
 
+    // Define o instante da leitura em epoch UTC (usado pelo formato binário)
+    void setEpoch(uint32_t epoch_seconds, uint16_t milliseconds = 0) {
+        _epoch_s = epoch_seconds;
+        _epoch_ms = milliseconds % 1000;
+    }
+
+    // Habilita o envio em lote: guarda até max_samples amostras entre transmissões (0 desabilita).
+    // Amostras pendentes são descartadas. Chamar depois de configurar os sensores.
+    bool beginBatch(int max_samples) {
+        free(_batch_values);
+        free(_batch_millis);
+        initBatch();
+        if (max_samples <= 0) return true;
+        if (_num_sensors == 0) return false;
+        _batch_values = (float*)malloc(sizeof(float) * max_samples * _num_sensors);
+        _batch_millis = (uint32_t*)malloc(sizeof(uint32_t) * max_samples);
+        if (!_batch_values || !_batch_millis) {
+            free(_batch_values);
+            free(_batch_millis);
+            initBatch();
+            return false;
+        }
+        _batch_capacity = max_samples;
+        return true;
+    }
+
+    // Guarda os valores atuais dos sensores como uma amostra do lote (descarta a mais antiga se cheio)
+    bool sample() {
+        if (_batch_capacity == 0) return false;
+        int slot;
+        if (_batch_count < _batch_capacity) {
+            slot = (_batch_start + _batch_count) % _batch_capacity;
+            _batch_count++;
+        } else {
+            slot = _batch_start;
+            _batch_start = (_batch_start + 1) % _batch_capacity;
+        }
+        _batch_millis[slot] = millis();
+        _sample_seq++;
+        for (int i = 0; i < _num_sensors; i++) {
+            _batch_values[slot * _num_sensors + i] = _sensors[i].value;
+        }
+        return true;
+    }
+
+    // Número de amostras aguardando transmissão
+    int pendingSamples() const {
+        return _batch_count;
+    }
+
+    // Limites do passo de transmissão (1 a cada N amostras) aceitos do receptor; os passos atuais
+    // são trazidos para dentro dos novos limites
+    void setTransmissionBounds(int min_step, int max_step) {
+        _min_step = constrain(min_step, 1, 255);
+        _max_step = constrain(max_step, _min_step, 255);
+        for (int i = 0; i < _num_sensors; i++) {
+            _steps[i] = constrain(_steps[i], _min_step, _max_step);
+        }
+    }
+
+    // Fração das amostras do lote transmitidas pelo sensor (1 = todas), convertida no passo
+    // inteiro mais próximo dentro dos limites. Sem lote (beginBatch), cada envio leva todos os sensores.
+    bool setTransmissionRatio(int index, float ratio) {
+        if (index < 0 || index >= _num_sensors || !(ratio > 0.0f)) return false;
+        long step = lroundf(1.0f / ratio);
+        _steps[index] = (uint8_t)constrain(step, (long)_min_step, (long)_max_step);
+        return true;
+    }
+
+    bool setTransmissionRatio(const char* type, float ratio) {
+        return setTransmissionRatio(sensorIndex(type), ratio);
+    }
+
+    // Passo atual do sensor: envia 1 a cada N amostras do lote
+    int transmissionStep(int index) const {
+        return (index >= 0 && index < _num_sensors) ? _steps[index] : 0;
+    }
+
+    // Aplica uma mensagem do tópico de controle: {"transmission_ratio": {"<sensor_type>": fração, ...}}.
+    // Sensores ausentes mantêm o passo atual; retorna quantos foram atualizados (-1 se inválida).
+    int applyControl(const uint8_t* payload, unsigned int length) {
+        DynamicJsonDocument doc(128 + _num_sensors * 48);
+        if (deserializeJson(doc, payload, length)) return -1;
+        JsonObject ratios = doc["transmission_ratio"];
+        if (ratios.isNull()) return -1;
+        int updated = 0;
+        for (JsonPair p : ratios) {
+            if (setTransmissionRatio(p.key().c_str(), p.value().as<float>())) updated++;
+        }
+        return updated;
+    }
+
+    // Identificador de 16 bits do esquema (FNV-1a dobrado), igual a id_esquema() no receptor
+    uint16_t schemaId() const {
+        uint32_t h = 0x811C9DC5UL;
+        for (int i = 0; i < _num_sensors; i++) {
+            const SensorConfig& s = _sensors[i];
+            h = fnv1aString(h, s.type);
+            h = fnv1aString(h, s.unit);
+            h = fnv1aString(h, s.description);
+            h = fnv1aString(h, s.interpolation);
+            float campos[3] = {s.optimal_min, s.optimal_max, sensorScale(i)};
+            h = fnv1aBytes(h, (const uint8_t*)campos, sizeof(campos));
+        }
+        return (uint16_t)((h >> 16) ^ (h & 0xFFFF));
+    }
+
+    // Publica os metadados estáticos no tópico de esquema (retido: enviado uma vez por conexão)
+    bool sendSchema(PubSubClient& mqttClient, const char* topic) {
+        size_t capacity = 256 + _num_sensors * 192;
+        DynamicJsonDocument doc(capacity);
+        buildSchemaJson(doc);
+
+        String output;
+        serializeJson(doc, output);
+        return mqttClient.publish(topic, output.c_str(), true);
+    }
+
+    // Envia as leituras no formato binário compacto: as amostras do lote, se houver, ou os valores atuais.
+    // O epoch (setEpoch) deve corresponder ao momento do envio. Lotes que não cabem em uma
+    // mensagem (255 leituras) são divididos em várias.
+    bool sendBinary(PubSubClient& mqttClient, const char* topic) {
+        uint8_t buffer[CFE_CABECALHO_BINARIO + 255 * CFE_BYTES_LEITURA];
+        if (_batch_count == 0) {
+            size_t len = buildBinary(buffer, sizeof(buffer));
+            if (len == 0) return false;
+            return mqttClient.publish(topic, buffer, len, false);
+        }
+        uint32_t now = millis();
+        int first = 0;
+        while (first < _batch_count) {
+            int consumed = 0;
+            size_t len = buildBinaryBatch(buffer, sizeof(buffer), first, now, &consumed);
+            bool empty = len == CFE_CABECALHO_BINARIO;  // nenhum sensor no passo destas amostras
+            if (len == 0 || (!empty && !mqttClient.publish(topic, buffer, len, false))) {
+                dropSamples(first); // mantém apenas as amostras ainda não enviadas
+                return false;
+            }
+            first += consumed;
+        }
+        dropSamples(_batch_count);
+        return true;
+    }
+
     // Envia os dados via MQTT
     bool send(PubSubClient& mqttClient, const char* topic) {
         // Estima capacidade do JSON (ajuste conforme necessidade)
-        size_t capacity = 512 + _num_sensors * 128;
+        size_t capacity = 512 + _num_sensors * 128 + (size_t)_batch_count * _num_sensors * 32;
         DynamicJsonDocument doc(capacity);
         buildJson(doc);
 
         String output;
         serializeJson(doc, output);
-        return mqttClient.publish(topic, output.c_str());
+        if (!mqttClient.publish(topic, output.c_str())) return false;
+        dropSamples(_batch_count);
+        return true;
     }
 
 private:
@@ -126,6 +301,200 @@ private:
     int _max_sensors;
     bool _dynamic;
     char _timestamp[25]; // buffer para "YYYY-mm-dd HH:MM:SS.999"
+    uint32_t _epoch_s;   // instante da leitura para o formato binário (UTC)
+    uint16_t _epoch_ms;
+    // Lote de amostras (buffer circular): _batch_values[slot * _num_sensors + sensor]
+    float* _batch_values;
+    uint32_t* _batch_millis;
+    int _batch_capacity;
+    int _batch_start;
+    int _batch_count;
+    // Passo de transmissão por sensor e contador de amostras (a amostra de número s leva o sensor i
+    // quando s % _steps[i] == 0; as pendentes são sempre as _batch_count últimas)
+    uint8_t* _steps;
+    int _steps_size;
+    uint8_t _min_step;
+    uint8_t _max_step;
+    uint32_t _sample_seq;
+
+    void initBatch() {
+        _batch_values = nullptr;
+        _batch_millis = nullptr;
+        _batch_capacity = 0;
+        _batch_start = 0;
+        _batch_count = 0;
+    }
+
+    void initSteps() {
+        _steps = nullptr;
+        _steps_size = 0;
+        _min_step = CFE_PASSO_MINIMO;
+        _max_step = CFE_PASSO_MAXIMO;
+        _sample_seq = 0;
+    }
+
+    // Acompanha o número de sensores; sensores novos transmitem todas as amostras (passo mínimo)
+    bool resizeSteps(int count) {
+        uint8_t* steps = (uint8_t*)realloc(_steps, count > 0 ? count : 1);
+        if (!steps) return false;
+        for (int i = _steps_size; i < count; i++) {
+            steps[i] = _min_step;
+        }
+        _steps = steps;
+        _steps_size = count;
+        return true;
+    }
+
+    int sensorIndex(const char* type) const {
+        for (int i = 0; i < _num_sensors; i++) {
+            if (strcmp(_sensors[i].type, type) == 0) return i;
+        }
+        return -1;
+    }
+
+    // Índice no buffer da k-ésima amostra pendente (0 = mais antiga)
+    int batchSlot(int k) const {
+        return (_batch_start + k) % _batch_capacity;
+    }
+
+    // A k-ésima amostra pendente leva o sensor i?
+    bool sampleIncludes(int k, int i) const {
+        uint32_t seq = _sample_seq - (uint32_t)_batch_count + (uint32_t)k;
+        return seq % _steps[i] == 0;
+    }
+
+    bool hasPendingSamples(int i) const {
+        for (int k = 0; k < _batch_count; k++) {
+            if (sampleIncludes(k, i)) return true;
+        }
+        return false;
+    }
+
+    void dropSamples(int n) {
+        if (n <= 0) return;
+        if (n >= _batch_count) {
+            _batch_start = 0;
+            _batch_count = 0;
+            return;
+        }
+        _batch_start = batchSlot(n);
+        _batch_count -= n;
+    }
+
+    // Epoch UTC (ms) de um instante de millis(), a partir do epoch definido para o envio em 'now'
+    uint64_t epochMillisAt(uint32_t stamp, uint32_t now) const {
+        return (uint64_t)_epoch_s * 1000 + _epoch_ms - (uint32_t)(now - stamp);
+    }
+
+    float sensorScale(int i) const {
+        return (_sensors[i].scale > 0.0f) ? _sensors[i].scale : CFE_ESCALA_PADRAO;
+    }
+
+    static uint32_t fnv1aBytes(uint32_t h, const uint8_t* data, size_t len) {
+        for (size_t i = 0; i < len; i++) {
+            h ^= data[i];
+            h *= 0x01000193UL;
+        }
+        return h;
+    }
+
+    // String incluindo o terminador '\0'
+    static uint32_t fnv1aString(uint32_t h, const char* str) {
+        return fnv1aBytes(h, (const uint8_t*)str, strlen(str) + 1);
+    }
+
+    static void writeU16(uint8_t* p, uint16_t v) {
+        p[0] = v & 0xFF;
+        p[1] = v >> 8;
+    }
+
+    static int16_t quantize(float value, float scale) {
+        if (isnan(value)) return CFE_VALOR_AUSENTE;
+        long q = lroundf(value / scale);
+        if (q <= CFE_VALOR_AUSENTE || q > 32767) return CFE_VALOR_AUSENTE;
+        return (int16_t)q;
+    }
+
+    // Monta a mensagem binária; retorna o número de bytes (0 se não couber no buffer)
+    size_t buildBinary(uint8_t* buf, size_t len) {
+        size_t needed = CFE_CABECALHO_BINARIO + (size_t)_num_sensors * CFE_BYTES_LEITURA;
+        if (_num_sensors > 255 || needed > len) return 0;
+
+        writeHeader(buf, schemaId(), (uint64_t)_epoch_s * 1000 + _epoch_ms, (uint8_t)_num_sensors);
+
+        uint8_t* p = buf + CFE_CABECALHO_BINARIO;
+        for (int i = 0; i < _num_sensors; i++, p += CFE_BYTES_LEITURA) {
+            p[0] = (uint8_t)i;
+            writeU16(p + 1, 0);  // leituras simultâneas: deslocamento zero
+            writeU16(p + 3, (uint16_t)quantize(_sensors[i].value, sensorScale(i)));
+        }
+        return needed;
+    }
+
+    static void writeHeader(uint8_t* buf, uint16_t schema_id, uint64_t epoch_ms, uint8_t count) {
+        uint32_t seconds = (uint32_t)(epoch_ms / 1000);
+        buf[0] = CFE_VERSAO_BINARIO;
+        writeU16(buf + 1, schema_id);
+        writeU16(buf + 3, seconds & 0xFFFF);
+        writeU16(buf + 5, seconds >> 16);
+        writeU16(buf + 7, (uint16_t)(epoch_ms % 1000));
+        buf[9] = count;
+    }
+
+    // Monta uma mensagem com as amostras do lote a partir de 'first'; informa quantas foram incluídas.
+    // Cada amostra leva só os sensores no seu passo de transmissão (sampleIncludes).
+    size_t buildBinaryBatch(uint8_t* buf, size_t len, int first, uint32_t now, int* consumed) {
+        int max_readings = (int)((len - CFE_CABECALHO_BINARIO) / CFE_BYTES_LEITURA);
+        if (max_readings > 255) max_readings = 255;
+        if (max_readings < _num_sensors) return 0;
+
+        uint32_t base_stamp = _batch_millis[batchSlot(first)];
+        uint8_t* p = buf + CFE_CABECALHO_BINARIO;
+        int k = 0;
+        int readings = 0;
+        for (; first + k < _batch_count; k++) {
+            int slot = batchSlot(first + k);
+            uint32_t delta = (_batch_millis[slot] - base_stamp + 50) / 100;  // décimos de segundo
+            if (delta > 0xFFFF) break;  // deslocamento não cabe: segue em outra mensagem
+            int included = 0;
+            for (int i = 0; i < _num_sensors; i++) {
+                if (sampleIncludes(first + k, i)) included++;
+            }
+            if (readings + included > max_readings) break;
+            for (int i = 0; i < _num_sensors; i++) {
+                if (!sampleIncludes(first + k, i)) continue;
+                p[0] = (uint8_t)i;
+                writeU16(p + 1, (uint16_t)delta);
+                writeU16(p + 3, (uint16_t)quantize(_batch_values[slot * _num_sensors + i], sensorScale(i)));
+                p += CFE_BYTES_LEITURA;
+            }
+            readings += included;
+        }
+        writeHeader(buf, schemaId(), epochMillisAt(base_stamp, now), (uint8_t)readings);
+        *consumed = k;
+        return CFE_CABECALHO_BINARIO + (size_t)readings * CFE_BYTES_LEITURA;
+    }
+
+    // Constrói o JSON do esquema (metadados estáticos dos sensores)
+    void buildSchemaJson(JsonDocument& doc) {
+        doc["schema_id"] = schemaId();
+        doc["device_id"] = _device_id;
+        doc["sampling_interval"] = _sampling_interval;
+        doc["transmission_interval"] = _transmission_interval;
+
+        JsonArray sensors = doc.createNestedArray("sensors");
+        for (int i = 0; i < _num_sensors; i++) {
+            JsonObject s = sensors.createNestedObject();
+            s["sensor_type"] = _sensors[i].type;
+            s["interpolation"] = _sensors[i].interpolation;
+            s["scale"] = sensorScale(i);
+            JsonObject meta = s.createNestedObject("metadata");
+            meta["unit"] = _sensors[i].unit;
+            meta["description"] = _sensors[i].description;
+            meta["optimal_min"] = _sensors[i].optimal_min;
+            meta["optimal_max"] = _sensors[i].optimal_max;
+        }
+    }
 
     // Constrói o documento JSON
     void buildJson(JsonDocument& doc) {
@@ -136,6 +505,7 @@ private:
 
         JsonArray readings = doc.createNestedArray("readings");
         for (int i = 0; i < _num_sensors; i++) {
+            if (_batch_count > 0 && !hasPendingSamples(i)) continue;  // fora do passo em todo o lote
             JsonObject r = readings.createNestedObject();
             r["sensor_type"] = _sensors[i].type;
             r["value"] = _sensors[i].value;
@@ -145,6 +515,19 @@ private:
             meta["description"] = _sensors[i].description;
             meta["optimal_min"] = _sensors[i].optimal_min;
             meta["optimal_max"] = _sensors[i].optimal_max;
+
+            // Modo em lote: [deslocamento em ms relativo ao envio (<= 0), valor] de cada amostra
+            if (_batch_count > 0) {
+                uint32_t now = millis();
+                JsonArray samples = r.createNestedArray("samples");
+                for (int k = 0; k < _batch_count; k++) {
+                    if (!sampleIncludes(k, i)) continue;
+                    int slot = batchSlot(k);
+                    JsonArray amostra = samples.createNestedArray();
+                    amostra.add(-(int32_t)(now - _batch_millis[slot]));
+                    amostra.add(_batch_values[slot * _num_sensors + i]);
+                }
+            }
         }
 
         JsonObject system = doc.createNestedObject("system");
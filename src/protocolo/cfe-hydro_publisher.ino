@@ -4,9 +4,9 @@
    Placa : ESP32 Dev Module
    Função: Enviar dados sensoriados para o broker MQTT
            usando protocolo cfe-hydro.h
-   Versão: 1.02
+   Versão: 1.05
    Date  : 25/02/2026 - 19:35h
-   L.U.  : 27/02/2026 - 16:15h
+   L.U.  : 16/10/2026 - 17:00h
    Referências:
       - WifiManager : https://github.com/tzapu/WiFiManager
       - PubSubClient: https://github.com/knolleary/pubsubclient
@@ -27,10 +27,22 @@
 const char* mqtt_server = "test.mosquitto.org"; // "BROKER_EXEMPLO.com";
 const int mqtt_port = 1883;
 const char* mqtt_topic = "cfe-hydro/data";
+// Formato binário compacto: metadados uma vez no tópico de esquema (retido), leituras em .../bin
+const bool usar_binario = true;
+const char* mqtt_topic_schema = "cfe-hydro/dispositivo_001/schema";
+const char* mqtt_topic_bin = "cfe-hydro/dispositivo_001/bin";
+// Taxa de transmissão por sensor recomendada pelo receptor (retido), aplicada dentro dos limites abaixo
+const char* mqtt_topic_control = "cfe-hydro/dispositivo_001/control";
+const int passo_minimo = 1;   // envia todas as amostras do sensor
+const int passo_maximo = 30;  // envia 1 a cada 30 amostras (5 min com amostragem de 10 s)
 
 // DEFINE VARIÁVEIS ===========================================
 const int intervalo = 60000; // 1 min.
 unsigned long ultimoEnvio = millis(); // 0;
+// Envio em lote: amostra a cada intervalo_amostragem e transmite as amostras acumuladas a cada intervalo
+const int intervalo_amostragem = 10000; // 10 s (sampling_interval do CFEHydro)
+const int amostras_por_lote = intervalo / intervalo_amostragem;
+unsigned long ultimaAmostra = millis();
 String timestamp;
 bool wifi_connected = false;
 
@@ -53,6 +65,7 @@ const float od_offSet = 0.00;
 // INSTANCIA FUNÇÕES ===========================================
 void connect_WiFi();
 void connect_MQTT();
+void callback_MQTT(char*, byte*, unsigned int);
 float readAnalogAverage(int);
 void initSensors();
 float Get_TP();
@@ -61,6 +74,7 @@ float Get_PH();
 float Get_OD();
 void Exibe_Valores_Serial();
 String formatTimestamp();
+void sincronizaNTP();
 
 // DEFINE PINOS ================================================
 #define TP_SENSOR_PIN 34
@@ -80,13 +94,19 @@ PubSubClient mqttClient(espClient);
 
 // NTP
 WiFiUDP ntpUDP;
-NTPClient timeClient(ntpUDP, "pool.ntp.org", -10800, 60000); // UTC-3 (Brasília): -3 * 3600 = -10800
+const long utc_offset = -10800; // UTC-3 (Brasília): -3 * 3600 = -10800
+NTPClient timeClient(ntpUDP, "pool.ntp.org", utc_offset, 60000);
+// Referência do último ajuste NTP: epoch (UTC) e millis() no momento do ajuste. Os milissegundos
+// contam a partir do ajuste (millis() % 1000 não tem relação com a virada do segundo NTP).
+unsigned long ntp_epoch = 0;
+unsigned long ntp_millis = 0;
+bool ntp_sincronizado = false;
 
 // CONFIGURAÇÃO DOS SENSORES UTILIZADOS ====================================
 CFEHydro::SensorConfig sensores[] = {
    {"temperatura", "°C", "Temperatura", 18.0, 30.0, "linear"},
    {"ph", "pH", "Nível de pH", 5.5, 7.0, "logarithmic"},
-   {"ec", "mS/cm", "EC", 0.0, 5.0, "polynomial"},
+   {"ec", "mS/cm", "EC", 0.0, 5.0, "polynomial", 0.0, 0.001}, // resolução 0.001 no formato binário
    {"od", "mg/L", "OD", 0.0, 6.0, "polynomial"}
    // Configurar todos os campos usados aqui.
 };
@@ -105,12 +125,15 @@ void setup() {
    digitalWrite(STATUS_LED, LOW);
 
    initSensors();
+   hydro.beginBatch(amostras_por_lote + 1); // folga para um atraso no envio
+   hydro.setTransmissionBounds(passo_minimo, passo_maximo);
 
    connect_WiFi();
 
    if (wifi_connected) {
       mqttClient.setServer(mqtt_server, mqtt_port);
       mqttClient.setBufferSize(3072);
+      mqttClient.setCallback(callback_MQTT);
    }
 
    timeClient.begin();
@@ -120,11 +143,13 @@ void setup() {
 
 void loop() {
    unsigned long currentMillis = millis();
-   if (currentMillis - ultimoEnvio >= intervalo) {
-      ultimoEnvio = currentMillis;
+   if (wifi_connected && mqttClient.connected()) {
+      mqttClient.loop(); // recebe as mensagens de controle entre os envios
+   }
+   if (currentMillis - ultimaAmostra >= intervalo_amostragem) {
+      ultimaAmostra = currentMillis;
 
       // Leitura dos sensores
-      timestamp = formatTimestamp();
       tp_value = Get_TP();
       ph_value = Get_PH();
       ec_value = Get_EC();
@@ -138,7 +163,20 @@ void loop() {
       hydro.updateSensor("ph", ph_value);
       hydro.updateSensor("ec", ec_value);
       hydro.updateSensor("od", od_value);
+      hydro.sample(); // guarda a amostra para o próximo envio
+   }
+
+   if (currentMillis - ultimoEnvio >= intervalo) {
+      ultimoEnvio = currentMillis;
+
+      timestamp = formatTimestamp();
       hydro.setTimestamp(timestamp.c_str());
+      if (ntp_sincronizado) {
+         unsigned long decorrido = millis() - ntp_millis;
+         hydro.setEpoch(ntp_epoch + decorrido / 1000, decorrido % 1000); // epoch em UTC
+      } else {
+         hydro.setEpoch(timeClient.getEpochTime() - utc_offset, 0);
+      }
 
       // Mantém conexão MQTT
       if (wifi_connected) {
@@ -149,10 +187,12 @@ void loop() {
       }
 
       // Envia os dados para o Broker
-      if (!hydro.send(mqttClient, mqtt_topic)) {
+      bool enviado = usar_binario ? hydro.sendBinary(mqttClient, mqtt_topic_bin)
+                                  : hydro.send(mqttClient, mqtt_topic);
+      if (!enviado) {
          Serial.println("Falha no envio");
       } else {
-         Serial.println("Dados enviados com sucesso");
+         Serial.println("Lote enviado com sucesso");
       }
    }
 } // end loop()
@@ -187,6 +227,10 @@ void connect_MQTT() {
       if (mqttClient.connect(clientId.c_str())) {
          Serial.println("conectado!");
          digitalWrite(STATUS_LED, HIGH);
+         if (usar_binario && !hydro.sendSchema(mqttClient, mqtt_topic_schema)) {
+            Serial.println("Falha no envio do esquema");
+         }
+         mqttClient.subscribe(mqtt_topic_control);
       } else {
          Serial.print("falhou, rc=");
          Serial.print(mqttClient.state());
@@ -197,6 +241,24 @@ void connect_MQTT() {
    }
 } // end connect_MQTT()
 
+// Recebe a taxa de transmissão recomendada pelo receptor
+void callback_MQTT(char* topic, byte* payload, unsigned int length) {
+   if (strcmp(topic, mqtt_topic_control) != 0) return;
+   int atualizados = hydro.applyControl(payload, length);
+   if (atualizados < 0) {
+      Serial.println("Mensagem de controle inválida");
+      return;
+   }
+   Serial.print("Passos de transmissão:");
+   for (int i = 0; i < numSensores; i++) {
+      Serial.print(" ");
+      Serial.print(sensores[i].type);
+      Serial.print("=");
+      Serial.print(hydro.transmissionStep(i));
+   }
+   Serial.println();
+} // end callback_MQTT()
+
 // Inicializa sensores
 void initSensors() {
     Serial.println("Inicializando sensores...");
@@ -259,8 +321,16 @@ float Get_OD() { // Lê sensor de OD ---------------------------------------
    return od_value;
 } // end Get_OD()
 
+void sincronizaNTP() { // Atualiza o NTPClient e guarda o instante do ajuste -----
+   if (timeClient.update()) { // true apenas quando houve um ajuste
+      ntp_millis = millis();
+      ntp_epoch = timeClient.getEpochTime() - utc_offset;
+      ntp_sincronizado = true;
+   }
+} // end sincronizaNTP()
+
 String formatTimestamp() { // Formata timestamp em string usando NTPClient
-   timeClient.update();    // Atualizar o cliente NTPClient
+   sincronizaNTP();        // Atualizar o cliente NTPClient
 
    // Obter a data completa do NTPClient
    String formattedDate = timeClient.getFormattedDate();
@@ -273,7 +343,7 @@ String formatTimestamp() { // Formata timestamp em string usando NTPClient
    String hour = formattedDate.substring(11, 13);
    String minute = formattedDate.substring(14, 16);
    String second = formattedDate.substring(17, 19);
-   unsigned long milliseconds = millis() % 1000;
+   unsigned long milliseconds = ntp_sincronizado ? (millis() - ntp_millis) % 1000 : 0;
 
    // Formata timestamp: "DD/MM/AAAA HH:MM:SS.mmm"
    String formatted = day + "/" + month + "/" + year + " " + 
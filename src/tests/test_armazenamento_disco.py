@@ -0,0 +1,108 @@
+"""
+Função: Testes do histórico em disco do GerenciadorDados (app/armazenamento_disco.py): o histórico
+        sobrevive a limpar() e a reinícios, apagar_historico() remove os arquivos sem que
+        instâncias antigas dos dispositivos voltem a criá-los, e as leituras escolhem os segmentos
+        pelos dados (inserções atrasadas) copiando fora do lock só o que não muda mais.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from armazenamento_disco import ArmazenamentoDisco, SerieDisco, concatenar  # noqa: E402
+from gerenciador import GerenciadorDados  # noqa: E402
+
+
+def pontos(inicio_ms, n, sensor_type='ph'):
+    return [(sensor_type, inicio_ms + i * 60_000, 6.0 + 0.01 * i, 'linear', {'unit': 'pH'}) for i in range(n)]
+
+
+@pytest.fixture
+def agora_ms():
+    return int(time.time() * 1000) - 3_600_000
+
+
+def arquivos(raiz):
+    return sorted(os.path.relpath(os.path.join(d, f), raiz) for d, _, fs in os.walk(raiz) for f in fs)
+
+
+def test_historico_sobrevive_a_limpar_e_ao_reinicio(tmp_path, agora_ms):
+    raiz = str(tmp_path / 'historico')
+    gerenciador = GerenciadorDados(armazenamento=ArmazenamentoDisco(raiz))
+    gerenciador.adicionar_lote('estufa', pontos(agora_ms, 30))
+    gerenciador.limpar()
+    assert gerenciador.lista_dispositivos() == []
+    assert gerenciador.armazenamento.series() == [('estufa', 'ph')]
+
+    gerenciador.armazenamento.sincronizar()
+    reiniciado = GerenciadorDados(armazenamento=ArmazenamentoDisco(raiz))
+    assert reiniciado.lista_dispositivos() == ['estufa']
+    dados = reiniciado.obter_dados_brutos('estufa', 'ph', horas=2)
+    assert len(dados) == 30
+    np.testing.assert_allclose(dados['value'].to_numpy(), 6.0 + 0.01 * np.arange(30))
+
+
+def test_apagar_historico_desliga_instancias_antigas(tmp_path, agora_ms):
+    raiz = str(tmp_path / 'historico')
+    gerenciador = GerenciadorDados(armazenamento=ArmazenamentoDisco(raiz))
+    gerenciador.adicionar_lote('estufa', pontos(agora_ms, 10))
+    descartada_por_limpar = gerenciador.dispositivos['estufa']
+    gerenciador.limpar()
+    gerenciador.adicionar_lote('estufa', pontos(agora_ms + 600_000, 10))
+    atual = gerenciador.dispositivos['estufa']
+
+    gerenciador.apagar_historico()
+    assert gerenciador.lista_dispositivos() == []
+    assert arquivos(raiz) == []
+    # Lotes atrasados das instâncias antigas não recriam os segmentos apagados
+    descartada_por_limpar.adicionar_lote(pontos(agora_ms + 1_200_000, 5))
+    atual.adicionar_lote(pontos(agora_ms + 1_200_000, 5))
+    assert arquivos(raiz) == []
+
+    # Leituras novas voltam a ser persistidas
+    gerenciador.adicionar_lote('estufa', pontos(agora_ms + 1_800_000, 3))
+    assert gerenciador.armazenamento.series() == [('estufa', 'ph')]
+    assert len(gerenciador.obter_dados_brutos('estufa', 'ph', horas=2)) == 3
+
+
+def test_ler_desde_inclui_atrasados_no_segmento_ativo(tmp_path):
+    serie = SerieDisco(str(tmp_path / 'serie'), pontos_por_segmento=6)
+    serie.adicionar(np.arange(6) * 10, np.arange(6))
+    serie.adicionar([100, 110], [10, 11])           # segmento ativo, de nome "100"
+    serie.adicionar([50, 60, 75], [5.5, 6, 7.5])    # atrasados: vão para o segmento "100"
+    ts, vals = serie.ler()
+    assert ts.tolist() == [0, 10, 20, 30, 40, 50, 50, 60, 75, 100, 110]
+    for desde in range(-5, 120, 5):
+        parcial_ts, parcial_vals = serie.ler(desde)
+        np.testing.assert_array_equal(parcial_ts, ts[ts >= desde])
+        np.testing.assert_array_equal(parcial_vals, vals[ts >= desde])
+        assert parcial_ts.dtype == np.int64 and parcial_vals.dtype == np.float64
+
+
+def test_fatias_dos_segmentos_fechados_sao_visoes(tmp_path):
+    serie = SerieDisco(str(tmp_path / 'serie'), pontos_por_segmento=4)
+    serie.adicionar(np.arange(10) * 10, np.arange(10))
+    partes = serie.fatias(15)
+    assert [len(ts) for ts, _ in partes] == [2, 4, 2]
+    fechadas, (ativo_ts, ativo_vals) = partes[:-1], partes[-1]
+    assert all(isinstance(ts, np.memmap) for ts, _ in fechadas)
+    assert not isinstance(ativo_ts, np.memmap)
+    # O segmento ativo copiado não muda com inserções atrasadas posteriores
+    serie.adicionar([85], [8.5])
+    assert ativo_ts.tolist() == [80, 90]
+    np.testing.assert_array_equal(concatenar(partes)[0], np.arange(2, 10) * 10)
+    assert serie.ler(15)[0].tolist() == [20, 30, 40, 50, 60, 70, 80, 85, 90]
+
+
+def test_copiar_historico_igual_ao_disco(tmp_path, agora_ms):
+    gerenciador = GerenciadorDados(armazenamento=ArmazenamentoDisco(str(tmp_path / 'historico'), pontos_por_segmento=16))
+    gerenciador.adicionar_lote('estufa', pontos(agora_ms, 50))
+    gerenciador.adicionar_lote('estufa', pontos(agora_ms - 30_000, 1))   # atrasado
+    ts, vals = gerenciador.dispositivos['estufa'].copiar_historico('ph', desde_ms=agora_ms + 10 * 60_000)
+    assert ts.tolist() == [agora_ms + i * 60_000 for i in range(10, 50)]
+    np.testing.assert_allclose(vals, 6.0 + 0.01 * np.arange(10, 50), rtol=1e-6)
@@ -0,0 +1,118 @@
+"""
+Função: Testes do cache de resultados por conteúdo (cfe_hydro.cache): ida e volta das entradas,
+        chaves que mudam só com o conteúdo e os parâmetros, entradas corrompidas e limite LRU.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.cache import EXTENSAO, CacheResultados, digital_arrays  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheResultados(str(tmp_path / 'cache'))
+
+
+def test_ida_e_volta(cache):
+    resultado = {
+        'reconstrucao': np.linspace(0, 1, 11),
+        'transmitidos': np.array([True, False, True]),
+        'matriz': np.arange(12, dtype=np.int32).reshape(3, 4),
+        'rotulos': np.array(['ph', 'ec']),
+        'r2': np.float64(0.98),
+        'vazio': np.empty(0),
+    }
+    cache.gravar('a' * 64, resultado)
+    lido = cache.obter('a' * 64)
+    assert list(lido) == list(resultado)
+    for nome, valor in resultado.items():
+        assert lido[nome].dtype == np.asarray(valor).dtype
+        np.testing.assert_array_equal(lido[nome], valor)
+    assert cache.acertos == 1 and cache.falhas == 0
+
+
+def test_ausente_e_corrompida(cache):
+    assert cache.obter('b' * 64) is None
+    cache.gravar('c' * 64, {'x': np.arange(10.0)})
+    caminho = os.path.join(cache.diretorio, 'c' * 64 + EXTENSAO)
+    with open(caminho, 'r+b') as f:
+        f.truncate(os.path.getsize(caminho) - 8)
+    assert cache.obter('c' * 64) is None
+    assert cache.falhas == 2
+
+
+def test_valores_de_objeto_rejeitados(cache):
+    with pytest.raises(TypeError):
+        cache.gravar('d' * 64, {'x': np.array([{}, None], dtype=object)})
+
+
+def test_chave_pelo_conteudo(cache):
+    dados = np.arange(100, dtype=np.float64)
+    chave = cache.chave('simular', [dados], {'intervalo': 5, 'metodo': 'linear'})
+    # Mesmo conteúdo em outro objeto, hash pré-calculado e parâmetros em outra ordem: mesma chave
+    assert cache.chave('simular', [dados.copy()], {'metodo': 'linear', 'intervalo': 5}) == chave
+    assert cache.chave('simular', [digital_arrays(dados)], {'intervalo': np.int64(5), 'metodo': 'linear'}) == chave
+    # Conteúdo, dtype, forma, parâmetros ou nome diferentes: outra chave
+    alterado = dados.copy()
+    alterado[50] += 1e-12
+    outras = [
+        cache.chave('simular', [alterado], {'intervalo': 5, 'metodo': 'linear'}),
+        cache.chave('simular', [dados.astype(np.float32)], {'intervalo': 5, 'metodo': 'linear'}),
+        cache.chave('simular', [dados.reshape(10, 10)], {'intervalo': 5, 'metodo': 'linear'}),
+        cache.chave('simular', [dados], {'intervalo': 6, 'metodo': 'linear'}),
+        cache.chave('interpolar', [dados], {'intervalo': 5, 'metodo': 'linear'}),
+    ]
+    assert len({chave, *outras}) == 6
+
+
+def test_chave_muda_com_o_codigo_da_funcao(cache):
+    def metodo(x):
+        return x + 1
+    primeira = cache.chave('simular', (), {'metodo': metodo})
+    assert cache.chave('simular', (), {'metodo': metodo}) == primeira
+
+    def metodo(x):  # noqa: F811 - mesmo nome, outro corpo
+        return x + 2
+    assert cache.chave('simular', (), {'metodo': metodo}) != primeira
+
+
+def test_memorizar_calcula_uma_vez(cache):
+    chamadas = []
+
+    def calcular():
+        chamadas.append(1)
+        return {'mae': 0.5, 'serie': np.arange(3)}
+
+    dados = np.arange(10.0)
+    primeiro = cache.memorizar('simular', [dados], {'intervalo': 2}, calcular)
+    segundo = cache.memorizar('simular', [dados.copy()], {'intervalo': 2}, calcular)
+    assert len(chamadas) == 1
+    assert primeiro['mae'].shape == segundo['mae'].shape == ()
+    assert float(segundo['mae']) == 0.5
+    np.testing.assert_array_equal(segundo['serie'], [0, 1, 2])
+    cache.memorizar('simular', [dados], {'intervalo': 3}, calcular)
+    assert len(chamadas) == 2
+
+
+def test_limite_remove_as_menos_recentes(tmp_path):
+    cache = CacheResultados(str(tmp_path / 'cache'), limite_bytes=10_000)
+    entrada = {'x': np.zeros(400)}            # ~3,3 kB por entrada: cabem 3
+    chaves = [f'{i:064x}' for i in range(3)]
+    for i, chave in enumerate(chaves):
+        cache.gravar(chave, entrada)
+        os.utime(os.path.join(cache.diretorio, chave + EXTENSAO), (1000 + i, 1000 + i))
+    # Ler a mais antiga a renova; a gravação seguinte remove a que ficou menos recente
+    assert cache.obter(chaves[0]) is not None
+    cache.gravar(f'{3:064x}', entrada)
+    assert cache.obter(chaves[1]) is None
+    assert all(cache.obter(c) is not None for c in (chaves[0], chaves[2], f'{3:064x}'))
+    assert cache.tamanho_bytes() <= 10_000
+
+    cache.limpar()
+    assert cache.tamanho_bytes() == 0
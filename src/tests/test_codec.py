@@ -0,0 +1,128 @@
+"""
+Função: Testes do formato binário (cfe_hydro.codec): ida e volta codificar_binario ->
+        decodificar_binario, esquema publicado em JSON e rejeição de mensagens inconsistentes.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.codec import (RESOLUCAO_DELTA_MS, VALOR_AUSENTE, EsquemaBinario, codificar_binario,  # noqa: E402
+                             decodificar_binario, timestamp_para_ms)
+
+# Os sensores do cfe-hydro_publisher.ino
+SENSORES = [
+    {'sensor_type': 'temperatura', 'interpolation': 'linear',
+     'metadata': {'unit': '°C', 'description': 'Temperatura', 'optimal_min': 18.0, 'optimal_max': 30.0}},
+    {'sensor_type': 'ph', 'interpolation': 'logarithmic',
+     'metadata': {'unit': 'pH', 'description': 'Nível de pH', 'optimal_min': 5.5, 'optimal_max': 7.0}},
+    {'sensor_type': 'ec', 'interpolation': 'polynomial', 'scale': 0.001,
+     'metadata': {'unit': 'mS/cm', 'description': 'EC', 'optimal_min': 0.0, 'optimal_max': 5.0}},
+    {'sensor_type': 'od', 'interpolation': 'polynomial',
+     'metadata': {'unit': 'mg/L', 'description': 'OD', 'optimal_min': 0.0, 'optimal_max': 6.0}},
+]
+EPOCH_MS = 1_767_225_600_123
+
+
+@pytest.fixture
+def esquema():
+    return EsquemaBinario(SENSORES, device_id='dispositivo_001', sampling_interval=10, transmission_interval=60)
+
+
+def test_ida_e_volta_lote(esquema):
+    # Lote de 6 amostras de 4 sensores, como o buildBinaryBatch do firmware
+    rng = np.random.default_rng(1)
+    base = {'temperatura': 24.0, 'ph': 6.2, 'ec': 1.8, 'od': 5.5}
+    leituras = []
+    for amostra in range(6):
+        for indice, sensor in enumerate(SENSORES):
+            valor = base[sensor['sensor_type']] + rng.normal(0, 0.3)
+            leituras.append((indice, amostra * 10_000, valor))
+
+    payload = codificar_binario(esquema, EPOCH_MS, leituras)
+    assert len(payload) == 10 + 5 * len(leituras)
+    decodificadas = decodificar_binario(payload, esquema)
+
+    assert len(decodificadas) == len(leituras)
+    for (indice, delta_ms, valor), (timestamp_ms, indice_lido, valor_lido) in zip(leituras, decodificadas):
+        assert indice_lido == indice
+        assert timestamp_ms == EPOCH_MS + delta_ms
+        # Erro de quantização: no máximo meia escala do sensor
+        assert abs(valor_lido - valor) <= esquema.escalas[indice] / 2 + 1e-12
+
+
+def test_valores_exatos_na_escala(esquema):
+    leituras = [(0, 0, 23.45), (1, 100, 6.07), (2, 200, 1.234), (3, 300, -0.5)]
+    decodificadas = decodificar_binario(codificar_binario(esquema, EPOCH_MS, leituras), esquema)
+    assert [i for _, i, _ in decodificadas] == [0, 1, 2, 3]
+    assert [v for _, _, v in decodificadas] == pytest.approx([23.45, 6.07, 1.234, -0.5], abs=1e-9)
+
+
+def test_deslocamento_arredondado_a_resolucao(esquema):
+    [(timestamp_ms, _, _)] = decodificar_binario(codificar_binario(esquema, EPOCH_MS, [(0, 1_249, 20.0)]), esquema)
+    assert timestamp_ms == EPOCH_MS + 12 * RESOLUCAO_DELTA_MS
+
+
+def test_leituras_ausentes_sao_omitidas(esquema):
+    # NaN e valores fora da faixa de int16 (após a quantização) viram VALOR_AUSENTE
+    leituras = [(0, 0, math.nan), (1, 0, 6.5), (0, 100, 400.0), (3, 100, VALOR_AUSENTE * 0.01)]
+    decodificadas = decodificar_binario(codificar_binario(esquema, EPOCH_MS, leituras), esquema)
+    assert [(i, pytest.approx(v)) for _, i, v in decodificadas] == [(1, 6.5)]
+
+
+def test_mensagem_vazia(esquema):
+    payload = codificar_binario(esquema, EPOCH_MS, [])
+    assert len(payload) == 10
+    assert decodificar_binario(payload, esquema) == []
+
+
+def test_esquema_json_ida_e_volta(esquema):
+    lido = EsquemaBinario.de_json(esquema.para_json())
+    assert lido.schema_id == esquema.schema_id
+    assert lido.sensores == esquema.sensores
+    assert lido.device_id == 'dispositivo_001'
+    assert lido.escalas == [0.01, 0.01, 0.001, 0.01]
+    # Mensagens de um lado decodificam do outro
+    payload = codificar_binario(esquema, EPOCH_MS, [(2, 0, 1.5)])
+    assert decodificar_binario(payload, lido)[0][2] == pytest.approx(1.5)
+
+
+def test_schema_id_muda_com_os_metadados(esquema):
+    alterados = [dict(s) for s in SENSORES]
+    alterados[2] = dict(alterados[2], scale=0.01)
+    assert EsquemaBinario(alterados).schema_id != esquema.schema_id
+
+
+def test_mensagens_inconsistentes(esquema):
+    payload = codificar_binario(esquema, EPOCH_MS, [(0, 0, 20.0), (1, 0, 6.0)])
+    with pytest.raises(ValueError, match='truncada'):
+        decodificar_binario(payload[:5], esquema)
+    with pytest.raises(ValueError, match='Tamanho'):
+        decodificar_binario(payload[:-1], esquema)
+    with pytest.raises(ValueError, match='Versão'):
+        decodificar_binario(b'\x02' + payload[1:], esquema)
+    outro = EsquemaBinario(SENSORES[:2])
+    with pytest.raises(ValueError, match='schema_id'):
+        decodificar_binario(codificar_binario(outro, EPOCH_MS, [(0, 0, 20.0)]), esquema)
+    # Índice 9 não existe no esquema
+    with pytest.raises(ValueError, match='Índice'):
+        decodificar_binario(payload[:10] + b'\x09' + payload[11:], esquema)
+
+
+def test_limite_de_leituras(esquema):
+    with pytest.raises(ValueError):
+        codificar_binario(esquema, EPOCH_MS, [(0, 0, 20.0)] * 256)
+
+
+def test_timestamp_layout_fixo():
+    # Caminho rápido (por posição) e strptime devem concordar
+    assert timestamp_para_ms('2026-01-01 00:00:00.123') == EPOCH_MS
+    assert timestamp_para_ms('2026-01-01 00:00:00.1234') == EPOCH_MS
+    assert timestamp_para_ms(EPOCH_MS) == EPOCH_MS
+    with pytest.raises(ValueError):
+        timestamp_para_ms('2026-01-01 24:00:00.000')
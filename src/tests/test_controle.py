@@ -0,0 +1,149 @@
+"""
+Função: Testes da malha de controle da taxa de transmissão: regra AIMD do ControladorTaxa
+        (cfe_hydro.controle), simulação do envio em lotes e entrega das recomendações pelo
+        ControleTaxa do receptor (app/controle_taxa.py).
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from cfe_hydro.controle import (BYTES_CABECALHO, BYTES_LEITURA, ControladorTaxa, reconstruir,  # noqa: E402
+                                simular)
+from controle_taxa import ControleTaxa  # noqa: E402
+
+AMOSTRA_MS = 10_000
+
+
+def alimentar(controlador, sinal, n):
+    """Entrega ao controlador as amostras que o firmware transmitiria com o passo vigente"""
+    mudancas = []
+    j = 0
+    while j < n:
+        if controlador.atualizar(j * AMOSTRA_MS, sinal(j)):
+            mudancas.append((j, controlador.passo))
+        j += controlador.passo
+    return mudancas
+
+
+def test_aumento_aditivo_ate_o_maximo():
+    controlador = ControladorTaxa(0.1, passo_maximo=5)
+    mudancas = alimentar(controlador, lambda j: 20.0 + 0.001 * j, 200)
+    # Sinal linear: erro zero; +1 a cada 3 leituras dentro da tolerância, até o máximo
+    assert [passo for _, passo in mudancas] == [2, 3, 4, 5]
+    assert controlador.passo == 5 and controlador.razao == pytest.approx(0.2)
+
+
+def test_reducao_multiplicativa():
+    controlador = ControladorTaxa(0.1, passo_maximo=16)
+    controlador.passo = 16
+    for j, v in ((0, 20.0), (16, 20.0), (32, 20.0)):
+        assert not controlador.atualizar(j * AMOSTRA_MS, v)
+    # Erro de 1,0 (> 2 x tolerância) na leitura central: passo cortado pela metade
+    assert controlador.atualizar(48 * AMOSTRA_MS, 22.0)
+    assert controlador.passo == 8
+    assert controlador.ultimo_erro == pytest.approx(1.0)
+
+
+def test_faixa_intermediaria_mantem_o_passo():
+    controlador = ControladorTaxa(0.1)
+    controlador.passo = 4
+    # Erros de 0,15 (entre a tolerância e 2 x tolerância), alternando o sinal
+    valores = [20.0, 20.15, 20.0, 20.15, 20.0, 20.15, 20.0]
+    assert not any(controlador.atualizar(j * 4 * AMOSTRA_MS, v) for j, v in enumerate(valores))
+    assert controlador.passo == 4
+    assert controlador.ultimo_erro == pytest.approx(0.15)
+
+
+def test_erro_do_ph_no_espaco_da_concentracao():
+    leituras = [(0, 4.0), (10, 5.5), (20, 7.0)]
+    linear, logaritmico = ControladorTaxa(0.1, 'linear'), ControladorTaxa(0.1, 'logarithmic')
+    for t, v in leituras:
+        linear.atualizar(t, v)
+        logaritmico.atualizar(t, v)
+    assert linear.ultimo_erro == pytest.approx(0.0)
+    esperado = abs(5.5 + math.log10((1e-4 + 1e-7) / 2))
+    assert logaritmico.ultimo_erro == pytest.approx(esperado)
+
+
+def test_leituras_invalidas_ignoradas():
+    controlador = ControladorTaxa(0.1)
+    assert not controlador.atualizar(0, 20.0)
+    assert not controlador.atualizar(10, math.nan)
+    assert not controlador.atualizar(0, 21.0)      # repetida / fora de ordem
+    assert not controlador.atualizar(20, 20.0)
+    assert math.isnan(controlador.ultimo_erro)      # ainda só 2 leituras válidas
+    with pytest.raises(ValueError):
+        ControladorTaxa(0.0)
+
+
+def test_simular_passo_fixo_reconstroi_exato():
+    n = 600
+    ts = np.arange(n, dtype=np.int64) * AMOSTRA_MS
+    series = {'temperatura': 22 + np.sin(np.arange(n) / 40), 'ph': 6 + 0.2 * np.cos(np.arange(n) / 30)}
+    r = simular(ts, series, {'ph': 'logarithmic'}, passo_fixo=1)
+    assert r['leituras'] == 2 * n
+    assert r['mensagens'] == n // 6
+    assert r['bytes'] == r['mensagens'] * BYTES_CABECALHO + r['leituras'] * BYTES_LEITURA
+    for metricas in r['sensores'].values():
+        assert metricas['mae'] == 0.0 and metricas['passo_medio'] == 1.0
+
+
+def test_simular_adaptativo_economiza_em_sinal_lento():
+    n = 8640
+    ts = np.arange(n, dtype=np.int64) * AMOSTRA_MS
+    horas = np.arange(n) / 360
+    series = {'temperatura': 22 + 3 * np.sin(2 * np.pi * horas / 24)}
+    fixo = simular(ts, series, passo_fixo=1)
+    adaptativo = simular(ts, series, tolerancias={'temperatura': 0.05})
+    assert adaptativo['bytes'] < 0.2 * fixo['bytes']
+    assert adaptativo['sensores']['temperatura']['erro_max'] <= 0.05
+    assert adaptativo['sensores']['temperatura']['mudancas'] > 0
+
+
+def test_reconstruir_nao_extrapola():
+    ts = np.arange(10, dtype=np.int64)
+    valores = np.arange(10, dtype=np.float64)
+    transmitidas = np.zeros(10, dtype=bool)
+    transmitidas[[2, 5, 8]] = True
+    resultado = reconstruir(ts, valores, transmitidas)
+    assert np.isnan(resultado[:2]).all() and np.isnan(resultado[9:]).all()
+    np.testing.assert_allclose(resultado[2:9], valores[2:9])
+
+
+def test_controle_publica_uma_vez_por_lote():
+    publicadas = []
+    controle = ControleTaxa(publicar=lambda device_id, razoes: publicadas.append((device_id, razoes)),
+                            passo_maximo=4)
+    # Lote com 12 leituras lineares de dois sensores (nomes do CFE-Hydro_send.ino inclusive)
+    pontos = [(s, j * AMOSTRA_MS, 20.0 + 0.001 * j, 'linear', {}) for j in range(12) for s in ('temperature', 'ph')]
+    controle.adicionar_lote('ESP32_Hydro_01', pontos)
+    assert len(publicadas) == 1
+    device_id, razoes = publicadas[0]
+    assert device_id == 'ESP32_Hydro_01'
+    assert set(razoes) == {'temperature', 'ph'}
+    assert controle.recomendacao('ESP32_Hydro_01') == razoes
+    assert controle.controladores['ESP32_Hydro_01']['temperature'].tolerancia == 0.2
+
+    controle.limpar()
+    assert controle.recomendacao('ESP32_Hydro_01') == {}
+
+
+def test_controle_sem_publicacao_e_falhas_isoladas():
+    controle = ControleTaxa()
+    pontos = [('od', j * AMOSTRA_MS, 6.0, 'polynomial', {}) for j in range(12)]
+    controle.adicionar_lote('d1', pontos)
+    assert controle.recomendacao('d1')['od'] < 1.0
+    assert controle.publicacoes == 0
+
+    def falhar(device_id, razoes):
+        raise ConnectionError("broker indisponível")
+    controle = ControleTaxa(publicar=falhar)
+    controle.adicionar_lote('d1', pontos)      # o erro é registrado, não propagado
+    assert controle.publicacoes == 0
@@ -0,0 +1,99 @@
+"""
+Função: Testes da grade interpolada em cache do dashboard (DadosDispositivo.grade_interpolada):
+        a grade estendida só na cauda, lote a lote, deve coincidir com o recálculo completo sobre
+        as mesmas leituras, para cada tipo de interpolação.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from gerenciador import DadosDispositivo  # noqa: E402
+
+INICIO_MS = 1_767_225_600_000
+INTERVALO_S = 20
+METODOS = ('linear', 'logarithmic', 'polynomial', 'sigmoidal')
+
+
+def gerar_leituras(n, rng):
+    """Leituras a cada ~60 s com atraso irregular e algumas lacunas longas"""
+    passos = rng.integers(45_000, 75_000, n)
+    passos[rng.random(n) < 0.05] = 600_000
+    ts = INICIO_MS + np.cumsum(passos)
+    horas = (ts - INICIO_MS) / 3_600_000
+    valores = 6.0 + 0.8 * np.sin(2 * np.pi * horas / 3) + rng.normal(0, 0.05, n)
+    return ts.tolist(), valores.tolist()
+
+
+def novo_dispositivo(ts, valores, metodo, capacidade=1000):
+    disp = DadosDispositivo('teste', capacidade)
+    adicionar(disp, ts, valores, metodo)
+    return disp
+
+
+def adicionar(disp, ts, valores, metodo):
+    disp.adicionar_lote([('ph', t, v, metodo, {}) for t, v in zip(ts, valores)])
+
+
+@pytest.mark.parametrize('metodo', METODOS)
+def test_cauda_incremental_igual_ao_recalculo(metodo):
+    rng = np.random.default_rng(11)
+    ts, valores = gerar_leituras(400, rng)
+    incremental = DadosDispositivo('teste', 1000)
+    inicio = 0
+    # Lotes de tamanhos variados (1 leitura por mensagem, lotes do firmware, rajadas), com uma
+    # consulta depois de cada um para a grade em cache avançar só pela cauda
+    for tamanho in [3, 1, 1, 6, 2, 40, 1, 6, 6, 100, 5, 1, 228]:
+        fim = inicio + tamanho
+        adicionar(incremental, ts[inicio:fim], valores[inicio:fim], metodo)
+        inicio = fim
+        x_inc, y_inc = incremental.grade_interpolada('ph', INTERVALO_S)
+
+        x_ref, y_ref = novo_dispositivo(ts[:fim], valores[:fim], metodo).grade_interpolada('ph', INTERVALO_S)
+        np.testing.assert_array_equal(x_inc, x_ref)
+        np.testing.assert_allclose(y_inc, y_ref, rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert inicio == len(ts)
+
+
+def test_sem_dados_novos_reaproveita_a_grade():
+    rng = np.random.default_rng(3)
+    ts, valores = gerar_leituras(50, rng)
+    disp = novo_dispositivo(ts, valores, 'linear')
+    x1, y1 = disp.grade_interpolada('ph', INTERVALO_S)
+    entrada = next(iter(disp.cache_interpolacao.values()))
+    x2, y2 = disp.grade_interpolada('ph', INTERVALO_S)
+    assert next(iter(disp.cache_interpolacao.values())) is entrada
+    np.testing.assert_array_equal(x1, x2)
+    np.testing.assert_array_equal(y1, y2)
+
+
+def test_leitura_fora_de_ordem_recalcula():
+    rng = np.random.default_rng(5)
+    ts, valores = gerar_leituras(60, rng)
+    disp = novo_dispositivo(ts[:50], valores[:50], 'linear')
+    disp.grade_interpolada('ph', INTERVALO_S)
+    # A leitura 50 chega depois das seguintes
+    adicionar(disp, ts[51:], valores[51:], 'linear')
+    adicionar(disp, ts[50:51], valores[50:51], 'linear')
+    x, y = disp.grade_interpolada('ph', INTERVALO_S)
+
+    x_ref, y_ref = novo_dispositivo(ts, valores, 'linear').grade_interpolada('ph', INTERVALO_S)
+    np.testing.assert_array_equal(x, x_ref)
+    np.testing.assert_allclose(y, y_ref, rtol=1e-12)
+
+
+def test_troca_de_metodo_recalcula():
+    rng = np.random.default_rng(8)
+    ts, valores = gerar_leituras(80, rng)
+    disp = novo_dispositivo(ts[:40], valores[:40], 'linear')
+    disp.grade_interpolada('ph', INTERVALO_S)
+    adicionar(disp, ts[40:], valores[40:], 'logarithmic')
+    x, y = disp.grade_interpolada('ph', INTERVALO_S)
+
+    x_ref, y_ref = novo_dispositivo(ts, valores, 'logarithmic').grade_interpolada('ph', INTERVALO_S)
+    np.testing.assert_array_equal(x, x_ref)
+    np.testing.assert_allclose(y, y_ref, rtol=1e-12)
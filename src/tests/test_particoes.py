@@ -0,0 +1,124 @@
+"""
+Função: Testes do Parquet particionado por dispositivo e dia (cfe_hydro.particoes): ingestão de
+        exportações CSV, leitura igual ao CSV, poda de partições por dispositivo e intervalo e
+        reingestão da mesma exportação.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pyarrow')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.dados import carregar_colunas, instante_ms  # noqa: E402
+from cfe_hydro.particoes import arquivos_particoes, ingerir_csv, ler_particoes  # noqa: E402
+
+DIAS = 3
+PASSO_MIN = 30
+
+
+def gravar_exportacao(caminho, rng, desvio=0.0, invalidas=0):
+    """CSV no formato de data/dataset_cfe-hydro.csv: DIAS dias a partir de 01/01/2026, a cada PASSO_MIN"""
+    n = DIAS * 24 * 60 // PASSO_MIN
+    linhas = ['id;timestamp;temperatura;ph;ec;od']
+    for i in range(n):
+        minutos = i * PASSO_MIN
+        dia, hora, minuto = 1 + minutos // 1440, minutos // 60 % 24, minutos % 60
+        valores = 25 + desvio + rng.normal(0, 1), 6 + rng.normal(0, 0.2), 1.8 + rng.normal(0, 0.1), 6 + rng.normal(0, 0.5)
+        linhas.append(f"{i + 1};{dia:02d}/01/2026 {hora:02d}:{minuto:02d};" + ';'.join(f'{v:.2f}' for v in valores))
+    for i in range(invalidas):
+        linhas.append(f"{n + i + 1};;25.00;6.00;1.80;6.00")
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linhas) + '\n')
+    return n
+
+
+@pytest.fixture
+def exportacoes(tmp_path):
+    rng = np.random.default_rng(4)
+    caminhos = {}
+    for dispositivo, desvio in (('estufa_a', 0.0), ('estufa_b', 3.0)):
+        caminhos[dispositivo] = str(tmp_path / f'{dispositivo}.csv')
+        gravar_exportacao(caminhos[dispositivo], rng, desvio)
+    raiz = str(tmp_path / 'parquet')
+    for dispositivo, caminho in caminhos.items():
+        ingerir_csv(caminho, raiz, linhas_por_bloco=20)
+    return raiz, caminhos
+
+
+def test_ingestao_um_arquivo_por_dia(tmp_path):
+    caminho = str(tmp_path / 'estufa.csv')
+    n = gravar_exportacao(caminho, np.random.default_rng(1), invalidas=2)
+    resumo = ingerir_csv(caminho, str(tmp_path / 'parquet'), linhas_por_bloco=25)
+    assert resumo == {'linhas': n, 'descartadas': 2, 'dias': DIAS, 'arquivos': DIAS}
+    pastas = sorted(os.listdir(tmp_path / 'parquet' / 'dispositivo=estufa'))
+    assert pastas == ['data=2026-01-01', 'data=2026-01-02', 'data=2026-01-03']
+
+
+def test_leitura_igual_ao_csv(exportacoes):
+    raiz, caminhos = exportacoes
+    lido = ler_particoes(raiz, dispositivos=['estufa_b'])
+    original = carregar_colunas(caminhos['estufa_b'])
+    assert set(lido) == set(original)
+    np.testing.assert_array_equal(lido['id'], original['id'])
+    np.testing.assert_array_equal(lido['timestamp'], original['timestamp'])
+    for parametro in ('temperatura', 'ph', 'ec', 'od'):
+        assert lido[parametro].dtype == np.float32
+        np.testing.assert_array_equal(lido[parametro], original[parametro])
+
+
+def test_poda_por_dispositivo_e_intervalo(exportacoes):
+    raiz, _ = exportacoes
+    todos = arquivos_particoes(raiz)
+    assert len(todos) == 2 * DIAS
+    # Só o dia 2 de um dispositivo
+    arquivos = arquivos_particoes(raiz, ['estufa_a'], '2026-01-02T06:00', '2026-01-02T18:00')
+    assert [os.path.relpath(a, raiz).split(os.sep)[:2] for a in arquivos] == [
+        ['dispositivo=estufa_a', 'data=2026-01-02']]
+    # fim exclusivo na meia-noite: o dia seguinte não é aberto
+    assert len(arquivos_particoes(raiz, None, '2026-01-01', '2026-01-02')) == 2
+
+
+def test_leitura_do_intervalo(exportacoes):
+    raiz, caminhos = exportacoes
+    inicio, fim = '2026-01-01T22:00', '2026-01-02T03:30'
+    lido = ler_particoes(raiz, ['timestamp', 'ph', 'dispositivo'], inicio=inicio, fim=fim)
+    assert set(lido) == {'timestamp', 'ph', 'dispositivo'}
+    esperado_ts, esperado_ph, esperado_disp = [], [], []
+    for dispositivo in sorted(caminhos):
+        original = carregar_colunas(caminhos[dispositivo], ['timestamp', 'ph'])
+        dentro = (original['timestamp'] >= instante_ms(inicio)) & (original['timestamp'] < instante_ms(fim))
+        esperado_ts.append(original['timestamp'][dentro])
+        esperado_ph.append(original['ph'][dentro])
+        esperado_disp += [dispositivo] * int(dentro.sum())
+    np.testing.assert_array_equal(lido['timestamp'], np.concatenate(esperado_ts))
+    np.testing.assert_array_equal(lido['ph'], np.concatenate(esperado_ph))
+    assert lido['dispositivo'].tolist() == esperado_disp
+    assert len(lido['timestamp']) == 2 * (5.5 * 60 // PASSO_MIN)
+
+
+def test_reingestao_substitui(exportacoes):
+    raiz, caminhos = exportacoes
+    antes = ler_particoes(raiz, dispositivos=['estufa_a'])
+    # A mesma exportação, agora só com 2 dias: o dia 3 da ingestão anterior é removido
+    gravar_exportacao(caminhos['estufa_a'], np.random.default_rng(9))
+    with open(caminhos['estufa_a'], encoding='utf-8') as f:
+        linhas = f.readlines()
+    with open(caminhos['estufa_a'], 'w', encoding='utf-8') as f:
+        f.writelines(linhas[:1 + 2 * 24 * 60 // PASSO_MIN])
+    ingerir_csv(caminhos['estufa_a'], raiz)
+    depois = ler_particoes(raiz, dispositivos=['estufa_a'])
+    assert len(depois['id']) == 2 * 24 * 60 // PASSO_MIN < len(antes['id'])
+    assert sorted(os.listdir(os.path.join(raiz, 'dispositivo=estufa_a'))) == ['data=2026-01-01', 'data=2026-01-02']
+    # Outro dispositivo não é afetado
+    assert len(ler_particoes(raiz, dispositivos=['estufa_b'])['id']) == DIAS * 24 * 60 // PASSO_MIN
+
+
+def test_sem_linhas_no_intervalo(exportacoes):
+    raiz, _ = exportacoes
+    lido = ler_particoes(raiz, ['timestamp', 'od'], inicio='2027-01-01')
+    assert lido['timestamp'].dtype == np.int64 and len(lido['timestamp']) == 0
+    assert lido['od'].dtype == np.float32 and len(lido['od']) == 0
@@ -0,0 +1,162 @@
+"""
+Função: Testes dos modelos de previsão em fluxo (cfe_hydro.previsao): somas recentradas da
+        TendenciaLinear contra o ajuste em lote por mínimos quadrados ponderados, séries exatas
+        previstas sem erro, leituras inválidas ignoradas, limite da TendenciaPH e atualizações
+        amortecida e sazonal do HoltWinters.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.previsao import (MS_POR_HORA, VARIACAO_MAXIMA_PH, HoltWinters, TendenciaLinear,  # noqa: E402
+                                TendenciaPH, criar_previsor)
+
+T0_MS = 1_767_225_600_000
+HORIZONTES_MS = np.array([1, 60_000, 600_000, 3_600_000])
+
+
+def tempos_irregulares(n, rng):
+    return T0_MS + np.cumsum(rng.integers(2_000, 120_000, n)).astype(np.int64)
+
+
+def ajuste_em_lote(ts, y, meia_vida_s):
+    """Mínimos quadrados ponderados direto: peso 2^(-idade / meia_vida), tempos em horas"""
+    tau = (ts - ts[-1]) / MS_POR_HORA
+    w = 0.5 ** (-tau / (meia_vida_s / 3600))
+    a = np.stack([np.ones_like(tau), tau], axis=1)
+    coef = np.linalg.solve(a.T @ (w[:, None] * a), a.T @ (w * y))
+    return coef[0], coef[1]
+
+
+@pytest.mark.parametrize('meia_vida_s', [300, 900, 7200])
+def test_tendencia_igual_ao_ajuste_em_lote(meia_vida_s):
+    rng = np.random.default_rng(meia_vida_s)
+    ts = tempos_irregulares(400, rng)
+    y = 20 + 0.8 * np.sin((ts - T0_MS) / 4e6) + rng.normal(0, 0.05, len(ts))
+    previsor = TendenciaLinear(meia_vida_s).ajustar(ts, y)
+    a, b = ajuste_em_lote(ts, y, meia_vida_s)
+    media, _, _ = previsor.prever(ts[-1] + HORIZONTES_MS)
+    np.testing.assert_allclose(media, a + b * HORIZONTES_MS / MS_POR_HORA, rtol=1e-9)
+    # E em cada prefixo da série (o estado recentrado a cada leitura)
+    for k in (3, 17, 150):
+        parcial = TendenciaLinear(meia_vida_s).ajustar(ts[:k], y[:k])
+        a, b = ajuste_em_lote(ts[:k], y[:k], meia_vida_s)
+        assert parcial.prever([ts[k - 1] + 600_000])[0][0] == pytest.approx(a + b / 6, rel=1e-9)
+
+
+@pytest.mark.parametrize('previsor', [TendenciaLinear(), TendenciaLinear(meia_vida_s=60)])
+def test_reta_e_constante_exatas(previsor):
+    rng = np.random.default_rng(1)
+    ts = tempos_irregulares(200, rng)
+    horas = (ts - T0_MS) / MS_POR_HORA
+    previsor.ajustar(ts, 7.5 - 0.3 * horas)
+    media, inferior, superior = previsor.prever(ts[-1] + HORIZONTES_MS)
+    esperado = 7.5 - 0.3 * (ts[-1] + HORIZONTES_MS - T0_MS) / MS_POR_HORA
+    np.testing.assert_allclose(media, esperado, rtol=1e-10)
+    # Erros de um passo nulos: faixa sem largura
+    np.testing.assert_allclose(superior - inferior, 0.0, atol=1e-9)
+
+
+@pytest.mark.parametrize('previsor', [TendenciaLinear(), TendenciaPH(), HoltWinters(),
+                                      criar_previsor('sigmoidal'), criar_previsor('polynomial')])
+def test_constante_exata(previsor):
+    ts = tempos_irregulares(300, np.random.default_rng(2))
+    previsor.ajustar(ts, np.full(len(ts), 6.3))
+    media, inferior, superior = previsor.prever(ts[-1] + HORIZONTES_MS)
+    np.testing.assert_allclose(media, 6.3, rtol=1e-12)
+    np.testing.assert_allclose(inferior, 6.3, rtol=1e-12)
+    np.testing.assert_allclose(superior, 6.3, rtol=1e-12)
+
+
+def test_holt_segue_reta_com_passo_regular():
+    ts = T0_MS + np.arange(2000, dtype=np.int64) * 10_000
+    previsor = HoltWinters().ajustar(ts, 20 + 1e-5 * np.arange(2000))
+    media, _, _ = previsor.prever(ts[-1] + np.array([10_000, 600_000]))
+    np.testing.assert_allclose(media, 20 + 1e-5 * np.array([2000, 2059]), rtol=1e-9)
+    assert previsor.tendencia == pytest.approx(1e-5, rel=1e-6)
+
+
+@pytest.mark.parametrize('modelo', ['linear', 'logarithmic', 'sigmoidal', 'polynomial'])
+def test_fora_de_ordem_e_nan_ignorados(modelo):
+    rng = np.random.default_rng(3)
+    ts = tempos_irregulares(120, rng)
+    y = 6.0 + 0.1 * np.sin(np.arange(120) / 9) + rng.normal(0, 0.02, 120)
+    limpo = criar_previsor(modelo).ajustar(ts, y)
+
+    sujo = criar_previsor(modelo)
+    for i, (t, v) in enumerate(zip(ts, y)):
+        sujo.atualizar(t, v)
+        if i % 10 == 5:
+            sujo.atualizar(t, v + 1.0)              # repetida
+            sujo.atualizar(ts[i - 3], v - 1.0)      # atrasada
+        if i % 7 == 3:
+            sujo.atualizar(t + 1, math.nan)         # sem valor: não avança o relógio
+            sujo.atualizar(t + 2, math.inf)
+            sujo.atualizar(t + 3, -math.inf)
+            sujo.atualizar(t + 4, -400.0 if modelo == 'logarithmic' else math.nan)
+    assert sujo.fora_de_ordem == 2 * 12
+    assert sujo.n == limpo.n == 120 and sujo.ultimo_ms == limpo.ultimo_ms
+    for a, b in zip(sujo.prever(ts[-1] + HORIZONTES_MS), limpo.prever(ts[-1] + HORIZONTES_MS)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_ph_limitado_em_torno_do_nivel():
+    # pH subindo depressa: a reta em [H+] cruza o zero poucas horas à frente
+    ts = T0_MS + np.arange(60, dtype=np.int64) * 60_000
+    ph = 5.0 + np.linspace(0, 0.6, 60)
+    previsor = TendenciaPH(meia_vida_s=600).ajustar(ts, ph + np.random.default_rng(4).normal(0, 0.02, 60))
+    nivel = float(TendenciaPH._inversa(previsor._coeficientes()[0]))
+    horizontes = ts[-1] + np.arange(1, 49) * 15 * 60_000
+    media, inferior, superior = previsor.prever(horizontes)
+    for valores in (media, inferior, superior):
+        assert np.isfinite(valores).all()
+        assert (valores >= nivel - VARIACAO_MAXIMA_PH - 1e-12).all()
+        assert (valores <= nivel + VARIACAO_MAXIMA_PH + 1e-12).all()
+    assert media[-1] == pytest.approx(nivel + VARIACAO_MAXIMA_PH)
+    assert (inferior <= media).all() and (media <= superior).all()
+
+
+def test_amortecido_satura():
+    ts = T0_MS + np.arange(300, dtype=np.int64) * 10_000
+    y = 5 + 3 / (1 + np.exp(-(np.arange(300) - 150) / 20))
+    previsor = criar_previsor('sigmoidal').ajustar(ts[:170], y[:170])
+    media, _, _ = previsor.prever(ts[169] + np.array([10_000, 3_600_000, 36_000_000]))
+    # phi < 1: a tendência decai e a previsão converge a nivel + tendencia * phi / (1 - phi)
+    limite = previsor.nivel + previsor.tendencia * previsor.phi / (1 - previsor.phi)
+    assert media[-1] == pytest.approx(limite)
+    assert media[1] == pytest.approx(limite, rel=1e-12)
+    assert y[169] < media[0] < limite
+
+
+def test_sazonal_aprende_o_perfil_diario():
+    passo_ms = 600_000
+    ts = T0_MS + np.arange(30 * 144, dtype=np.int64) * passo_ms
+    fase = 2 * np.pi * (ts % 86_400_000) / 86_400_000
+    # Nível lento (alfa pequeno): o ciclo diário fica para a componente sazonal
+    previsor = HoltWinters(alfa=0.02, beta=0.02, gama=0.3, periodo_s=86400).ajustar(ts, 6 + np.sin(fase))
+    futuro = ts[-1] + np.arange(1, 145, dtype=np.int64) * passo_ms
+    media, inferior, superior = previsor.prever(futuro)
+    esperado = 6 + np.sin(2 * np.pi * (futuro % 86_400_000) / 86_400_000)
+    # Resta o erro da interpolação linear do perfil entre os 24 baldes
+    assert np.abs(media - esperado).max() < 0.01
+    assert (inferior < media).all() and (media < superior).all()
+    # Sem a componente sazonal, o mesmo Holt não acompanha o ciclo
+    sem_sazonal = HoltWinters(alfa=0.02, beta=0.02).ajustar(ts, 6 + np.sin(fase))
+    assert np.abs(sem_sazonal.prever(futuro)[0] - esperado).max() > 0.5
+
+
+def test_prever_grade_alinhada_e_vazia():
+    previsor = TendenciaLinear()
+    x, media, inferior, superior = previsor.prever_grade(3_600_000, 60_000)
+    assert len(x) == len(media) == 0
+    previsor.ajustar([T0_MS + 12_345, T0_MS + 72_345, T0_MS + 132_345], [1.0, 2.0, 3.0])
+    x, media, _, _ = previsor.prever_grade(600_000, 60_000)
+    assert (x % 60_000 == 0).all() and x[0] > T0_MS + 132_345 and x[-1] <= T0_MS + 732_345
+    assert len(x) == 10
+    np.testing.assert_allclose(media, 1.0 + (x - T0_MS - 12_345) / 60_000)
@@ -0,0 +1,86 @@
+"""
+Função: Testes da reconstrução esparsa (cfe_hydro.reconstrucao): costura das janelas sobrepostas
+        de reconstruir_serie (só o miolo de cada janela chega ao resultado), recuperação de um
+        sinal esparso no dicionário e preenchimento de trechos sem amostras.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.reconstrucao import (dicionario, mascaras_aleatorias, reconstruir_lote,  # noqa: E402
+                                    reconstruir_serie)
+
+
+def sinal(n, rng):
+    t = np.arange(n)
+    return 22 + 2 * np.sin(2 * np.pi * t / 300) + 0.5 * np.sin(2 * np.pi * t / 37) + rng.normal(0, 0.1, n)
+
+
+def janelas(n, janela, margem):
+    """Inícios das janelas como em reconstruir_serie: passo janela - 2*margem, última alinhada ao fim"""
+    passo = janela - 2 * margem
+    inicios = np.arange(0, n - janela + passo, passo)
+    inicios[-1] = min(inicios[-1], n - janela)
+    return inicios
+
+
+@pytest.mark.parametrize('n, janela, margem', [(1000, 64, 8), (2000, 256, 32), (448, 64, 8), (300, 128, 40)])
+@pytest.mark.parametrize('metodo', ['fista', 'omp'])
+def test_costura_usa_so_o_miolo(n, janela, margem, metodo):
+    rng = np.random.default_rng(n + janela)
+    valores = sinal(n, rng)
+    mascara = mascaras_aleatorias(n, 0.3, rng=rng)[0]
+    resultado = reconstruir_serie(valores, mascara, janela, margem, metodo=metodo)
+
+    inicios = janelas(n, janela, margem)
+    idx = inicios[:, None] + np.arange(janela)[None, :]
+    blocos = reconstruir_lote(valores[idx], mascara[idx], metodo=metodo)
+    cobertos = np.zeros(n, dtype=bool)
+    for b, inicio in enumerate(inicios):
+        a = 0 if b == 0 else margem
+        z = janela if b == len(inicios) - 1 else janela - margem
+        miolo = slice(inicio + a, inicio + z)
+        if b + 1 < len(inicios):
+            # Trecho também coberto pelo miolo da janela seguinte (a última, recuada até o fim)
+            miolo = slice(miolo.start, min(miolo.stop, inicios[b + 1] + margem))
+        np.testing.assert_array_equal(resultado[miolo], blocos[b, miolo.start - inicio:miolo.stop - inicio])
+        cobertos[miolo] = True
+    assert cobertos.all()
+
+
+def test_serie_curta_uma_janela():
+    rng = np.random.default_rng(1)
+    valores = sinal(200, rng)
+    mascara = mascaras_aleatorias(200, 0.4, rng=rng)[0]
+    np.testing.assert_array_equal(reconstruir_serie(valores, mascara, janela=256),
+                                  reconstruir_lote(valores, mascara))
+    with pytest.raises(ValueError):
+        reconstruir_serie(np.zeros(600), np.ones(600, dtype=bool), janela=64, margem=32)
+
+
+@pytest.mark.parametrize('tipo', ['dct', 'haar'])
+def test_recupera_sinal_esparso(tipo):
+    n = 128
+    rng = np.random.default_rng(2)
+    coef = np.zeros(n)
+    coef[[1, 3, 6]] = [4.0, -2.0, 1.0]
+    x = 10 + dicionario(n, tipo) @ coef
+    mascara = mascaras_aleatorias(n, 0.5, rng=rng, incluir_extremos=True)[0]
+    recuperado = reconstruir_lote(np.where(mascara, x, np.nan), mascara, tipo, lam=0.001, max_iter=2000, tol=1e-8)
+    assert np.abs(recuperado - x).max() < 0.05 * np.ptp(x)
+
+
+def test_trecho_sem_amostras_interpolado():
+    n, janela, margem = 1000, 64, 8
+    valores = np.linspace(20.0, 30.0, n)
+    mascara = np.zeros(n, dtype=bool)
+    mascara[::5] = True
+    mascara[300:500] = False            # janelas inteiras sem nenhuma amostra transmitida
+    resultado = reconstruir_serie(valores, mascara, janela, margem)
+    assert np.isfinite(resultado).all()
+    np.testing.assert_allclose(resultado[380:420], valores[380:420])
@@ -0,0 +1,155 @@
+"""
+Função: Testes da reconstrução online (app/reconstrucao_online.py): pontos emitidos em fluxo iguais
+        à grade completa do InterpoladorSeletivo, descarga das lacunas pendentes dos métodos com
+        contexto, lacunas longas não preenchidas, descarte dos lotes mais antigos com a fila cheia
+        e contadores consistentes com entregas concorrentes.
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from config import CONTEXTO_RECONSTRUCAO, MAX_PONTOS_LACUNA  # noqa: E402
+from interpolador import InterpoladorSeletivo  # noqa: E402
+from reconstrucao_online import ReconstrucaoOnline  # noqa: E402
+
+INICIO_MS = 1_767_225_600_000
+INTERVALO_S = 20
+
+
+def gerar_leituras(n, rng):
+    """Leituras a cada ~60 s com atraso irregular, algumas no instante exato da grade"""
+    passos = rng.integers(45_000, 75_000, n)
+    passos[::17] = 60_000
+    ts = INICIO_MS + np.cumsum(passos)
+    valores = 6.0 + 0.8 * np.sin(2 * np.pi * (ts - INICIO_MS) / 10_800_000) + rng.normal(0, 0.05, n)
+    return ts, valores
+
+
+def pontos(ts, valores, metodo, sensor_type='ph'):
+    return [(sensor_type, int(t), float(v), metodo, {}) for t, v in zip(ts, valores)]
+
+
+def emitidos(reconstrucao):
+    """Lotes da fila local, concatenados: (timestamps_ms, valores)"""
+    lotes = []
+    while not reconstrucao.fila.empty():
+        lotes.append(reconstrucao.fila.get_nowait())
+    if not lotes:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    return np.concatenate([lote[3] for lote in lotes]), np.concatenate([lote[4] for lote in lotes])
+
+
+def grade_completa(ts, valores, metodo, passo_ms=INTERVALO_S * 1000):
+    x = passo_ms * np.arange(-(-int(ts[0]) // passo_ms), int(ts[-1]) // passo_ms + 1, dtype=np.int64)
+    return x, InterpoladorSeletivo.interpolar(ts, valores, x, metodo)
+
+
+@pytest.mark.parametrize('metodo', ['linear', 'logarithmic'])
+def test_metodos_locais_iguais_a_grade_completa(metodo):
+    ts, valores = gerar_leituras(300, np.random.default_rng(1))
+    reconstrucao = ReconstrucaoOnline(INTERVALO_S)
+    inicio = 0
+    for tamanho in [1, 1, 5, 2, 40, 6, 6, 100, 139]:
+        reconstrucao.adicionar_lote('estufa', pontos(ts[inicio:inicio + tamanho], valores[inicio:inicio + tamanho], metodo))
+        inicio += tamanho
+    x, y = emitidos(reconstrucao)
+    x_ref, y_ref = grade_completa(ts, valores, metodo)
+    np.testing.assert_array_equal(x, x_ref)
+    np.testing.assert_allclose(y, y_ref, rtol=1e-12, atol=1e-12)
+    # Métodos locais não deixam nada pendente
+    reconstrucao.descarregar()
+    assert len(emitidos(reconstrucao)[0]) == 0
+    assert reconstrucao.pontos_emitidos == len(x_ref)
+
+
+@pytest.mark.parametrize('metodo', ['polynomial', 'sigmoidal'])
+def test_descarregar_emite_lacunas_pendentes(metodo):
+    ts, valores = gerar_leituras(60, np.random.default_rng(2))
+    reconstrucao = ReconstrucaoOnline(INTERVALO_S)
+    reconstrucao.adicionar_lote('estufa', pontos(ts, valores, metodo))
+    x, _ = emitidos(reconstrucao)
+    # Espera CONTEXTO_RECONSTRUCAO leituras depois de cada lacuna antes de emiti-la
+    assert x[-1] <= ts[-1 - CONTEXTO_RECONSTRUCAO[metodo]] < x[-1] + INTERVALO_S * 1000
+
+    reconstrucao.descarregar()
+    x_fim, y_fim = emitidos(reconstrucao)
+    assert x_fim[0] > x[-1] and x_fim[-1] <= ts[-1] < x_fim[-1] + INTERVALO_S * 1000
+    x_ref, y_ref = grade_completa(ts, valores, metodo)
+    np.testing.assert_array_equal(np.concatenate([x, x_fim]), x_ref)
+    assert np.isfinite(y_fim).all()
+    # Janela curta: só aproxima a grade completa
+    np.testing.assert_allclose(y_fim, y_ref[-len(y_fim):], atol=0.1)
+    reconstrucao.descarregar()
+    assert len(emitidos(reconstrucao)[0]) == 0
+
+
+def test_lacuna_longa_nao_preenchida():
+    passo_ms = INTERVALO_S * 1000
+    longa = (MAX_PONTOS_LACUNA + 5) * passo_ms
+    ts = INICIO_MS + np.array([0, 60_000, 120_000, 120_000 + longa, 180_000 + longa, 240_000 + longa])
+    valores = np.arange(6, dtype=np.float64)
+    reconstrucao = ReconstrucaoOnline(INTERVALO_S)
+    reconstrucao.adicionar_lote('estufa', pontos(ts, valores, 'linear', 'temperatura'))
+    x, y = emitidos(reconstrucao)
+    assert reconstrucao.series[('estufa', 'temperatura')].lacunas_ignoradas == 1
+    dentro = (x > ts[2]) & (x < ts[3])
+    assert not dentro.any()
+    # Antes e depois da lacuna, a grade continua sendo emitida
+    np.testing.assert_array_equal(x[x <= ts[2]], INICIO_MS + passo_ms * np.arange(7))
+    np.testing.assert_array_equal(x[x >= ts[3]], ts[3] + passo_ms * np.arange(7))
+    np.testing.assert_allclose(y[x >= ts[3]], 3 + np.arange(7) / 3)
+
+
+def test_fora_de_ordem_nao_reemitido():
+    ts, valores = gerar_leituras(20, np.random.default_rng(3))
+    reconstrucao = ReconstrucaoOnline(INTERVALO_S)
+    reconstrucao.adicionar_lote('estufa', pontos(ts[:10], valores[:10], 'linear'))
+    reconstrucao.adicionar_lote('estufa', pontos(ts[[4, 9]], valores[[4, 9]] + 1, 'linear'))
+    reconstrucao.adicionar_lote('estufa', pontos(ts[10:], valores[10:], 'linear'))
+    x, y = emitidos(reconstrucao)
+    x_ref, y_ref = grade_completa(ts, valores, 'linear')
+    np.testing.assert_array_equal(x, x_ref)
+    np.testing.assert_allclose(y, y_ref)
+    assert reconstrucao.series[('estufa', 'ph')].fora_de_ordem == 2
+
+
+def test_fila_cheia_descarta_os_mais_antigos():
+    publicados = []
+    reconstrucao = ReconstrucaoOnline(INTERVALO_S, publicar=lambda *lote: publicados.append(lote[3][0]),
+                                      capacidade_fila=3)
+    ts = INICIO_MS + 60_000 * np.arange(7)
+    for t in ts:
+        reconstrucao.adicionar_lote('estufa', pontos([t], [6.0], 'linear'))
+    # 1 lote por leitura a partir da segunda: 6 lotes, os 3 primeiros descartados
+    assert reconstrucao.lotes_emitidos == len(publicados) == 6
+    assert reconstrucao.lotes_descartados == 3
+    restantes = [reconstrucao.fila.get_nowait()[3][0] for _ in range(3)]
+    assert restantes == publicados[3:]
+    assert reconstrucao.fila.empty()
+
+
+def test_contadores_com_entregas_concorrentes():
+    reconstrucao = ReconstrucaoOnline(INTERVALO_S, capacidade_fila=50)
+    n_threads, leituras = 8, 400
+    barreira = threading.Barrier(n_threads)
+
+    def ingerir(i):
+        barreira.wait()
+        for j in range(leituras):
+            reconstrucao.adicionar_lote(f'd{i}', pontos([INICIO_MS + 60_000 * j], [6.0], 'linear'))
+
+    threads = [threading.Thread(target=ingerir, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    lotes = n_threads * (leituras - 1)
+    assert reconstrucao.lotes_emitidos == lotes
+    assert reconstrucao.pontos_emitidos == lotes * 3 + n_threads
+    assert reconstrucao.lotes_descartados == lotes - reconstrucao.fila.qsize() == lotes - 50
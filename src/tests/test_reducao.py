@@ -0,0 +1,105 @@
+"""
+Função: Testes da redução de séries para exibição (cfe_hydro.reducao): LTTB contra uma
+        implementação escalar direta do algoritmo, com os mesmos baldes por tempo, e as
+        propriedades comuns aos métodos (limite, bordas, NaN, picos).
+
+Uso: python -m pytest -q tests   (a partir de ./src)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cfe_hydro.reducao import lttb, minmax, reduzir  # noqa: E402
+
+
+def lttb_referencia(x, y, limite):
+    """LTTB em laços Python: baldes de mesma duração sobre os pontos interiores"""
+    x = x - x[0]                    # como lttb: tempos relativos ao primeiro ponto
+    n = len(x)
+    if n <= limite:
+        return list(range(n))
+    interiores = range(1, n - 1)
+    bordas = np.linspace(x[1], x[n - 2], limite - 1)[1:-1]
+    baldes = {}
+    for i in interiores:
+        baldes.setdefault(int(np.searchsorted(bordas, x[i], side='right')), []).append(i)
+    baldes = [baldes[b] for b in sorted(baldes)]
+    escolhidos = [0]
+    for b, balde in enumerate(baldes):
+        ax, ay = x[escolhidos[-1]], y[escolhidos[-1]]
+        if b + 1 < len(baldes):
+            seguinte = baldes[b + 1]
+            cx = sum(x[j] for j in seguinte) / len(seguinte)
+            cy = sum(y[j] for j in seguinte) / len(seguinte)
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        areas = [abs((ax - cx) * (y[j] - ay) - (ax - x[j]) * (cy - ay)) for j in balde]
+        escolhidos.append(balde[int(np.argmax(areas))])
+    escolhidos.append(n - 1)
+    return escolhidos
+
+
+def serie(n, rng, irregular=False):
+    if irregular:
+        x = np.cumsum(rng.integers(1, 120, n)).astype(np.float64) * 1000 + 1.7e12
+    else:
+        x = np.arange(n, dtype=np.float64) * 60_000 + 1.7e12
+    y = np.sin(np.arange(n) / 50) + rng.normal(0, 0.1, n)
+    return x, y
+
+
+@pytest.mark.parametrize('n, limite, irregular', [
+    (1000, 100, False), (1000, 100, True), (5000, 37, True), (250, 249, False), (300, 3, True)])
+def test_lttb_igual_a_referencia(n, limite, irregular):
+    x, y = serie(n, np.random.default_rng(n + limite), irregular)
+    assert lttb(x, y, limite).tolist() == lttb_referencia(x, y, limite)
+
+
+@pytest.mark.parametrize('metodo', ['lttb', 'minmax'])
+def test_limite_bordas_e_ordem(metodo):
+    x, y = serie(10_000, np.random.default_rng(1), irregular=True)
+    indices = reduzir(x, y, 200, metodo)
+    assert len(indices) <= 200
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize('metodo', ['lttb', 'minmax'])
+def test_serie_curta_devolvida_inteira(metodo):
+    x, y = serie(50, np.random.default_rng(2))
+    assert reduzir(x, y, 50, metodo).tolist() == list(range(50))
+
+
+@pytest.mark.parametrize('metodo', ['lttb', 'minmax'])
+def test_nan_nunca_escolhido(metodo):
+    x, y = serie(2000, np.random.default_rng(3))
+    y[::7] = np.nan
+    indices = reduzir(x, y, 100, metodo)
+    assert np.isfinite(y[indices]).all()
+    assert indices[0] == 1 and indices[-1] == len(x) - 1
+
+
+@pytest.mark.parametrize('metodo', ['lttb', 'minmax'])
+def test_pico_preservado(metodo):
+    x, y = serie(5000, np.random.default_rng(4))
+    y[1234] = 50.0
+    assert 1234 in reduzir(x, y, 100, metodo)
+
+
+def test_minmax_extremos_de_cada_balde():
+    x, y = serie(4000, np.random.default_rng(5))
+    indices = minmax(x, y, 402)
+    assert y.argmax() in indices and y.argmin() in indices
+
+
+def test_datetime64_e_metodo_invalido():
+    x, y = serie(1000, np.random.default_rng(6))
+    datas = x.astype('datetime64[ms]')
+    assert lttb(datas, y, 50).tolist() == lttb(x, y, 50).tolist()
+    with pytest.raises(ValueError):
+        reduzir(x, y, 50, 'media')
+    with pytest.raises(ValueError):
+        lttb(x, y, 1)